@@ -0,0 +1,120 @@
+"""
+Script backends -- where ``runScript`` commands and the GUI steps around
+them are executed.
+
+``AfterEffectsBackend`` is the default: it assembles the ExtendScript file,
+drops it into the ``ae_command_runner.jsx`` queue and drives the AE window
+with hotkeys. Other backends (see ``ae_automation.simulator``) receive the
+same calls -- the script name plus its placeholder replacements -- and can
+run the orchestration layer without Windows or After Effects.
+
+Usage::
+
+    from ae_automation.simulator import SimulatorBackend
+
+    client = Client()
+    client.setScriptBackend(SimulatorBackend(latency=0.05))
+    client.startAfterEffect(config)
+
+Set ``AE_BACKEND=simulator`` to make the simulator the default backend.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ae_automation import settings
+from ae_automation.cancellation import CancellationToken
+from ae_automation.exceptions import ConfigValidationError
+from ae_automation.platform import hotkey, kill_ae_process, open_file, press_key, save_project_hotkey
+
+if TYPE_CHECKING:
+    from ae_automation import Client
+
+
+class ScriptBackend:
+    """Interface for executing automation commands against an After Effects host."""
+
+    name = "base"
+
+    def validate(self) -> None:
+        """Raise if the backend cannot run on this machine."""
+
+    def run_script(self, client: Client, file_name: str, replacements: dict[str, str]) -> str:
+        """Execute JSX template *file_name* with *replacements*; return the run's log name."""
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str) -> None:
+        """Send a keyboard shortcut to the host."""
+        raise NotImplementedError
+
+    def press_key(self, key: str) -> None:
+        """Send a single key press to the host."""
+        raise NotImplementedError
+
+    def pause(self, seconds: float, token: CancellationToken) -> None:
+        """Wait for the host UI to settle after a GUI step."""
+        token.sleep(seconds)
+
+    def open_project(self, path: str) -> None:
+        """Open the project file at *path* in the host."""
+        raise NotImplementedError
+
+    def wait_until_ready(self, client: Client, timeout: float) -> bool:
+        """Block until the host can accept scripts; False on timeout."""
+        return True
+
+    def save_project(self) -> None:
+        """Save the open project."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Shut the host down."""
+
+
+class AfterEffectsBackend(ScriptBackend):
+    """Run commands in a real After Effects through the file-based command queue."""
+
+    name = "aftereffects"
+
+    def validate(self) -> None:
+        settings.validate_settings()
+
+    def run_script(self, client: Client, file_name: str, replacements: dict[str, str]) -> str:
+        filePath, randomName = client.assembleScript(file_name, replacements)
+
+        # Execute script in the already-running After Effects instance using queue system
+        client._execute_script_in_running_ae(filePath)
+
+        client.cancel_token().sleep(1)  # Reduced sleep time since we wait in _execute_script_in_running_ae
+        return randomName
+
+    def hotkey(self, *keys: str) -> None:
+        hotkey(*keys)
+
+    def press_key(self, key: str) -> None:
+        press_key(key)
+
+    def open_project(self, path: str) -> None:
+        open_file(path)
+
+    def wait_until_ready(self, client: Client, timeout: float) -> bool:
+        return client.wait_for_after_effects_ready(timeout=timeout)
+
+    def save_project(self) -> None:
+        save_project_hotkey()
+
+    def close(self) -> None:
+        kill_ae_process()
+
+
+def create_backend(name: str | None = None) -> ScriptBackend:
+    """Build the backend named *name* (default: the ``AE_BACKEND`` setting)."""
+    name = (name or settings.AE_BACKEND).lower()
+    if name == "aftereffects":
+        return AfterEffectsBackend()
+    if name == "simulator":
+        from ae_automation.simulator import SimulatorBackend
+
+        return SimulatorBackend(latency=settings.SIMULATOR_LATENCY)
+    raise ConfigValidationError(field="AE_BACKEND", detail=f"unknown backend {name!r} (aftereffects, simulator)")
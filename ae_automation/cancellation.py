@@ -0,0 +1,219 @@
+"""
+Cooperative cancellation and per-stage timeouts for automation jobs.
+
+A ``CancellationToken`` is attached to the client while a job runs. The
+blocking points of a job -- ``runScript``'s queue polling, the readiness
+waits and aerender/ffmpeg subprocesses -- sleep through ``token.sleep()``
+and call ``token.check()``, so a cancel or timeout is noticed within a
+poll interval. Subprocesses registered with the token are killed (with
+their children) the moment it fires, which unblocks a render that would
+otherwise never exit.
+
+Usage::
+
+    token = CancellationToken(timeout=3600, stage_timeouts={"render": 1800})
+    with token.stage("render"):
+        token.sleep(1)      # raises JobTimeoutError once the stage overruns
+    token.begin_stage("edit")   # or switch stages without nesting
+    token.cancel()          # from another thread
+"""
+
+from __future__ import annotations
+
+import contextlib
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from typing import Callable
+
+from ae_automation.exceptions import JobCancelledError, JobTimeoutError
+from ae_automation.logging_config import get_logger
+from ae_automation.tracing import span
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+
+def parse_stage_timeouts(value: str) -> dict[str, float]:
+    """Parse ``"open=300,render=7200"`` into ``{"open": 300.0, "render": 7200.0}``."""
+    timeouts: dict[str, float] = {}
+    for part in value.split(","):
+        name, sep, seconds = part.partition("=")
+        if sep and name.strip() and seconds.strip():
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+def kill_process_tree(process: subprocess.Popen | int) -> None:
+    """Kill a process and all of its descendants. Missing processes are ignored."""
+    pid = process if isinstance(process, int) else process.pid
+    if psutil is not None:
+        try:
+            parent = psutil.Process(pid)
+            victims = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return
+        for proc in victims:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(victims, timeout=5)
+    elif not isinstance(process, int):
+        process.kill()
+
+
+class CancellationToken:
+    """Cancellation flag with an optional job deadline and per-stage deadlines."""
+
+    def __init__(self, timeout: float | None = None, stage_timeouts: dict[str, float] | None = None) -> None:
+        self.stage_timeouts = dict(stage_timeouts or {})
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._error: JobCancelledError | None = None
+        self._processes: set[subprocess.Popen] = set()
+        self._callbacks: list[Callable[[], None]] = []
+        self._timers: list[threading.Timer] = []
+        self._stage_timer: threading.Timer | None = None
+        self.stage_name: str | None = None
+        self.started_at = time.time()
+        self.stage_started_at = self.started_at
+        if timeout:
+            self._arm(timeout, lambda: JobTimeoutError(timeout=timeout))
+
+    # ── State ────────────────────────────────────────────────
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def error(self) -> JobCancelledError | None:
+        return self._error
+
+    def check(self) -> None:
+        """Raise the cancellation/timeout error if the token has fired."""
+        if self._error is not None:
+            raise self._error
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to *seconds*, waking immediately (and raising) on cancellation."""
+        self.check()
+        if seconds > 0:
+            with span("sleep", seconds=seconds):
+                woke = self._event.wait(seconds)
+            if woke:
+                self.check()
+
+    # ── Firing ───────────────────────────────────────────────
+
+    def cancel(self, reason: str | None = None) -> None:
+        """Cancel the job. Safe to call from any thread, and more than once."""
+        self._fire(JobCancelledError(reason=reason))
+
+    def _fire(self, error: JobCancelledError) -> None:
+        with self._lock:
+            if self._error is not None:
+                return
+            self._error = error
+            processes = list(self._processes)
+            callbacks = list(self._callbacks)
+            for timer in self._timers:
+                timer.cancel()
+        logger.warning("%s", error)
+        self._event.set()
+        for process in processes:
+            kill_process_tree(process)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                logger.debug("Cancellation callback failed: %s", exc)
+
+    def _arm(self, seconds: float, make_error: Callable[[], JobCancelledError]) -> threading.Timer:
+        timer = threading.Timer(seconds, lambda: self._fire(make_error()))
+        timer.daemon = True
+        with self._lock:
+            self._timers.append(timer)
+        timer.start()
+        return timer
+
+    def begin_stage(self, name: str, timeout: float | None = None) -> None:
+        """Enter stage *name*, replacing the current stage and its timer.
+
+        The stage times out after *timeout* seconds, or ``stage_timeouts[name]``.
+        """
+        self.end_stage()
+        self.check()
+        limit = timeout if timeout is not None else self.stage_timeouts.get(name)
+        self.stage_name = name
+        self.stage_started_at = time.time()
+        if limit:
+            self._stage_timer = self._arm(limit, lambda: JobTimeoutError(stage=name, timeout=limit))
+
+    def end_stage(self) -> None:
+        """Leave the current stage and stop its timer."""
+        timer, self._stage_timer = self._stage_timer, None
+        self.stage_name = None
+        if timer is not None:
+            timer.cancel()
+            with self._lock:
+                if timer in self._timers:
+                    self._timers.remove(timer)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, timeout: float | None = None) -> Iterator[CancellationToken]:
+        """Context-manager form of ``begin_stage()``/``end_stage()``."""
+        self.begin_stage(name, timeout)
+        try:
+            yield self
+        finally:
+            self.end_stage()
+        self.check()
+
+    def close(self) -> None:
+        """Stop any pending timers once the job is over."""
+        with self._lock:
+            for timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+
+    # ── Resources ────────────────────────────────────────────
+
+    def register_process(self, process: subprocess.Popen) -> None:
+        """Kill *process* (and its children) if the token fires while it runs."""
+        with self._lock:
+            if self._error is None:
+                self._processes.add(process)
+                return
+        kill_process_tree(process)
+
+    def unregister_process(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run *callback* when the token fires (e.g. to release an AE session)."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+
+class _NeverCancelled(CancellationToken):
+    """Token used outside batch jobs: never fires and tracks nothing."""
+
+    def cancel(self, reason: str | None = None) -> None:
+        pass
+
+    def register_process(self, process: subprocess.Popen) -> None:
+        pass
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        pass
+
+
+NEVER_CANCELLED: CancellationToken = _NeverCancelled()
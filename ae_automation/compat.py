@@ -69,6 +69,13 @@ SCRIPT_COMPAT: dict[str, dict[str, Any]] = {
             2020: "Some expression controls may not be accessible via scripting.",
         },
     },
+    "update_properties_bulk.jsx": {
+        "min_version": 2020,
+        "notes": "Batched update_properties.jsx: resolves the comp once, reports success per edit.",
+        "known_issues": {
+            2020: "Some expression controls may not be accessible via scripting.",
+        },
+    },
     "update_properties_frame.jsx": {
         "min_version": 2020,
         "notes": "Keyframe setting via setValueAtTime(). Universal but slow on comps with many keyframes.",
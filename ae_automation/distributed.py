@@ -0,0 +1,403 @@
+"""
+Distributed render nodes -- a coordinator that serves the batch queue over
+HTTP and worker agents that lease jobs from it.
+
+The coordinator wraps the durable job store (``ae_automation.job_store``).
+A worker leases one job at a time, heartbeats while it runs and posts the
+result record when it finishes. A worker that goes silent for longer than
+the lease (``settings.DISTRIBUTED_LEASE_SECONDS``) loses the job, which goes
+back to the queue for another node; its late heartbeat or result is
+refused, and a worker told its lease is gone cancels the local run.
+
+Workers run jobs with ``startBot`` (and through it ``renderFile``) by
+default. Any ``runner(config_path, token) -> result dict`` can be plugged
+in instead, e.g. a stub for testing several local workers without AE.
+
+Usage::
+
+    ae-automation coordinator --port 5050
+    ae-automation worker --coordinator http://render-head:5050
+
+Endpoints (JSON; ``X-AE-Token`` header required when DISTRIBUTED_TOKEN is set):
+
+- ``POST /api/jobs``                   ``{"configs": [...], "priority", "deadline"}``
+- ``GET  /api/status``                 batch status, as ``get_batch_status()``
+- ``POST /api/lease``                  ``{"worker"}`` -> ``{"job": {...} | null}``
+- ``POST /api/jobs/<id>/heartbeat``    ``{"worker"}``; 409 once the lease is revoked
+- ``POST /api/jobs/<id>/complete``     ``{"worker", "state", "error", "result"}``; 409 if revoked
+- ``POST /api/jobs/<id>/release``      ``{"worker"}``; hand the job back unfinished
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from typing import TYPE_CHECKING, Any, Callable
+
+from ae_automation import settings
+from ae_automation.cancellation import CancellationToken, parse_stage_timeouts
+from ae_automation.exceptions import CoordinatorError, JobCancelledError, JobTimeoutError
+from ae_automation.job_store import worker_id
+from ae_automation.logging_config import get_logger
+from ae_automation.timeline import StageTimeline
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+    from ae_automation import Client
+
+logger = get_logger(__name__)
+
+# runner(config_path, token) -> result record stored on the job
+JobRunner = Callable[[str, CancellationToken], dict[str, Any]]
+
+
+# ── Coordinator ──────────────────────────────────────────────
+
+
+class Coordinator:
+    """Serve a client's batch queue to remote workers."""
+
+    def __init__(self, client: Client | None = None, lease_seconds: float | None = None, token: str | None = None):
+        if client is None:
+            from ae_automation import Client
+
+            client = Client()
+        self.client = client
+        self.store = client.get_job_store()
+        self.lease_seconds = lease_seconds or settings.DISTRIBUTED_LEASE_SECONDS
+        self.token = settings.DISTRIBUTED_TOKEN if token is None else token
+        self._reaper_stop = threading.Event()
+        self.app = self.create_app()
+
+    def lease(self, worker: str) -> dict[str, Any] | None:
+        """Lease the next scheduled job to *worker*, with the config's text for nodes without shared storage."""
+        self.store.revoke_expired_leases()
+        job = self.store.claim_next(worker, lease_seconds=self.lease_seconds)
+        if job is None:
+            return None
+        try:
+            with open(job["config"], encoding="utf-8") as fh:
+                config_text: str | None = fh.read()
+        except OSError:
+            config_text = None
+        logger.info("Leased job %d (%s) to %s", job["id"], job["config"], worker)
+        return {
+            "id": job["id"],
+            "config": job["config"],
+            "config_text": config_text,
+            "attempts": job["attempts"],
+            "lease_seconds": self.lease_seconds,
+        }
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        return self.store.heartbeat(job_id, worker, self.lease_seconds)
+
+    def complete(
+        self, job_id: int, worker: str, state: str, error: str | None = None, result: dict[str, Any] | None = None
+    ) -> bool:
+        accepted = self.store.finish(job_id, state, error=error, result=result, worker=worker)
+        if accepted:
+            logger.info("Job %d finished on %s: %s", job_id, worker, state)
+        else:
+            logger.warning("Dropped result of job %d from %s: lease no longer held", job_id, worker)
+        return accepted
+
+    def release(self, job_id: int, worker: str) -> bool:
+        return self.store.release(job_id, worker)
+
+    def create_app(self) -> Flask:
+        from flask import Flask, jsonify, request
+
+        app = Flask(__name__)
+
+        @app.before_request
+        def check_token():
+            if self.token and request.headers.get("X-AE-Token") != self.token:
+                return jsonify({"success": False, "error": "Invalid or missing X-AE-Token"}), 401
+            return None
+
+        def body() -> dict[str, Any]:
+            return request.get_json(silent=True) or {}
+
+        @app.route("/api/status", methods=["GET"])
+        def status():
+            self.store.revoke_expired_leases()
+            return jsonify({"success": True, **self.client.get_batch_status()})
+
+        @app.route("/api/jobs", methods=["POST"])
+        def submit():
+            data = body()
+            configs = data.get("configs", [])
+            if not configs:
+                return jsonify({"success": False, "error": "No configs provided"}), 400
+            try:
+                total = self.client.queue_configs(
+                    configs, priority=int(data.get("priority", 0)), deadline=data.get("deadline")
+                )
+            except (OSError, ValueError) as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            return jsonify({"success": True, "queued": total})
+
+        @app.route("/api/lease", methods=["POST"])
+        def lease():
+            worker = body().get("worker")
+            if not worker:
+                return jsonify({"success": False, "error": "worker is required"}), 400
+            return jsonify({"success": True, "job": self.lease(worker)})
+
+        @app.route("/api/jobs/<int:job_id>/heartbeat", methods=["POST"])
+        def heartbeat(job_id: int):
+            if not self.heartbeat(job_id, body().get("worker", "")):
+                return jsonify({"success": False, "error": "Lease revoked"}), 409
+            return jsonify({"success": True})
+
+        @app.route("/api/jobs/<int:job_id>/complete", methods=["POST"])
+        def complete(job_id: int):
+            data = body()
+            try:
+                accepted = self.complete(
+                    job_id, data.get("worker", ""), data.get("state", ""), data.get("error"), data.get("result")
+                )
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            if not accepted:
+                return jsonify({"success": False, "error": "Lease revoked"}), 409
+            return jsonify({"success": True})
+
+        @app.route("/api/jobs/<int:job_id>/release", methods=["POST"])
+        def release(job_id: int):
+            if not self.release(job_id, body().get("worker", "")):
+                return jsonify({"success": False, "error": "Lease revoked"}), 409
+            return jsonify({"success": True})
+
+        return app
+
+    def start_reaper(self, interval: float | None = None) -> threading.Thread:
+        """Revoke expired leases in the background, even while no worker is polling."""
+        interval = interval or max(self.lease_seconds / 4, 0.05)
+
+        def _reap() -> None:
+            while not self._reaper_stop.wait(interval):
+                try:
+                    self.store.revoke_expired_leases()
+                except Exception as exc:
+                    logger.error("Lease reaper failed: %s", exc)
+
+        self._reaper_stop.clear()
+        thread = threading.Thread(target=_reap, daemon=True, name="ae-lease-reaper")
+        thread.start()
+        return thread
+
+    def stop_reaper(self) -> None:
+        self._reaper_stop.set()
+
+    def serve(self, host: str = "127.0.0.1", port: int = 5050) -> None:
+        """Run the coordinator until interrupted."""
+        from werkzeug.serving import run_simple
+
+        self.store.requeue_stale()
+        self.start_reaper()
+        try:
+            run_simple(host, port, self.app, threaded=True, use_reloader=False, use_debugger=False)
+        finally:
+            self.stop_reaper()
+
+
+# ── Worker ───────────────────────────────────────────────────
+
+
+class ClientRunner:
+    """Default job runner: ``startBot`` on this machine, returning stages and derived outputs."""
+
+    def __init__(self, client: Client | None = None) -> None:
+        if client is None:
+            from ae_automation import Client
+
+            client = Client()
+        self.client = client
+
+    def __call__(self, config_path: str, token: CancellationToken) -> dict[str, Any]:
+        client = self.client
+        timeline = StageTimeline()
+        client._cancel_token = token
+        client._stage_timeline = timeline
+        client._last_output_job = None
+        try:
+            client.startBot(config_path)
+            timeline.end()
+            result: dict[str, Any] = {"stages": timeline.as_list()}
+            if client._last_output_job is not None:
+                result["outputs"] = client._last_output_job.result()
+            return result
+        finally:
+            client._cancel_token = None
+            client._stage_timeline = None
+
+
+def load_runner(spec: str) -> JobRunner:
+    """Import a runner given as ``"package.module:function"``."""
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Runner must look like 'module:function', got {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class Worker:
+    """Lease jobs from a coordinator and run them one at a time."""
+
+    def __init__(
+        self,
+        coordinator_url: str,
+        runner: JobRunner | None = None,
+        name: str | None = None,
+        poll_interval: float | None = None,
+        token: str | None = None,
+        work_dir: str | None = None,
+    ) -> None:
+        if not coordinator_url.startswith(("http://", "https://")):
+            raise ValueError(f"Coordinator URL must be http(s), got {coordinator_url!r}")
+        self.url = coordinator_url.rstrip("/")
+        self.runner = runner
+        self.name = name or f"{worker_id()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = settings.DISTRIBUTED_POLL_SECONDS if poll_interval is None else poll_interval
+        self.token = settings.DISTRIBUTED_TOKEN if token is None else token
+        self.work_dir = work_dir or os.path.join(settings.CACHE_FOLDER, "worker")
+        self._stop = threading.Event()
+        self._current: CancellationToken | None = None
+
+    def _request(self, path: str, payload: dict[str, Any] | None = None) -> tuple[int, dict[str, Any]]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(  # noqa: S310 -- scheme checked in __init__
+            self.url + path, data=data, method="POST" if data is not None else "GET"
+        )
+        req.add_header("Content-Type", "application/json")
+        if self.token:
+            req.add_header("X-AE-Token", self.token)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:  # noqa: S310
+                return resp.status, json.loads(resp.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            try:
+                body = json.loads(e.read() or b"{}")
+            except ValueError:
+                body = {}
+            return e.code, body
+        except (urllib.error.URLError, OSError) as e:
+            raise CoordinatorError(url=self.url, detail=f"unreachable: {e}") from e
+
+    def _runner(self) -> JobRunner:
+        if self.runner is None:
+            self.runner = ClientRunner()
+        return self.runner
+
+    def _local_config(self, job: dict[str, Any]) -> str:
+        """Use the coordinator's path on shared storage, else a local copy of the config."""
+        if os.path.isfile(job["config"]) or job.get("config_text") is None:
+            return job["config"]
+        job_dir = os.path.join(self.work_dir, f"job_{job['id']}")
+        os.makedirs(job_dir, exist_ok=True)
+        path = os.path.join(job_dir, os.path.basename(job["config"]))
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(job["config_text"])
+        return path
+
+    def run_once(self) -> bool:
+        """Lease and run one job. Returns False when the queue had nothing to lease."""
+        status, body = self._request("/api/lease", {"worker": self.name})
+        if status != 200:
+            raise CoordinatorError(url=self.url, detail=f"lease failed ({status}): {body.get('error')}")
+        job = body.get("job")
+        if not job:
+            return False
+        self._run_job(job)
+        return True
+
+    def _run_job(self, job: dict[str, Any]) -> None:
+        job_id = job["id"]
+        token = CancellationToken(
+            timeout=settings.BATCH_JOB_TIMEOUT or None,
+            stage_timeouts=parse_stage_timeouts(settings.BATCH_STAGE_TIMEOUTS),
+        )
+        self._current = token
+        lease_lost = threading.Event()
+        done = threading.Event()
+        beat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job_id, token, max(float(job.get("lease_seconds", 60)) / 3, 0.05), done, lease_lost),
+            daemon=True,
+        )
+        beat.start()
+        logger.info("Worker %s running job %d (%s)", self.name, job_id, job["config"])
+
+        state, error, result = "success", None, {}
+        try:
+            result = self._runner()(self._local_config(job), token) or {}
+        except JobTimeoutError as exc:
+            state, error = "error", str(exc)
+        except JobCancelledError as exc:
+            state, error = "cancelled", str(exc)
+        except Exception as exc:
+            logger.error("Job %d failed: %s", job_id, exc)
+            state, error = "error", str(exc)
+        finally:
+            done.set()
+            beat.join()
+            token.close()
+            self._current = None
+
+        if lease_lost.is_set():
+            logger.warning("Job %d was reassigned; discarding the local result", job_id)
+            return
+        if self._stop.is_set() and state == "cancelled":
+            self._request(f"/api/jobs/{job_id}/release", {"worker": self.name})
+            return
+        status, _ = self._request(
+            f"/api/jobs/{job_id}/complete", {"worker": self.name, "state": state, "error": error, "result": result}
+        )
+        if status == 409:
+            logger.warning("Coordinator refused the result of job %d: lease revoked", job_id)
+
+    def _heartbeat_loop(
+        self, job_id: int, token: CancellationToken, interval: float, done: threading.Event, lease_lost: threading.Event
+    ) -> None:
+        while not done.wait(interval):
+            try:
+                status, _ = self._request(f"/api/jobs/{job_id}/heartbeat", {"worker": self.name})
+            except CoordinatorError as exc:
+                # Keep working; the coordinator revokes the lease if this lasts
+                logger.warning("Heartbeat for job %d failed: %s", job_id, exc)
+                continue
+            if status == 409:
+                lease_lost.set()
+                token.cancel("lease revoked by coordinator")
+                return
+
+    def run(self, max_jobs: int | None = None, exit_when_idle: bool = False) -> int:
+        """Process jobs until stopped. Returns how many jobs this worker ran."""
+        processed = 0
+        logger.info("Worker %s polling %s", self.name, self.url)
+        while not self._stop.is_set() and (max_jobs is None or processed < max_jobs):
+            try:
+                ran = self.run_once()
+            except CoordinatorError as exc:
+                logger.warning("%s", exc)
+                ran = False
+            if ran:
+                processed += 1
+            elif exit_when_idle:
+                break
+            else:
+                self._stop.wait(self.poll_interval)
+        return processed
+
+    def stop(self) -> None:
+        """Stop after handing the current job (if any) back to the coordinator."""
+        self._stop.set()
+        if self._current is not None:
+            self._current.cancel("worker stopping")
@@ -0,0 +1,336 @@
+"""
+Bounded undo/redo history stored as JSON-patch deltas.
+
+Each edit is kept as a forward and an inverse RFC 6902 patch (``add``,
+``remove`` and ``replace`` operations), so undo and redo touch only what
+the edit changed instead of re-parsing a snapshot of the whole project.
+Every ``checkpoint_every`` edits a full snapshot is kept as well. Snapshots
+let the oldest edits be dropped in blocks once the history passes its entry
+or memory cap. They also rebuild a state when a patch no longer applies,
+e.g. after the project file was edited outside the editor.
+
+Usage::
+
+    history = EditHistory(data)
+    history.record(data, new_data)
+    data = new_data
+    data = history.undo(data)  # patched in place
+    data = history.redo(data)
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+from dataclasses import dataclass
+from typing import Any
+
+from ae_automation import settings
+
+Patch = list[dict[str, Any]]
+
+
+class PatchError(ValueError):
+    """A patch operation does not fit the document it is applied to."""
+
+
+def _escape(token: str | int) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> Patch:
+    """Return the operations that turn *old* into *new*."""
+    return diff_with_inverse(old, new, path)[0]
+
+
+def diff_with_inverse(old: Any, new: Any, path: str = "") -> tuple[Patch, Patch]:
+    """Return the operations that turn *old* into *new* and the ones that turn it back.
+
+    Both patches come from one walk: each forward operation records the old
+    value it overwrites or removes, and the inverse is those operations
+    undone in reverse order. Containers are walked rather than compared as a
+    whole, so no subtree is compared more than once; list insertions and
+    deletions are found after trimming the common prefix and suffix, so
+    adding a scene produces one ``add`` rather than a shifted ``replace`` per
+    following scene.
+    """
+    ops: Patch = []
+    inverse: Patch = []
+    _diff(old, new, path, ops, inverse)
+    inverse.reverse()
+    return ops, inverse
+
+
+def _same(old: Any, new: Any) -> bool:
+    """JSON equality: unlike ``==``, ``true`` is not ``1`` and ``1`` is not ``1.0``."""
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return len(old) == len(new) and all(key in new and _same(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(map(_same, old, new))
+    return bool(old == new)
+
+
+def _same_run(old: list[Any], new: list[Any]) -> bool:
+    """``_same`` for two list slices, checked in C where possible.
+
+    marshal version 0 writes every value with its own type code and no
+    shared references, so equal bytes mean equal JSON. Different bytes may
+    only mean a different key order, which the slow path accepts.
+    """
+    try:
+        if marshal.dumps(old, 0) == marshal.dumps(new, 0):
+            return True
+    except ValueError:
+        pass
+    return all(map(_same, old, new))
+
+
+def _diff(old: Any, new: Any, path: str, ops: Patch, inverse: Patch) -> None:
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+                inverse.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+                inverse.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+            else:
+                _diff(old[key], value, f"{path}/{_escape(key)}", ops, inverse)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        _diff_lists(old, new, path, ops, inverse)
+        return
+    if type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+        inverse.append({"op": "replace", "path": path, "value": old})
+
+
+def _diff_lists(old: list[Any], new: list[Any], path: str, ops: Patch, inverse: Patch) -> None:
+    shortest = min(len(old), len(new))
+    prefix = 0
+    while prefix < shortest and old[prefix] == new[prefix]:
+        prefix += 1
+    # == treats true as 1 and 1 as 1.0, so confirm the trimmed runs with JSON types
+    if prefix and not _same_run(old[:prefix], new[:prefix]):
+        prefix = 0
+        while prefix < shortest and _same(old[prefix], new[prefix]):
+            prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    if suffix and not _same_run(old[len(old) - suffix :], new[len(new) - suffix :]):
+        suffix = 0
+        while suffix < shortest - prefix and _same(old[-1 - suffix], new[-1 - suffix]):
+            suffix += 1
+    old_mid = old[prefix : len(old) - suffix]
+    new_mid = new[prefix : len(new) - suffix]
+
+    common = min(len(old_mid), len(new_mid))
+    for offset in range(common):
+        _diff(old_mid[offset], new_mid[offset], f"{path}/{prefix + offset}", ops, inverse)
+    # Remove from the highest index down so earlier indices stay valid
+    for offset in range(len(old_mid) - 1, common - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+        inverse.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": old_mid[offset]})
+    for offset in range(common, len(new_mid)):
+        ops.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": new_mid[offset]})
+        inverse.append({"op": "remove", "path": f"{path}/{prefix + offset}"})
+
+
+def apply_patch(doc: Any, ops: Patch) -> Any:
+    """Apply *ops* to *doc* in place and return the (possibly replaced) document.
+
+    Raises:
+        PatchError: A path does not exist or an index is out of range
+    """
+    for op in ops:
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        if not tokens:
+            if op["op"] == "remove":
+                raise PatchError("Cannot remove the document root")
+            doc = op["value"]
+            continue
+        parent = doc
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+            key = tokens[-1]
+            if isinstance(parent, list):
+                index = int(key)
+                if op["op"] == "add":
+                    if index > len(parent):
+                        raise IndexError(index)
+                    parent.insert(index, op["value"])
+                elif op["op"] == "remove":
+                    del parent[index]
+                else:
+                    parent[index] = op["value"]
+            elif isinstance(parent, dict):
+                if op["op"] == "remove":
+                    del parent[key]
+                elif op["op"] == "replace" and key not in parent:
+                    raise KeyError(key)
+                else:
+                    parent[key] = op["value"]
+            else:
+                raise TypeError(type(parent).__name__)
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            raise PatchError(f"Cannot {op['op']} {op['path']}: {exc!r}") from exc
+    return doc
+
+
+@dataclass
+class _Step:
+    """One edit: patches serialized as JSON so stored values never alias the live document."""
+
+    redo: str
+    undo: str
+    # Snapshot of the state after this edit, kept every checkpoint_every edits
+    checkpoint: str | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.redo) + len(self.undo) + len(self.checkpoint or "")
+
+
+class EditHistory:
+    """Undo/redo stack of JSON-patch deltas with periodic snapshots.
+
+    Args:
+        data: The document as it is now (the oldest state undo can return to)
+        max_entries: Most edits kept (default ``EDITOR_HISTORY_MAX_ENTRIES``)
+        max_bytes: Memory cap for patches and snapshots (default ``EDITOR_HISTORY_MAX_MB``)
+        checkpoint_every: Edits between full snapshots (default ``EDITOR_HISTORY_CHECKPOINT_EVERY``)
+
+    The caps are enforced by dropping the oldest edits up to the next
+    snapshot, so the history may exceed them by up to ``checkpoint_every``
+    edits.
+    """
+
+    def __init__(
+        self,
+        data: Any = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        checkpoint_every: int | None = None,
+    ) -> None:
+        self.max_entries = max_entries if max_entries is not None else settings.EDITOR_HISTORY_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.EDITOR_HISTORY_MAX_BYTES
+        self.checkpoint_every = max(
+            1, checkpoint_every if checkpoint_every is not None else settings.EDITOR_HISTORY_CHECKPOINT_EVERY
+        )
+        self.reset(data if data is not None else {})
+
+    def reset(self, data: Any) -> None:
+        """Forget every edit; *data* becomes the only state."""
+        self._base = json.dumps(data)
+        self._steps: list[_Step] = []
+        self._index = 0
+        self._bytes = len(self._base)
+
+    # ── Queries ──────────────────────────────────────────────
+
+    @property
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._index < len(self._steps)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    @property
+    def size_bytes(self) -> int:
+        """Characters held in patches and snapshots."""
+        return self._bytes
+
+    # ── Editing ──────────────────────────────────────────────
+
+    def record(self, old: Any, new: Any) -> bool:
+        """Add the edit from *old* to *new*, discarding any redo branch.
+
+        Returns False (and records nothing) when the documents are equal.
+        """
+        redo, undo = diff_with_inverse(old, new)
+        if not redo:
+            return False
+        for step in self._steps[self._index :]:
+            self._bytes -= step.size
+        del self._steps[self._index :]
+
+        step = _Step(redo=json.dumps(redo), undo=json.dumps(undo))
+        since_checkpoint = 1
+        for previous in reversed(self._steps):
+            if previous.checkpoint is not None:
+                break
+            since_checkpoint += 1
+        if since_checkpoint >= self.checkpoint_every:
+            step.checkpoint = json.dumps(new)
+        self._steps.append(step)
+        self._index += 1
+        self._bytes += step.size
+        self._trim()
+        return True
+
+    def undo(self, data: Any) -> Any:
+        """Return *data* (patched in place) as it was before the last edit."""
+        if not self.can_undo:
+            raise IndexError("Nothing to undo")
+        step = self._steps[self._index - 1]
+        self._index -= 1
+        try:
+            return apply_patch(data, json.loads(step.undo))
+        except PatchError:
+            return self.state_at(self._index)
+
+    def redo(self, data: Any) -> Any:
+        """Return *data* (patched in place) with the next undone edit reapplied."""
+        if not self.can_redo:
+            raise IndexError("Nothing to redo")
+        step = self._steps[self._index]
+        self._index += 1
+        try:
+            return apply_patch(data, json.loads(step.redo))
+        except PatchError:
+            return self.state_at(self._index)
+
+    def state_at(self, index: int) -> Any:
+        """Rebuild the state after *index* edits from the nearest snapshot at or before it."""
+        snapshot = self._base
+        start = index
+        while start > 0:
+            checkpoint = self._steps[start - 1].checkpoint
+            if checkpoint is not None:
+                snapshot = checkpoint
+                break
+            start -= 1
+        data = json.loads(snapshot)
+        for step in self._steps[start:index]:
+            data = apply_patch(data, json.loads(step.redo))
+        return data
+
+    def _trim(self) -> None:
+        """Drop the oldest edits, a snapshot-delimited block at a time, while over a cap."""
+        while len(self._steps) > self.max_entries or self._bytes > self.max_bytes:
+            cut = next((i for i, step in enumerate(self._steps) if step.checkpoint is not None), None)
+            # Never drop the current state or anything after it
+            if cut is None or cut + 1 > self._index:
+                return
+            dropped, self._steps = self._steps[: cut + 1], self._steps[cut + 1 :]
+            new_base = dropped[-1].checkpoint or ""
+            self._bytes += len(new_base) - len(self._base) - sum(step.size for step in dropped)
+            self._base = new_base
+            self._index -= cut + 1
@@ -7,7 +7,10 @@ Hierarchy:
     ├── AENotResponsiveError   -- AE launched but not responding
     ├── ScriptExecutionError   -- JSX script failed to execute
     ├── RenderError            -- aerender failed
-    └── ConfigValidationError  -- Invalid JSON config or settings
+    ├── ConfigValidationError  -- Invalid JSON config or settings
+    ├── CoordinatorError       -- Render node could not talk to the coordinator
+    └── JobCancelledError      -- Job cancelled before it finished
+        └── JobTimeoutError    -- Job or one of its stages ran out of time
 """
 
 from __future__ import annotations
@@ -96,8 +99,15 @@ class ConfigValidationError(AEAutomationError):
 
     field: str | None
     detail: str | None
+    errors: list[str]
 
-    def __init__(self, field: str | None = None, detail: str | None = None, message: str | None = None) -> None:
+    def __init__(
+        self,
+        field: str | None = None,
+        detail: str | None = None,
+        message: str | None = None,
+        errors: list[str] | None = None,
+    ) -> None:
         if message is None:
             message = "Configuration validation failed"
             if field:
@@ -106,4 +116,51 @@ class ConfigValidationError(AEAutomationError):
                 message += f": {detail}"
         self.field = field
         self.detail = detail
+        self.errors = errors or ([detail] if detail else [])
+        super().__init__(message)
+
+
+class CoordinatorError(AEAutomationError):
+    """A distributed worker could not reach the coordinator, or was refused."""
+
+    url: str | None
+
+    def __init__(self, url: str | None = None, detail: str | None = None, message: str | None = None) -> None:
+        if message is None:
+            message = f"Coordinator {url} request failed" if url else "Coordinator request failed"
+            if detail:
+                message += f": {detail}"
+        self.url = url
         super().__init__(message)
+
+
+class JobCancelledError(AEAutomationError):
+    """A batch job was cancelled while running."""
+
+    reason: str | None
+
+    def __init__(self, reason: str | None = None, message: str | None = None) -> None:
+        if message is None:
+            message = "Job cancelled"
+            if reason:
+                message += f": {reason}"
+        self.reason = reason
+        super().__init__(message)
+
+
+class JobTimeoutError(JobCancelledError):
+    """A job, or one of its stages, exceeded its time limit."""
+
+    stage: str | None
+    timeout: float | None
+
+    def __init__(self, stage: str | None = None, timeout: float | None = None, message: str | None = None) -> None:
+        if message is None:
+            message = "Job timed out"
+            if stage:
+                message += f" in stage '{stage}'"
+            if timeout is not None:
+                message += f" after {timeout:g}s"
+        self.stage = stage
+        self.timeout = timeout
+        super().__init__(message=message)
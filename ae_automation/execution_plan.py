@@ -0,0 +1,349 @@
+"""
+Execution plan -- lower timeline ``custom_actions`` into a flat list of
+operations and optimize it before anything is sent to After Effects.
+
+``parseCustomActions`` used to walk the raw config for every action:
+re-slugging ``scene_folder + " " + comp_name`` on each call and re-expanding
+``template`` actions by copying dicts. ``lower_config()`` does that work once,
+producing ``Operation`` objects whose target comp names, colors, defaults and
+template placeholders are already resolved. Optimization passes then run
+over the list:
+
+* ``drop_redundant_edits`` -- an ``update_layer_property`` that a later edit
+  of the same comp/layer/property overwrites is never sent.
+* ``group_by_comp`` -- runs of independent edits are reordered so edits to
+  the same comp sit together (order within a comp is kept).
+* ``merge_adjacent_edits`` -- adjacent property edits on one comp become a
+  single ``update_layer_properties`` operation.
+
+Operations that create comps or drive the AE GUI (``add_comp``,
+``swap_items_by_index``) are barriers no pass moves anything across, and
+passes never cross scene boundaries.
+
+Usage::
+
+    plan = lower_config(data, slug=client.slug, color=client.hexToRGBA).optimize()
+    for op in plan.scene(0):
+        ...
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from ae_automation.exceptions import ConfigValidationError
+from ae_automation.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# A whole value of "{name}" is filled from template_values; any name without braces works,
+# e.g. "{hero-title}" or "{line 1}"
+PLACEHOLDER_RE = re.compile(r"^\{([^{}]+)\}$")
+
+# Edits that only touch their own comp and may be reordered against edits to other comps
+REORDERABLE = frozenset({"update_layer_property", "update_layer_property_at_frame", "add_marker", "add_transition"})
+# Operations that create comps or depend on GUI selection; nothing moves across them
+BARRIERS = frozenset({"add_comp", "swap_items_by_index"})
+
+
+@dataclass
+class Operation:
+    """One resolved step of the plan.
+
+    ``comp`` is the final (slugged) comp the operation targets and ``args``
+    holds the remaining, already-converted arguments for its kind.
+    """
+
+    kind: str
+    scene: int
+    comp: str
+    args: dict[str, Any] = field(default_factory=dict)
+
+    def edit_key(self) -> tuple[str, str, str] | None:
+        """Return (comp, layer, property) for static property edits, else None."""
+        if self.kind != "update_layer_property":
+            return None
+        return (self.comp, self.args["layer"], self.args["property"])
+
+
+@dataclass
+class ExecutionPlan:
+    """A flat, ordered list of operations across all timeline scenes."""
+
+    operations: list[Operation] = field(default_factory=list)
+    # Number of actions in the config after template expansion
+    lowered: int = 0
+
+    def __iter__(self) -> Iterator[Operation]:
+        return iter(self.operations)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def scene(self, index: int) -> list[Operation]:
+        """Return the operations of timeline scene *index*, in execution order."""
+        return [op for op in self.operations if op.scene == index]
+
+    def optimize(self, passes: list[Callable[[list[Operation]], list[Operation]]] | None = None) -> ExecutionPlan:
+        """Run optimization *passes* (default: ``DEFAULT_PASSES``) over each scene, in place."""
+        passes = DEFAULT_PASSES if passes is None else passes
+        scenes: dict[int, list[Operation]] = {}
+        for op in self.operations:
+            scenes.setdefault(op.scene, []).append(op)
+        before = len(self.operations)
+        optimized: list[Operation] = []
+        for index in sorted(scenes):
+            ops = scenes[index]
+            for optimization in passes:
+                ops = optimization(ops)
+            optimized.extend(ops)
+        self.operations = optimized
+        logger.debug("Execution plan: %d actions lowered, %d -> %d operations", self.lowered, before, len(optimized))
+        return self
+
+
+# ── Lowering ────────────────────────────────────────────────
+
+
+class _Lowering:
+    """State shared while lowering one config: compiled templates and callbacks."""
+
+    def __init__(self, templates: dict[str, Any], slug: Callable[[str], str], color: Callable[[str], str] | None):
+        self.templates = templates
+        self.slug = slug
+        self.color = color
+        self.compiled: dict[str, list[tuple[dict[str, Any], list[tuple[str, str]]]]] = {}
+        self.count = 0
+
+    def compile_template(self, name: str) -> list[tuple[dict[str, Any], list[tuple[str, str]]]]:
+        """Return the steps of template *name* with their ``{placeholder}`` slots, parsed once."""
+        compiled = self.compiled.get(name)
+        if compiled is None:
+            compiled = []
+            for step in self.templates[name]:
+                slots = []
+                for key, value in step.items():
+                    match = PLACEHOLDER_RE.match(value) if isinstance(value, str) else None
+                    if match:
+                        slots.append((key, match.group(1)))
+                compiled.append((step, slots))
+            self.compiled[name] = compiled
+        return compiled
+
+    def lower(
+        self,
+        action: dict[str, Any],
+        scene_index: int,
+        scene_folder: str,
+        scene: dict[str, Any],
+        out: list[Operation],
+        expanding: tuple[str, ...] = (),
+    ) -> None:
+        kind = action["change_type"]
+        if kind == "template":
+            name = action["template_name"]
+            if name not in self.templates:
+                # Unknown templates were always skipped; validate_config reports them
+                return
+            if name in expanding:
+                raise ConfigValidationError(
+                    field="templates", detail=f"template {name!r} includes itself via {' -> '.join(expanding)}"
+                )
+            values = action.get("template_values") or {}
+            for step, slots in self.compile_template(name):
+                filled = dict(step)
+                for key, placeholder in slots:
+                    filled[key] = values[placeholder]
+                self.lower(filled, scene_index, scene_folder, scene, out, expanding + (name,))
+            return
+
+        self.count += 1
+        if kind == "add_comp":
+            out.append(
+                Operation(
+                    kind,
+                    scene_index,
+                    self.slug(scene_folder + " " + scene["template_comp"]),
+                    {
+                        "source": action["comp_name"],
+                        "folder": scene_folder,
+                        "start": action["startTime"],
+                        "duration": action["duration"],
+                    },
+                )
+            )
+            return
+
+        comp = self.slug(scene_folder + " " + action["comp_name"])
+        if kind in ("update_layer_property", "update_layer_property_at_frame"):
+            value = action["value"]
+            if action.get("property_type") == "color" and self.color is not None:
+                value = self.color(value)
+            args = {"layer": action["layer_name"], "property": action["property_name"], "value": value}
+            if kind == "update_layer_property_at_frame":
+                args["frame"] = action["frame"]
+        elif kind == "add_resource":
+            args = {
+                "resource": action["resource_name"],
+                "start": action["startTime"],
+                "duration": float(action["duration"]),
+                "move_to_end": str(action.get("moveToEnd", "false")).lower(),
+            }
+        elif kind == "edit_resource":
+            args = {
+                "layer_index": action["layerIndex"],
+                "start": action["startTime"],
+                "duration": action["duration"],
+                "move_to_end": str(action["moveToEnd"]).lower(),
+            }
+        elif kind == "swap_items_by_index":
+            args = {
+                "layer_index": action["layer_index"],
+                "item": action["layer_name"],
+                "fit_to_screen": action["fit_to_screen"],
+                "fit_to_screen_width": action["fit_to_screen_width"],
+                "fit_to_screen_height": action["fit_to_screen_height"],
+            }
+        elif kind == "add_marker":
+            args = {
+                "layer": self.slug(scene_folder + " " + action["layer_name"]),
+                "marker_name": action["marker_name"],
+                "marker_time": action["marker_time"],
+            }
+        elif kind == "apply_template_values":
+            values_source = action.get("values_file") or action.get("values", [])
+            args = {"values_file": values_source} if isinstance(values_source, str) else {"values": values_source}
+        elif kind == "add_transition":
+            args = {
+                "layer": action["layer_name"],
+                "transition_type": action.get("transition_type", "fade_in"),
+                "start_time": action.get("start_time", 0.0),
+                "duration": action.get("duration", 1.0),
+            }
+        else:
+            logger.warning("Skipping unknown custom action %r", kind)
+            self.count -= 1
+            return
+        out.append(Operation(kind, scene_index, comp, args))
+
+
+def lower_actions(
+    actions: list[dict[str, Any]],
+    scene_index: int,
+    scene_folder: str,
+    scene: dict[str, Any],
+    templates: dict[str, Any],
+    slug: Callable[[str], str],
+    color: Callable[[str], str] | None = None,
+) -> ExecutionPlan:
+    """Lower one scene's custom actions into an (unoptimized) plan."""
+    lowering = _Lowering(templates, slug, color)
+    operations: list[Operation] = []
+    for action in actions:
+        lowering.lower(action, scene_index, scene_folder, scene, operations)
+    return ExecutionPlan(operations, lowering.count)
+
+
+def lower_config(
+    data: dict[str, Any], slug: Callable[[str], str], color: Callable[[str], str] | None = None
+) -> ExecutionPlan:
+    """Lower every scene's custom actions in *data* into one (unoptimized) plan.
+
+    Args:
+        data: Loaded automation config
+        slug: Name normaliser used for AE item names (``Client.slug``)
+        color: Converts ``property_type: color`` values (``Client.hexToRGBA``)
+    """
+    lowering = _Lowering(data.get("templates") or {}, slug, color)
+    operations: list[Operation] = []
+    for index, scene in enumerate(data["timeline"]):
+        scene_folder = slug("Scene " + str(index + 1))
+        for action in scene.get("custom_actions", []):
+            lowering.lower(action, index, scene_folder, scene, operations)
+    return ExecutionPlan(operations, lowering.count)
+
+
+# ── Optimization passes ─────────────────────────────────────
+
+
+def _segments(ops: list[Operation]) -> Iterator[tuple[bool, list[Operation]]]:
+    """Split *ops* into (reorderable, operations) runs separated by everything else."""
+    run: list[Operation] = []
+    for op in ops:
+        if op.kind in REORDERABLE:
+            run.append(op)
+            continue
+        if run:
+            yield True, run
+            run = []
+        yield False, [op]
+    if run:
+        yield True, run
+
+
+def drop_redundant_edits(ops: list[Operation]) -> list[Operation]:
+    """Drop static property edits that a later edit of the same property overwrites.
+
+    An edit survives when anything other than a static edit touches its comp
+    (keyframes, markers, resources, ...) or a barrier runs before the
+    overwriting edit.
+    """
+    keep = [True] * len(ops)
+    # (comp, layer, property) -> index of the latest edit still pending an overwrite
+    pending: dict[tuple[str, str, str], int] = {}
+    for index, op in enumerate(ops):
+        key = op.edit_key()
+        if key is not None:
+            previous = pending.get(key)
+            if previous is not None:
+                keep[previous] = False
+            pending[key] = index
+        elif op.kind in BARRIERS:
+            pending.clear()
+        else:
+            pending = {k: v for k, v in pending.items() if k[0] != op.comp}
+    return [op for op, kept in zip(ops, keep) if kept]
+
+
+def group_by_comp(ops: list[Operation]) -> list[Operation]:
+    """Gather reorderable edits by target comp, keeping each comp's own order."""
+    grouped: list[Operation] = []
+    for reorderable, run in _segments(ops):
+        if not reorderable:
+            grouped.extend(run)
+            continue
+        by_comp: dict[str, list[Operation]] = {}
+        for op in run:
+            by_comp.setdefault(op.comp, []).append(op)
+        for comp_ops in by_comp.values():
+            grouped.extend(comp_ops)
+    return grouped
+
+
+def merge_adjacent_edits(ops: list[Operation]) -> list[Operation]:
+    """Merge adjacent static property edits on one comp into ``update_layer_properties``."""
+    merged: list[Operation] = []
+    for op in ops:
+        if op.kind != "update_layer_property":
+            merged.append(op)
+            continue
+        edit = {"layer": op.args["layer"], "property": op.args["property"], "value": op.args["value"]}
+        last = merged[-1] if merged else None
+        if last is not None and last.comp == op.comp and last.kind == "update_layer_properties":
+            last.args["edits"].append(edit)
+        elif last is not None and last.comp == op.comp and last.kind == "update_layer_property":
+            first = {"layer": last.args["layer"], "property": last.args["property"], "value": last.args["value"]}
+            merged[-1] = Operation("update_layer_properties", op.scene, op.comp, {"edits": [first, edit]})
+        else:
+            merged.append(op)
+    return merged
+
+
+DEFAULT_PASSES: list[Callable[[list[Operation]], list[Operation]]] = [
+    drop_redundant_edits,
+    group_by_comp,
+    merge_adjacent_edits,
+]
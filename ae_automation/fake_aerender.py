@@ -0,0 +1,179 @@
+"""
+Fake aerender -- a stand-in for After Effects' command-line renderer.
+
+Accepts aerender's arguments (``-project``, ``-comp``, ``-output``, ``-s``,
+``-e``, ...), prints the same PROGRESS/DURATION lines a real render does,
+writes diagnostics to stderr and produces an output file, so the render
+executor, progress parsing, split/stitch and output fan-out paths run on
+Linux without After Effects.
+
+``install()`` writes an executable ``aerender`` launcher; point
+``AERENDER_PATH`` at it. The render itself is tuned through environment
+variables, since callers only control aerender's own arguments:
+
+``FAKE_AERENDER_FRAMES``
+    Frames rendered when ``-s``/``-e`` are not given (default 300)
+``FAKE_AERENDER_FRAME_RATE``
+    Comp frame rate (default 30)
+``FAKE_AERENDER_FPS``
+    Render speed in frames per second; 0 renders without delay (default 0)
+``FAKE_AERENDER_PROGRESS_EVERY``
+    Print a PROGRESS line every N frames (default 1)
+``FAKE_AERENDER_STDERR_EVERY``
+    Print a stderr warning every N frames; 0 never (default 0)
+``FAKE_AERENDER_MEDIA``
+    ``ffmpeg`` encodes a real test clip with ffmpeg (``FFMPEG_PATH``), ``dummy``
+    writes placeholder bytes, ``auto`` (default) uses ffmpeg when available
+``FAKE_AERENDER_EXIT_CODE``
+    Exit code after rendering (default 0)
+
+Usage::
+
+    AERENDER_PATH=$(python -m ae_automation.fake_aerender --install /tmp/fake_ae)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import time
+
+# Runs this file directly so each render skips importing the whole package
+LAUNCHER = """#!{python}
+import os
+import runpy
+
+os.environ.setdefault("FFMPEG_PATH", {ffmpeg!r})
+runpy.run_path({script!r}, run_name="__main__")
+"""
+
+
+def install(folder: str, name: str = "aerender") -> str:
+    """Write an executable launcher for this module into *folder*; return its path."""
+    from ae_automation import settings
+
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    launcher = LAUNCHER.format(python=sys.executable, ffmpeg=settings.FFMPEG_PATH, script=os.path.abspath(__file__))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(launcher)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def timecode(frames: int, frame_rate: int) -> str:
+    """Format *frames* as aerender's ``H:MM:SS:FF`` timecode."""
+    seconds, frame = divmod(frames, frame_rate)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}:{frame:02d}"
+
+
+def _env(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="aerender", add_help=False)
+    parser.add_argument("-project", default="")
+    parser.add_argument("-comp", default="")
+    parser.add_argument("-output", default="")
+    parser.add_argument("-s", type=int)
+    parser.add_argument("-e", type=int)
+    parser.add_argument("-OMtemplate")
+    parser.add_argument("-mem_usage", nargs=2)
+    parser.add_argument("-mfr", nargs=2)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def write_media(path: str, frames: int, frame_rate: int, mode: str = "auto", ffmpeg: str | None = None) -> None:
+    """Write *path*: a real clip of *frames* frames through ffmpeg, or placeholder bytes."""
+    if mode == "dummy":
+        ffmpeg = ""
+    else:
+        ffmpeg = ffmpeg or os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg") or ""
+    if not ffmpeg and mode == "ffmpeg":
+        raise RuntimeError("FAKE_AERENDER_MEDIA=ffmpeg but ffmpeg was not found")
+    if not ffmpeg:
+        with open(path, "wb") as f:
+            f.write(b"\0" * 1024)
+        return
+
+    seconds = f"{frames / frame_rate:.6f}"
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y"]
+    if os.path.splitext(path)[1].lower() in (".wav", ".aif", ".aiff"):
+        cmd += ["-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo", "-t", seconds, path]
+    else:
+        source = f"testsrc2=size=320x180:rate={frame_rate}"
+        cmd += ["-f", "lavfi", "-i", source, "-frames:v", str(frames), "-c:v", "libx264", "-pix_fmt", "yuv420p"]
+        cmd += ["-preset", "ultrafast", path]
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+def render(argv: list[str] | None = None) -> int:
+    """Run one fake render with aerender's *argv*; return the exit code."""
+    args = _parse_args(argv)
+    frame_rate = int(_env("FAKE_AERENDER_FRAME_RATE", 30))
+    if args.s is not None or args.e is not None:
+        start = args.s or 0
+        end = args.e if args.e is not None else start + int(_env("FAKE_AERENDER_FRAMES", 300)) - 1
+        frames = end - start + 1
+    else:
+        frames = int(_env("FAKE_AERENDER_FRAMES", 300))
+    speed = _env("FAKE_AERENDER_FPS", 0)
+    progress_every = max(1, int(_env("FAKE_AERENDER_PROGRESS_EVERY", 1)))
+    stderr_every = int(_env("FAKE_AERENDER_STDERR_EVERY", 0))
+    out, err = sys.stdout, sys.stderr
+
+    def say(line: str) -> None:
+        out.write(f"PROGRESS:  {line}\n")
+        out.flush()
+
+    started = time.time()
+    out.write("aerender version 25.0x0 (fake)\n")
+    say("Launching After Effects...")
+    say(f"Project: {args.project}")
+    say(f'Starting composition "{args.comp}".')
+    say("")
+    say("Render Settings: Best Settings")
+    say(f"Duration: {timecode(frames, frame_rate)}")
+    say(f"Frame Rate: {frame_rate:.2f} (comp)")
+    say(f"Output To: {args.output}")
+
+    for frame in range(1, frames + 1):
+        if speed > 0:
+            time.sleep(1 / speed)
+        if frame % progress_every == 0 or frame == frames:
+            say(f"{timecode(frame - 1, frame_rate)} ({frame}): {int(time.time() - started)} Seconds")
+        if stderr_every and frame % stderr_every == 0:
+            err.write(f"aerender WARNING: frame {frame}: missing font substituted\n")
+            err.flush()
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        write_media(args.output, frames, frame_rate, os.getenv("FAKE_AERENDER_MEDIA", "auto"))
+    say(f'Finished composition "{args.comp}".')
+    say(f"Total Time Elapsed: {int(time.time() - started)} Seconds")
+    out.flush()
+
+    code = int(_env("FAKE_AERENDER_EXIT_CODE", 0))
+    if code:
+        err.write(f"aerender ERROR: render failed with code {code}\n")
+    return code
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--install"]:
+        print(install(argv[1] if len(argv) > 1 else os.getcwd()))
+        return 0
+    return render(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
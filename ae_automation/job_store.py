@@ -0,0 +1,457 @@
+"""
+Durable batch job store -- SQLite in WAL mode, stdlib only.
+
+Every queued config is a row with its state, attempt count, timestamps and
+result, so a crash or restart no longer loses a batch. WAL mode lets
+several processes enqueue and read status while one worker writes, and
+``claim_next()`` takes a job inside an ``IMMEDIATE`` transaction so two
+workers never run the same row.
+
+Job states::
+
+    pending -> running -> success | error
+    pending -> cancelled
+
+A ``running`` row whose worker process is gone is put back to ``pending``
+by ``requeue_stale()``, until it has used up ``max_attempts``. Jobs handed
+to remote render nodes (``ae_automation.distributed``) carry a lease
+instead: ``heartbeat()`` extends it and ``revoke_expired_leases()`` requeues
+the job once its worker goes silent.
+
+Scheduling: ``claim_next()`` picks the highest ``priority`` class first.
+Within a class, jobs with a deadline run earliest-deadline-first; the rest
+run shortest-estimated-cost first, with the cost discounted the longer a
+job waits (``BATCH_AGING_SECONDS``) so long renders are not starved either.
+The choice is recomputed on every claim, so an urgent job enqueued during
+an overnight run goes next without cancelling anything.
+
+Coalescing: a job enqueued with the same ``fingerprint`` as a pending job
+is linked to it (``coalesced_into``) instead of running again. The pair
+runs once -- the primary takes the higher priority and earlier deadline of
+the two -- and every follower mirrors the primary's state, error and result.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from ae_automation import settings
+from ae_automation.logging_config import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+FINISHED_STATES = ("success", "error", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    config TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    error TEXT,
+    result TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch_id, id);
+"""
+
+# Columns added after the first schema; applied to existing databases on open
+_MIGRATIONS = {
+    "priority": "ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+    "deadline": "ALTER TABLE jobs ADD COLUMN deadline REAL",
+    "est_cost": "ALTER TABLE jobs ADD COLUMN est_cost REAL",
+    "fingerprint": "ALTER TABLE jobs ADD COLUMN fingerprint TEXT",
+    "coalesced_into": "ALTER TABLE jobs ADD COLUMN coalesced_into INTEGER",
+    "lease_expires": "ALTER TABLE jobs ADD COLUMN lease_expires REAL",
+}
+
+
+def worker_id() -> str:
+    """Identify this process as ``host:pid``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def estimate_job_cost(config_path: str) -> float | None:
+    """Estimate a job's render cost as the seconds of timeline it renders.
+
+    Only the relative size matters for scheduling. Returns None when the
+    config cannot be read.
+    """
+    try:
+        with open(config_path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        timeline = data.get("timeline") or []
+        end = max((float(scene["startTime"]) + float(scene["duration"]) for scene in timeline), default=0.0)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    # Every derived output is another (cheaper) encode of the same length
+    outputs = len((data.get("project") or {}).get("outputs") or [])
+    return end * (1 + 0.25 * outputs)
+
+
+def config_fingerprint(config: dict[str, Any]) -> str:
+    """Hash a loaded config (paths already resolved) so identical jobs compare equal."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def parse_deadline(value: float | str | datetime.datetime | None) -> float | None:
+    """Accept epoch seconds, a datetime or an ISO 8601 string (local time if naive)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def schedule_key(job: dict[str, Any], now: float, aging_seconds: float, default_cost: float) -> tuple[Any, ...]:
+    """Sort key for pending jobs: lowest key runs next."""
+    deadline = job.get("deadline")
+    if deadline is not None:
+        # Earliest deadline first, ahead of undated jobs in the same class
+        return (-job.get("priority", 0), 0, deadline, job["id"])
+    cost = job.get("est_cost")
+    cost = default_cost if cost is None else cost
+    waited = max(0.0, now - job["created_at"])
+    effective = cost / (1 + waited / aging_seconds) if aging_seconds > 0 else cost
+    return (-job.get("priority", 0), 1, effective, job["id"])
+
+
+def _worker_alive(worker: str | None) -> bool:
+    """True if *worker* may still be running. Workers on other hosts are assumed alive."""
+    if not worker:
+        return False
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    if psutil is None:
+        return True
+    return bool(psutil.pid_exists(int(pid)))
+
+
+class JobStore:
+    """Persistent job queue shared by every process pointing at the same database file."""
+
+    def __init__(self, db_path: str | None = None, max_attempts: int | None = None) -> None:
+        self.db_path = db_path or settings.BATCH_DB_PATH
+        self.max_attempts = max_attempts if max_attempts is not None else settings.BATCH_MAX_ATTEMPTS
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, ddl in _MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(ddl)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection (sqlite3 connections are not shared across threads)."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict[str, Any]:
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else {}
+        return job
+
+    # ── Enqueue ──────────────────────────────────────────────
+
+    def current_batch(self) -> str | None:
+        """Return the newest batch that still has unfinished jobs, if any."""
+        row = (
+            self._conn()
+            .execute("SELECT batch_id FROM jobs WHERE state IN ('pending', 'running') ORDER BY id DESC LIMIT 1")
+            .fetchone()
+        )
+        return row["batch_id"] if row else None
+
+    def latest_batch(self) -> str | None:
+        row = self._conn().execute("SELECT batch_id FROM jobs ORDER BY id DESC LIMIT 1").fetchone()
+        return row["batch_id"] if row else None
+
+    def enqueue(
+        self,
+        config: str,
+        batch_id: str | None = None,
+        priority: int = 0,
+        deadline: float | None = None,
+        est_cost: float | None = None,
+        fingerprint: str | None = None,
+    ) -> int:
+        """Add a pending job. Joins the open batch unless *batch_id* is given. Returns the job id.
+
+        Args:
+            config: Path to the config file
+            batch_id: Batch to join (default: the open batch, or a new one)
+            priority: Higher runs first; an urgent revision can use e.g. 10
+            deadline: Epoch seconds the job should finish by
+            est_cost: Relative cost; estimated from the config when omitted
+            fingerprint: ``config_fingerprint()`` of the loaded config. A pending
+                job with the same fingerprint absorbs this one, and both get
+                its result.
+        """
+        if est_cost is None:
+            est_cost = estimate_job_cost(config)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if batch_id is None:
+                batch_id = self.current_batch() or uuid.uuid4().hex[:12]
+            primary = None
+            if fingerprint is not None:
+                primary = conn.execute(
+                    "SELECT id, priority, deadline FROM jobs "
+                    "WHERE fingerprint = ? AND state = 'pending' AND coalesced_into IS NULL ORDER BY id LIMIT 1",
+                    (fingerprint,),
+                ).fetchone()
+            if primary is not None:
+                # The shared run keeps the most urgent terms of every submitter
+                deadlines = [d for d in (primary["deadline"], deadline) if d is not None]
+                conn.execute(
+                    "UPDATE jobs SET priority = ?, deadline = ? WHERE id = ?",
+                    (max(primary["priority"], priority), min(deadlines) if deadlines else None, primary["id"]),
+                )
+            cursor = conn.execute(
+                "INSERT INTO jobs (batch_id, config, max_attempts, created_at, priority, deadline, est_cost, "
+                "fingerprint, coalesced_into) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    batch_id,
+                    config,
+                    self.max_attempts,
+                    time.time(),
+                    priority,
+                    deadline,
+                    est_cost,
+                    fingerprint,
+                    primary["id"] if primary is not None else None,
+                ),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        job_id = int(cursor.lastrowid or 0)
+        if primary is not None:
+            logger.info("Job %d duplicates pending job %d; it will share that run", job_id, primary["id"])
+        return job_id
+
+    # ── Worker side ──────────────────────────────────────────
+
+    def claim_next(self, worker: str | None = None, lease_seconds: float | None = None) -> dict[str, Any] | None:
+        """Atomically move the next scheduled pending job to ``running`` and return it.
+
+        With *lease_seconds* the claim expires unless the worker heartbeats.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._next_pending(conn)
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, worker = ?, started_at = ?, "
+                "finished_at = NULL, error = NULL, lease_expires = ? WHERE id = ? OR coalesced_into = ?",
+                (worker or worker_id(), now, now + lease_seconds if lease_seconds else None, row["id"], row["id"]),
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self._row(job)
+
+    def _next_pending(self, conn: sqlite3.Connection) -> dict[str, Any] | None:
+        pending = [
+            dict(row)
+            for row in conn.execute(
+                "SELECT id, priority, deadline, est_cost, created_at FROM jobs "
+                "WHERE state = 'pending' AND coalesced_into IS NULL"
+            )
+        ]
+        if not pending:
+            return None
+        known = sorted(job["est_cost"] for job in pending if job["est_cost"] is not None)
+        # Jobs without an estimate are treated as typical ones
+        default_cost = known[len(known) // 2] if known else 0.0
+        now = time.time()
+        return min(pending, key=lambda job: schedule_key(job, now, settings.BATCH_AGING_SECONDS, default_cost))
+
+    def finish(
+        self,
+        job_id: int,
+        state: str,
+        error: str | None = None,
+        result: dict[str, Any] | None = None,
+        worker: str | None = None,
+    ) -> bool:
+        """Record a job's final state, error and result payload (shared with coalesced jobs).
+
+        With *worker*, the update only applies while that worker still holds
+        the running job; returns False when its lease was revoked meanwhile.
+        """
+        if state not in FINISHED_STATES:
+            raise ValueError(f"Not a finished state: {state}")
+        sql = "UPDATE jobs SET state = ?, error = ?, result = ?, finished_at = ?, lease_expires = NULL "
+        sql += "WHERE (id = ? OR coalesced_into = ?)"
+        params: list[Any] = [state, error, json.dumps(result or {}), time.time(), job_id, job_id]
+        if worker is not None:
+            sql += " AND worker = ? AND state = 'running'"
+            params.append(worker)
+        return self._conn().execute(sql, params).rowcount > 0
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend *worker*'s lease on a running job. False means the lease is gone."""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'running'",
+            (time.time() + lease_seconds, job_id, worker),
+        )
+        return cursor.rowcount > 0
+
+    def release(self, job_id: int, worker: str) -> bool:
+        """Hand a running job back to the queue (e.g. a worker shutting down)."""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL "
+            "WHERE (id = ? OR coalesced_into = ?) AND worker = ? AND state = 'running'",
+            (job_id, job_id, worker),
+        )
+        return cursor.rowcount > 0
+
+    def update_result(self, job_id: int, **fields: Any) -> None:
+        """Merge *fields* into a job's stored result payload."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            result = json.loads(row["result"]) if row and row["result"] else {}
+            result.update(fields)
+            conn.execute(
+                "UPDATE jobs SET result = ? WHERE id = ? OR coalesced_into = ?", (json.dumps(result), job_id, job_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def requeue_stale(self) -> int:
+        """Return ``running`` jobs whose worker died to ``pending`` (or fail them past max_attempts)."""
+        requeued = self._requeue_running(lambda row: row["lease_expires"] is None and not _worker_alive(row["worker"]))
+        if requeued:
+            logger.info("Requeued %d interrupted job(s)", requeued)
+        return requeued
+
+    def revoke_expired_leases(self) -> int:
+        """Requeue leased jobs whose worker stopped heartbeating. Returns how many were revoked."""
+        now = time.time()
+        revoked = self._requeue_running(lambda row: row["lease_expires"] is not None and row["lease_expires"] < now)
+        if revoked:
+            logger.warning("Revoked %d expired lease(s)", revoked)
+        return revoked
+
+    def _requeue_running(self, is_lost: Callable[[sqlite3.Row], bool]) -> int:
+        conn = self._conn()
+        requeued = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, worker, attempts, max_attempts, lease_expires FROM jobs "
+                "WHERE state = 'running' AND coalesced_into IS NULL"
+            ).fetchall()
+            for row in rows:
+                if not is_lost(row):
+                    continue
+                if row["attempts"] >= row["max_attempts"]:
+                    conn.execute(
+                        "UPDATE jobs SET state = 'error', error = ?, finished_at = ?, lease_expires = NULL "
+                        "WHERE id = ? OR coalesced_into = ?",
+                        (
+                            f"Abandoned after {row['attempts']} interrupted attempt(s)",
+                            time.time(),
+                            row["id"],
+                            row["id"],
+                        ),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL "
+                        "WHERE id = ? OR coalesced_into = ?",
+                        (row["id"], row["id"]),
+                    )
+                    requeued += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return requeued
+
+    def cancel_pending(self, batch_id: str | None = None) -> int:
+        """Cancel pending jobs (in *batch_id*, or everywhere). Returns the number cancelled."""
+        sql = "UPDATE jobs SET state = 'cancelled', finished_at = ? WHERE state = 'pending'"
+        params: list[Any] = [time.time()]
+        if batch_id is not None:
+            sql += " AND batch_id = ?"
+            params.append(batch_id)
+        return self._conn().execute(sql, params).rowcount
+
+    # ── Queries ──────────────────────────────────────────────
+
+    def get(self, job_id: int) -> dict[str, Any] | None:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def jobs(self, batch_id: str | None = None, states: tuple[str, ...] | None = None) -> list[dict[str, Any]]:
+        """Return jobs in queue order, optionally filtered by batch and state."""
+        sql = "SELECT * FROM jobs WHERE 1 = 1"
+        params: list[Any] = []
+        if batch_id is not None:
+            sql += " AND batch_id = ?"
+            params.append(batch_id)
+        if states:
+            sql += f" AND state IN ({', '.join('?' * len(states))})"
+            params.extend(states)
+        return [self._row(row) for row in self._conn().execute(sql + " ORDER BY id", params)]
+
+    def counts(self, batch_id: str | None = None) -> dict[str, int]:
+        sql = "SELECT state, COUNT(*) AS n FROM jobs"
+        params: list[Any] = []
+        if batch_id is not None:
+            sql += " WHERE batch_id = ?"
+            params.append(batch_id)
+        return {row["state"]: row["n"] for row in self._conn().execute(sql + " GROUP BY state", params)}
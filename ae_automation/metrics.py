@@ -0,0 +1,301 @@
+"""
+Operational metrics in the Prometheus text exposition format.
+
+The automation records counters, gauges and histograms into one in-process
+``REGISTRY``; the VideoEditor and ChatPanel Flask apps serve it at
+``/metrics`` so Prometheus (or plain ``curl``) can scrape it without any
+extra service. Gauges whose value lives elsewhere (the queue folder, the
+batch job store) are read through a callback at scrape time.
+
+Usage::
+
+    from ae_automation import metrics
+
+    metrics.COMMANDS.inc(script="file_map.jsx")
+    metrics.COMMAND_LATENCY.observe(0.42, script="file_map.jsx")
+    print(metrics.REGISTRY.render())
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
+
+from ae_automation.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base for one named metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[tuple[str, LabelValues, tuple[str, ...], float]]:
+        """Return (suffix, label values, extra label pair, value) rows."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self._samples():
+            names = self.labelnames + (("le",) if extra else ())
+            labels = _format_labels(names, values + extra)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. commands sent."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[tuple[str, LabelValues, tuple[str, ...], float]]:
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._function: Callable[[], float | dict[Any, float]] | None = None
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float | dict[Any, float]] | None) -> None:
+        """Read the gauge from *function* on every scrape.
+
+        Unlabelled gauges return a number; labelled ones a dict keyed by the
+        label value (one label) or a tuple of label values.
+        """
+        self._function = function
+
+    def value(self, **labels: Any) -> float:
+        key = self._key(labels)
+        return dict(self._current()).get(key, 0)
+
+    def _current(self) -> list[tuple[LabelValues, float]]:
+        function = self._function
+        if function is None:
+            with self._lock:
+                return sorted(self._values.items())
+        try:
+            result = function()
+        except Exception as exc:
+            # One broken source must not take the whole scrape down
+            logger.debug("Could not read gauge %s: %s", self.name, exc)
+            return []
+        if not isinstance(result, dict):
+            return [((), float(result))]
+        return sorted(((key if isinstance(key, tuple) else (str(key),)), value) for key, value in result.items())
+
+    def _samples(self) -> list[tuple[str, LabelValues, tuple[str, ...], float]]:
+        return [("", key, (), value) for key, value in self._current()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets, e.g. command latency."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: non-cumulative bucket counts and a one-element running sum
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def totals(self) -> dict[LabelValues, tuple[int, float]]:
+        """Return ``(count, sum)`` of the observations for every label set."""
+        with self._lock:
+            return {key: (sum(counts), total[0]) for key, (counts, total) in self._values.items()}
+
+    def _samples(self) -> list[tuple[str, LabelValues, tuple[str, ...], float]]:
+        rows: list[tuple[str, LabelValues, tuple[str, ...], float]] = []
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                rows.append(("_bucket", key, (_format_value(bound),), cumulative))
+            rows.append(("_sum", key, (), total))
+            rows.append(("_count", key, (), cumulative))
+        return rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """Named collection of metrics rendered together for a scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: MetricT) -> MetricT:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = ()
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def clear(self) -> None:
+        """Reset all recorded values; metrics and gauge callbacks stay registered."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+def _queue_depth() -> float:
+    from ae_automation import settings
+
+    try:
+        return sum(1 for name in os.listdir(settings.QUEUE_FOLDER) if name.endswith(".jsx"))
+    except OSError:
+        return 0
+
+
+REGISTRY = Registry()
+
+COMMANDS = REGISTRY.counter("ae_commands_total", "Scripts sent to After Effects", ["script"])
+COMMAND_LATENCY = REGISTRY.histogram(
+    "ae_command_duration_seconds",
+    "Time from sending a script to After Effects until it returned",
+    ["script"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+COMMAND_PICKUP = REGISTRY.histogram(
+    "ae_command_pickup_seconds",
+    "Time from queueing a script until the After Effects runner picked it up",
+    ["script"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1, 2, 5),
+)
+COMMAND_EXECUTION = REGISTRY.histogram(
+    "ae_command_execution_seconds",
+    "ExtendScript execution time inside After Effects, measured with $.hiresTimer",
+    ["script"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+QUEUE_DEPTH = REGISTRY.gauge("ae_queue_depth", "Command files waiting in the After Effects queue folder")
+BATCH_JOBS = REGISTRY.gauge("ae_batch_jobs", "Batch jobs in the job store by state", ["state"])
+RENDER_DURATION = REGISTRY.histogram(
+    "ae_render_duration_seconds",
+    "Wall time of render processes",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+RENDER_FPS = REGISTRY.histogram(
+    "ae_render_fps", "Frames rendered per second by render processes", buckets=(1, 2, 5, 10, 15, 24, 30, 60, 120)
+)
+RENDER_CACHE_LOOKUPS = REGISTRY.counter(
+    "ae_render_cache_lookups_total", "Render cache lookups by result (hit or miss)", ["result"]
+)
+AE_RESTARTS = REGISTRY.counter("ae_restarts_total", "After Effects sessions started or killed, by reason", ["reason"])
+
+QUEUE_DEPTH.set_function(_queue_depth)
@@ -2,22 +2,30 @@ from __future__ import annotations
 
 import json
 import os
+import uuid
 import webbrowser
 from threading import Timer
 from typing import Any
 
-from flask import Flask, jsonify, request, send_file, send_from_directory
+from flask import Flask, Response, jsonify, request, send_file, send_from_directory
 from flask_cors import CORS
 from werkzeug.serving import run_simple
 
+from ae_automation import metrics
+from ae_automation.edit_history import EditHistory
+
 
 class VideoEditorAppMixin:
     dist_dir: str
     app: Flask
     data: dict[str, Any]
     file_path: str
-    history: list[str]
-    history_index: int
+    history: EditHistory
+    # (mtime_ns, size) of the project file when self.data was last read or written
+    _project_stat: tuple[int, int] | None
+    _data_version: int
+    _etag_prefix: str
+    _project_body: tuple[int, bytes] | None
 
     def __init__(self) -> None:
         # Get absolute path to the videoEditor directory
@@ -29,44 +37,50 @@ class VideoEditorAppMixin:
 
         self.data = {}
         self.file_path = ""
-        self.history = []
-        self.history_index = -1
+        self.history = EditHistory()
+        self._project_stat = None
+        self._data_version = 0
+        # Distinguishes ETags across server restarts, when versions start over
+        self._etag_prefix = uuid.uuid4().hex[:8]
+        self._project_body = None
 
         # API Routes
         @self.app.route("/api/project", methods=["GET"])
         def get_project():
-            """Get current project data"""
-            if self.file_path and os.path.exists(self.file_path):
-                with open(self.file_path) as f:
-                    self.data = json.load(f)
-            return jsonify({"success": True, "data": self.data, "file_path": self.file_path})
+            """Get current project data (304 when the client's ETag is current)"""
+            self._load_project()
+            etag = f"{self._etag_prefix}-{self._data_version}"
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                if self._project_body is None or self._project_body[0] != self._data_version:
+                    body = json.dumps({"success": True, "data": self.data, "file_path": self.file_path})
+                    self._project_body = (self._data_version, body.encode("utf-8"))
+                response = Response(self._project_body[1], mimetype="application/json")
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate every poll
+            response.headers["Cache-Control"] = "no-cache"
+            return response
 
         @self.app.route("/api/project", methods=["POST"])
         def update_project():
             """Update project data with history tracking"""
             try:
                 new_data = request.json
+                data = new_data.get("data", {})
 
-                # Add to history for undo/redo
-                if self.history_index < len(self.history) - 1:
-                    self.history = self.history[: self.history_index + 1]
-                self.history.append(json.dumps(self.data))
-                self.history_index += 1
+                # Add the delta to history for undo/redo
+                self.history.record(self.data, data)
 
                 # Update data
-                self.data = new_data.get("data", {})
-
-                # Save to file
-                if self.file_path:
-                    with open(self.file_path, "w") as f:
-                        json.dump(self.data, f, indent=4)
+                self._set_data(data)
 
                 return jsonify(
                     {
                         "success": True,
                         "message": "Project updated successfully",
-                        "can_undo": self.history_index > 0,
-                        "can_redo": self.history_index < len(self.history) - 1,
+                        "can_undo": self.history.can_undo,
+                        "can_redo": self.history.can_redo,
                     }
                 )
             except Exception as e:
@@ -75,32 +89,24 @@ class VideoEditorAppMixin:
         @self.app.route("/api/undo", methods=["POST"])
         def undo():
             """Undo last change"""
-            if self.history_index > 0:
-                self.history_index -= 1
-                self.data = json.loads(self.history[self.history_index])
-                if self.file_path:
-                    with open(self.file_path, "w") as f:
-                        json.dump(self.data, f, indent=4)
+            if self.history.can_undo:
+                self._set_data(self.history.undo(self.data))
                 return jsonify(
-                    {"success": True, "data": self.data, "can_undo": self.history_index > 0, "can_redo": True}
+                    {"success": True, "data": self.data, "can_undo": self.history.can_undo, "can_redo": True}
                 )
             return jsonify({"success": False, "message": "Nothing to undo"}), 400
 
         @self.app.route("/api/redo", methods=["POST"])
         def redo():
             """Redo last undone change"""
-            if self.history_index < len(self.history) - 1:
-                self.history_index += 1
-                self.data = json.loads(self.history[self.history_index])
-                if self.file_path:
-                    with open(self.file_path, "w") as f:
-                        json.dump(self.data, f, indent=4)
+            if self.history.can_redo:
+                self._set_data(self.history.redo(self.data))
                 return jsonify(
                     {
                         "success": True,
                         "data": self.data,
                         "can_undo": True,
-                        "can_redo": self.history_index < len(self.history) - 1,
+                        "can_redo": self.history.can_redo,
                     }
                 )
             return jsonify({"success": False, "message": "Nothing to redo"}), 400
@@ -289,6 +295,11 @@ class VideoEditorAppMixin:
 
             return send_file(file_path)
 
+        @self.app.route("/metrics", methods=["GET"])
+        def metrics_endpoint():
+            """Prometheus scrape endpoint for the shared metrics registry"""
+            return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
         # Serve React app
         @self.app.route("/", defaults={"path": ""})
         @self.app.route("/<path:path>")
@@ -298,6 +309,40 @@ class VideoEditorAppMixin:
                 return send_from_directory(self.dist_dir, path)
             return send_from_directory(self.dist_dir, "index.html")
 
+    def _stat_project(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_project(self) -> None:
+        """Re-read the project file into self.data if it changed on disk since it was last read or written."""
+        if not self.file_path:
+            return
+        stat = self._stat_project()
+        if stat is None or stat == self._project_stat:
+            return
+        with open(self.file_path) as f:
+            data = json.load(f)
+        if self._project_stat is None:
+            self.history.reset(data)
+        else:
+            # Edits made outside the editor become an undoable step
+            self.history.record(self.data, data)
+        self.data = data
+        self._project_stat = stat
+        self._data_version += 1
+
+    def _set_data(self, data: dict[str, Any]) -> None:
+        """Replace the project data and save it to the project file."""
+        self.data = data
+        self._data_version += 1
+        if self.file_path:
+            with open(self.file_path, "w") as f:
+                json.dump(self.data, f, indent=4)
+            self._project_stat = self._stat_project()
+
     def runVideoEditor(self, file_path: str, host: str = "127.0.0.1", port: int = 5000, dev_mode: bool = False) -> None:
         """
         Run the video editor application
@@ -310,14 +355,9 @@ class VideoEditorAppMixin:
         """
         self.file_path = os.path.abspath(file_path)
 
-        # Load initial data
-        if os.path.exists(self.file_path):
-            with open(self.file_path) as f:
-                self.data = json.load(f)
-
-        # Initialize history
-        self.history = [json.dumps(self.data)]
-        self.history_index = 0
+        # Load initial data and start the undo history from it
+        self._project_stat = None
+        self._load_project()
 
         print(f"Starting Video Editor API at http://{host}:{port}/")
         print(f"Editing file: {self.file_path}")
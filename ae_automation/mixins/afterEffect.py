@@ -2,24 +2,36 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import shutil
 import subprocess
+import tempfile
 import threading
 import time
 import uuid
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
 from jsmin import jsmin
 from mutagen.mp3 import MP3
 
-from ae_automation import settings
+from ae_automation import metrics, settings
+from ae_automation.backends import ScriptBackend, create_backend
+from ae_automation.cancellation import NEVER_CANCELLED, CancellationToken
 from ae_automation.exceptions import (
     AENotResponsiveError,
     RenderError,
 )
+from ae_automation.execution_plan import ExecutionPlan, Operation, lower_actions, lower_config
 from ae_automation.logging_config import get_logger
-from ae_automation.platform import hotkey, kill_ae_process, open_file, press_key, save_project_hotkey
+from ae_automation.outputs import OutputJob, OutputPipeline
+from ae_automation.render import build_aerender_command, split_frame_range, stitch_segments
+from ae_automation.render_cache import RenderCache, remove_output, scene_fingerprint
+from ae_automation.render_monitor import AerenderOutputReader, RenderEvent
+from ae_automation.render_planner import RenderPlan, RenderPlanner
+from ae_automation.tracing import span, trace_context
+from ae_automation.transcode import transcode
+
+from .types import validate_config
 
 logger = get_logger(__name__)
 
@@ -38,6 +50,9 @@ try:
 except ImportError:
     send_keys = None
 
+# Timing files older than this belong to commands whose wait already gave up
+_STALE_TIMING_SECONDS = 60
+
 
 class afterEffectMixin:
     """
@@ -47,6 +62,11 @@ class afterEffectMixin:
     afterEffectItems: list[dict[str, Any]]
     afterEffectResource: list[dict[str, Any]]
     JS_FRAMEWORK: str
+    _render_cache: RenderCache | None
+    _render_planner: RenderPlanner | None
+    _output_pipeline: OutputPipeline | None
+    _last_output_job: OutputJob | None
+    _script_backend: ScriptBackend | None
 
     def sanitize_text_for_ae(self, text: Any) -> Any:
         """
@@ -74,7 +94,11 @@ class afterEffectMixin:
         """
         startAfterEffect
         """
-        settings.validate_settings()
+        # Fail on config mistakes before spending minutes on launching AE
+        validate_config(data)
+        backend = self.getScriptBackend()
+        backend.validate()
+        self.mark_stage("startup")
         filePath = data["project"]["project_file"]
         logger.info("Start After Effect")
         logger.debug("debug=%s", data["project"]["debug"])
@@ -94,12 +118,17 @@ class afterEffectMixin:
         filePath = new_file_path
         logger.info("File copied to %s", filePath)
 
+        token = self.cancel_token()
         if not data["project"]["debug"]:
-            open_file(filePath)
+            token.begin_stage("open")
+            backend.open_project(filePath)
+            metrics.AE_RESTARTS.inc(reason="job")
             # Wait for After Effects to be fully loaded and ready
-            if not self.wait_for_after_effects_ready(timeout=120):
+            if not backend.wait_until_ready(self, timeout=120):
                 raise AENotResponsiveError(timeout=120)
 
+        token.begin_stage("edit")
+        self.mark_stage("project_map")
         self.deselectAll()
 
         # Get Map Project
@@ -140,6 +169,7 @@ class afterEffectMixin:
 
         logger.info("Comp ready")
 
+        self.mark_stage("imports")
         self.createFolder(settings.AFTER_EFFECT_PROJECT_FOLDER + "-cache", settings.AFTER_EFFECT_PROJECT_FOLDER)
         # Import Resources
         for resource in data["project"]["resources"]:
@@ -156,33 +186,53 @@ class afterEffectMixin:
 
         self.getProjectMap()
 
+        self.mark_stage("scene_setup")
         logger.info("Setting up the project")
+        plan = self.buildExecutionPlan(data)
         for i, itemTimeline in enumerate(data["timeline"]):
             scene_folder = self.slug("Scene " + str(i + 1))
 
             logger.info("Setting up %s", scene_folder)
 
-            if not self.checkIfItemExists(scene_folder):
-                self.deleteFolder(scene_folder)
-
-            self.createFolder(scene_folder, settings.AFTER_EFFECT_PROJECT_FOLDER)
-            self.addCompToTimeline(
-                data["project"]["comp_name"],
-                itemTimeline["template_comp"],
-                scene_folder,
-                itemTimeline["startTime"],
-                itemTimeline["duration"],
-            )
+            with trace_context(scene=i + 1), span("scene", folder=scene_folder):
+                if not self.checkIfItemExists(scene_folder):
+                    self.deleteFolder(scene_folder)
+
+                self.createFolder(scene_folder, settings.AFTER_EFFECT_PROJECT_FOLDER)
+                self.addCompToTimeline(
+                    data["project"]["comp_name"],
+                    itemTimeline["template_comp"],
+                    scene_folder,
+                    itemTimeline["startTime"],
+                    itemTimeline["duration"],
+                )
 
-            for custom_edit in itemTimeline["custom_actions"]:
-                self.parseCustomActions(custom_edit, scene_folder, itemTimeline, data)
+                self.executePlan(plan.scene(i))
 
         if not data["project"]["debug"]:
-            save_project_hotkey()
-            time.sleep(10)
-            kill_ae_process()
-            time.sleep(10)
-            self.renderFile(filePath, data["project"]["comp_name"], data["project"]["output_dir"])
+            self.mark_stage("save")
+            backend.save_project()
+            backend.pause(10, token)
+            backend.close()
+            token.begin_stage("render")
+            backend.pause(10, token)
+            self.mark_stage("render")
+            if data["project"].get("render_mode") == "scenes":
+                master_path = self.renderScenes(filePath, data)
+            else:
+                master_path = self.renderFile(
+                    filePath,
+                    data["project"]["comp_name"],
+                    data["project"]["output_dir"],
+                    segments=int(data["project"].get("render_segments", 1)),
+                    cache=data["project"].get("render_cache"),
+                    resources=[resource["path"] for resource in data["project"]["resources"]],
+                )
+            if data["project"].get("outputs"):
+                # Encoded in the background so the next job can start rendering
+                self._last_output_job = self.getOutputPipeline().submit(master_path, data["project"]["outputs"])
+        token.end_stage()
+        self.end_stage()
 
     def getResourceDuration(self, resource_name: str) -> float:
         """
@@ -193,110 +243,67 @@ class afterEffectMixin:
                 return float(resource["duration"])
         return 0
 
+    def buildExecutionPlan(self, data: dict[str, Any]) -> ExecutionPlan:
+        """Lower and optimize every scene's custom actions (see ``ae_automation.execution_plan``)."""
+        plan = lower_config(data, self.slug, self.hexToRGBA).optimize()
+        logger.info("Execution plan: %d custom actions in %d operations", plan.lowered, len(plan))
+        return plan
+
     def parseCustomActions(
         self, custom_edit: dict[str, Any], scene_folder: str, itemTimeline: dict[str, Any], data: dict[str, Any]
     ) -> None:
-        if "property_type" in custom_edit:
-            if custom_edit["property_type"] == "color":
-                custom_edit["value"] = self.hexToRGBA(custom_edit["value"])
-
-        if custom_edit["change_type"] == "update_layer_property":
-            self.editComp(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["layer_name"],
-                custom_edit["property_name"],
-                custom_edit["value"],
-            )
-
-        if custom_edit["change_type"] == "update_layer_property_at_frame":
-            self.editLayerAtKey(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["layer_name"],
-                custom_edit["property_name"],
-                custom_edit["value"],
-                custom_edit["frame"],
-            )
-
-        if custom_edit["change_type"] == "add_resource":
-            if "moveToEnd" not in custom_edit:
-                custom_edit["moveToEnd"] = "false"
-
-            _comp_duration = float(custom_edit["duration"])
+        """Run one custom action (expanding templates) without plan optimization."""
+        plan = lower_actions(
+            [custom_edit], 0, scene_folder, itemTimeline, data.get("templates") or {}, self.slug, self.hexToRGBA
+        )
+        self.executePlan(plan.operations)
+
+    def executePlan(self, operations: list[Operation] | ExecutionPlan) -> None:
+        """Send planned operations to After Effects in order."""
+        open_comp = None
+        for op in operations:
+            self.cancel_token().check()
+            if op.kind == "swap_items_by_index":
+                # Consecutive swaps in one comp reuse the comp already open in the viewer
+                self.swapItem(op.comp, op.args["layer_index"], op.args["item"], openComp=op.comp != open_comp)
+                open_comp = op.comp
+                if op.args["fit_to_screen"]:
+                    self.getScriptBackend().hotkey("ctrl", "alt", "f")
+                if op.args["fit_to_screen_width"]:
+                    self.getScriptBackend().hotkey("ctrl", "alt", "shift", "h")
+                if op.args["fit_to_screen_height"]:
+                    self.getScriptBackend().hotkey("ctrl", "alt", "shift", "g")
+                continue
+            open_comp = None
+            self._executeOperation(op)
+
+    def _executeOperation(self, op: Operation) -> None:
+        args = op.args
+        if op.kind == "update_layer_property":
+            self.editComp(op.comp, args["layer"], args["property"], args["value"])
+        elif op.kind == "update_layer_properties":
+            self.editCompBulk(op.comp, [(edit["layer"], edit["property"], edit["value"]) for edit in args["edits"]])
+        elif op.kind == "update_layer_property_at_frame":
+            self.editLayerAtKey(op.comp, args["layer"], args["property"], args["value"], args["frame"])
+        elif op.kind == "add_resource":
+            _comp_duration = args["duration"]
             if _comp_duration == 0.0:
-                _comp_duration = self.getResourceDuration(custom_edit["resource_name"])
-
+                _comp_duration = self.getResourceDuration(args["resource"])
             self.addResourceToTimeline(
-                custom_edit["resource_name"],
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["startTime"],
-                _comp_duration,
-                moveToEnd=str(custom_edit["moveToEnd"]).lower(),
+                args["resource"], op.comp, args["start"], _comp_duration, moveToEnd=args["move_to_end"]
             )
-
-        if custom_edit["change_type"] == "edit_resource":
+        elif op.kind == "edit_resource":
             self.updateLayerProperties(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["layerIndex"],
-                custom_edit["startTime"],
-                custom_edit["duration"],
-                moveToEnd=str(custom_edit["moveToEnd"]).lower(),
-            )
-
-        if custom_edit["change_type"] == "swap_items_by_index":
-            self.swapItem(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["layer_index"],
-                custom_edit["layer_name"],
-            )
-            if custom_edit["fit_to_screen"]:
-                hotkey("ctrl", "alt", "f")
-            if custom_edit["fit_to_screen_width"]:
-                hotkey("ctrl", "alt", "shift", "h")
-            if custom_edit["fit_to_screen_height"]:
-                hotkey("ctrl", "alt", "shift", "g")
-
-        if custom_edit["change_type"] == "add_marker":
-            self.addMarker(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                self.slug(scene_folder + " " + custom_edit["layer_name"]),
-                custom_edit["marker_name"],
-                custom_edit["marker_time"],
-            )
-
-        if custom_edit["change_type"] == "template":
-            if custom_edit["template_name"] in data["templates"]:
-                for _template in data["templates"][custom_edit["template_name"]]:
-                    template_edit = _template.copy()
-                    for key, value in template_edit.items():
-                        if "{" in str(value) and "}" in str(value):
-                            template_edit[key] = custom_edit["template_values"][value[1:-1]]
-                    self.parseCustomActions(template_edit, scene_folder, itemTimeline, data)
-
-        if custom_edit["change_type"] == "add_comp":
-            self.addCompToTimeline(
-                self.slug(scene_folder + " " + itemTimeline["template_comp"]),
-                custom_edit["comp_name"],
-                scene_folder,
-                custom_edit["startTime"],
-                custom_edit["duration"],
-            )
-
-        if custom_edit["change_type"] == "apply_template_values":
-            target = self.slug(scene_folder + " " + custom_edit["comp_name"])
-            values_source = custom_edit.get("values_file") or custom_edit.get("values", [])
-            if isinstance(values_source, str):
-                self.applyTemplateValues(target, values_file=values_source)
-            else:
-                self.applyTemplateValues(target, values=values_source)
-
-        if custom_edit["change_type"] == "add_transition":
-            self.addTransition(
-                self.slug(scene_folder + " " + custom_edit["comp_name"]),
-                custom_edit["layer_name"],
-                custom_edit.get("transition_type", "fade_in"),
-                custom_edit.get("start_time", 0.0),
-                custom_edit.get("duration", 1.0),
+                op.comp, args["layer_index"], args["start"], args["duration"], moveToEnd=args["move_to_end"]
             )
+        elif op.kind == "add_marker":
+            self.addMarker(op.comp, args["layer"], args["marker_name"], args["marker_time"])
+        elif op.kind == "add_comp":
+            self.addCompToTimeline(op.comp, args["source"], args["folder"], args["start"], args["duration"])
+        elif op.kind == "apply_template_values":
+            self.applyTemplateValues(op.comp, values=args.get("values"), values_file=args.get("values_file"))
+        elif op.kind == "add_transition":
+            self.addTransition(op.comp, args["layer"], args["transition_type"], args["start_time"], args["duration"])
 
     def checkIfItemExists(self, itemName: str) -> bool:
         """
@@ -311,10 +318,11 @@ class afterEffectMixin:
         """
         focusOnProjectPanel
         """
-        hotkey("ctrl", "0")
-        time.sleep(2)
-        hotkey("ctrl", "0")
-        time.sleep(2)
+        backend = self.getScriptBackend()
+        backend.hotkey("ctrl", "0")
+        backend.pause(2, self.cancel_token())
+        backend.hotkey("ctrl", "0")
+        backend.pause(2, self.cancel_token())
 
     def getProjectMap(self) -> dict[str, Any]:
         """
@@ -322,14 +330,25 @@ class afterEffectMixin:
         """
         logger.info("Getting project map")
 
-        self.runScript("file_map.jsx")
-        time.sleep(2)
-        data = json.load(open(settings.CACHE_FOLDER + "/file_map.json", encoding="utf-8"))
+        with span("getProjectMap") as trace:
+            self.runScript("file_map.jsx")
+            self.getScriptBackend().pause(2, self.cancel_token())
+            data = self.readScriptResult("file_map.json")
+            trace.set(items=len(data["files"]))
 
         self.afterEffectItems = data["files"]
         logger.debug("Finished getting project map")
         return data
 
+    def getCompFrameRange(self, compName: str) -> tuple[int, int] | None:
+        """Return the inclusive (start, end) frame range of a comp from the cached project map."""
+        for item in getattr(self, "afterEffectItems", []):
+            if item["name"] == compName and item.get("frameRate") and item.get("duration"):
+                total_frames = int(round(float(item["duration"]) * float(item["frameRate"])))
+                if total_frames > 0:
+                    return (0, total_frames - 1)
+        return None
+
     def getFolderItems(self, folder_name: str) -> list[dict[str, Any]]:
         """Return items from cached afterEffectItems whose parentFolder matches folder_name."""
         return [item for item in self.afterEffectItems if item.get("parentFolder") == folder_name]
@@ -340,7 +359,7 @@ class afterEffectMixin:
             "{folderName}": str(folder_name),
         }
         self.runScript("search_folder_items.jsx", _replace)
-        data = json.load(open(settings.CACHE_FOLDER + "/search_folder_items.json", encoding="utf-8"))
+        data = self.readScriptResult("search_folder_items.json")
         return data
 
     def createFolder(self, folderName: str, parentFolder: str = "") -> None:
@@ -361,11 +380,12 @@ class afterEffectMixin:
         """
         logger.info("Deleting folder: %s", folderName)
         self.goToItem(folderName)
-        press_key("delete")
-        time.sleep(1)
-        press_key("enter")
-        time.sleep(2)
-        save_project_hotkey()
+        backend = self.getScriptBackend()
+        backend.press_key("delete")
+        backend.pause(1, self.cancel_token())
+        backend.press_key("enter")
+        backend.pause(2, self.cancel_token())
+        backend.save_project()
 
     def createComp(
         self,
@@ -438,6 +458,51 @@ class afterEffectMixin:
         logger.debug("editComp replacements: %s", _replace)
         self.runScript("update_properties.jsx", _replace)
 
+    def editCompBulk(self, comp_name: str, edits: list[tuple[str, str, Any]]) -> list[bool]:
+        """
+        Apply several (layer_name, property_name, value) edits to one comp in a
+        single update_properties_bulk.jsx run.
+
+        Returns one success flag per edit, in order. Failed edits are logged
+        with the ExtendScript error; they do not stop the remaining edits.
+        """
+        if not edits:
+            return []
+        payload = [
+            {
+                "layer": str(layer_name),
+                "property": str(property_name),
+                "value": str(self.sanitize_text_for_ae(value) if isinstance(value, str) else value),
+            }
+            for layer_name, property_name, value in edits
+        ]
+        _replace = {
+            "{comp_name}": str(comp_name),
+            "{edits}": json.dumps(payload),
+        }
+        result_path = os.path.join(settings.CACHE_FOLDER, "update_properties_bulk.json")
+        if os.path.exists(result_path):
+            os.remove(result_path)
+        logger.debug("editCompBulk %s: %d edits", comp_name, len(edits))
+        self.runScript("update_properties_bulk.jsx", _replace)
+
+        try:
+            results = self.readScriptResult("update_properties_bulk.json")
+        except (OSError, ValueError):
+            logger.warning("No result from update_properties_bulk.jsx for %s", comp_name)
+            return [False] * len(edits)
+
+        flags = []
+        for edit, result in zip(payload, results):
+            if not result.get("ok"):
+                logger.warning(
+                    "Edit %s.%s on %s failed: %s", edit["layer"], edit["property"], comp_name, result.get("error")
+                )
+            flags.append(bool(result.get("ok")))
+        # A script error part-way leaves the rest unreported
+        flags.extend([False] * (len(edits) - len(flags)))
+        return flags
+
     def selectLayerByName(self, comp_name: str, layer_name: str) -> None:
         """
         editComp
@@ -489,12 +554,13 @@ class afterEffectMixin:
         }
         self.runScript("duplicate_comp_1.jsx", _replace)
 
-    def swapItem(self, fromCompName: str, toLayerIndex: int | str, ItemName: str) -> None:
-        self.openItemByName(fromCompName)
+    def swapItem(self, fromCompName: str, toLayerIndex: int | str, ItemName: str, openComp: bool = True) -> None:
+        if openComp:
+            self.openItemByName(fromCompName)
         self.selectItemByName(ItemName)
-        time.sleep(2)
+        self.getScriptBackend().pause(2, self.cancel_token())
         self.selectLayerByIndex(fromCompName, toLayerIndex)
-        hotkey("ctrl", "alt", "/")
+        self.getScriptBackend().hotkey("ctrl", "alt", "/")
 
     def addMarker(self, comp_name: str, layer_name: str, marker_name: str, marker_time: float | str) -> None:
         """
@@ -549,7 +615,7 @@ class afterEffectMixin:
 
         self.runScript("duplicate_comp_2.jsx", _replace)
 
-        data = json.load(open(settings.CACHE_FOLDER + "/comp_map.json", encoding="utf-8"))
+        data = self.readScriptResult("comp_map.json")
 
         for comp in data:
             self.swapItem(comp["fromCompName"], comp["toLayerIndex"], comp["ItemName"])
@@ -564,7 +630,7 @@ class afterEffectMixin:
             "{parentFolder}": str(parent_folder),
         }
         self.runScript("duplicate_folder_items.jsx", _replace)
-        data = json.load(open(settings.CACHE_FOLDER + "/duplicate_folder_items.json", encoding="utf-8"))
+        data = self.readScriptResult("duplicate_folder_items.json")
         return data
 
     def addResourceToTimeline(
@@ -674,9 +740,10 @@ class afterEffectMixin:
         deselectAll
         """
         self.focusOnProjectPanel()
-        time.sleep(2)
-        hotkey("ctrl", "shift", "a")
-        time.sleep(2)
+        backend = self.getScriptBackend()
+        backend.pause(2, self.cancel_token())
+        backend.hotkey("ctrl", "shift", "a")
+        backend.pause(2, self.cancel_token())
 
     def executeCommand(self, cmdId: int | str) -> None:
         """
@@ -685,20 +752,26 @@ class afterEffectMixin:
         _replace = {"cmdId": str(cmdId)}
         self.runScript("run_command.jsx", _replace)
 
-    def _execute_script_in_running_ae(self, script_path: str) -> None:
+    def _execute_script_in_running_ae(self, script_path: str) -> dict[str, Any] | None:
         """
         Execute a script in an already-running After Effects instance
         Uses file-based command queue system
+
+        Returns the runner's timing for the command (see ``_read_command_timing``),
+        or None when the runner did not report any.
         """
         # Generate unique filename to avoid conflicts
         queue_file = os.path.join(settings.QUEUE_FOLDER, f"cmd_{uuid.uuid4().hex[:8]}.jsx")
+        timing = None
 
         try:
             # Ensure queue folder exists
             os.makedirs(settings.QUEUE_FOLDER, exist_ok=True)
 
             # Copy the script to the queue folder
-            shutil.copy2(script_path, queue_file)
+            with span("queue_write"):
+                shutil.copy2(script_path, queue_file)
+            enqueued_at = time.time()
 
             # Wait for the script to be processed (deleted by AE)
             # The ae_command_runner.jsx script running in AE will pick it up
@@ -706,11 +779,23 @@ class afterEffectMixin:
             wait_interval = 0.1  # seconds
             elapsed = 0
 
-            while os.path.exists(queue_file) and elapsed < max_wait:
-                time.sleep(wait_interval)
-                elapsed += wait_interval
+            token = self.cancel_token()
+            with span("queue_wait") as trace:
+                while os.path.exists(queue_file) and elapsed < max_wait:
+                    token.sleep(wait_interval)
+                    elapsed += wait_interval
+                timing = self._read_command_timing(queue_file, os.path.basename(script_path), enqueued_at)
+                if timing is not None:
+                    trace.set(pickup=timing["pickup"], execute=timing["execute"])
+                else:
+                    self._discard_command_timings(queue_file)
 
-            if os.path.exists(queue_file):
+            if timing is not None and not timing["ok"]:
+                error_file = queue_file.replace(".jsx", ".error")
+                logger.warning("Script execution failed in After Effects: %s", os.path.basename(script_path))
+                if os.path.exists(error_file):
+                    os.remove(error_file)
+            elif os.path.exists(queue_file):
                 # File still exists - might not have been processed
                 # Check if it was renamed to .error
                 error_file = queue_file.replace(".jsx", ".error")
@@ -733,11 +818,92 @@ class afterEffectMixin:
                     os.remove(queue_file)
             except OSError:
                 pass
+        return timing
+
+    def _read_command_timing(self, queue_file: str, script: str, enqueued_at: float) -> dict[str, Any] | None:
+        """
+        Read the timing ae_command_runner.jsx wrote next to *queue_file* and
+        record it in the per-script pickup/execution histograms.
+
+        Returns seconds from queueing to pickup (``pickup``), spent reading the
+        file (``read``) and executing it (``execute``), plus ``ok``.
+        """
+        timing_file = os.path.splitext(queue_file)[0] + ".timing"
+        try:
+            with open(timing_file, encoding="utf-8") as f:
+                data = json.load(f)
+            os.remove(timing_file)
+        except (OSError, ValueError):
+            # Older runners (or a command still in flight) report nothing
+            return None
+        timing = {
+            "script": script,
+            "pickup": max(0.0, data["seen_at"] / 1000 - enqueued_at),
+            "read": (data["start"] - data["seen"]) / 1e6,
+            "execute": (data["end"] - data["start"]) / 1e6,
+            "ok": bool(data.get("ok", True)),
+        }
+        metrics.COMMAND_PICKUP.observe(timing["pickup"], script=script)
+        metrics.COMMAND_EXECUTION.observe(timing["execute"], script=script)
+        return timing
+
+    def _discard_command_timings(self, queue_file: str) -> None:
+        """
+        Remove timing files nothing will read: this command's, and any the runner
+        wrote for earlier commands after their wait had already timed out.
+        """
+        timing_file = os.path.splitext(queue_file)[0] + ".timing"
+        cutoff = time.time() - _STALE_TIMING_SECONDS
+        try:
+            names = os.listdir(settings.QUEUE_FOLDER)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(settings.QUEUE_FOLDER, name)
+            if not name.endswith(".timing"):
+                continue
+            try:
+                if path == timing_file or os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def commandLatencyReport(self) -> list[dict[str, Any]]:
+        """
+        Per-script latency recorded in this process, slowest total execution first.
+
+        Each row has the script name, how often it ran, and the mean round trip,
+        runner pickup delay and ExtendScript execution time in seconds.
+        """
+        round_trips = metrics.COMMAND_LATENCY.totals()
+        pickups = metrics.COMMAND_PICKUP.totals()
+        executions = metrics.COMMAND_EXECUTION.totals()
+
+        def mean(totals: dict[tuple[str, ...], tuple[int, float]], key: tuple[str, ...]) -> float | None:
+            count, total = totals.get(key, (0, 0.0))
+            return total / count if count else None
+
+        rows = []
+        for key, (count, _) in round_trips.items():
+            rows.append(
+                {
+                    "script": key[0],
+                    "count": count,
+                    "round_trip": mean(round_trips, key),
+                    "pickup": mean(pickups, key),
+                    "execute": mean(executions, key),
+                    "execute_total": executions.get(key, (0, 0.0))[1],
+                }
+            )
+        rows.sort(key=lambda row: (row["execute_total"], row["count"] * row["round_trip"]), reverse=True)
+        return rows
 
     def runScript(self, fileName: str, _remplacements: dict[str, str] | None = None, debug: bool = False) -> str:
         """
         run Script
         """
+        self.cancel_token().check()
+
         # Check version compatibility before executing
         from ae_automation.compat import check_script_compat
 
@@ -764,33 +930,58 @@ class afterEffectMixin:
             )
 
         logger.info("Running script: %s", fileName)
-        fileContent = self.file_get_contents(os.path.join(settings.JS_DIR, fileName))
-        filePath = os.path.join(settings.CACHE_FOLDER, fileName)
-
-        if _remplacements is not None:
-            for key, value in _remplacements.items():
-                fileContent = fileContent.replace(key, value)
-
-        fileContent = (
-            jsmin(self.JS_FRAMEWORK)
-            + "\n var _error=''; try{"
-            + fileContent
-            + "\n}catch(e){_error= e.lineNumber+' '+e.toString(); }outputLogs(_error);"
-        )
+        self.count_command()
+        metrics.COMMANDS.inc(script=fileName)
+        started = time.perf_counter()
+        with span("runScript", script=fileName):
+            randomName = self.getScriptBackend().run_script(self, fileName, _remplacements or {})
+        metrics.COMMAND_LATENCY.observe(time.perf_counter() - started, script=fileName)
+        logger.debug("Finished script: %s", fileName)
+        return randomName
+
+    def assembleScript(self, fileName: str, _remplacements: dict[str, str] | None = None) -> tuple[str, str]:
+        """
+        Fill JSX template *fileName*, wrap it with the JS framework and write it
+        to the cache folder. Returns (script path, log name).
+        """
+        with span("assemble", script=fileName):
+            fileContent = self.file_get_contents(os.path.join(settings.JS_DIR, fileName))
+            filePath = os.path.join(settings.CACHE_FOLDER, fileName)
 
-        randomName = str(uuid.uuid4())
-        fileContent = fileContent.replace("{LOGS_NAME}", randomName)
-        fileContent = fileContent.replace("{FILE_NAME}", fileName)
+            if _remplacements is not None:
+                for key, value in _remplacements.items():
+                    fileContent = fileContent.replace(key, value)
 
-        with open(filePath, "w", encoding="utf-8") as text_file:
-            text_file.write(fileContent)
+            fileContent = (
+                jsmin(self.JS_FRAMEWORK)
+                + "\n var _error=''; try{"
+                + fileContent
+                + "\n}catch(e){_error= e.lineNumber+' '+e.toString(); }outputLogs(_error);"
+            )
 
-        # Execute script in the already-running After Effects instance using queue system
-        self._execute_script_in_running_ae(filePath)
+            randomName = str(uuid.uuid4())
+            fileContent = fileContent.replace("{LOGS_NAME}", randomName)
+            fileContent = fileContent.replace("{FILE_NAME}", fileName)
 
-        time.sleep(1)  # Reduced sleep time since we wait in _execute_script_in_running_ae
-        logger.debug("Finished script: %s", fileName)
-        return randomName
+            with open(filePath, "w", encoding="utf-8") as text_file:
+                text_file.write(fileContent)
+        return filePath, randomName
+
+    def readScriptResult(self, fileName: str) -> Any:
+        """Load the JSON result file *fileName* a script wrote into the cache folder."""
+        with span("read_result", file=fileName):
+            with open(os.path.join(settings.CACHE_FOLDER, fileName), encoding="utf-8") as f:
+                return json.load(f)
+
+    def getScriptBackend(self) -> ScriptBackend:
+        """Return the backend runScript executes on, creating it from AE_BACKEND on first use."""
+        if getattr(self, "_script_backend", None) is None:
+            self._script_backend = create_backend()
+        return self._script_backend
+
+    def setScriptBackend(self, backend: ScriptBackend) -> None:
+        """Run all further commands on *backend* (e.g. a ``SimulatorBackend``)."""
+        self._script_backend = backend
 
     def applyTemplateValues(
         self, comp_name: str, values: list[dict[str, Any]] | None = None, values_file: str | None = None
@@ -811,10 +1002,15 @@ class afterEffectMixin:
         if values is None:
             values = []
 
+        edits = []
         for val in values:
             if val.get("property_type") == "color":
                 val["value"] = self.hexToRGBA(val["value"])
-            self.editComp(comp_name, val["layer_name"], val["property_name"], val["value"])
+            edits.append((val["layer_name"], val["property_name"], val["value"]))
+        if len(edits) == 1:
+            self.editComp(comp_name, *edits[0])
+        else:
+            self.editCompBulk(comp_name, edits)
 
     def addTransition(
         self,
@@ -850,26 +1046,81 @@ class afterEffectMixin:
         _replace = {"{compName}": str(compName), "{startTime}": str(startTime), "{durationTime}": str(duration)}
         self.runScript("workAreaComp.jsx", _replace)
 
-    def runCommand(self, command: str) -> str:
-        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    def runCommand(
+        self,
+        command: str | list[str],
+        total_frames: int = 0,
+        on_event: Callable[[RenderEvent], None] | None = None,
+    ) -> str:
+        """
+        Run a render command, streaming its stdout and stderr without blocking.
 
-        while True:
-            output = process.stdout.readline()
-            if output == b"" and process.poll() is not None:
-                break
-            if output:
-                logger.info(output.decode("utf-8").strip())
+        Args:
+            command: Argument list (run without a shell) or legacy shell string
+            total_frames: Expected frame count, used for percent/ETA when the
+                command does not print its own duration
+            on_event: Receives RenderEvent objects (start, frame, warning, done)
+
+        Raises:
+            JobCancelledError: The job was cancelled or timed out; the process
+                tree has been killed
+        """
+        token = self.cancel_token()
+        token.check()
+        self.count_command()
+        program = os.path.basename(command[0]) if isinstance(command, list) else "shell"
+        started = time.perf_counter()
+        with span("render_process", program=program) as trace:
+            process = subprocess.Popen(
+                command, shell=isinstance(command, str), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            token.register_process(process)
+            try:
+                reader = AerenderOutputReader(process, total_frames=total_frames, on_event=on_event)
+                returncode = reader.run()
+            finally:
+                token.unregister_process(process)
+            trace.set(frames=reader.frame, returncode=returncode)
 
-        stderr = process.communicate()[1]
+        token.check()
+        if returncode != 0:
+            raise RenderError(detail="\n".join(reader.stderr_tail))
 
-        if process.returncode != 0:
-            raise RenderError(detail=stderr.decode("utf-8"))
+        elapsed = time.perf_counter() - started
+        metrics.RENDER_DURATION.observe(elapsed)
+        if reader.frame and elapsed > 0:
+            metrics.RENDER_FPS.observe(reader.frame / elapsed)
 
         return "Command executed successfully."
 
-    def renderFile(self, projectPath: str, compName: str, outputDir: str) -> str:
+    def renderFile(
+        self,
+        projectPath: str,
+        compName: str,
+        outputDir: str,
+        segments: int = 1,
+        frame_range: tuple[int, int] | None = None,
+        cache: bool | None = None,
+        resources: list[str] | None = None,
+        plan: RenderPlan | None = None,
+    ) -> str:
         """
         Render an Adobe After Effects project file via terminal
+
+        Args:
+            projectPath: Path to the .aep file
+            compName: Composition to render
+            outputDir: Directory for the rendered file
+            segments: Split the comp's frame range into this many parts and
+                render them in parallel aerender processes
+            frame_range: Inclusive (start, end) frames to render. Split renders
+                take it from the cached project map when omitted.
+            cache: Reuse a previous render when the project, comp, settings and
+                resources are unchanged. Defaults to the RENDER_CACHE setting.
+            resources: Files referenced by the project, folded into the cache key
+            plan: Memory/MFR/concurrency settings. Planned from the host's free
+                resources when omitted; callers running several renders at
+                once pass a shared plan.
         """
         settings.validate_settings()
         if not os.path.exists(outputDir):
@@ -877,94 +1128,301 @@ class afterEffectMixin:
 
         outputPath = os.path.join(outputDir, f"{compName}.mp4")
 
-        render_command = f'"{settings.AERENDER_PATH}" -project "{projectPath}" -comp "{compName}" -output "{outputPath}" -mem_usage 20 40'
-        logger.info("Rendering project...")
-        self.runCommand(render_command)
+        use_cache = settings.RENDER_CACHE_ENABLED if cache is None else cache
+        cache_key = None
+        if use_cache:
+            render_settings: dict[str, Any] = {"segments": segments, "frame_range": frame_range}
+            if segments > 1:
+                render_settings["video_template"] = settings.AERENDER_VIDEO_TEMPLATE
+                render_settings["audio_template"] = settings.AERENDER_AUDIO_TEMPLATE
+            cache_key = self.getRenderCache().fingerprint(projectPath, compName, render_settings, resources)
+            if self.getRenderCache().get(cache_key, outputPath):
+                return outputPath
+
+        planner = self.getRenderPlanner()
+        if plan is None:
+            # The audio pass of a split render runs alongside the segments
+            plan = planner.plan(requested=segments + 1 if segments > 1 else 1)
+
+        # The old output may be a hardlink to a cache entry; render into a new file
+        remove_output(outputPath)
+        started = time.time()
+        if segments > 1:
+            self._renderSegmented(projectPath, compName, outputPath, segments, frame_range, plan)
+        else:
+            start_frame, end_frame = frame_range if frame_range is not None else (None, None)
+            render_command = build_aerender_command(
+                projectPath,
+                compName,
+                outputPath,
+                start_frame,
+                end_frame,
+                mem_usage=plan.mem_usage,
+                mfr_cpu_percent=plan.mfr_cpu_percent,
+            )
+            logger.info("Rendering project...")
+            self._runRender(render_command)
+        planner.record(plan, compName, time.time() - started)
+
+        if cache_key is not None:
+            self.getRenderCache().put(cache_key, outputPath, label=compName)
 
         return outputPath
 
-    def renderFileWithProgress(self, projectPath: str, compName: str, outputDir: str) -> str:
+    def renderScenes(self, projectPath: str, data: dict[str, Any]) -> str:
+        """
+        Render each timeline scene comp on its own and concatenate the results.
+
+        Scene renders are cached by ``scene_fingerprint``, so only scenes whose
+        config, template or resources changed go through aerender again.
+        Plain concatenation cannot reproduce overlapping or gapped scenes, so
+        those timelines fall back to a full render.
+        """
+        project = data["project"]
+        outputDir = project["output_dir"]
+        fps = float(project["comp_fps"])
+        half_frame = 0.5 / fps
+
+        # Scene folders are numbered by config order, playback follows startTime
+        ordered = sorted(enumerate(data["timeline"]), key=lambda pair: float(pair[1]["startTime"]))
+        expected_start = 0.0
+        for _, scene in ordered:
+            if abs(float(scene["startTime"]) - expected_start) > half_frame:
+                logger.warning("Scenes overlap or leave gaps, falling back to a full render")
+                return self.renderFile(
+                    projectPath,
+                    project["comp_name"],
+                    outputDir,
+                    cache=project.get("render_cache"),
+                    resources=[resource["path"] for resource in project["resources"]],
+                )
+            expected_start = float(scene["startTime"]) + float(scene["duration"])
+
+        scenes_dir = os.path.join(outputDir, ".scenes")
+        render_cache = self.getRenderCache()
+        scene_paths: list[str] = []
+        misses: list[tuple[str, str, int]] = []
+        for index, scene in ordered:
+            scene_comp = self.slug(self.slug("Scene " + str(index + 1)) + " " + scene["template_comp"])
+            scene_path = os.path.join(scenes_dir, f"{scene_comp}.mp4")
+            key = scene_fingerprint(project["project_file"], scene, data)
+            if render_cache.get(key, scene_path) is None:
+                misses.append((key, scene_comp, int(round(float(scene["duration"]) * fps))))
+            scene_paths.append(scene_path)
+
+        if misses:
+            plan = self.getRenderPlanner().plan(requested=len(misses))
+
+            def _render_scene(miss: tuple[str, str, int]) -> None:
+                key, scene_comp, frames = miss
+                self.renderFile(
+                    projectPath, scene_comp, scenes_dir, frame_range=(0, frames - 1), cache=False, plan=plan
+                )
+                render_cache.put(key, os.path.join(scenes_dir, f"{scene_comp}.mp4"), label=scene_comp)
+
+            with ThreadPoolExecutor(max_workers=plan.concurrency) as pool:
+                list(pool.map(_render_scene, misses))
+        rendered = len(misses)
+
+        logger.info("Rendered %d of %d scenes, %d from cache", rendered, len(scene_paths), len(scene_paths) - rendered)
+
+        outputPath = os.path.join(outputDir, f"{project['comp_name']}.mp4")
+        self.mark_stage("stitch")
+        remove_output(outputPath)
+        stitch_segments(scene_paths, outputPath)
+        shutil.rmtree(scenes_dir, ignore_errors=True)
+        return outputPath
+
+    def getOutputPipeline(self) -> OutputPipeline:
+        """Return the post-render output pipeline, creating it on first use."""
+        if getattr(self, "_output_pipeline", None) is None:
+            self._output_pipeline = OutputPipeline()
+        return self._output_pipeline
+
+    def wait_for_outputs(self, timeout: float | None = None) -> list[OutputJob]:
+        """Block until all background derived outputs (project.outputs) are written."""
+        if getattr(self, "_output_pipeline", None) is None:
+            return []
+        return self.getOutputPipeline().wait(timeout)
+
+    def cancel_token(self) -> CancellationToken:
+        """Return the running job's cancellation token (a no-op token outside batch jobs)."""
+        return getattr(self, "_cancel_token", None) or NEVER_CANCELLED
+
+    def mark_stage(self, name: str) -> None:
+        """Start stage *name* on the running job's timeline, if one is being recorded."""
+        timeline = getattr(self, "_stage_timeline", None)
+        if timeline is not None:
+            timeline.begin(name)
+
+    def end_stage(self) -> None:
+        """Close the current stage on the running job's timeline."""
+        timeline = getattr(self, "_stage_timeline", None)
+        if timeline is not None:
+            timeline.end()
+
+    def count_command(self) -> None:
+        """Count one AE script or subprocess against the current timeline stage."""
+        timeline = getattr(self, "_stage_timeline", None)
+        if timeline is not None:
+            timeline.count_command()
+
+    def getRenderPlanner(self) -> RenderPlanner:
+        """Return the render resource planner, creating it on first use."""
+        if getattr(self, "_render_planner", None) is None:
+            self._render_planner = RenderPlanner()
+        return self._render_planner
+
+    def _runRender(self, command: list[str], **kwargs: Any) -> str:
+        """Run one aerender command, counting it as active for the planner."""
+        planner = self.getRenderPlanner()
+        planner.begin()
+        try:
+            return self.runCommand(command, **kwargs)
+        finally:
+            planner.end()
+
+    def getRenderCache(self) -> RenderCache:
+        """Return the render result cache, creating it on first use."""
+        if getattr(self, "_render_cache", None) is None:
+            self._render_cache = RenderCache()
+        return self._render_cache
+
+    def _renderSegmented(
+        self,
+        projectPath: str,
+        compName: str,
+        outputPath: str,
+        segments: int,
+        frame_range: tuple[int, int] | None = None,
+        plan: RenderPlan | None = None,
+    ) -> str:
+        """Render *compName* as parallel frame-range segments and stitch them into *outputPath*.
+
+        At most ``plan.concurrency`` aerender processes run at a time.
+        """
+        if frame_range is None:
+            frame_range = self.getCompFrameRange(compName)
+        if frame_range is None:
+            raise RenderError(
+                project_path=projectPath,
+                comp_name=compName,
+                detail="Split rendering needs the comp frame range. Pass frame_range or load the project map first.",
+            )
+
+        ranges = split_frame_range(frame_range[0], frame_range[1], segments)
+        work_dir = tempfile.mkdtemp(prefix=".segments_", dir=os.path.dirname(outputPath))
+        ext = os.path.splitext(outputPath)[1]
+        segment_paths = [os.path.join(work_dir, f"segment_{i:03d}{ext}") for i in range(len(ranges))]
+
+        if plan is None:
+            plan = self.getRenderPlanner().plan(requested=len(ranges) + 1)
+        resource_args: dict[str, Any] = {"mem_usage": plan.mem_usage, "mfr_cpu_percent": plan.mfr_cpu_percent}
+
+        commands = [
+            build_aerender_command(
+                projectPath, compName, path, start, end, settings.AERENDER_VIDEO_TEMPLATE or None, **resource_args
+            )
+            for path, (start, end) in zip(segment_paths, ranges)
+        ]
+
+        # Audio is rendered once over the whole range so segment joins stay seamless
+        audio_path = None
+        if settings.AERENDER_AUDIO_TEMPLATE:
+            audio_ext = ".wav" if "wav" in settings.AERENDER_AUDIO_TEMPLATE.lower() else ".aif"
+            audio_path = os.path.join(work_dir, "audio" + audio_ext)
+            commands.append(
+                build_aerender_command(
+                    projectPath,
+                    compName,
+                    audio_path,
+                    frame_range[0],
+                    frame_range[1],
+                    settings.AERENDER_AUDIO_TEMPLATE,
+                    **resource_args,
+                )
+            )
+
+        logger.info(
+            "Rendering %s in %d segments (frames %d-%d)...", compName, len(ranges), frame_range[0], frame_range[1]
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=min(plan.concurrency, len(commands))) as pool:
+                list(pool.map(self._runRender, commands))
+            self.mark_stage("stitch")
+            remove_output(outputPath)
+            stitch_segments(segment_paths, outputPath, audio_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return outputPath
+
+    def renderFileWithProgress(
+        self,
+        projectPath: str,
+        compName: str,
+        outputDir: str,
+        on_event: Callable[[RenderEvent], None] | None = None,
+    ) -> str:
         """
-        Render an AE project while tracking progress from aerender stdout.
+        Render an AE project while tracking progress from aerender output.
 
-        Parses lines like ``PROGRESS:  0:00:05:00 (150)`` to update
-        ``self._render_progress`` in real time.  The render runs in a
-        background thread so callers can poll ``get_render_progress()``.
+        Both output pipes are drained concurrently and parsed into
+        RenderEvents that update ``self._render_progress`` (frame, percent,
+        fps, ETA) in real time. The render runs in a background thread so
+        callers can poll ``get_render_progress()`` or pass *on_event*.
         """
         settings.validate_settings()
         if not os.path.exists(outputDir):
             os.makedirs(outputDir)
 
         outputPath = os.path.join(outputDir, f"{compName}.mp4")
+        remove_output(outputPath)
 
-        render_command = (
-            f'"{settings.AERENDER_PATH}" -project "{projectPath}" '
-            f'-comp "{compName}" -output "{outputPath}" -mem_usage 20 40'
+        plan = self.getRenderPlanner().plan()
+        render_command = build_aerender_command(
+            projectPath, compName, outputPath, mem_usage=plan.mem_usage, mfr_cpu_percent=plan.mfr_cpu_percent
         )
 
+        # Aerender only sometimes prints a duration; fall back to the project map
+        comp_range = self.getCompFrameRange(compName)
+        total_frames = comp_range[1] - comp_range[0] + 1 if comp_range else 0
+
         # Initialise progress state
-        self._render_progress: dict[str, Any] = {
+        progress: dict[str, Any] = {
             "percent": 0,
             "frame": 0,
-            "total_frames": 0,
+            "total_frames": total_frames,
+            "fps": 0.0,
+            "eta": None,
             "status": "starting",
             "output_path": outputPath,
             "error": None,
         }
-
-        # Pattern: PROGRESS:  H:MM:SS:FF (frame N)  or just (N)
-        progress_re = re.compile(r"PROGRESS:\s*[\d:]+\s*\((?:frame\s+)?(\d+)\)", re.IGNORECASE)
-        # aerender sometimes outputs total duration / frames
-        total_re = re.compile(r"DURATION:\s*[\d:]+\s*\((?:frame\s+)?(\d+)\)", re.IGNORECASE)
+        self._render_progress = progress
+
+        def _on_event(event: RenderEvent) -> None:
+            progress["frame"] = event.frame
+            progress["total_frames"] = event.total_frames
+            progress["percent"] = event.percent
+            progress["fps"] = round(event.fps, 2)
+            progress["eta"] = round(event.eta, 1) if event.eta is not None else None
+            if event.kind == "start":
+                progress["status"] = "rendering"
+            if on_event is not None:
+                on_event(event)
 
         def _run() -> None:
             try:
-                self._render_progress["status"] = "rendering"
-                process = subprocess.Popen(
-                    render_command,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                )
-
-                while True:
-                    line_bytes = process.stdout.readline()
-                    if line_bytes == b"" and process.poll() is not None:
-                        break
-                    if line_bytes:
-                        line = line_bytes.decode("utf-8", errors="replace").strip()
-                        logger.info(line)
-
-                        # Try to extract total frames first
-                        tm = total_re.search(line)
-                        if tm:
-                            self._render_progress["total_frames"] = int(tm.group(1))
-
-                        # Extract current frame
-                        pm = progress_re.search(line)
-                        if pm:
-                            current_frame = int(pm.group(1))
-                            self._render_progress["frame"] = current_frame
-                            total = self._render_progress["total_frames"]
-                            if total > 0:
-                                pct = min(int((current_frame / total) * 100), 100)
-                                self._render_progress["percent"] = pct
-
-                stderr = process.communicate()[1]
-
-                if process.returncode != 0:
-                    err_msg = stderr.decode("utf-8", errors="replace")
-                    self._render_progress["status"] = "error"
-                    self._render_progress["error"] = err_msg
-                    logger.error("Render failed: %s", err_msg)
-                else:
-                    self._render_progress["percent"] = 100
-                    self._render_progress["status"] = "complete"
-                    logger.info("Render completed: %s", outputPath)
+                started = time.time()
+                self._runRender(render_command, total_frames=total_frames, on_event=_on_event)
+                self.getRenderPlanner().record(plan, compName, time.time() - started)
+                progress["status"] = "complete"
+                logger.info("Render completed: %s", outputPath)
             except Exception as exc:
-                self._render_progress["status"] = "error"
-                self._render_progress["error"] = str(exc)
-                logger.error("Render thread error: %s", exc)
+                progress["status"] = "error"
+                progress["error"] = exc.detail if isinstance(exc, RenderError) else str(exc)
+                logger.error("Render failed: %s", progress["error"])
 
         thread = threading.Thread(target=_run, daemon=True)
         thread.start()
@@ -977,6 +1435,8 @@ class afterEffectMixin:
                 "percent": 0,
                 "frame": 0,
                 "total_frames": 0,
+                "fps": 0.0,
+                "eta": None,
                 "status": "idle",
                 "output_path": None,
                 "error": None,
@@ -989,14 +1449,9 @@ class afterEffectMixin:
 
     def convertMovToMp4(self, inputPath: str, outputPath: str) -> None:
         """
-        Convert MOV to MP4 using moviepy
+        Convert MOV to MP4 with ffmpeg, keeping the source frame rate.
+
+        Remuxes without re-encoding when the MOV already holds H.264/AAC.
         """
-        try:
-            from moviepy import VideoFileClip
-        except ImportError:
-            from moviepy.video.io.VideoFileClip import VideoFileClip
-
-        logger.info("Converting MOV to MP4 using moviepy...")
-        clip = VideoFileClip(inputPath)
-        clip.write_videofile(outputPath, codec="libx264", audio_codec="aac", fps=29.97)
-        clip.close()
+        logger.info("Converting MOV to MP4...")
+        transcode(inputPath, outputPath)
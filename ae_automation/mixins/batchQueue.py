@@ -1,15 +1,38 @@
 """
 Batch Queue Mixin -- Queue and run multiple automation configs sequentially.
+
+The queue lives in a SQLite job store (``settings.BATCH_DB_PATH``), so a
+batch survives crashes and restarts, and several processes can enqueue
+configs and read status while one of them works through the queue.
+
+Each job runs under a ``CancellationToken`` (``settings.BATCH_JOB_TIMEOUT``,
+``settings.BATCH_STAGE_TIMEOUTS``). ``cancel_batch()`` or a timeout fires the
+token, which kills the job's render processes and wakes its waits, and the
+After Effects session is released before the next job starts.
+
+Submitting a config whose resolved content matches a job that is still
+pending does not cost another After Effects run: the two are coalesced and
+share one result.
+
+Every job result also carries a stage timeline (see ``ae_automation.timeline``)
+showing how long AE startup, imports, scene setup, render etc. took.
 """
 
 from __future__ import annotations
 
+import datetime
 import os
 import threading
-import time
 from typing import Any
 
+from ae_automation import metrics, settings
+from ae_automation.cancellation import CancellationToken, parse_stage_timeouts
+from ae_automation.exceptions import ConfigValidationError, JobCancelledError, JobTimeoutError
+from ae_automation.job_store import FINISHED_STATES, JobStore, config_fingerprint, parse_deadline, worker_id
 from ae_automation.logging_config import get_logger
+from ae_automation.outputs import OutputJob
+from ae_automation.timeline import StageTimeline
+from ae_automation.tracing import span, trace_context
 
 logger = get_logger(__name__)
 
@@ -17,122 +40,214 @@ logger = get_logger(__name__)
 class BatchQueueMixin:
     """Queue and run multiple automation configs sequentially."""
 
-    _batch_queue: list[str]
-    _batch_status: dict[str, Any]
+    _batch_store: JobStore | None
     _batch_lock: threading.Lock
     _batch_thread: threading.Thread | None
+    _batch_stop: threading.Event
+    _last_output_job: OutputJob | None
+    _cancel_token: CancellationToken | None
+    _stage_timeline: StageTimeline | None
 
     def _ensure_batch_state(self) -> None:
         """Lazily initialise batch-related attributes if not yet set."""
-        if not hasattr(self, "_batch_queue"):
-            self._batch_queue = []
-        if not hasattr(self, "_batch_status"):
-            self._batch_status = {
-                "current": 0,
-                "total": 0,
-                "results": [],
-                "running": False,
-            }
         if not hasattr(self, "_batch_lock"):
             self._batch_lock = threading.Lock()
         if not hasattr(self, "_batch_thread"):
             self._batch_thread = None
+        if not hasattr(self, "_batch_stop"):
+            self._batch_stop = threading.Event()
+        if not hasattr(self, "_cancel_token"):
+            self._cancel_token = None
 
-    def queue_config(self, config_path: str) -> int:
-        """Add a config to the batch queue. Returns queue position (1-based)."""
+    def get_job_store(self) -> JobStore:
+        """Return the persistent batch job store, opening it on first use."""
         self._ensure_batch_state()
+        if getattr(self, "_batch_store", None) is None:
+            self._batch_store = JobStore()
+            metrics.BATCH_JOBS.set_function(self._batch_store.counts)
+        return self._batch_store
+
+    def queue_config(
+        self, config_path: str, priority: int = 0, deadline: float | str | datetime.datetime | None = None
+    ) -> int:
+        """Add a config to the batch queue. Returns queue position (1-based).
+
+        Args:
+            config_path: Path to the JSON config
+            priority: Higher-priority jobs run before lower ones, even mid-batch
+            deadline: Finish-by time (epoch seconds, datetime or ISO string);
+                dated jobs run earliest-deadline-first within their priority
+
+        A config whose resolved content matches a pending job is coalesced
+        with it: it runs once and both jobs get the same result.
+        """
+        store = self.get_job_store()
         abs_path = os.path.abspath(config_path)
         if not os.path.isfile(abs_path):
             raise FileNotFoundError(f"Config file not found: {abs_path}")
-        with self._batch_lock:
-            self._batch_queue.append(abs_path)
-            self._batch_status["total"] = len(self._batch_queue)
-            return len(self._batch_queue)
-
-    def queue_configs(self, config_paths: list[str]) -> int:
+        try:
+            fingerprint: str | None = config_fingerprint(self.loadConfig(abs_path))
+        except ConfigValidationError:
+            fingerprint = None  # fails when it runs, like any other bad config
+        job_id = store.enqueue(abs_path, priority=priority, deadline=parse_deadline(deadline), fingerprint=fingerprint)
+        job = store.get(job_id)
+        return len(store.jobs(batch_id=job["batch_id"] if job else None))
+
+    def queue_configs(
+        self, config_paths: list[str], priority: int = 0, deadline: float | str | datetime.datetime | None = None
+    ) -> int:
         """Add multiple configs. Returns total queued."""
-        self._ensure_batch_state()
+        total = 0
         for path in config_paths:
-            self.queue_config(path)
-        return len(self._batch_queue)
+            total = self.queue_config(path, priority=priority, deadline=deadline)
+        return total
+
+    def _batch_running(self) -> bool:
+        return self._batch_thread is not None and self._batch_thread.is_alive()
 
     def start_batch(self) -> None:
-        """Start processing the queue sequentially in a background thread."""
-        self._ensure_batch_state()
+        """Process pending jobs in a background thread, resuming any interrupted by a crash."""
+        store = self.get_job_store()
         with self._batch_lock:
-            if self._batch_status["running"]:
+            if self._batch_running():
                 logger.warning("Batch is already running")
                 return
-            if not self._batch_queue:
+            store.requeue_stale()
+            if not store.counts().get("pending"):
                 logger.warning("Batch queue is empty, nothing to start")
                 return
-            self._batch_status["running"] = True
-            self._batch_status["current"] = 0
-            self._batch_status["results"] = []
-            self._batch_status["total"] = len(self._batch_queue)
-
-        def _run_batch() -> None:
-            queue_snapshot: list[str]
+            self._batch_stop.clear()
+            self._batch_thread = threading.Thread(target=self._run_batch, daemon=True)
+            self._batch_thread.start()
+
+    def _run_batch(self) -> None:
+        store = self.get_job_store()
+        worker = worker_id()
+        output_jobs: list[tuple[int, OutputJob]] = []
+
+        while not self._batch_stop.is_set():
+            job = store.claim_next(worker)
+            if job is None:
+                break
+
+            counts = store.counts(job["batch_id"])
+            logger.info(
+                "Batch [%d/%d]: processing %s (priority %d, attempt %d)",
+                sum(counts.get(state, 0) for state in FINISHED_STATES) + 1,
+                sum(counts.values()),
+                job["config"],
+                job["priority"],
+                job["attempts"],
+            )
+
+            token = CancellationToken(
+                timeout=settings.BATCH_JOB_TIMEOUT or None,
+                stage_timeouts=parse_stage_timeouts(settings.BATCH_STAGE_TIMEOUTS),
+            )
+            timeline = StageTimeline()
             with self._batch_lock:
-                queue_snapshot = list(self._batch_queue)
-
-            for idx, config_path in enumerate(queue_snapshot):
+                self._cancel_token = token
+                if self._batch_stop.is_set():
+                    token.cancel("batch cancelled")
+            self._stage_timeline = timeline
+            try:
+                self._last_output_job = None
+                with trace_context(job=job["id"]), span("job", config=os.path.basename(job["config"])):
+                    self.startBot(job["config"])
+                timeline.end()
+                store.finish(job["id"], "success", result={"stages": timeline.as_list()})
+                if self._last_output_job is not None:
+                    # Derived outputs keep encoding while the next config renders
+                    output_jobs.append((job["id"], self._last_output_job))
+            except JobTimeoutError as exc:
+                store.finish(job["id"], "error", error=str(exc), result={"stages": timeline.as_list()})
+                logger.error("Batch timeout on %s: %s", job["config"], exc)
+                self._release_session()
+            except JobCancelledError as exc:
+                store.finish(job["id"], "cancelled", error=str(exc), result={"stages": timeline.as_list()})
+                logger.warning("Batch job %s cancelled", job["config"])
+                self._release_session()
+            except Exception as exc:
+                store.finish(job["id"], "error", error=str(exc), result={"stages": timeline.as_list()})
+                logger.error("Batch error on %s: %s", job["config"], exc)
+            finally:
+                self._stage_timeline = None
+                token.close()
                 with self._batch_lock:
-                    if not self._batch_status["running"]:
-                        # Cancelled
-                        break
-                    self._batch_status["current"] = idx + 1
-
-                logger.info(
-                    "Batch [%d/%d]: processing %s",
-                    idx + 1,
-                    len(queue_snapshot),
-                    config_path,
-                )
-
-                result: dict[str, Any] = {
-                    "config": config_path,
-                    "status": "running",
-                    "error": None,
-                    "started_at": time.time(),
-                    "finished_at": None,
-                }
-
-                try:
-                    self.startBot(config_path)
-                    result["status"] = "success"
-                except Exception as exc:
-                    result["status"] = "error"
-                    result["error"] = str(exc)
-                    logger.error("Batch error on %s: %s", config_path, exc)
-                finally:
-                    result["finished_at"] = time.time()
-                    with self._batch_lock:
-                        self._batch_status["results"].append(result)
-
-            with self._batch_lock:
-                self._batch_status["running"] = False
-                self._batch_queue.clear()
-            logger.info("Batch processing complete")
-
-        self._batch_thread = threading.Thread(target=_run_batch, daemon=True)
-        self._batch_thread.start()
+                    self._cancel_token = None
+
+        self.wait_for_outputs()
+        for job_id, output_job in output_jobs:
+            self._record_outputs(job_id, output_job)
+        logger.info("Batch processing complete")
+
+    def _release_session(self) -> None:
+        """Close the After Effects session a cancelled job left behind."""
+        try:
+            self.getScriptBackend().close()
+            metrics.AE_RESTARTS.inc(reason="cancelled")
+        except Exception as exc:
+            logger.debug("Could not close After Effects: %s", exc)
+
+    def _record_outputs(self, job_id: int, job: OutputJob) -> None:
+        """Store a finished output job's files (or failures) on its batch result."""
+        store = self.get_job_store()
+        errors = job.errors()
+        outputs = {label: future.result() for label, future in job.futures.items() if label not in errors}
+        store.update_result(job_id, outputs=outputs)
+        if errors:
+            stored = store.get(job_id)
+            store.finish(
+                job_id,
+                "error",
+                error="; ".join(f"{label}: {err}" for label, err in errors.items()),
+                result=stored["result"] if stored else {"outputs": outputs},
+            )
 
     def get_batch_status(self) -> dict[str, Any]:
-        """Return current batch status."""
-        self._ensure_batch_state()
-        with self._batch_lock:
-            return {
-                "current": self._batch_status["current"],
-                "total": self._batch_status["total"],
-                "results": list(self._batch_status["results"]),
-                "running": self._batch_status["running"],
-            }
+        """Return status of the current (or most recent) batch."""
+        store = self.get_job_store()
+        batch_id = store.current_batch() or store.latest_batch()
+        if batch_id is None:
+            return {"batch_id": None, "current": 0, "total": 0, "results": [], "running": self._batch_running()}
+
+        jobs = store.jobs(batch_id=batch_id)
+        running_jobs = [job for job in jobs if job["state"] == "running"]
+        finished = [job for job in jobs if job["state"] in FINISHED_STATES]
+        finished.sort(key=lambda job: job["finished_at"] or 0)
+        current = len(finished) + (1 if running_jobs else 0)
+        return {
+            "batch_id": batch_id,
+            "current": current,
+            "total": len(jobs),
+            "results": [
+                {
+                    "id": job["id"],
+                    "config": job["config"],
+                    "status": job["state"],
+                    "error": job["error"],
+                    "attempts": job["attempts"],
+                    "worker": job["worker"],
+                    "priority": job["priority"],
+                    "deadline": job["deadline"],
+                    "started_at": job["started_at"],
+                    "finished_at": job["finished_at"],
+                    "outputs": job["result"].get("outputs", {}),
+                    "stages": job["result"].get("stages", []),
+                    "coalesced_into": job["coalesced_into"],
+                }
+                for job in finished
+            ],
+            "running": self._batch_running() or bool(running_jobs),
+        }
 
     def cancel_batch(self) -> None:
-        """Cancel remaining items in the queue."""
-        self._ensure_batch_state()
+        """Cancel remaining items in the queue and abort the job that is running."""
+        store = self.get_job_store()
         with self._batch_lock:
-            self._batch_status["running"] = False
-            self._batch_queue.clear()
-        logger.info("Batch cancelled")
+            self._batch_stop.set()
+            token = self._cancel_token
+        if token is not None:
+            token.cancel("batch cancelled")
+        cancelled = store.cancel_pending()
+        logger.info("Batch cancelled (%d pending job(s) dropped)", cancelled)
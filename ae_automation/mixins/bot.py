@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from typing import Any
 
 from ae_automation.exceptions import ConfigValidationError
 from ae_automation.logging_config import get_logger
@@ -18,7 +19,12 @@ class botMixin:
         startBot
         """
         logger.info("Starting bot")
+        self.startAfterEffect(self.loadConfig(file_name))
 
+    def loadConfig(self, file_name: str) -> dict[str, Any]:
+        """
+        Read a JSON config and resolve its relative paths against the config's folder
+        """
         import os
 
         try:
@@ -47,4 +53,4 @@ class botMixin:
                     data["project"]["output_dir"] = os.path.abspath(os.path.join(config_dir, out_dir))
                     logger.info("Resolved output dir: %s", data["project"]["output_dir"])
 
-        self.startAfterEffect(data)
+        return data
@@ -11,9 +11,10 @@ import os
 import sys
 from typing import Any
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
+from ae_automation import metrics
 from ae_automation.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -159,7 +160,9 @@ class ChatPanelMixin:
                 configs = data.get("configs", [])
                 if not configs:
                     return jsonify({"success": False, "error": "No configs provided"}), 400
-                total = self.queue_configs(configs)
+                total = self.queue_configs(
+                    configs, priority=int(data.get("priority", 0)), deadline=data.get("deadline")
+                )
                 self.start_batch()
                 return jsonify(
                     {"success": True, "queued": total, "message": f"Queued {total} configs and started batch"}
@@ -209,6 +212,11 @@ class ChatPanelMixin:
                 logger.error("Plugin run error: %s", e, exc_info=True)
                 return jsonify({"success": False, "error": str(e)}), 500
 
+        @self.chat_app.route("/metrics", methods=["GET"])
+        def chat_metrics():
+            """Prometheus scrape endpoint for the shared metrics registry."""
+            return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
         # Also serve static files for the extension (for dev/testing)
         ext_dir = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -21,6 +21,28 @@
 
     $.writeln("AE Command Runner: Watching " + queueFolder);
 
+    // $.hiresTimer returns microseconds since it was last read, so keep a
+    // running total to get a monotonic clock
+    var clock = 0;
+    function elapsedMicros() {
+        clock += $.hiresTimer;
+        return clock;
+    }
+
+    // Write cmd_xxx.timing next to the command before it leaves the queue so
+    // Python can split pickup delay from ExtendScript execution time
+    function writeTiming(file, seenAt, seen, start, end, ok) {
+        try {
+            var timingFile = new File(file.fsName.replace(/\.jsx$/, ".timing"));
+            timingFile.open("w");
+            timingFile.write('{"seen_at":' + seenAt + ',"seen":' + seen + ',"start":' + start +
+                ',"end":' + end + ',"ok":' + ok + '}');
+            timingFile.close();
+        } catch (e) {
+            $.writeln("AE Command Runner: Could not write timing for " + file.name + ": " + e.toString());
+        }
+    }
+
     // Function to process command files
     function processCommands() {
         try {
@@ -41,6 +63,11 @@
 
                 $.writeln("AE Command Runner: Executing " + file.name);
 
+                // Wall clock (ms) for the enqueue-to-seen delay, hires clock (us) for the rest
+                var seenAt = new Date().getTime();
+                var seen = elapsedMicros();
+                var start = seen;
+
                 try {
                     // Read and execute the script
                     file.open('r');
@@ -48,7 +75,9 @@
                     file.close();
 
                     // Execute the script
+                    start = elapsedMicros();
                     eval(scriptContent);
+                    writeTiming(file, seenAt, seen, start, elapsedMicros(), true);
 
                     $.writeln("AE Command Runner: Success - " + file.name);
 
@@ -57,6 +86,7 @@
 
                 } catch (e) {
                     $.writeln("AE Command Runner: Error in " + file.name + ": " + e.toString());
+                    writeTiming(file, seenAt, seen, start, elapsedMicros(), false);
 
                     // Rename to .error so it doesn't get processed again
                     var errorFile = new File(file.fsName.replace('.jsx', '.error'));
@@ -1,11 +1,24 @@
 // Socket server that runs inside After Effects
 // This allows Python to send commands to a running AE instance
+//
+// Each reply is the status line ("OK" or "ERROR: ...") followed by a
+// timing line in the same microsecond clock ae_command_runner.jsx uses:
+//   TIMING {"seen":..., "start":..., "end":..., "ok":true}
+// "seen" is when the connection was picked up, "start"/"end" bracket eval().
 
 (function() {
     var PORT = 49494;
     var serverSocket = null;
     var isRunning = false;
 
+    // $.hiresTimer returns microseconds since it was last read, so keep a
+    // running total to get a monotonic clock
+    var clock = 0;
+    function elapsedMicros() {
+        clock += $.hiresTimer;
+        return clock;
+    }
+
     function startServer() {
         if (isRunning) {
             return;
@@ -28,36 +41,44 @@
         }
     }
 
-    function checkForConnections() {
-        if (!serverSocket) return;
+    function serveConnection(conn) {
+        var seen = elapsedMicros();
+        $.writeln("AE Server: Client connected");
 
-        var conn = serverSocket.poll();
-        if (conn) {
-            $.writeln("AE Server: Client connected");
+        // Read the script content
+        var scriptContent = "";
+        var line;
+        while ((line = conn.readln()) != "") {
+            scriptContent += line + "\n";
+        }
 
-            // Read the script content
-            var scriptContent = "";
-            var line;
-            while ((line = conn.readln()) != "") {
-                scriptContent += line + "\n";
-            }
+        $.writeln("AE Server: Received script (" + scriptContent.length + " bytes)");
 
-            $.writeln("AE Server: Received script (" + scriptContent.length + " bytes)");
+        var start = elapsedMicros();
+        var reply = "OK";
+        try {
+            // Execute the script
+            eval(scriptContent);
+            $.writeln("AE Server: Script executed successfully");
+        } catch (e) {
+            reply = "ERROR: " + e.toString();
+            $.writeln("AE Server Error: " + e.toString());
+        }
+        var end = elapsedMicros();
 
-            try {
-                // Execute the script
-                eval(scriptContent);
+        conn.writeln(reply);
+        conn.writeln('TIMING {"seen":' + seen + ',"start":' + start + ',"end":' + end +
+            ',"ok":' + (reply === "OK") + '}');
 
-                // Send success response
-                conn.writeln("OK");
-                $.writeln("AE Server: Script executed successfully");
-            } catch (e) {
-                // Send error response
-                conn.writeln("ERROR: " + e.toString());
-                $.writeln("AE Server Error: " + e.toString());
-            }
+        conn.close();
+    }
+
+    function checkForConnections() {
+        if (!serverSocket) return;
 
-            conn.close();
+        var conn = serverSocket.poll();
+        if (conn) {
+            serveConnection(conn);
         }
     }
 
@@ -67,26 +88,7 @@
 
         var conn = serverSocket.poll();
         if (conn) {
-            $.writeln("AE Server: Client connected");
-
-            var scriptContent = "";
-            var line;
-            while ((line = conn.readln()) != "") {
-                scriptContent += line + "\n";
-            }
-
-            $.writeln("AE Server: Received script (" + scriptContent.length + " bytes)");
-
-            try {
-                eval(scriptContent);
-                conn.writeln("OK");
-                $.writeln("AE Server: Script executed successfully");
-            } catch (e) {
-                conn.writeln("ERROR: " + e.toString());
-                $.writeln("AE Server Error: " + e.toString());
-            }
-
-            conn.close();
+            serveConnection(conn);
         }
     };
 
@@ -15,6 +15,12 @@ for (var i = 1; i <= projectItems.length; i++) {
         parentFolder: String(projectItems[i].parentFolder.name),
         parentId: String(projectItems[i].parentFolder.id),
     };
+
+    // Comp timing lets Python plan frame ranges without another round trip
+    if (projectItems[i] instanceof CompItem) {
+        _file.duration = projectItems[i].duration;
+        _file.frameRate = projectItems[i].frameRate;
+    }
     
     fileMap.push(_file);
 }
@@ -26,4 +32,3 @@ _obj={
 }
 
 saveFile("file_map.json",JSON.stringify(_obj));
-
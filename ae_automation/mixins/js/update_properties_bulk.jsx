@@ -0,0 +1,54 @@
+//
+// Update Comp (bulk)
+// ------------------------------------------------------------
+// Language: javascript
+//
+// Applies a list of {layer, property, value} edits to one comp. The comp is
+// resolved once and its layers indexed by name, instead of a project and
+// layer scan per edit. Each edit reports its own success to
+// update_properties_bulk.json.
+
+function updateCompPropertiesBulk(compName, edits) {
+    var results = [];
+    var comp = null;
+    var projectItems = app.project.items;
+    for (var i = 1; i <= projectItems.length; i++) {
+        if (projectItems[i].name == compName && projectItems[i] instanceof CompItem) {
+            comp = projectItems[i];
+            break;
+        }
+    }
+
+    // First layer wins for duplicate names, like FindLayerByComp
+    var layers = {};
+    if (comp != null) {
+        for (var l = 1; l <= comp.layers.length; l++) {
+            var layerName = comp.layers[l].name;
+            if (!layers.hasOwnProperty(layerName)) {
+                layers[layerName] = comp.layers[l];
+            }
+        }
+    }
+
+    for (var e = 0; e < edits.length; e++) {
+        var edit = edits[e];
+        try {
+            if (comp == null) {
+                throw new Error("Comp not found: " + compName);
+            }
+            if (!layers.hasOwnProperty(edit.layer)) {
+                throw new Error("Layer not found: " + edit.layer);
+            }
+            var property = propertyParser(layers[edit.layer], edit.property);
+            property.setValue(valueParser(edit.value));
+            results.push({ ok: true });
+        }
+        catch (err) {
+            results.push({ ok: false, error: err.toString() });
+        }
+    }
+
+    saveFile("update_properties_bulk.json", JSON.stringify(results));
+}
+
+updateCompPropertiesBulk("{comp_name}", {edits});
@@ -11,6 +11,7 @@ import time
 
 import psutil
 
+from ae_automation.cancellation import NEVER_CANCELLED
 from ae_automation.logging_config import get_logger
 from ae_automation.platform import get_ae_executable, get_ae_process_name, press_key
 from ae_automation.settings import IS_WINDOWS
@@ -33,6 +34,10 @@ class ProcessManagerMixin:
     Mixin for managing After Effects process lifecycle
     """
 
+    def _wait(self, seconds: float) -> None:
+        """Sleep between polls, waking early if the running batch job is cancelled."""
+        (getattr(self, "_cancel_token", None) or NEVER_CANCELLED).sleep(seconds)
+
     def wait_for_process(self, process_name: str | None = None, timeout: int = 30) -> psutil.Process | None:
         """
         Wait for a process to start
@@ -57,7 +62,7 @@ class ProcessManagerMixin:
                         return proc
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
-            time.sleep(0.5)
+            self._wait(0.5)
 
         logger.warning("Timeout waiting for %s", process_name)
         return None
@@ -87,7 +92,7 @@ class ProcessManagerMixin:
                     if len(windows) > 0:
                         logger.info("After Effects window is ready (%d window(s) found)", len(windows))
                         # Give it a moment to fully initialize
-                        time.sleep(3)
+                        self._wait(3)
                         return True
                 else:
                     # Non-Windows fallback: check via psutil for process existence
@@ -95,7 +100,7 @@ class ProcessManagerMixin:
 
                     if process_is_running(get_ae_process_name()):
                         logger.info("After Effects process detected (non-Windows fallback)")
-                        time.sleep(3)
+                        self._wait(3)
                         return True
             except Exception:
                 # Try alternate detection method
@@ -105,12 +110,12 @@ class ProcessManagerMixin:
                     ae_windows = [w for w in gw.getAllWindows() if "after effects" in w.title.lower()]
                     if ae_windows:
                         logger.info("After Effects window is ready (found via alternate method)")
-                        time.sleep(3)
+                        self._wait(3)
                         return True
                 except Exception:
                     pass
 
-            time.sleep(1)
+            self._wait(1)
 
         logger.warning("Timeout waiting for After Effects window")
         return False
@@ -157,10 +162,10 @@ class ProcessManagerMixin:
 
             except subprocess.TimeoutExpired:
                 logger.debug("Attempt %d/%d: Still loading...", attempt + 1, max_retries)
-                time.sleep(3)
+                self._wait(3)
             except Exception as e:
                 logger.debug("Attempt %d/%d: Waiting... (%s)", attempt + 1, max_retries, e)
-                time.sleep(3)
+                self._wait(3)
 
         logger.warning("After Effects is not responding")
         return False
@@ -179,7 +184,7 @@ class ProcessManagerMixin:
             # Send Space key to dismiss "Start Safe Mode" dialog or "Crash Repair"
             press_key("space")
             logger.debug("Sent SPACE key to handle potential dialog")
-            time.sleep(1)
+            self._wait(1)
         except Exception as e:
             logger.debug("Failed to handle crash dialog: %s", e)
 
@@ -208,7 +213,7 @@ class ProcessManagerMixin:
             return False
 
         # Attempt to handle crash dialog early
-        time.sleep(5)
+        self._wait(5)
         self.handle_crash_dialog()
 
         # Step 2: Wait for main window
@@ -219,7 +224,7 @@ class ProcessManagerMixin:
 
         # Step 3: Wait a bit more for plugins to load
         logger.info("Waiting for plugins and UI to initialize...")
-        time.sleep(5)
+        self._wait(5)
 
         # Step 4: Check if responsive
         if not self.is_after_effects_responsive(max_retries=3):
@@ -308,7 +313,7 @@ class ProcessManagerMixin:
             if os.path.exists(marker_file):
                 os.remove(marker_file)
                 return True
-            time.sleep(0.1)
+            self._wait(0.1)
 
         return False
 
@@ -332,7 +337,7 @@ class ProcessManagerMixin:
         self.runScript(script_name, replacements)
 
         # Wait for completion
-        time.sleep(wait_time)
+        self._wait(wait_time)
 
         return True
 
@@ -352,7 +357,7 @@ class ProcessManagerMixin:
 
         try:
             self.runScript("test_script_execution.jsx")
-            time.sleep(3)
+            self._wait(3)
 
             print("Test script sent to After Effects")
             print("\nIMPORTANT: Did you see an alert dialog in After Effects?")
@@ -381,7 +386,7 @@ class ProcessManagerMixin:
 
         try:
             self.runScript("check_scripting_enabled.jsx")
-            time.sleep(3)
+            self._wait(3)
 
             print("Settings check sent to After Effects")
             print("\nRead the alert dialog in After Effects for details")
@@ -418,7 +423,7 @@ class ProcessManagerMixin:
             }
 
             self.runScript("debug_create_comp.jsx", replacements)
-            time.sleep(5)
+            self._wait(5)
 
             print("Debug comp creation script sent")
             print("\nCheck After Effects:")
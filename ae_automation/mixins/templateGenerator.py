@@ -6,7 +6,6 @@ Provides functionality to create After Effects project templates (.aep files)
 from __future__ import annotations
 
 import os
-import time
 from typing import Any
 
 from ae_automation.exceptions import AENotResponsiveError, ScriptExecutionError
@@ -26,7 +25,7 @@ class TemplateGeneratorMixin:
         """
         logger.info("Creating new project...")
         self.runScript("create_new_project.jsx")
-        time.sleep(1)  # Brief wait for script execution
+        self._wait(1)  # Brief wait for script execution
 
     def saveProject(self, project_path: str) -> None:
         """
@@ -47,7 +46,7 @@ class TemplateGeneratorMixin:
 
         _replace = {"{projectPath}": str(project_path)}
         self.runScript("save_project.jsx", _replace)
-        time.sleep(2)  # Wait for save operation to complete
+        self._wait(2)  # Wait for save operation to complete
 
         # Verify the file was actually created
         original_path = project_path.replace("/", "\\")
@@ -55,7 +54,7 @@ class TemplateGeneratorMixin:
             if os.path.exists(original_path):
                 logger.info("Project saved successfully")
                 return
-            time.sleep(0.5)
+            self._wait(0.5)
 
         raise ScriptExecutionError(script_name="save_project.jsx", detail=f"File was not created at {original_path}")
 
@@ -89,7 +88,7 @@ class TemplateGeneratorMixin:
             "{font_size}": str(font_size),
         }
         self.runScript("add_text_layer.jsx", _replace)
-        time.sleep(1)
+        self._wait(1)
 
     def addSolidLayer(
         self,
@@ -124,7 +123,7 @@ class TemplateGeneratorMixin:
             "{height}": str(height),
         }
         self.runScript("add_solid_layer.jsx", _replace)
-        time.sleep(1)
+        self._wait(1)
 
     def addNullLayer(self, comp_name: str, layer_name: str) -> None:
         """
@@ -137,7 +136,7 @@ class TemplateGeneratorMixin:
         logger.info("Adding null layer '%s' to %s", layer_name, comp_name)
         _replace = {"{comp_name}": str(comp_name), "{layer_name}": str(layer_name)}
         self.runScript("add_null_layer.jsx", _replace)
-        time.sleep(1)
+        self._wait(1)
 
     def addShapeLayer(
         self,
@@ -172,7 +171,7 @@ class TemplateGeneratorMixin:
             "{color_b}": str(color_b),
         }
         self.runScript("add_shape_layer.jsx", _replace)
-        time.sleep(1)
+        self._wait(1)
 
     def buildTemplate(self, template_config: dict[str, Any], output_path: str) -> None:
         """
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import tempfile
 import webbrowser
@@ -8,6 +9,12 @@ from PIL import ImageColor
 from slugify import slugify
 
 
+@functools.lru_cache(maxsize=4096)
+def _slug(value: str) -> str:
+    # Scene and comp names repeat across every action of a run; slugify is not cheap
+    return slugify(value.lower())
+
+
 class ToolsMixin:
     """
     ToolsMixin
@@ -25,7 +32,7 @@ class ToolsMixin:
             return f.read()
 
     def slug(self, _str: str) -> str:
-        return slugify(str(_str).lower())
+        return _slug(str(_str))
 
     def hexToRGBA(self, hex: str) -> str:
         _h = ImageColor.getcolor(hex, "RGB")
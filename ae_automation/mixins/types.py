@@ -1,4 +1,44 @@
-from pydantic import BaseModel, Field
+"""
+Typed schema for automation configs.
+
+``validate_config()`` checks a loaded config (project, resources, timeline,
+custom actions and templates) before After Effects is launched, so a typo
+in scene 30 fails in milliseconds instead of as a KeyError minutes into a
+run. Every problem is collected and reported in one ConfigValidationError.
+
+The pydantic validator is compiled once per process and reused for every
+config (e.g. across batch jobs). The models use ``Optional``/``Union``
+rather than ``X | None`` because pydantic evaluates annotations at runtime
+and Python 3.9 is supported.
+"""
+
+import functools
+import re
+from typing import Annotated, Any, Literal, Optional, Union, get_args
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+
+from ae_automation.exceptions import ConfigValidationError
+from ae_automation.execution_plan import PLACEHOLDER_RE
+
+_HMS_RE = re.compile(r"^\d+:\d{1,2}:\d{1,2}(\.\d+)?$")
+
+Number = Union[int, float]
+Flag = Union[bool, str]
+
+ChangeType = Literal[
+    "update_layer_property",
+    "update_layer_property_at_frame",
+    "add_resource",
+    "edit_resource",
+    "swap_items_by_index",
+    "add_marker",
+    "template",
+    "add_comp",
+    "apply_template_values",
+    "add_transition",
+]
+_ACTION_TAGS = set(get_args(ChangeType))
 
 
 class ae_files(BaseModel):
@@ -10,3 +50,264 @@ class ae_files(BaseModel):
 class ae_bot(BaseModel):
     projectName: str
     files: list[ae_files] = Field(default_factory=list)
+
+
+# ── Project ─────────────────────────────────────────────────
+
+
+class _Model(BaseModel):
+    # Unknown keys are kept: configs carry editor metadata the bot ignores
+    model_config = ConfigDict(extra="allow")
+
+
+class Resource(_Model):
+    type: str
+    name: str
+    path: str
+    duration: Optional[Number] = None
+
+
+class Project(_Model):
+    project_file: str
+    comp_name: str
+    comp_fps: float = Field(gt=0)
+    comp_width: int = Field(gt=0)
+    comp_height: int = Field(gt=0)
+    comp_start_time: Union[str, Number] = "00:00:00"
+    comp_end_time: Union[str, Number]
+    output_dir: str
+    output_file: Optional[str] = None
+    debug: bool = False
+    renderComp: bool = True
+    auto_time: bool = False
+    resources: list[Resource] = Field(default_factory=list)
+    render_mode: Optional[Literal["full", "scenes"]] = None
+    render_segments: int = Field(default=1, ge=1)
+    render_cache: Optional[bool] = None
+    outputs: list[Union[str, dict[str, Any]]] = Field(default_factory=list)
+
+    @field_validator("comp_end_time", "comp_start_time")
+    @classmethod
+    def _check_time(cls, value: Union[str, Number]) -> Union[str, Number]:
+        if isinstance(value, str) and not _HMS_RE.match(value):
+            raise ValueError("must be seconds or HH:MM:SS")
+        return value
+
+    @field_validator("outputs")
+    @classmethod
+    def _check_outputs(cls, value: list[Union[str, dict[str, Any]]]) -> list[Union[str, dict[str, Any]]]:
+        from ae_automation.outputs import normalize_output_spec
+
+        for spec in value:
+            try:
+                normalize_output_spec(spec)
+            except ConfigValidationError as e:
+                raise ValueError(e.detail) from e
+        return value
+
+
+# ── Custom actions ──────────────────────────────────────────
+
+
+class UpdateLayerProperty(_Model):
+    change_type: Literal["update_layer_property"]
+    comp_name: str
+    layer_name: str
+    property_name: str
+    value: Any
+    property_type: Optional[str] = None
+
+
+class UpdateLayerPropertyAtFrame(UpdateLayerProperty):
+    change_type: Literal["update_layer_property_at_frame"]  # type: ignore[assignment]
+    frame: Number
+
+
+class AddResource(_Model):
+    change_type: Literal["add_resource"]
+    comp_name: str
+    resource_name: str
+    startTime: Number
+    duration: Number = Field(ge=0)
+    moveToEnd: Flag = "false"
+
+
+class EditResource(_Model):
+    change_type: Literal["edit_resource"]
+    comp_name: str
+    layerIndex: Union[int, str]
+    startTime: Number
+    duration: Number
+    moveToEnd: Flag
+
+
+class SwapItemsByIndex(_Model):
+    change_type: Literal["swap_items_by_index"]
+    comp_name: str
+    layer_index: Union[int, str]
+    layer_name: str
+    fit_to_screen: bool
+    fit_to_screen_width: bool
+    fit_to_screen_height: bool
+
+
+class AddMarker(_Model):
+    change_type: Literal["add_marker"]
+    comp_name: str
+    layer_name: str
+    marker_name: str
+    marker_time: Union[Number, str]
+
+
+class UseTemplate(_Model):
+    change_type: Literal["template"]
+    template_name: str
+    template_values: dict[str, Any] = Field(default_factory=dict)
+
+
+class AddComp(_Model):
+    change_type: Literal["add_comp"]
+    comp_name: str
+    startTime: Number
+    duration: Number
+
+
+class ApplyTemplateValues(_Model):
+    change_type: Literal["apply_template_values"]
+    comp_name: str
+    values: list[dict[str, Any]] = Field(default_factory=list)
+    values_file: Optional[str] = None
+
+
+class AddTransition(_Model):
+    change_type: Literal["add_transition"]
+    comp_name: str
+    layer_name: str
+    transition_type: str = "fade_in"
+    start_time: Number = 0.0
+    duration: Number = 1.0
+
+
+CustomAction = Annotated[
+    Union[
+        UpdateLayerProperty,
+        UpdateLayerPropertyAtFrame,
+        AddResource,
+        EditResource,
+        SwapItemsByIndex,
+        AddMarker,
+        UseTemplate,
+        AddComp,
+        ApplyTemplateValues,
+        AddTransition,
+    ],
+    Field(discriminator="change_type"),
+]
+
+
+# ── Config ──────────────────────────────────────────────────
+
+
+class Scene(_Model):
+    name: Optional[str] = None
+    startTime: Number = Field(ge=0)
+    duration: Number = Field(gt=0)
+    template_comp: str
+    reverse: bool = False
+    custom_actions: list[CustomAction] = Field(default_factory=list)
+
+
+class TemplateStep(_Model):
+    """One step of a reusable template; values may be ``{placeholder}`` strings."""
+
+    change_type: ChangeType
+
+
+class AutomationConfig(_Model):
+    project: Project
+    timeline: list[Scene] = Field(default_factory=list)
+    templates: dict[str, list[TemplateStep]] = Field(default_factory=dict)
+
+
+@functools.cache
+def config_validator() -> TypeAdapter[AutomationConfig]:
+    """Return the compiled config validator, built once per process."""
+    return TypeAdapter(AutomationConfig)
+
+
+@functools.cache
+def _action_validator() -> TypeAdapter[Any]:
+    return TypeAdapter(CustomAction)
+
+
+def _location(loc: tuple[Any, ...]) -> str:
+    # Drop the discriminator tag pydantic inserts into union paths
+    return ".".join(str(part) for part in loc if part not in _ACTION_TAGS) or "(root)"
+
+
+def _format_errors(error: ValidationError, prefix: tuple[Any, ...] = ()) -> list[str]:
+    return [f"{_location(prefix + tuple(err['loc']))}: {err['msg']}" for err in error.errors()]
+
+
+def _check_references(data: dict[str, Any]) -> list[str]:
+    """Cross-field checks the per-field schema cannot express."""
+    errors: list[str] = []
+    project = data.get("project") if isinstance(data.get("project"), dict) else {}
+    resource_names = {r.get("name") for r in project.get("resources", []) if isinstance(r, dict)}
+    templates = data.get("templates") if isinstance(data.get("templates"), dict) else {}
+    timeline = data.get("timeline") if isinstance(data.get("timeline"), list) else []
+
+    for s, scene in enumerate(timeline):
+        actions = scene.get("custom_actions", []) if isinstance(scene, dict) else []
+        for a, action in enumerate(actions if isinstance(actions, list) else []):
+            if not isinstance(action, dict):
+                continue
+            where = f"timeline.{s}.custom_actions.{a}"
+            if action.get("change_type") == "add_resource" and action.get("resource_name") not in resource_names:
+                errors.append(f"{where}.resource_name: unknown resource {action.get('resource_name')!r}")
+            if action.get("change_type") == "template":
+                errors.extend(_check_template_use(action, templates, resource_names, where))
+    return errors
+
+
+def _check_template_use(
+    action: dict[str, Any], templates: dict[str, Any], resource_names: set[Any], where: str
+) -> list[str]:
+    name = action.get("template_name")
+    if name not in templates:
+        return [f"{where}.template_name: unknown template {name!r}"]
+    values = action.get("template_values") or {}
+    errors: list[str] = []
+    for step_index, step in enumerate(templates[name] if isinstance(templates[name], list) else []):
+        if not isinstance(step, dict):
+            continue
+        # Substitute placeholders the way parseCustomActions does, then validate the result
+        filled = dict(step)
+        for key, value in step.items():
+            match = PLACEHOLDER_RE.match(str(value)) if isinstance(value, str) else None
+            if match:
+                if match.group(1) not in values:
+                    errors.append(f"{where}.template_values: missing {match.group(1)!r} used by template {name!r}")
+                    continue
+                filled[key] = values[match.group(1)]
+        try:
+            _action_validator().validate_python(filled)
+        except ValidationError as e:
+            errors.extend(_format_errors(e, (f"templates.{name}", step_index)))
+    return errors
+
+
+def validate_config(data: dict[str, Any]) -> AutomationConfig:
+    """Validate a loaded config, raising one ConfigValidationError that lists every problem."""
+    errors: list[str] = []
+    config = None
+    try:
+        config = config_validator().validate_python(data)
+    except ValidationError as e:
+        errors.extend(_format_errors(e))
+    errors.extend(_check_references(data))
+    if errors:
+        raise ConfigValidationError(
+            field="config", detail=f"{len(errors)} error(s)\n  " + "\n  ".join(errors), errors=errors
+        )
+    return config  # type: ignore[return-value]
@@ -0,0 +1,236 @@
+"""
+Post-render output fan-out -- derive several deliverables from one master render.
+
+A project declares the outputs it needs::
+
+    "project": {
+        ...
+        "outputs": ["webm", "gif", {"format": "poster", "count": 3}]
+    }
+
+After aerender writes the master file, ``OutputPipeline.submit()`` schedules
+one ffmpeg task per output on a shared worker pool and returns immediately,
+so the derived files are encoded while the next batch job renders. The
+encodes read a per-job snapshot of the master (a hardlink, or a copy), so a
+later job that re-renders the same output path cannot change or delete it
+underneath them. Call ``OutputJob.result()`` (or ``OutputPipeline.wait()``)
+to collect the paths.
+
+Formats:
+
+- ``mp4``: H.264/AAC via ``ae_automation.transcode`` (stream copy when possible)
+- ``webm``: VP9/Opus
+- ``gif``: palette-optimised preview (``width``, ``fps``)
+- ``poster``: ``count`` JPEG frames spread evenly over the video, or one at ``time``
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from ae_automation import settings
+from ae_automation.exceptions import ConfigValidationError, RenderError
+from ae_automation.logging_config import get_logger
+from ae_automation.render_cache import remove_output
+from ae_automation.tracing import span
+from ae_automation.transcode import MediaInfo, probe_media, transcode
+
+logger = get_logger(__name__)
+
+OUTPUT_FORMATS = ("mp4", "webm", "gif", "poster")
+
+# Defaults per format; a config dict overrides any of these
+OUTPUT_DEFAULTS: dict[str, dict[str, Any]] = {
+    "mp4": {},
+    "webm": {"crf": 32},
+    "gif": {"width": 480, "fps": 12},
+    "poster": {"count": 1, "width": None},
+}
+
+
+def normalize_output_spec(spec: str | dict[str, Any]) -> dict[str, Any]:
+    """Turn a config entry (``"gif"`` or ``{"format": "gif", ...}``) into a full spec."""
+    if isinstance(spec, str):
+        spec = {"format": spec}
+    fmt = str(spec.get("format", "")).lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ConfigValidationError(
+            "project.outputs", f"unknown output format {fmt!r}, expected one of {OUTPUT_FORMATS}"
+        )
+    return {**OUTPUT_DEFAULTS[fmt], **spec, "format": fmt}
+
+
+def _output_path(master_path: str, spec: dict[str, Any], output_dir: str) -> str:
+    base = spec.get("name") or os.path.splitext(os.path.basename(master_path))[0]
+    ext = {"mp4": ".mp4", "webm": ".webm", "gif": ".gif", "poster": ".jpg"}[spec["format"]]
+    return os.path.join(output_dir, base + ("_poster" if spec["format"] == "poster" else "") + ext)
+
+
+def _run_ffmpeg(cmd: list[str], label: str) -> None:
+    with span("ffmpeg", label=label):
+        result = subprocess.run(cmd, capture_output=True, check=False)
+    if result.returncode != 0:
+        raise RenderError(detail=f"{label} failed: " + result.stderr.decode("utf-8", errors="replace")[-2000:])
+
+
+def _poster_times(spec: dict[str, Any], info: MediaInfo) -> list[float]:
+    if "time" in spec:
+        return [float(spec["time"])]
+    count = max(1, int(spec["count"]))
+    # Evenly spaced, avoiding the very first and last frame (often black)
+    return [info.duration * (i + 1) / (count + 1) for i in range(count)]
+
+
+def _snapshot(master_path: str) -> str:
+    """Hardlink (or copy) *master_path* to a unique hidden name next to it."""
+    directory, name = os.path.split(os.path.abspath(master_path))
+    stem, ext = os.path.splitext(name)
+    snapshot = os.path.join(directory, f".{stem}.{uuid.uuid4().hex[:8]}{ext}")
+    try:
+        os.link(master_path, snapshot)
+    except OSError:
+        shutil.copy2(master_path, snapshot)
+    return snapshot
+
+
+def render_output(master_path: str, spec: dict[str, Any], output_dir: str, source_path: str | None = None) -> list[str]:
+    """Produce one derived output from *master_path*. Returns the written file paths.
+
+    Outputs are named after *master_path*; the frames are read from
+    *source_path* when given (a snapshot of the master).
+    """
+    if not settings.FFMPEG_PATH:
+        raise RenderError(detail="ffmpeg not found. Install ffmpeg or set FFMPEG_PATH in .env")
+    spec = normalize_output_spec(spec)
+    os.makedirs(output_dir, exist_ok=True)
+    dest = _output_path(master_path, spec, output_dir)
+    source = source_path or master_path
+    ffmpeg = [settings.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-y"]
+    fmt = spec["format"]
+
+    if fmt == "mp4":
+        if os.path.abspath(dest) == os.path.abspath(master_path):
+            return [dest]
+        return [transcode(source, dest)]
+
+    if fmt == "webm":
+        cmd = ffmpeg + ["-i", source, "-map", "0:v:0", "-map", "0:a?"]
+        cmd += ["-c:v", "libvpx-vp9", "-crf", str(spec["crf"]), "-b:v", "0", "-row-mt", "1", "-c:a", "libopus", dest]
+        _run_ffmpeg(cmd, "WebM encode")
+        return [dest]
+
+    if fmt == "gif":
+        scale = f"fps={spec['fps']},scale={spec['width']}:-1:flags=lanczos"
+        graph = f"[0:v]{scale},split[a][b];[a]palettegen=stats_mode=diff[p];[b][p]paletteuse=dither=bayer"
+        _run_ffmpeg(ffmpeg + ["-i", source, "-filter_complex", graph, "-loop", "0", dest], "GIF encode")
+        return [dest]
+
+    # poster
+    times = _poster_times(spec, probe_media(source))
+    stem, ext = os.path.splitext(dest)
+    paths: list[str] = []
+    for index, seconds in enumerate(times):
+        path = dest if len(times) == 1 else f"{stem}_{index + 1:02d}{ext}"
+        cmd = ffmpeg + ["-ss", f"{seconds:.3f}", "-i", source, "-frames:v", "1", "-q:v", "2"]
+        if spec.get("width"):
+            cmd += ["-vf", f"scale={spec['width']}:-1"]
+        _run_ffmpeg(cmd + [path], "Poster frame")
+        paths.append(path)
+    return paths
+
+
+@dataclass
+class OutputJob:
+    """Derived outputs scheduled for one master render."""
+
+    master_path: str
+    futures: dict[str, Future[list[str]]] = field(default_factory=dict)
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures.values())
+
+    def result(self, timeout: float | None = None) -> dict[str, list[str]]:
+        """Wait for every output and return ``{label: [paths]}``. Raises the first failure."""
+        return {label: future.result(timeout=timeout) for label, future in self.futures.items()}
+
+    def errors(self) -> dict[str, str]:
+        """Return ``{label: error}`` for finished outputs that failed."""
+        return {
+            label: str(future.exception())
+            for label, future in self.futures.items()
+            if future.done() and future.exception() is not None
+        }
+
+
+class OutputPipeline:
+    """Shared ffmpeg worker pool for post-render outputs."""
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers or settings.OUTPUT_WORKERS
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: list[OutputJob] = []
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ae-output")
+        return self._executor
+
+    def submit(self, master_path: str, outputs: list[str | dict[str, Any]], output_dir: str | None = None) -> OutputJob:
+        """Schedule every output for *master_path* and return without waiting.
+
+        The encodes read a snapshot of *master_path* taken now, so the caller
+        may render over *master_path* straight away.
+        """
+        specs = [normalize_output_spec(spec) for spec in outputs]
+        output_dir = output_dir or os.path.dirname(os.path.abspath(master_path))
+        job = OutputJob(master_path)
+        if not specs:
+            return job
+        snapshot = _snapshot(master_path)
+        remaining = [len(specs)]
+
+        def _render(spec: dict[str, Any]) -> list[str]:
+            try:
+                return render_output(master_path, spec, output_dir, snapshot)
+            finally:
+                # The last encode to finish removes the snapshot
+                with self._lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    remove_output(snapshot)
+
+        with self._lock:
+            pool = self._pool()
+            for index, spec in enumerate(specs):
+                label = spec.get("name") or spec["format"]
+                if label in job.futures:
+                    label = f"{label}_{index + 1}"
+                job.futures[label] = pool.submit(_render, spec)
+            self._jobs.append(job)
+        logger.info("Queued %d derived output(s) for %s", len(specs), master_path)
+        return job
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs if not job.done())
+
+    def wait(self, timeout: float | None = None) -> list[OutputJob]:
+        """Block until every submitted job finishes. Returns the finished jobs and forgets them."""
+        with self._lock:
+            jobs, self._jobs = self._jobs, []
+        for job in jobs:
+            for future in job.futures.values():
+                try:
+                    future.result(timeout=timeout)
+                except Exception as exc:
+                    logger.error("Derived output for %s failed: %s", job.master_path, exc)
+        return jobs
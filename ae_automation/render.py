@@ -0,0 +1,126 @@
+"""
+Render helpers -- aerender command assembly, frame-range splitting and
+segment stitching.
+
+A long composition can be rendered as K independent frame ranges
+(``aerender -s/-e``) in parallel processes. The segments are then joined
+with ffmpeg's concat demuxer using stream copy, so the video is never
+re-encoded. Audio is rendered once over the full range and muxed in at the
+end, which avoids clicks at segment boundaries.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+
+from ae_automation import settings
+from ae_automation.exceptions import RenderError
+from ae_automation.logging_config import get_logger
+from ae_automation.tracing import span
+
+logger = get_logger(__name__)
+
+
+def split_frame_range(start_frame: int, end_frame: int, segments: int) -> list[tuple[int, int]]:
+    """Partition the inclusive range ``[start_frame, end_frame]`` into contiguous segments.
+
+    Every frame belongs to exactly one segment, segment sizes differ by at
+    most one frame, and the number of segments is clamped to the number of
+    frames. Bounds are inclusive, matching aerender's ``-s``/``-e``.
+    """
+    if end_frame < start_frame:
+        raise ValueError(f"Invalid frame range: {start_frame}-{end_frame}")
+    if segments < 1:
+        raise ValueError(f"segments must be >= 1, got {segments}")
+
+    total = end_frame - start_frame + 1
+    segments = min(segments, total)
+    base, extra = divmod(total, segments)
+
+    ranges: list[tuple[int, int]] = []
+    cursor = start_frame
+    for i in range(segments):
+        size = base + (1 if i < extra else 0)
+        ranges.append((cursor, cursor + size - 1))
+        cursor += size
+    return ranges
+
+
+def build_aerender_command(
+    project_path: str,
+    comp_name: str,
+    output_path: str,
+    start_frame: int | None = None,
+    end_frame: int | None = None,
+    om_template: str | None = None,
+    mem_usage: tuple[int, int] = (20, 40),
+    mfr_cpu_percent: int | None = None,
+) -> list[str]:
+    """Return the aerender argument list for one render.
+
+    *mem_usage* is ``(image cache %, max memory %)``. *mfr_cpu_percent*
+    turns on multi-frame rendering (AE 2022+) capped at that share of CPU.
+    """
+    cmd = [
+        settings.AERENDER_PATH,
+        "-project",
+        project_path,
+        "-comp",
+        comp_name,
+        "-output",
+        output_path,
+    ]
+    if start_frame is not None:
+        cmd += ["-s", str(start_frame)]
+    if end_frame is not None:
+        cmd += ["-e", str(end_frame)]
+    if om_template:
+        cmd += ["-OMtemplate", om_template]
+    cmd += ["-mem_usage", str(mem_usage[0]), str(mem_usage[1])]
+    if mfr_cpu_percent:
+        cmd += ["-mfr", "ON", str(mfr_cpu_percent)]
+    return cmd
+
+
+def stitch_segments(segment_paths: list[str], output_path: str, audio_path: str | None = None) -> str:
+    """Concatenate rendered segments into *output_path* without re-encoding video.
+
+    Uses ffmpeg's concat demuxer with ``-c:v copy``. When *audio_path* is
+    given, the segments' own audio is dropped and the separately rendered
+    track is muxed in (encoded once to AAC).
+    """
+    if not segment_paths:
+        raise RenderError(detail="No segments to stitch")
+    if not settings.FFMPEG_PATH:
+        raise RenderError(detail="ffmpeg not found. Install ffmpeg or set FFMPEG_PATH in .env")
+
+    fd, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_", dir=os.path.dirname(segment_paths[0]))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            for path in segment_paths:
+                # concat demuxer quoting: single quotes, with embedded quotes escaped
+                escaped = os.path.abspath(path).replace("\\", "/").replace("'", "'\\''")
+                fh.write(f"file '{escaped}'\n")
+
+        cmd = [settings.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-y"]
+        cmd += ["-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path:
+            cmd += ["-i", audio_path, "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", "-shortest"]
+        else:
+            cmd += ["-c", "copy"]
+        cmd.append(output_path)
+
+        logger.info("Stitching %d segments -> %s", len(segment_paths), output_path)
+        with span("ffmpeg", label="stitch", segments=len(segment_paths)):
+            result = subprocess.run(cmd, capture_output=True, check=False)
+        if result.returncode != 0:
+            raise RenderError(detail="Segment stitch failed: " + result.stderr.decode("utf-8", errors="replace"))
+    finally:
+        try:
+            os.remove(list_path)
+        except OSError:
+            pass
+
+    return output_path
@@ -0,0 +1,318 @@
+"""
+Render result cache -- skip aerender when nothing that affects the output changed.
+
+Entries are keyed by a fingerprint of the staged ``.aep``, the comp name,
+the render settings and the content of every referenced resource. Cached
+files live in ``RENDER_CACHE_FOLDER`` and are hardlinked into the output
+directory on a hit, so a cache hit costs a few filesystem calls instead of
+a full render. The cache is size-bounded with least-recently-used eviction.
+
+Because outputs and cache entries can share their data, cache files are made
+read-only and renderers must write to a fresh file: call ``remove_output``
+before rendering over a path that may have come from the cache. The index is
+guarded by a lock file so several worker processes can share one cache folder.
+
+Usage::
+
+    cache = RenderCache()
+    key = cache.fingerprint("ae_automation.aep", "FinalComposition", {"segments": 1}, ["music.mp3"])
+    if cache.get(key, "out/FinalComposition.mp4") is None:
+        ...  # render
+        cache.put(key, "out/FinalComposition.mp4")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+from ae_automation import metrics, settings
+from ae_automation.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_INDEX_FILE = "index.json"
+_LOCK_FILE = "index.lock"
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+_CHUNK_SIZE = 1024 * 1024
+
+# Content hashes keyed by (path, size, mtime_ns) so unchanged resources are
+# not re-read on every render in a batch.
+_file_hash_memo: dict[tuple[str, int, int], str] = {}
+_memo_lock = threading.Lock()
+
+
+def hash_file(path: str) -> str:
+    """Return the sha256 of a file's content, memoised on its stat signature."""
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    memo_key = (abs_path, st.st_size, st.st_mtime_ns)
+    with _memo_lock:
+        cached = _file_hash_memo.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(abs_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _memo_lock:
+        _file_hash_memo[memo_key] = value
+    return value
+
+
+def remove_output(path: str) -> None:
+    """Delete *path* if it exists, including read-only links to cache entries.
+
+    aerender, ffmpeg ``-y`` and ``open(..., "wb")`` all rewrite an existing
+    file in place, which would change a cache entry hardlinked to it. Removing
+    the file first gives the renderer a new one.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # Windows refuses to delete read-only files
+        os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+        os.remove(path)
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    """Hardlink *src* to *dest*, falling back to a copy across filesystems."""
+    remove_output(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered outputs."""
+
+    cache_dir: str
+    max_bytes: int
+
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None) -> None:
+        self.cache_dir = cache_dir or settings.RENDER_CACHE_FOLDER
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RENDER_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # ── Fingerprinting ───────────────────────────────────────
+
+    def fingerprint(
+        self,
+        project_path: str,
+        comp_name: str,
+        render_settings: dict[str, Any] | None = None,
+        resources: list[str] | None = None,
+    ) -> str:
+        """Return the cache key for a render.
+
+        Missing resources are folded in by path so the key still changes
+        when one appears later.
+        """
+        digest = hashlib.sha256()
+        digest.update(b"aep:" + hash_file(project_path).encode())
+        digest.update(b"comp:" + comp_name.encode("utf-8"))
+        digest.update(b"settings:" + json.dumps(render_settings or {}, sort_keys=True, default=str).encode("utf-8"))
+        for resource in sorted(resources or []):
+            if os.path.isfile(resource):
+                digest.update(b"res:" + hash_file(resource).encode())
+            else:
+                digest.update(b"missing:" + resource.encode("utf-8"))
+        return digest.hexdigest()
+
+    # ── Index ────────────────────────────────────────────────
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, _INDEX_FILE)
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path(), encoding="utf-8") as fh:
+                data: dict[str, dict[str, Any]] = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        # Drop entries whose file was removed behind our back
+        return {k: v for k, v in data.items() if os.path.isfile(os.path.join(self.cache_dir, v["file"]))}
+
+    def _save_index(self, index: dict[str, dict[str, Any]]) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix="index.", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(index, fh, indent=2)
+            os.replace(tmp_path, self._index_path())
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the index against other threads and other processes sharing the cache folder."""
+        with self._lock, open(os.path.join(self.cache_dir, _LOCK_FILE), "a+b") as fh:
+            if os.name == "nt":
+                fh.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after ten one-second retries
+                        continue
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    # ── Lookup / store ───────────────────────────────────────
+
+    def get(self, key: str, dest_path: str) -> str | None:
+        """Materialise a cached output at *dest_path*. Returns the path on a hit, None on a miss."""
+        with self._locked():
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                metrics.RENDER_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, entry["file"])
+            _link_or_copy(cached_path, dest_path)
+            # remove_output on Windows clears the flag on every link to the file
+            os.chmod(cached_path, _READ_ONLY)
+            entry["last_used"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._save_index(index)
+        metrics.RENDER_CACHE_LOOKUPS.inc(result="hit")
+        logger.info("Render cache hit: %s", dest_path)
+        return dest_path
+
+    def put(self, key: str, source_path: str, label: str = "") -> None:
+        """Store a rendered file under *key* and evict old entries past the size limit."""
+        ext = os.path.splitext(source_path)[1]
+        file_name = key + ext
+        cached_path = os.path.join(self.cache_dir, file_name)
+        with self._locked():
+            index = self._load_index()
+            _link_or_copy(source_path, cached_path)
+            # An in-place write to a linked output now fails instead of corrupting the entry
+            os.chmod(cached_path, _READ_ONLY)
+            now = time.time()
+            index[key] = {
+                "file": file_name,
+                "label": label or os.path.basename(source_path),
+                "size": os.path.getsize(source_path),
+                "created_at": now,
+                "last_used": now,
+                "hits": 0,
+            }
+            self._evict(index, self.max_bytes)
+            self._save_index(index)
+
+    def _evict(self, index: dict[str, dict[str, Any]], max_bytes: int) -> list[str]:
+        """Remove least-recently-used entries from *index* until it fits in *max_bytes*."""
+        removed: list[str] = []
+        total = sum(e["size"] for e in index.values())
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= max_bytes:
+                break
+            try:
+                remove_output(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+            total -= entry["size"]
+            del index[key]
+            removed.append(key)
+        if removed:
+            logger.info("Render cache evicted %d entr%s", len(removed), "y" if len(removed) == 1 else "ies")
+        return removed
+
+    # ── Inspection / maintenance ─────────────────────────────
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return all entries, most recently used first."""
+        with self._locked():
+            index = self._load_index()
+        result = [{"key": k, **v} for k, v in index.items()]
+        result.sort(key=lambda e: e["last_used"], reverse=True)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        entries = self.entries()
+        return {
+            "cache_dir": self.cache_dir,
+            "entries": len(entries),
+            "total_bytes": sum(e["size"] for e in entries),
+            "max_bytes": self.max_bytes,
+            "hits": sum(e.get("hits", 0) for e in entries),
+        }
+
+    def prune(self, max_bytes: int | None = None) -> list[str]:
+        """Evict LRU entries until the cache fits in *max_bytes* (default: the configured limit)."""
+        with self._locked():
+            index = self._load_index()
+            removed = self._evict(index, self.max_bytes if max_bytes is None else max_bytes)
+            self._save_index(index)
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry. Returns the number removed."""
+        return len(self.prune(max_bytes=0))
+
+
+def scene_fingerprint(template_project: str, scene: dict[str, Any], data: dict[str, Any]) -> str:
+    """Return the cache key for one timeline scene rendered on its own.
+
+    Covers the scene's own config, the source template project, the comp
+    settings, any templates the scene expands and the content of every
+    resource it mentions. Edits to other scenes leave the key unchanged.
+    """
+    project = data.get("project", {})
+    scene_json = json.dumps(scene, sort_keys=True, default=str)
+
+    # Templates can reference other templates, so expand until stable
+    all_templates = data.get("templates", {})
+    used_templates: dict[str, Any] = {}
+    pending = scene_json
+    while True:
+        found = {n: t for n, t in all_templates.items() if n not in used_templates and n in pending}
+        if not found:
+            break
+        used_templates.update(found)
+        pending = json.dumps(found, sort_keys=True, default=str)
+    templates_json = json.dumps(used_templates, sort_keys=True, default=str)
+
+    digest = hashlib.sha256()
+    digest.update(b"template:" + hash_file(template_project).encode())
+    digest.update(b"scene:" + scene_json.encode("utf-8"))
+    digest.update(b"templates:" + templates_json.encode("utf-8"))
+    for key in ("comp_fps", "comp_width", "comp_height"):
+        digest.update(f"{key}:{project.get(key)}".encode())
+    for resource in project.get("resources", []):
+        name = resource.get("name", "")
+        if name and (name in scene_json or name in templates_json):
+            path = resource.get("path", "")
+            digest.update(b"res:" + (hash_file(path) if os.path.isfile(path) else "missing:" + path).encode())
+    return digest.hexdigest()
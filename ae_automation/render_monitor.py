@@ -0,0 +1,221 @@
+"""
+Streaming aerender output reader.
+
+aerender writes progress to stdout and diagnostics to stderr. Reading one
+pipe to completion before touching the other can deadlock once the unread
+pipe's OS buffer fills, so ``AerenderOutputReader`` drains both pipes on
+dedicated threads and keeps only the most recent lines of each in bounded
+buffers. Parsed output is surfaced as typed ``RenderEvent`` objects
+(start, frame, warning, done) carrying frame counts, throughput and ETA.
+
+Usage::
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    reader = AerenderOutputReader(process, total_frames=300, on_event=print)
+    returncode = reader.run()
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Callable
+
+from ae_automation.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# PROGRESS:  0:00:05:00 (150): 1 Seconds  -- or (frame 150)
+PROGRESS_RE = re.compile(r"PROGRESS:\s*[\d:;]+\s*\((?:frame\s+)?(\d+)\)", re.IGNORECASE)
+# DURATION: 0:00:10:00 (300)  -- some builds print the frame count directly
+TOTAL_RE = re.compile(r"DURATION:\s*[\d:;]+\s*\((?:frame\s+)?(\d+)\)", re.IGNORECASE)
+# PROGRESS:  Duration: 0:00:10:00  /  PROGRESS:  Frame Rate: 29.97 (comp)
+DURATION_TIMECODE_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+)[:;](\d+)\s*$", re.IGNORECASE)
+FRAME_RATE_RE = re.compile(r"Frame Rate:\s*([\d.]+)", re.IGNORECASE)
+WARNING_RE = re.compile(r"\b(WARNING|ERROR)\b", re.IGNORECASE)
+
+
+@dataclass
+class RenderEvent:
+    """One structured progress event from a render."""
+
+    kind: str  # "start" | "frame" | "warning" | "done"
+    frame: int = 0
+    total_frames: int = 0
+    percent: int = 0
+    fps: float = 0.0
+    eta: float | None = None
+    message: str = ""
+    returncode: int | None = None
+    timestamp: float = field(default_factory=time.time)
+
+
+class AerenderOutputReader:
+    """Drain an aerender process's stdout and stderr concurrently and emit RenderEvents."""
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        total_frames: int = 0,
+        on_event: Callable[[RenderEvent], None] | None = None,
+        max_lines: int = 500,
+        log_output: bool = True,
+    ) -> None:
+        self.process = process
+        self.total_frames = total_frames
+        self.on_event = on_event
+        self.log_output = log_output
+        self.stdout_tail: deque[str] = deque(maxlen=max_lines)
+        self.stderr_tail: deque[str] = deque(maxlen=max_lines)
+        self.frame = 0
+        self._lines: queue.Queue[tuple[str, str] | None] = queue.Queue(maxsize=10000)
+        self._frame_rate: float = 0.0
+        self._duration_timecode: tuple[int, int, int, int] | None = None
+        self._first_frame_at: float | None = None
+        self._first_frame: int = 0
+
+    # ── Draining ─────────────────────────────────────────────
+
+    def _pump(self, stream_name: str, pipe: IO[bytes]) -> None:
+        try:
+            for raw in iter(pipe.readline, b""):
+                self._lines.put((stream_name, raw.decode("utf-8", errors="replace").rstrip()))
+        finally:
+            pipe.close()
+            self._lines.put(None)
+
+    def run(self) -> int:
+        """Block until the process exits and both pipes are drained. Returns the exit code."""
+        pumps = []
+        for name, pipe in (("stdout", self.process.stdout), ("stderr", self.process.stderr)):
+            if pipe is not None:
+                thread = threading.Thread(target=self._pump, args=(name, pipe), daemon=True)
+                thread.start()
+                pumps.append(thread)
+
+        self._emit(RenderEvent("start", total_frames=self.total_frames))
+
+        open_pipes = len(pumps)
+        while open_pipes:
+            item = self._lines.get()
+            if item is None:
+                open_pipes -= 1
+                continue
+            stream_name, line = item
+            if line:
+                self._handle_line(stream_name, line)
+
+        for thread in pumps:
+            thread.join()
+        returncode = self.process.wait()
+
+        percent = 100 if returncode == 0 else self._percent()
+        message = "" if returncode == 0 else "\n".join(self.stderr_tail)
+        self._emit(
+            RenderEvent(
+                "done",
+                frame=self.frame,
+                total_frames=self.total_frames,
+                percent=percent,
+                fps=self._fps(),
+                eta=0.0 if returncode == 0 else None,
+                message=message,
+                returncode=returncode,
+            )
+        )
+        return returncode
+
+    # ── Parsing ──────────────────────────────────────────────
+
+    def _handle_line(self, stream_name: str, line: str) -> None:
+        if stream_name == "stderr":
+            self.stderr_tail.append(line)
+            if self.log_output:
+                logger.debug(line)
+            self._emit(RenderEvent("warning", frame=self.frame, total_frames=self.total_frames, message=line))
+            return
+
+        self.stdout_tail.append(line)
+        if self.log_output:
+            logger.info(line)
+
+        total_match = TOTAL_RE.search(line)
+        if total_match:
+            self.total_frames = int(total_match.group(1))
+            return
+
+        rate_match = FRAME_RATE_RE.search(line)
+        if rate_match:
+            self._frame_rate = float(rate_match.group(1))
+            self._update_total_from_timecode()
+            return
+
+        duration_match = DURATION_TIMECODE_RE.search(line)
+        if duration_match:
+            h, m, s, f = (int(g) for g in duration_match.groups())
+            self._duration_timecode = (h, m, s, f)
+            self._update_total_from_timecode()
+            return
+
+        progress_match = PROGRESS_RE.search(line)
+        if progress_match:
+            self._on_frame(int(progress_match.group(1)))
+            return
+
+        if WARNING_RE.search(line):
+            self._emit(RenderEvent("warning", frame=self.frame, total_frames=self.total_frames, message=line))
+
+    def _update_total_from_timecode(self) -> None:
+        """aerender prints Duration as a timecode; convert once the frame rate is known."""
+        if self._duration_timecode is None or not self._frame_rate:
+            return
+        h, m, s, f = self._duration_timecode
+        # Timecode frame fields count in whole frames per second (30 for 29.97)
+        timecode_base = round(self._frame_rate)
+        self.total_frames = (h * 3600 + m * 60 + s) * timecode_base + f
+
+    def _on_frame(self, frame: int) -> None:
+        now = time.time()
+        if self._first_frame_at is None:
+            self._first_frame_at = now
+            self._first_frame = frame
+        self.frame = frame
+        fps = self._fps(now)
+        eta = None
+        if fps > 0 and self.total_frames > 0:
+            eta = max(self.total_frames - frame, 0) / fps
+        self._emit(
+            RenderEvent(
+                "frame",
+                frame=frame,
+                total_frames=self.total_frames,
+                percent=self._percent(),
+                fps=fps,
+                eta=eta,
+            )
+        )
+
+    def _percent(self) -> int:
+        if self.total_frames <= 0:
+            return 0
+        return min(int((self.frame / self.total_frames) * 100), 100)
+
+    def _fps(self, now: float | None = None) -> float:
+        if self._first_frame_at is None:
+            return 0.0
+        elapsed = (now or time.time()) - self._first_frame_at
+        rendered = self.frame - self._first_frame
+        return rendered / elapsed if elapsed > 0 and rendered > 0 else 0.0
+
+    def _emit(self, event: RenderEvent) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event)
+        except Exception as exc:
+            logger.debug("Render event callback failed: %s", exc)
@@ -0,0 +1,171 @@
+"""
+Render resource planner -- choose aerender memory, multi-frame rendering and
+process concurrency for the current host.
+
+aerender's ``-mem_usage`` percentages apply per process, so a fixed
+``20 40`` is too conservative for a lone render and oversubscribes RAM when
+several renders run at once. ``RenderPlanner`` sizes all three knobs
+together from psutil-reported memory and cores plus the aerender processes
+already running. Each decision is logged, and ``record()`` logs it again
+with the measured render time so the settings can be tuned.
+
+Usage::
+
+    planner = RenderPlanner()
+    plan = planner.plan(requested=4)
+    cmd = build_aerender_command(..., mem_usage=plan.mem_usage, mfr_cpu_percent=plan.mfr_cpu_percent)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import asdict, dataclass
+
+from ae_automation import settings
+from ae_automation.logging_config import get_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+_GB = 1024**3
+# First AE release whose aerender supports -mfr
+MFR_MIN_VERSION = 2022
+# With MFR one aerender already spreads frames over cores; give each
+# concurrent process at least this many
+MFR_CORES_PER_PROCESS = 4
+
+
+@dataclass
+class RenderPlan:
+    """Resource settings chosen for one render (or one group of parallel renders)."""
+
+    concurrency: int
+    mem_usage: tuple[int, int]  # (image cache %, max memory %) passed to -mem_usage
+    mfr_cpu_percent: int | None  # -mfr ON <percent>, or None to leave MFR off
+    total_memory_gb: float
+    available_memory_gb: float
+    cpu_count: int
+    active_renders: int
+
+    def describe(self) -> str:
+        mfr = f"ON {self.mfr_cpu_percent}%" if self.mfr_cpu_percent else "OFF"
+        return (
+            f"concurrency={self.concurrency} mem_usage={self.mem_usage[0]}/{self.mem_usage[1]} mfr={mfr} "
+            f"ram={self.available_memory_gb:.1f}/{self.total_memory_gb:.1f}GB cpus={self.cpu_count} "
+            f"active={self.active_renders}"
+        )
+
+
+class RenderPlanner:
+    """Plan aerender resource settings from host memory, cores and active renders."""
+
+    def __init__(
+        self,
+        memory_per_process_gb: float | None = None,
+        memory_budget_percent: int | None = None,
+        mfr: str | None = None,
+        ae_version: int | None = None,
+    ) -> None:
+        self.memory_per_process_gb = (
+            memory_per_process_gb if memory_per_process_gb is not None else settings.RENDER_MEMORY_PER_PROCESS_GB
+        )
+        self.memory_budget_percent = (
+            memory_budget_percent if memory_budget_percent is not None else settings.RENDER_MEMORY_BUDGET_PERCENT
+        )
+        self.mfr = (mfr or settings.RENDER_MFR).lower()
+        self.ae_version = ae_version if ae_version is not None else settings.get_ae_version()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    # ── Host inspection ──────────────────────────────────────
+
+    def _memory(self) -> tuple[float, float]:
+        """Return (total, available) memory in GB."""
+        if psutil is None:
+            return 0.0, 0.0
+        vm = psutil.virtual_memory()
+        return vm.total / _GB, vm.available / _GB
+
+    def _cpu_count(self) -> int:
+        count = psutil.cpu_count(logical=True) if psutil is not None else None
+        return count or os.cpu_count() or 1
+
+    def active_renders(self) -> int:
+        """Count aerender processes on the host, including ones started by other workers."""
+        running = 0
+        if psutil is not None:
+            for proc in psutil.process_iter(["name"]):
+                try:
+                    name = (proc.info["name"] or "").lower()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+                if name.startswith("aerender"):
+                    running += 1
+        with self._lock:
+            return max(running, self._in_flight)
+
+    def mfr_supported(self) -> bool:
+        if self.mfr == "off":
+            return False
+        if self.mfr == "on":
+            return True
+        return self.ae_version is not None and self.ae_version >= MFR_MIN_VERSION
+
+    # ── Planning ─────────────────────────────────────────────
+
+    def plan(self, requested: int = 1) -> RenderPlan:
+        """Choose settings for *requested* parallel aerender processes.
+
+        Concurrency is capped by available memory (``memory_per_process_gb``
+        each) and by cores; memory percentages split the budget across every
+        aerender process that will be running, including other workers'.
+        """
+        total_gb, available_gb = self._memory()
+        cpus = self._cpu_count()
+        active = self.active_renders()
+        use_mfr = self.mfr_supported()
+
+        concurrency = max(1, requested)
+        if available_gb > 0:
+            concurrency = min(concurrency, max(1, int(available_gb // self.memory_per_process_gb)))
+        cores_per_process = MFR_CORES_PER_PROCESS if use_mfr else 1
+        concurrency = max(1, min(concurrency, cpus // cores_per_process))
+
+        processes = concurrency + active
+        max_mem = max(10, min(100, self.memory_budget_percent // processes))
+        mem_usage = (max(5, max_mem // 2), max_mem)
+        mfr_cpu_percent = max(10, 100 // processes) if use_mfr else None
+
+        plan = RenderPlan(
+            concurrency=concurrency,
+            mem_usage=mem_usage,
+            mfr_cpu_percent=mfr_cpu_percent,
+            total_memory_gb=round(total_gb, 2),
+            available_memory_gb=round(available_gb, 2),
+            cpu_count=cpus,
+            active_renders=active,
+        )
+        logger.info("Render plan (requested %d): %s", requested, plan.describe())
+        return plan
+
+    # ── Bookkeeping ──────────────────────────────────────────
+
+    def begin(self) -> None:
+        """Mark one aerender process started by this client as running."""
+        with self._lock:
+            self._in_flight += 1
+
+    def end(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def record(self, plan: RenderPlan, label: str, elapsed: float) -> dict[str, object]:
+        """Log a finished render's timing next to the plan that produced it."""
+        entry: dict[str, object] = {"label": label, "elapsed": round(elapsed, 2), **asdict(plan)}
+        logger.info("Render timing: %s took %.1fs with %s", label, elapsed, plan.describe())
+        return entry
@@ -3,6 +3,7 @@ from __future__ import annotations
 import glob
 import os
 import re
+import shutil
 import sys
 from pathlib import Path
 
@@ -144,6 +145,22 @@ def _get_aerender_path(ae_folder: str) -> str:
     return os.path.join(ae_folder, exe)
 
 
+def _get_ffmpeg_path() -> str:
+    """Resolve ffmpeg: env var > PATH > the binary bundled with imageio-ffmpeg (moviepy dependency)."""
+    env_val = os.getenv("FFMPEG_PATH")
+    if env_val:
+        return env_val
+    on_path = shutil.which("ffmpeg")
+    if on_path:
+        return on_path
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return ""
+
+
 # ── CEP Extension Directory (cross-platform) ────────────────
 def get_cep_extensions_dir() -> str:
     """Get the platform-appropriate CEP extensions directory."""
@@ -168,6 +185,55 @@ AFTER_EFFECT_FOLDER: str = _get_ae_folder()
 AFTER_EFFECT_PROJECT_FOLDER: str = os.getenv("AFTER_EFFECT_PROJECT_FOLDER", "au-automate")
 QUEUE_FOLDER: str = os.path.join(_appdata, "ae_automation", "queue")
 AERENDER_PATH: str = _get_aerender_path(AFTER_EFFECT_FOLDER)
+FFMPEG_PATH: str = _get_ffmpeg_path()
+# Parallel ffmpeg transcodes (each ffmpeg is itself multithreaded)
+TRANSCODE_WORKERS: int = int(os.getenv("TRANSCODE_WORKERS", "2"))
+# ffmpeg workers deriving project.outputs (webm, gif, posters) after each render
+OUTPUT_WORKERS: int = int(os.getenv("OUTPUT_WORKERS", "2"))
+
+# Output module templates used by split (segmented) renders. Segments are
+# stitched video-only, so the video template may omit audio; the audio pass
+# renders the whole comp once with the audio template.
+AERENDER_VIDEO_TEMPLATE: str = os.getenv("AERENDER_VIDEO_TEMPLATE", "")
+AERENDER_AUDIO_TEMPLATE: str = os.getenv("AERENDER_AUDIO_TEMPLATE", "AIFF 48kHz")
+
+# Render result cache (see ae_automation.render_cache)
+RENDER_CACHE_ENABLED: bool = os.getenv("RENDER_CACHE", "").lower() in ("1", "true", "yes")
+RENDER_CACHE_FOLDER: str = os.getenv("RENDER_CACHE_FOLDER", os.path.join(_appdata, "ae_automation", "render_cache"))
+RENDER_CACHE_MAX_BYTES: int = int(float(os.getenv("RENDER_CACHE_MAX_MB", "20480")) * 1024 * 1024)
+
+# Render resource planning (see ae_automation.render_planner). RENDER_MFR is
+# "auto" (on for AE 2022+), "on" or "off".
+RENDER_MEMORY_PER_PROCESS_GB: float = float(os.getenv("RENDER_MEMORY_PER_PROCESS_GB", "4"))
+RENDER_MEMORY_BUDGET_PERCENT: int = int(os.getenv("RENDER_MEMORY_BUDGET_PERCENT", "70"))
+RENDER_MFR: str = os.getenv("RENDER_MFR", "auto").lower()
+
+# Durable batch queue (see ae_automation.job_store)
+BATCH_DB_PATH: str = os.getenv("BATCH_DB_PATH", os.path.join(_appdata, "ae_automation", "batch.db"))
+BATCH_MAX_ATTEMPTS: int = int(os.getenv("BATCH_MAX_ATTEMPTS", "3"))
+# After this many seconds waiting, a pending job's estimated cost counts half
+BATCH_AGING_SECONDS: float = float(os.getenv("BATCH_AGING_SECONDS", "3600"))
+# Per-job time limit in seconds (0 = none) and per-stage limits ("open=300,render=14400")
+BATCH_JOB_TIMEOUT: float = float(os.getenv("BATCH_JOB_TIMEOUT", "0"))
+BATCH_STAGE_TIMEOUTS: str = os.getenv("BATCH_STAGE_TIMEOUTS", "")
+
+# Distributed render nodes (see ae_automation.distributed). A worker that misses
+# heartbeats for DISTRIBUTED_LEASE_SECONDS loses its job; DISTRIBUTED_TOKEN, when
+# set, must be sent by every worker.
+DISTRIBUTED_LEASE_SECONDS: float = float(os.getenv("DISTRIBUTED_LEASE_SECONDS", "60"))
+DISTRIBUTED_POLL_SECONDS: float = float(os.getenv("DISTRIBUTED_POLL_SECONDS", "5"))
+DISTRIBUTED_TOKEN: str = os.getenv("DISTRIBUTED_TOKEN", "")
+
+# VideoEditor undo history (see ae_automation.edit_history): most edits kept,
+# memory cap, and edits between full snapshots
+EDITOR_HISTORY_MAX_ENTRIES: int = int(os.getenv("EDITOR_HISTORY_MAX_ENTRIES", "500"))
+EDITOR_HISTORY_MAX_BYTES: int = int(float(os.getenv("EDITOR_HISTORY_MAX_MB", "64")) * 1024 * 1024)
+EDITOR_HISTORY_CHECKPOINT_EVERY: int = int(os.getenv("EDITOR_HISTORY_CHECKPOINT_EVERY", "50"))
+
+# Command backend (see ae_automation.backends): "aftereffects" or "simulator"
+# for headless runs; SIMULATOR_LATENCY is the seconds each simulated command takes
+AE_BACKEND: str = os.getenv("AE_BACKEND", "aftereffects").lower()
+SIMULATOR_LATENCY: float = float(os.getenv("SIMULATOR_LATENCY", "0"))
 
 # Ensure directories exist
 os.makedirs(CACHE_FOLDER, exist_ok=True)
@@ -216,15 +282,19 @@ def get_discovery_report() -> dict[str, object]:
         "ae_version": get_ae_version(),
         "aerender_path": AERENDER_PATH,
         "aerender_exists": bool(AERENDER_PATH) and os.path.exists(AERENDER_PATH),
+        "ffmpeg_path": FFMPEG_PATH,
         "all_ae_installs": discover_all_ae_installs(),
         "cache_folder": CACHE_FOLDER,
         "queue_folder": QUEUE_FOLDER,
+        "render_cache_folder": RENDER_CACHE_FOLDER,
+        "batch_db_path": BATCH_DB_PATH,
         "js_dir": JS_DIR,
         "js_dir_exists": os.path.exists(JS_DIR),
         "cep_extensions_dir": get_cep_extensions_dir(),
         "env_overrides": {
             "AFTER_EFFECT_FOLDER": os.getenv("AFTER_EFFECT_FOLDER"),
             "AERENDER_PATH": os.getenv("AERENDER_PATH"),
+            "FFMPEG_PATH": os.getenv("FFMPEG_PATH"),
             "CACHE_FOLDER": os.getenv("CACHE_FOLDER"),
             "PROMPTURE_PATH": os.getenv("PROMPTURE_PATH"),
         },
@@ -0,0 +1,723 @@
+"""
+In-memory After Effects simulator -- run the automation layer headless.
+
+``AESimulator`` models an AE project (folders, comps, footage, layers,
+properties, keyframes and markers) and implements the operation behind each
+shipped ``.jsx`` template, including the JSON result files Python reads back
+(``file_map.json``, ``comp_map.json``, ...). ``SimulatorBackend`` plugs it
+under ``runScript`` so ``startAfterEffect`` runs end to end on Linux CI, with
+an optional per-command latency for benchmarks.
+
+Projects are plain JSON: ``open_project()`` loads one from the project path
+(a template ``.aep`` can be a JSON spec) and ``save_project.jsx`` writes one
+back. A spec looks like::
+
+    {"items": [
+        {"type": "folder", "name": "templates"},
+        {"type": "comp", "name": "Intro", "folder": "templates", "duration": 10,
+         "layers": [{"name": "Title", "type": "text"}, {"source": "Logo"}]},
+    ]}
+
+Script errors are recorded in ``AESimulator.errors`` and logged, as AE's
+command runner would swallow them; pass ``strict=True`` to raise
+``ScriptExecutionError`` instead.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable
+
+from ae_automation import settings
+from ae_automation.backends import ScriptBackend
+from ae_automation.cancellation import CancellationToken
+from ae_automation.exceptions import ScriptExecutionError
+from ae_automation.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from ae_automation import Client
+
+logger = get_logger(__name__)
+
+_SLUG_FROM = "àáäâèéëêìíïîòóöôùúüûñç·/_,:;"
+_SLUG_TO = "aaaaeeeeiiiioooouuuunc------"
+
+
+class SimulatorError(Exception):
+    """An operation failed the way the ExtendScript would have thrown."""
+
+
+def js_slugify(value: str) -> str:
+    """Port of ``slugify()`` from framework.js, used for duplicated comp names."""
+    value = value.strip().lower()
+    for src, dst in zip(_SLUG_FROM, _SLUG_TO):
+        value = value.replace(src, dst)
+    value = re.sub(r"[^a-z0-9 -]", "", value)
+    value = re.sub(r"\s+", "-", value)
+    return re.sub(r"-+", "-", value)
+
+
+def parse_value(value: str) -> Any:
+    """Port of ``valueParser()``: ``"[1,2]"`` becomes a list, anything else is entity-decoded."""
+    if "," in value and "[" in value and "]" in value:
+        parts = value[1:-1].split(",")
+        try:
+            return [float(part) for part in parts]
+        except ValueError:
+            return parts
+    return html.unescape(value)
+
+
+# ── Project model ───────────────────────────────────────────
+
+
+class SimItem:
+    """A project item: ``FolderItem``, ``CompItem`` or ``FootageItem``."""
+
+    def __init__(self, item_id: int, name: str, type: str, parent: SimItem | None = None, **attrs: Any) -> None:
+        self.id = item_id
+        self.name = name
+        self.type = type
+        self.parent = parent
+        self.selected = False
+        self.path: str = attrs.get("path", "")
+        self.width: int = int(attrs.get("width", 1920))
+        self.height: int = int(attrs.get("height", 1080))
+        self.duration: float = float(attrs.get("duration", 0.0))
+        self.frameRate: float = float(attrs.get("frameRate", 30.0))
+        self.workArea: tuple[float, float] = (0.0, self.duration)
+        self.layers: list[SimLayer] = []
+
+    @property
+    def is_comp(self) -> bool:
+        return self.type == "CompItem"
+
+
+class SimLayer:
+    """A comp layer. Unless renamed it is named after its source, like in AE."""
+
+    def __init__(self, source: SimItem | None = None, name: str | None = None, type: str = "AVLayer") -> None:
+        self.source = source
+        self._name = name
+        self.type = type
+        self.null_layer = False
+        self.enabled = True
+        self.selected = False
+        self.startTime = 0.0
+        self.inPoint = 0.0
+        self.outPoint = source.duration if source is not None else 0.0
+        self.stretch = 100.0
+        self.properties: dict[str, Any] = {}
+        self.keyframes: dict[str, list[tuple[float, Any]]] = {}
+        self.markers: list[tuple[float, str]] = []
+        self.fit: str | None = None
+
+    @property
+    def name(self) -> str:
+        if self._name is not None:
+            return self._name
+        return self.source.name if self.source is not None else ""
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+
+    def copy(self) -> SimLayer:
+        layer = SimLayer(self.source, self._name, self.type)
+        layer.__dict__.update(
+            {k: v for k, v in self.__dict__.items() if k not in ("properties", "keyframes", "markers")}
+        )
+        layer.properties = dict(self.properties)
+        layer.keyframes = {k: list(v) for k, v in self.keyframes.items()}
+        layer.markers = list(self.markers)
+        return layer
+
+
+class AESimulator:
+    """In-memory model of an After Effects project plus the shipped JSX operations."""
+
+    ROOT_NAME = "Root"
+
+    def __init__(self, project: dict[str, Any] | None = None, strict: bool = False) -> None:
+        self.strict = strict
+        self.errors: list[tuple[str, str]] = []
+        self.commands: Counter[str] = Counter()
+        self.hotkeys: list[tuple[str, ...]] = []
+        self.render_queue: list[dict[str, Any]] = []
+        self.executed_commands: list[str] = []
+        self.saves = 0
+        self.project_name = "Untitled Project.aep"
+        self._lock = threading.Lock()
+        self._handlers: dict[str, Callable[[dict[str, str]], None]] = {
+            "file_map.jsx": self._file_map,
+            "search_folder_items.jsx": self._search_folder_items,
+            "create_folder.jsx": self._create_folder,
+            "addComp.jsx": self._add_comp,
+            "debug_create_comp.jsx": self._debug_add_comp,
+            "selectItem.jsx": self._select_item,
+            "selectItemByName.jsx": self._select_item_by_name,
+            "openItemName.jsx": self._open_item,
+            "update_properties.jsx": self._update_property,
+            "update_properties_bulk.jsx": self._update_properties_bulk,
+            "update_properties_frame.jsx": self._update_property_at_frame,
+            "selectLayerByLayer.jsx": self._select_layer_by_name,
+            "selectLayerByIndex.jsx": self._select_layer_by_index,
+            "add_marker.jsx": self._add_marker,
+            "duplicate_comp_2.jsx": self._duplicate_comp_to_timeline,
+            "duplicate_folder_items.jsx": self._duplicate_folder_items,
+            "add_resource.jsx": self._add_resource,
+            "update_resource.jsx": self._update_resource,
+            "add_comp_to_templates.jsx": self._add_comp_to_template,
+            "renameItem.jsx": self._rename_item,
+            "importFile.jsx": self._import_file,
+            "renderComp.jsx": self._render_comp,
+            "run_command.jsx": self._run_command,
+            "add_transition.jsx": self._add_transition,
+            "workAreaComp.jsx": self._work_area,
+            "save_project.jsx": self._save_project,
+            "debug_save_project.jsx": self._save_project,
+            "create_new_project.jsx": self._new_project,
+            "add_text_layer.jsx": self._add_text_layer,
+            "add_solid_layer.jsx": self._add_solid_layer,
+            "add_null_layer.jsx": self._add_null_layer,
+            "add_shape_layer.jsx": self._add_shape_layer,
+            "check_scripting_enabled.jsx": self._noop,
+            "test_script_execution.jsx": self._noop,
+        }
+        self.load(project or {})
+
+    # ── Project state ────────────────────────────────────────
+
+    def load(self, spec: dict[str, Any]) -> None:
+        """Replace the project with the items described by *spec*."""
+        self.items: list[SimItem] = []
+        self.active_comp: SimItem | None = None
+        self._next_id = 1
+        self.project_name = spec.get("projectName", self.project_name)
+        pending_layers: list[tuple[SimItem, list[dict[str, Any]]]] = []
+        for entry in spec.get("items", []):
+            type_name = {"folder": "FolderItem", "comp": "CompItem", "footage": "FootageItem"}[entry["type"]]
+            attrs = {k: v for k, v in entry.items() if k not in ("type", "name", "folder", "layers")}
+            parent = self.find(entry["folder"]) if entry.get("folder") else None
+            item = self._add_item(entry["name"], type_name, parent, **attrs)
+            if entry.get("layers"):
+                pending_layers.append((item, entry["layers"]))
+        # Layers may reference items declared later in the spec
+        for comp, layers in pending_layers:
+            for layer_spec in layers:
+                source = self.find(layer_spec["source"]) if layer_spec.get("source") else None
+                layer_type = {"text": "TextLayer", "shape": "ShapeLayer"}.get(layer_spec.get("type", ""), "AVLayer")
+                layer = SimLayer(source, layer_spec.get("name"), layer_type)
+                layer.null_layer = bool(layer_spec.get("null", False))
+                layer.enabled = bool(layer_spec.get("enabled", True))
+                layer.properties.update(layer_spec.get("properties", {}))
+                comp.layers.append(layer)
+
+    def to_spec(self) -> dict[str, Any]:
+        """Serialise the project back into a spec ``load()`` accepts."""
+        type_names = {"FolderItem": "folder", "CompItem": "comp", "FootageItem": "footage"}
+        items = []
+        for item in self.items:
+            entry: dict[str, Any] = {"type": type_names[item.type], "name": item.name}
+            if item.parent is not None:
+                entry["folder"] = item.parent.name
+            if item.type == "FootageItem":
+                entry["path"] = item.path
+            if item.is_comp:
+                entry.update(width=item.width, height=item.height, duration=item.duration, frameRate=item.frameRate)
+                entry["layers"] = [
+                    {
+                        "name": layer._name,
+                        "source": layer.source.name if layer.source is not None else None,
+                        "properties": layer.properties,
+                    }
+                    for layer in item.layers
+                ]
+            items.append(entry)
+        return {"projectName": self.project_name, "items": items}
+
+    def _add_item(self, name: str, type: str, parent: SimItem | None = None, **attrs: Any) -> SimItem:
+        item = SimItem(self._next_id, name, type, parent, **attrs)
+        self._next_id += 1
+        self.items.append(item)
+        return item
+
+    def item(self, index: int | str) -> SimItem:
+        """Return ``app.project.item(index)`` (1-based)."""
+        try:
+            position = int(index)
+        except (TypeError, ValueError):
+            raise SimulatorError(f"Bad item index {index!r}")
+        if not 1 <= position <= len(self.items):
+            raise SimulatorError(f"Item index {position} out of range")
+        return self.items[position - 1]
+
+    def find(self, name: str, comp: bool = False) -> SimItem:
+        """``FindItemByName``: the first item called *name* (optionally the first comp)."""
+        for item in self.items:
+            if item.name == name and (item.is_comp or not comp):
+                return item
+        raise SimulatorError(f"Item not found: {name}")
+
+    def find_layer(self, comp_name: str, layer_name: str) -> SimLayer:
+        """``FindLayerByComp``: the first layer called *layer_name* in comps called *comp_name*."""
+        for item in self.items:
+            if item.name == comp_name:
+                for layer in item.layers:
+                    if layer.name == layer_name:
+                        return layer
+        raise SimulatorError(f"Layer not found: {comp_name} / {layer_name}")
+
+    def delete(self, item: SimItem) -> None:
+        """Remove *item* (and a folder's contents) from the project and from every comp."""
+        doomed = {id(item)}
+        changed = True
+        while changed:
+            changed = False
+            for candidate in self.items:
+                if candidate.parent is not None and id(candidate.parent) in doomed and id(candidate) not in doomed:
+                    doomed.add(id(candidate))
+                    changed = True
+        self.items = [candidate for candidate in self.items if id(candidate) not in doomed]
+        for comp in self.items:
+            comp.layers = [layer for layer in comp.layers if layer.source is None or id(layer.source) not in doomed]
+        if self.active_comp is not None and id(self.active_comp) in doomed:
+            self.active_comp = None
+
+    def _parent_name(self, item: SimItem) -> str:
+        return item.parent.name if item.parent is not None else self.ROOT_NAME
+
+    def _describe(self, index: int, item: SimItem) -> dict[str, Any]:
+        entry: dict[str, Any] = {
+            "id": index,
+            "name": item.name,
+            "type": item.type,
+            "parentFolder": self._parent_name(item),
+            "parentId": str(item.parent.id if item.parent is not None else 0),
+        }
+        return entry
+
+    def _write_result(self, file_name: str, data: Any) -> None:
+        with open(os.path.join(settings.CACHE_FOLDER, file_name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    # ── Execution ────────────────────────────────────────────
+
+    def execute(self, file_name: str, replacements: dict[str, str]) -> None:
+        """Run the operation behind *file_name*, recording (or raising) its error."""
+        with self._lock:
+            self.commands[file_name] += 1
+            handler = self._handlers.get(file_name)
+            try:
+                if handler is None:
+                    raise SimulatorError("script is not simulated")
+                handler(replacements)
+            except (SimulatorError, KeyError, ValueError, IndexError) as e:
+                self.errors.append((file_name, str(e)))
+                if self.strict:
+                    raise ScriptExecutionError(script_name=file_name, detail=str(e))
+                logger.warning("Simulated %s failed: %s", file_name, e)
+
+    def press(self, keys: tuple[str, ...]) -> None:
+        """Apply the effect of a keyboard shortcut on the project panel or timeline."""
+        with self._lock:
+            self.hotkeys.append(keys)
+            combo = "+".join(keys)
+            if combo == "ctrl+shift+a":
+                for item in self.items:
+                    item.selected = False
+            elif combo == "delete":
+                for item in [item for item in self.items if item.selected]:
+                    self.delete(item)
+            elif combo == "ctrl+alt+/":
+                self._replace_selected_layers()
+            elif combo in ("ctrl+alt+f", "ctrl+alt+shift+h", "ctrl+alt+shift+g"):
+                for layer in self._selected_layers():
+                    layer.fit = {"ctrl+alt+f": "screen", "ctrl+alt+shift+h": "width"}.get(combo, "height")
+            elif combo == "ctrl+s":
+                self.saves += 1
+
+    def _selected_layers(self) -> list[SimLayer]:
+        if self.active_comp is None:
+            return []
+        return [layer for layer in self.active_comp.layers if layer.selected]
+
+    def _replace_selected_layers(self) -> None:
+        # Alt-drag replace: every selected layer takes the first selected project item as source
+        sources = [item for item in self.items if item.selected]
+        if sources:
+            for layer in self._selected_layers():
+                layer.source = sources[0]
+
+    # ── Operations (one per .jsx) ────────────────────────────
+
+    def _noop(self, r: dict[str, str]) -> None:
+        pass
+
+    def _file_map(self, r: dict[str, str]) -> None:
+        files = []
+        for index, item in enumerate(self.items, start=1):
+            entry = self._describe(index, item)
+            if item.is_comp:
+                entry["duration"] = item.duration
+                entry["frameRate"] = item.frameRate
+            files.append(entry)
+        self._write_result("file_map.json", {"projectName": self.project_name, "files": files})
+
+    def _search_folder_items(self, r: dict[str, str]) -> None:
+        folder = r["{folderName}"]
+        results = [
+            self._describe(index, item)
+            for index, item in enumerate(self.items, start=1)
+            if self._parent_name(item) == folder
+        ]
+        self._write_result("search_folder_items.json", results)
+
+    def _create_folder(self, r: dict[str, str]) -> None:
+        folder = self._add_item(r["{folderName}"], "FolderItem")
+        if r.get("{parentFolder}", "") != "":
+            folder.parent = self.find(r["{parentFolder}"])
+
+    def _add_comp(self, r: dict[str, str]) -> None:
+        comp = self._add_item(
+            r["{compName}"],
+            "CompItem",
+            width=float(r["{compWidth}"]),
+            height=float(r["{compHeight}"]),
+            duration=float(r["{duration}"]),
+            frameRate=float(r["{frameRate}"]),
+        )
+        comp.parent = self.find(r["{folderName}"])
+
+    def _debug_add_comp(self, r: dict[str, str]) -> None:
+        # The debug script falls back to the root folder instead of failing
+        comp = self._add_item(
+            r["{compName}"],
+            "CompItem",
+            width=float(r["{compWidth}"]),
+            height=float(r["{compHeight}"]),
+            duration=float(r["{duration}"]),
+            frameRate=float(r["{frameRate}"]),
+        )
+        folders = [item for item in self.items if item.type == "FolderItem" and item.name == r["{folderName}"]]
+        comp.parent = folders[0] if folders else None
+
+    def _select_item(self, r: dict[str, str]) -> None:
+        self.item(r["index"]).selected = True
+
+    def _select_item_by_name(self, r: dict[str, str]) -> None:
+        for item in self.items:
+            item.selected = False
+        self.find(r["{name}"]).selected = True
+
+    def _open_item(self, r: dict[str, str]) -> None:
+        self.active_comp = self.find(r["{name}"])
+
+    def _set_property(self, layer: SimLayer, path: str, value: str) -> None:
+        if path in layer.keyframes:
+            # AE refuses setValue on a property that already has keyframes
+            raise SimulatorError(f"Property {path} has keyframes")
+        layer.properties[path] = parse_value(value)
+
+    def _update_property(self, r: dict[str, str]) -> None:
+        layer = self.find_layer(r["{comp_name}"], r["{layer_name}"])
+        self._set_property(layer, r["{property_name}"], r["{value}"])
+
+    def _update_properties_bulk(self, r: dict[str, str]) -> None:
+        comp_name = r["{comp_name}"]
+        comp = next((item for item in self.items if item.name == comp_name and item.is_comp), None)
+        results = []
+        for edit in json.loads(r["{edits}"]):
+            try:
+                if comp is None:
+                    raise SimulatorError(f"Comp not found: {comp_name}")
+                layer = next((layer for layer in comp.layers if layer.name == edit["layer"]), None)
+                if layer is None:
+                    raise SimulatorError(f"Layer not found: {edit['layer']}")
+                self._set_property(layer, edit["property"], edit["value"])
+                results.append({"ok": True})
+            except SimulatorError as e:
+                results.append({"ok": False, "error": str(e)})
+        self._write_result("update_properties_bulk.json", results)
+
+    def _update_property_at_frame(self, r: dict[str, str]) -> None:
+        layer = self.find_layer(r["{comp_name}"], r["{layer_name}"])
+        self._set_keyframe(layer, r["{property_name}"], float(r["{frame}"]), parse_value(r["{value}"]))
+
+    def _set_keyframe(self, layer: SimLayer, path: str, time: float, value: Any) -> None:
+        keys = [key for key in layer.keyframes.get(path, []) if key[0] != time]
+        keys.append((time, value))
+        layer.keyframes[path] = sorted(keys, key=lambda key: key[0])
+
+    def _deselect_layers(self) -> None:
+        if self.active_comp is None:
+            raise SimulatorError("No active comp")
+        for layer in self.active_comp.layers:
+            layer.selected = False
+
+    def _select_layer_by_name(self, r: dict[str, str]) -> None:
+        self._deselect_layers()
+        self.find_layer(r["{comp_name}"], r["{layer_name}"]).selected = True
+
+    def _select_layer_by_index(self, r: dict[str, str]) -> None:
+        self._deselect_layers()
+        comp = self.find(r["{comp_name}"])
+        index = int(r["{layer_index}"])
+        if not 1 <= index <= len(comp.layers):
+            raise SimulatorError(f"Layer index {index} out of range in {comp.name}")
+        comp.layers[index - 1].selected = True
+
+    def _add_marker(self, r: dict[str, str]) -> None:
+        layer = self.find_layer(r["{comp_name}"], r["{layer_name}"])
+        layer.markers.append((float(r["{marker_time}"]), r["{marker_name}"]))
+
+    def _add_layer(self, comp: SimItem, layer: SimLayer) -> SimLayer:
+        # layers.add() inserts at the top of the stack
+        comp.layers.insert(0, layer)
+        return layer
+
+    def _place(self, layer: SimLayer, start: float, in_point: float, stretch: float, out_point: float) -> None:
+        layer.startTime = start
+        layer.inPoint = in_point
+        layer.stretch = stretch
+        layer.outPoint = out_point
+
+    def _duplicate_deep(self, comp: SimItem, folder: SimItem) -> SimItem:
+        name = js_slugify(folder.name + "-" + comp.name)
+        for item in self.items:
+            if item.name == name:
+                return item
+        duplicate = self._add_item(
+            name,
+            "CompItem",
+            folder,
+            width=comp.width,
+            height=comp.height,
+            duration=comp.duration,
+            frameRate=comp.frameRate,
+        )
+        duplicate.layers = [layer.copy() for layer in comp.layers]
+        for layer in duplicate.layers:
+            if not layer.null_layer and layer.enabled and layer.type == "AVLayer":
+                if layer.source is not None and layer.source.is_comp:
+                    layer.source = self._duplicate_deep(layer.source, folder)
+        return duplicate
+
+    def _duplicate_comp_to_timeline(self, r: dict[str, str]) -> None:
+        duplicate = self._duplicate_deep(self.find(r["{CopyCompName}"]), self.find(r["{FolderName}"]))
+        # The shipped script never fills compMap, so Python always reads an empty list
+        self._write_result("comp_map.json", [])
+        out_point = float(r["{outPoint}"])
+        duplicate.duration = out_point
+        template = self.find(r["{CompTemplateName}"])
+        layer = self._add_layer(template, SimLayer(duplicate))
+        self._place(layer, float(r["{startTime}"]), float(r["{inPoint}"]), float(r["{stretch}"]), out_point)
+
+    def _duplicate_folder_items(self, r: dict[str, str]) -> None:
+        target_name = r["{targetFolderName}"]
+        target = next((item for item in self.items if item.name == target_name), None)
+        if target is None:
+            target = self._add_item(target_name, "FolderItem")
+            if r.get("{parentFolder}", "") != "":
+                target.parent = self.find(r["{parentFolder}"])
+        sources = [item for item in self.items if self._parent_name(item) == r["{sourceFolderName}"]]
+        results = []
+        for source in sources:
+            if source.is_comp:
+                duplicate = self._duplicate_deep(source, target)
+            else:
+                duplicate = self._add_item(source.name, source.type, target, path=source.path, duration=source.duration)
+            results.append(
+                {"originalName": source.name, "newName": duplicate.name, "type": duplicate.type, "id": duplicate.id}
+            )
+        self._write_result("duplicate_folder_items.json", results)
+
+    def _add_resource(self, r: dict[str, str]) -> None:
+        resource = self.find(r["{ResourceName}"])
+        comp = self.find(r["{CompName}"])
+        layer = self._add_layer(comp, SimLayer(resource))
+        self._place(
+            layer, float(r["{startTime}"]), float(r["{inPoint}"]), float(r["{stretch}"]), float(r["{outPoint}"])
+        )
+        if r["{moveToEnd}"] == "true":
+            comp.layers.remove(layer)
+            comp.layers.append(layer)
+
+    def _update_resource(self, r: dict[str, str]) -> None:
+        comp = self.find(r["{CompName}"])
+        index = int(r["{layerIndex}"])
+        if not 1 <= index <= len(comp.layers):
+            raise SimulatorError(f"Layer index {index} out of range in {comp.name}")
+        layer = comp.layers[index - 1]
+        self._place(
+            layer, float(r["{startTime}"]), float(r["{inPoint}"]), float(r["{stretch}"]), float(r["{outPoint}"])
+        )
+        if r["{moveToEnd}"] == "true":
+            comp.layers.remove(layer)
+            comp.layers.append(layer)
+
+    def _add_comp_to_template(self, r: dict[str, str]) -> None:
+        comp = self.find(r["{compName}"])
+        layer = self._add_layer(comp, SimLayer(self.item(r["{CompTemplateID}"])))
+        self._place(
+            layer, float(r["{start_time}"]), float(r["{inPoint}"]), float(r["{stretch}"]), float(r["{end_time}"])
+        )
+
+    def _rename_item(self, r: dict[str, str]) -> None:
+        self.item(r["{index}"]).name = r["{name}"]
+
+    def _import_file(self, r: dict[str, str]) -> None:
+        path = r["{filePath}"]
+        if not os.path.exists(path):
+            raise SimulatorError(f"File not found: {path}")
+        item = self._add_item(r["{fileName}"], "FootageItem", path=path)
+        item.parent = self.find(r["{cacheFolder}"])
+
+    def _render_comp(self, r: dict[str, str]) -> None:
+        for item in self.items:
+            item.selected = False
+        comp = self.find(r["{compName}"])
+        self.render_queue.append({"comp": comp.name, "output": r["{outputPath}"] + "/" + comp.name})
+
+    def _run_command(self, r: dict[str, str]) -> None:
+        self.executed_commands.append(r["cmdId"])
+
+    def _add_transition(self, r: dict[str, str]) -> None:
+        comp = self.find(r["{comp_name}"])
+        layer = self.find_layer(r["{comp_name}"], r["{layer_name}"])
+        kind = r["{transition_type}"]
+        start = float(r["{start_time}"])
+        end = start + float(r["{duration}"])
+        center = [comp.width / 2, comp.height / 2]
+        if kind == "fade_in":
+            frames = [("Transform.Opacity", 0, 100)]
+        elif kind in ("fade_out", "cross_dissolve"):
+            frames = [("Transform.Opacity", 100, 0)]
+        elif kind == "slide_left":
+            frames = [("Transform.Position", [comp.width + center[0], center[1]], center)]
+        elif kind == "slide_right":
+            frames = [("Transform.Position", [-center[0], center[1]], center)]
+        elif kind == "wipe_left":
+            frames = [("Transform.Position", center, [-center[0], center[1]])]
+        else:
+            frames = []
+        for path, first, last in frames:
+            self._set_keyframe(layer, path, start, first)
+            self._set_keyframe(layer, path, end, last)
+
+    def _work_area(self, r: dict[str, str]) -> None:
+        comp = self.find(r["{compName}"])
+        comp.workArea = (float(r["{startTime}"]), float(r["{durationTime}"]))
+
+    def _save_project(self, r: dict[str, str]) -> None:
+        path = r["{projectPath}"]
+        self.project_name = os.path.basename(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_spec(), f, indent=2)
+        self.saves += 1
+
+    def _new_project(self, r: dict[str, str]) -> None:
+        self.project_name = "Untitled Project.aep"
+        self.load({})
+
+    def _find_comp(self, name: str) -> SimItem:
+        return self.find(name, comp=True)
+
+    def _add_text_layer(self, r: dict[str, str]) -> None:
+        layer = self._add_layer(self._find_comp(r["{comp_name}"]), SimLayer(name=r["{layer_name}"], type="TextLayer"))
+        layer.properties["Source Text"] = r["{text_content}"]
+        layer.properties["Transform.Position"] = [float(r["{x_position}"]), float(r["{y_position}"])]
+        layer.properties["Source Text.fontSize"] = float(r["{font_size}"])
+
+    def _add_solid_layer(self, r: dict[str, str]) -> None:
+        comp = self._find_comp(r["{comp_name}"])
+        solid = self._add_item(r["{layer_name}"], "FootageItem", width=float(r["{width}"]), height=float(r["{height}"]))
+        layer = self._add_layer(comp, SimLayer(solid))
+        layer.properties["color"] = [float(r["{color_r}"]), float(r["{color_g}"]), float(r["{color_b}"])]
+
+    def _add_null_layer(self, r: dict[str, str]) -> None:
+        layer = self._add_layer(self._find_comp(r["{comp_name}"]), SimLayer(name=r["{layer_name}"]))
+        layer.null_layer = True
+
+    def _add_shape_layer(self, r: dict[str, str]) -> None:
+        comp = self._find_comp(r["{comp_name}"])
+        layer = self._add_layer(comp, SimLayer(name=r["{layer_name}"], type="ShapeLayer"))
+        layer.properties["Contents.Rectangle.Size"] = [float(r["{width}"]), float(r["{height}"])]
+        layer.properties["Contents.Rectangle.Fill.Color"] = [
+            float(r["{color_r}"]),
+            float(r["{color_g}"]),
+            float(r["{color_b}"]),
+        ]
+
+
+# ── Backend ─────────────────────────────────────────────────
+
+
+class SimulatorBackend(ScriptBackend):
+    """Run ``runScript`` against an ``AESimulator`` instead of After Effects.
+
+    Args:
+        simulator: Project model to drive (a fresh, empty one by default)
+        latency: Seconds each command takes, or a ``{script name: seconds}``
+            map (key ``"*"`` is the default for unlisted scripts)
+        pause_scale: Multiplier for the GUI settle waits the real backend
+            sleeps through; 0 skips them
+    """
+
+    name = "simulator"
+
+    def __init__(
+        self,
+        simulator: AESimulator | None = None,
+        latency: float | dict[str, float] = 0.0,
+        pause_scale: float = 0.0,
+    ) -> None:
+        self.simulator = simulator if simulator is not None else AESimulator()
+        self.latency = latency
+        self.pause_scale = pause_scale
+
+    def command_latency(self, file_name: str) -> float:
+        if isinstance(self.latency, dict):
+            return float(self.latency.get(file_name, self.latency.get("*", 0.0)))
+        return float(self.latency)
+
+    def run_script(self, client: Client, file_name: str, replacements: dict[str, str]) -> str:
+        delay = self.command_latency(file_name)
+        if delay > 0:
+            client.cancel_token().sleep(delay)
+        self.simulator.execute(file_name, replacements)
+        return str(uuid.uuid4())
+
+    def hotkey(self, *keys: str) -> None:
+        self.simulator.press(keys)
+
+    def press_key(self, key: str) -> None:
+        self.simulator.press((key,))
+
+    def pause(self, seconds: float, token: CancellationToken) -> None:
+        if self.pause_scale > 0:
+            token.sleep(seconds * self.pause_scale)
+        else:
+            token.check()
+
+    def open_project(self, path: str) -> None:
+        """Load the project spec at *path*; a non-JSON file (a real .aep) opens empty."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, ValueError):
+            spec = {}
+        self.simulator.load(spec)
+        self.simulator.project_name = os.path.basename(path)
+
+    def save_project(self) -> None:
+        self.simulator.press(("ctrl", "s"))
+
+    def close(self) -> None:
+        self.simulator.active_comp = None
@@ -0,0 +1,241 @@
+"""
+Stub command runner -- a Python stand-in for ``ae_command_runner.jsx``.
+
+``StubCommandRunner`` watches ``QUEUE_FOLDER`` the way the AE startup script
+does: every ``poll_interval`` it picks up queued ``cmd_*.jsx`` files, holds
+each one for a configurable latency, writes the JSON result file Python reads
+back (``file_map.json``, ``comp_map.json``, ...) and the command's
+``.timing`` file, then deletes it. Paired with
+``StubRunnerBackend`` -- the real queue-based backend minus the GUI steps --
+``startBot`` runs its real ``runScript`` path on Linux, so orchestration
+overhead (queue polling, fixed sleeps) can be measured without After Effects.
+
+Unlike ``ae_automation.simulator`` the stub does not model the project:
+``file_map.jsx`` always reports the ``files`` it was given and scripts that
+return lists report empty ones.
+
+Usage::
+
+    runner = StubCommandRunner(latency={"*": 0.05, "file_map.jsx": 0.5}, files=items)
+    with runner:
+        client.setScriptBackend(StubRunnerBackend())
+        client.startBot("config.json")
+    print(runner.executed.most_common())
+
+Or as a separate process next to a client::
+
+    python -m ae_automation.stub_runner --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from ae_automation import settings
+from ae_automation.backends import AfterEffectsBackend
+from ae_automation.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from ae_automation import Client
+
+logger = get_logger(__name__)
+
+# framework.js shows the running script's name in its log dialog
+_FILE_NAME_RE = re.compile(r'"File : ([^"]+)"')
+_BULK_EDITS_RE = re.compile(r'updateCompPropertiesBulk\(".*", (\[.*\])\);')
+
+# Result file each list-returning script writes into the cache folder
+_EMPTY_RESULTS = {
+    "duplicate_comp_2.jsx": "comp_map.json",
+    "search_folder_items.jsx": "search_folder_items.json",
+    "duplicate_folder_items.jsx": "duplicate_folder_items.json",
+}
+
+
+class StubCommandRunner:
+    """Process queued command files from a background thread.
+
+    Args:
+        queue_folder: Folder to watch (default: ``settings.QUEUE_FOLDER``)
+        cache_folder: Where result files are written (default: ``settings.CACHE_FOLDER``)
+        latency: Seconds each command takes, or a ``{script name: seconds}``
+            map (key ``"*"`` is the default for unlisted scripts)
+        poll_interval: Seconds between queue scans (the AE runner uses 0.5)
+        files: Items ``file_map.jsx`` reports, in ``file_map.json`` format
+    """
+
+    def __init__(
+        self,
+        queue_folder: str | None = None,
+        cache_folder: str | None = None,
+        latency: float | dict[str, float] = 0.0,
+        poll_interval: float = 0.5,
+        files: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.queue_folder = queue_folder or settings.QUEUE_FOLDER
+        self.cache_folder = cache_folder or settings.CACHE_FOLDER
+        self.latency = latency
+        self.poll_interval = poll_interval
+        self.files = list(files or [])
+        self.executed: Counter[str] = Counter()
+        # Seconds from a command landing in the queue to the runner picking it up
+        self.pickup_delays: list[float] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def command_latency(self, file_name: str) -> float:
+        if isinstance(self.latency, dict):
+            return float(self.latency.get(file_name, self.latency.get("*", 0.0)))
+        return float(self.latency)
+
+    # ── Lifecycle ────────────────────────────────────────────
+
+    def start(self) -> StubCommandRunner:
+        os.makedirs(self.queue_folder, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stub-command-runner", daemon=True)
+        self._thread.start()
+        logger.info("Stub command runner watching %s", self.queue_folder)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> StubCommandRunner:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.process_queue()
+            self._stop.wait(self.poll_interval)
+
+    # ── Processing ───────────────────────────────────────────
+
+    def process_queue(self) -> int:
+        """Run every command currently queued; return how many ran."""
+        try:
+            names = sorted(name for name in os.listdir(self.queue_folder) if name.endswith(".jsx"))
+        except OSError:
+            return 0
+        count = 0
+        for name in names:
+            path = os.path.join(self.queue_folder, name)
+            try:
+                # Skip files still being written, like the AE runner does
+                if os.path.getsize(path) < 10:
+                    continue
+                queued_at = os.stat(path).st_ctime
+                seen_at = time.time()
+                seen = time.perf_counter_ns() // 1000
+                with open(path, encoding="utf-8") as f:
+                    content = f.read()
+            except OSError:
+                continue
+            self.pickup_delays.append(max(0.0, seen_at - queued_at))
+            start = time.perf_counter_ns() // 1000
+            self.execute(content)
+            timing = {"seen_at": seen_at * 1000, "seen": seen, "start": start, "end": time.perf_counter_ns() // 1000}
+            with open(path[: -len(".jsx")] + ".timing", "w", encoding="utf-8") as f:
+                json.dump({**timing, "ok": True}, f)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            count += 1
+        return count
+
+    def execute(self, content: str) -> str:
+        """Stand in for ``eval`` of one assembled script; return its script name."""
+        match = _FILE_NAME_RE.search(content)
+        file_name = match.group(1) if match else "unknown"
+        delay = self.command_latency(file_name)
+        if delay > 0:
+            time.sleep(delay)
+        self.executed[file_name] += 1
+
+        if file_name == "file_map.jsx":
+            self._write("file_map.json", {"files": self.files})
+        elif file_name in _EMPTY_RESULTS:
+            self._write(_EMPTY_RESULTS[file_name], [])
+        elif file_name == "update_properties_bulk.jsx":
+            edits = _BULK_EDITS_RE.search(content)
+            count = len(json.loads(edits.group(1))) if edits else 0
+            self._write("update_properties_bulk.json", [{"ok": True}] * count)
+        return file_name
+
+    def _write(self, name: str, data: Any) -> None:
+        with open(os.path.join(self.cache_folder, name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+class StubRunnerBackend(AfterEffectsBackend):
+    """The queue-based After Effects backend with the Windows-only GUI steps removed.
+
+    Scripts still go through ``assembleScript`` and the command queue, and
+    the fixed sleeps around them still run on the job's cancellation token.
+    """
+
+    name = "stub"
+
+    def __init__(self) -> None:
+        self.hotkeys: list[tuple[str, ...]] = []
+
+    def validate(self) -> None:
+        pass
+
+    def hotkey(self, *keys: str) -> None:
+        self.hotkeys.append(keys)
+
+    def press_key(self, key: str) -> None:
+        self.hotkeys.append((key,))
+
+    def open_project(self, path: str) -> None:
+        pass
+
+    def wait_until_ready(self, client: Client, timeout: float) -> bool:
+        return True
+
+    def save_project(self) -> None:
+        self.hotkeys.append(("ctrl", "s"))
+
+    def close(self) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process the ae_automation command queue without After Effects")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds each command takes")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between queue scans")
+    parser.add_argument("--files", help="JSON file with the items file_map.jsx reports")
+    args = parser.parse_args()
+
+    files = None
+    if args.files:
+        with open(args.files, encoding="utf-8") as f:
+            files = json.load(f)
+    runner = StubCommandRunner(latency=args.latency, poll_interval=args.poll_interval, files=files)
+    runner.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        runner.stop()
+        for name, count in runner.executed.most_common():
+            print(f"{count:6d}  {name}")
+
+
+if __name__ == "__main__":
+    main()
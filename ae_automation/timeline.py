@@ -0,0 +1,94 @@
+"""
+Per-job stage timeline -- where the time of one automation run goes.
+
+``startAfterEffect`` and the render path mark stage boundaries (AE startup,
+project mapping, imports, scene setup, save, render ...) and every
+``runScript``/``runCommand`` call is counted against the stage it ran in.
+The batch queue stores ``StageTimeline.as_list()`` on each job result.
+
+Usage::
+
+    timeline = StageTimeline()
+    timeline.begin("imports")
+    timeline.count_command()
+    timeline.end()
+    timeline.as_list()  # [{"name": "imports", "start": ..., "duration": ..., "commands": 1}]
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class StageRecord:
+    """One stage of a job."""
+
+    name: str
+    start: float
+    duration: float | None = None
+    commands: int = 0
+
+
+class StageTimeline:
+    """Ordered, thread-safe list of stages for one job."""
+
+    def __init__(self) -> None:
+        self.stages: list[StageRecord] = []
+        self._current: StageRecord | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> str | None:
+        return self._current.name if self._current else None
+
+    def begin(self, name: str) -> None:
+        """Start stage *name*, closing the current one."""
+        now = time.time()
+        with self._lock:
+            self._close(now)
+            self._current = StageRecord(name=name, start=now)
+            self.stages.append(self._current)
+
+    def end(self) -> None:
+        """Close the current stage."""
+        with self._lock:
+            self._close(time.time())
+
+    def _close(self, now: float) -> None:
+        if self._current is not None:
+            self._current.duration = now - self._current.start
+            self._current = None
+
+    def count_command(self) -> None:
+        """Count one AE script or subprocess against the current stage."""
+        with self._lock:
+            if self._current is not None:
+                self._current.commands += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the stages as JSON-ready dicts (open stages report their elapsed time)."""
+        now = time.time()
+        with self._lock:
+            records = [asdict(stage) for stage in self.stages]
+        for record in records:
+            if record["duration"] is None:
+                record["duration"] = now - record["start"]
+        return records
+
+
+def summarize_stages(jobs: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Aggregate the timelines of several jobs into per-stage totals, in first-seen order."""
+    totals: dict[str, dict[str, Any]] = {}
+    for stages in jobs:
+        for stage in stages:
+            entry = totals.setdefault(stage["name"], {"name": stage["name"], "jobs": 0, "total": 0.0, "commands": 0})
+            entry["jobs"] += 1
+            entry["total"] += stage["duration"] or 0.0
+            entry["commands"] += stage["commands"]
+    for entry in totals.values():
+        entry["average"] = entry["total"] / entry["jobs"]
+    return list(totals.values())
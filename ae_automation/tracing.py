@@ -0,0 +1,171 @@
+"""
+Hot-path tracing -- spans exported as Chrome trace / Perfetto JSON.
+
+``span()`` wraps a block of work (script assembly, the queue round trip,
+sleeps, project mapping, media probing, render subprocesses) and records it
+as a complete event with the job and scene the running thread is working
+on. Tracing is off by default: ``span()`` then returns a shared no-op
+context manager, so the instrumented hot paths pay one global lookup.
+
+Open the exported file in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+Usage::
+
+    tracer = start_tracing()
+    with trace_context(job=7, scene=1):
+        with span("runScript", script="file_map.jsx"):
+            ...
+    stop_tracing()
+    tracer.export("out.json")
+
+From the CLI::
+
+    ae-automation run config.json --trace out.json
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Job/scene ids attached to every span started in this context
+_context: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar("ae_trace_context", default=None)
+
+_tracer: Tracer | None = None
+
+
+class _NullSpan:
+    """Shared span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed block; becomes a Chrome trace complete (``"X"``) event on exit."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self, end)
+
+    def set(self, **args: Any) -> None:
+        """Attach extra arguments (e.g. a result size) to the span."""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects spans from every thread of the process."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def span(self, name: str, category: str = "ae", **args: Any) -> Span:
+        context = _context.get()
+        if context:
+            args = {**context, **args}
+        return Span(self, name, category, args)
+
+    def record(self, span: Span, end: int) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start - self._origin) / 1000,
+            "dur": (end - span.start) / 1000,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": span.args,
+        }
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(thread.ident or 0, thread.name)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the trace in Chrome's JSON object format."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> str:
+        """Write the trace to *path*; returns the path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        return path
+
+
+def span(name: str, category: str = "ae", **args: Any) -> Span | _NullSpan:
+    """Time a block as *name*; a no-op unless tracing is enabled."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **args)
+
+
+@contextmanager
+def trace_context(**ids: Any) -> Iterator[None]:
+    """Tag spans started inside the block with *ids* (e.g. ``job=3``, ``scene=2``)."""
+    token = _context.set({**(_context.get() or {}), **ids})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def start_tracing() -> Tracer:
+    """Enable tracing process-wide and return the collecting tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    """Disable tracing; returns the tracer that was collecting, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_tracing() -> bool:
+    return _tracer is not None
@@ -0,0 +1,203 @@
+"""
+ffmpeg transcode stage -- container-to-container conversion without
+decoding frames into Python.
+
+``transcode()`` drives ffmpeg as a subprocess. Each source stream already in
+its target codec is stream-copied; the others are re-encoded in ffmpeg,
+keeping the source frame rate. Progress is read from ``-progress pipe:1``
+and stderr is drained on a separate thread, so a chatty encoder can never
+block the pipe. ``transcode_many()`` runs several
+conversions at once.
+
+Usage::
+
+    transcode("render.mov", "render.mp4", on_progress=lambda pct: print(f"{pct:.0f}%"))
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Any, Callable
+
+from ae_automation import settings
+from ae_automation.exceptions import RenderError
+from ae_automation.logging_config import get_logger
+from ae_automation.tracing import span
+
+logger = get_logger(__name__)
+
+DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+VIDEO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+)")
+AUDIO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (\w+)")
+FPS_RE = re.compile(r"(\d+(?:\.\d+)?)\s+(?:fps|tbr)\b")
+
+# Containers that can hold h264/aac without re-encoding
+COPY_CONTAINERS = (".mp4", ".m4v", ".mov")
+
+
+@dataclass
+class MediaInfo:
+    """Stream details parsed from ffmpeg's input summary."""
+
+    duration: float = 0.0
+    video_codec: str | None = None
+    audio_codec: str | None = None
+    fps: float | None = None
+
+
+def _require_ffmpeg() -> str:
+    if not settings.FFMPEG_PATH:
+        raise RenderError(detail="ffmpeg not found. Install ffmpeg or set FFMPEG_PATH in .env")
+    return settings.FFMPEG_PATH
+
+
+def parse_media_info(ffmpeg_output: str) -> MediaInfo:
+    """Parse the ``Input #0`` summary ffmpeg prints to stderr."""
+    info = MediaInfo()
+    duration = DURATION_RE.search(ffmpeg_output)
+    if duration:
+        h, m, s = duration.groups()
+        info.duration = int(h) * 3600 + int(m) * 60 + float(s)
+    for line in ffmpeg_output.splitlines():
+        video = VIDEO_STREAM_RE.search(line)
+        if video and info.video_codec is None:
+            info.video_codec = video.group(1)
+            fps = FPS_RE.search(line)
+            if fps:
+                info.fps = float(fps.group(1))
+            continue
+        audio = AUDIO_STREAM_RE.search(line)
+        if audio and info.audio_codec is None:
+            info.audio_codec = audio.group(1)
+    return info
+
+
+def probe_media(path: str) -> MediaInfo:
+    """Return codec, frame rate and duration for *path* (uses ``ffmpeg -i``, no ffprobe needed)."""
+    if not os.path.isfile(path):
+        raise RenderError(detail=f"Transcode input not found: {path}")
+    with span("probe_media", path=os.path.basename(path)):
+        result = subprocess.run([_require_ffmpeg(), "-hide_banner", "-i", path], capture_output=True, check=False)
+    return parse_media_info(result.stderr.decode("utf-8", errors="replace"))
+
+
+def can_copy_video(info: MediaInfo, output_path: str, video_codec: str) -> bool:
+    """True when *info*'s video stream already matches the encoder's codec and the output container."""
+    target_video = "h264" if video_codec == "libx264" else video_codec
+    if os.path.splitext(output_path)[1].lower() not in COPY_CONTAINERS:
+        return False
+    return info.video_codec == target_video
+
+
+def can_stream_copy(info: MediaInfo, output_path: str, video_codec: str, audio_codec: str) -> bool:
+    """True when every stream of *info* can be copied without re-encoding."""
+    if not can_copy_video(info, output_path, video_codec):
+        return False
+    return info.audio_codec is None or info.audio_codec == audio_codec
+
+
+def build_transcode_command(
+    input_path: str,
+    output_path: str,
+    info: MediaInfo,
+    video_codec: str = "libx264",
+    audio_codec: str = "aac",
+) -> list[str]:
+    """Return the ffmpeg argument list, stream-copying each stream whose codec already matches."""
+    cmd = [_require_ffmpeg(), "-hide_banner", "-loglevel", "error", "-y", "-i", input_path]
+    if can_stream_copy(info, output_path, video_codec, audio_codec):
+        cmd += ["-map", "0:v:0", "-map", "0:a?", "-c", "copy"]
+    else:
+        cmd += ["-map", "0:v:0", "-map", "0:a?"]
+        if can_copy_video(info, output_path, video_codec):
+            # e.g. an AE render with H.264 video and PCM audio: only the audio needs encoding
+            cmd += ["-c:v", "copy"]
+        else:
+            # No -r: ffmpeg keeps the source frame rate
+            cmd += ["-c:v", video_codec]
+            if video_codec == "libx264":
+                cmd += ["-pix_fmt", "yuv420p", "-preset", "medium", "-crf", "18"]
+        cmd += ["-c:a", "copy" if info.audio_codec == audio_codec else audio_codec]
+    if output_path.lower().endswith((".mp4", ".m4v")):
+        cmd += ["-movflags", "+faststart"]
+    cmd += ["-progress", "pipe:1", "-nostats", output_path]
+    return cmd
+
+
+def transcode(
+    input_path: str,
+    output_path: str,
+    video_codec: str = "libx264",
+    audio_codec: str = "aac",
+    on_progress: Callable[[float], None] | None = None,
+) -> str:
+    """Convert *input_path* to *output_path* with ffmpeg.
+
+    Args:
+        input_path: Source media file
+        output_path: Destination; the container follows its extension
+        video_codec: ffmpeg video encoder used when a re-encode is needed
+        audio_codec: ffmpeg audio encoder used when a re-encode is needed
+        on_progress: Called with the percent complete (0-100) as ffmpeg reports it
+    """
+    info = probe_media(input_path)
+    cmd = build_transcode_command(input_path, output_path, info, video_codec, audio_codec)
+    if can_stream_copy(info, output_path, video_codec, audio_codec):
+        mode = "stream copy"
+    elif can_copy_video(info, output_path, video_codec):
+        mode = "video copy"
+    else:
+        mode = "re-encode"
+    logger.info("Transcoding %s -> %s (%s, %s fps)", input_path, output_path, mode, info.fps or "source")
+
+    with span("ffmpeg", label="transcode", mode=mode):
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stderr_tail: deque[str] = deque(maxlen=200)
+
+        def _drain_stderr(pipe: IO[bytes]) -> None:
+            for raw in iter(pipe.readline, b""):
+                stderr_tail.append(raw.decode("utf-8", errors="replace").rstrip())
+            pipe.close()
+
+        drain = threading.Thread(target=_drain_stderr, args=(process.stderr,), daemon=True)
+        drain.start()
+
+        stdout: IO[bytes] = process.stdout  # type: ignore[assignment]
+        for raw in iter(stdout.readline, b""):
+            key, _, value = raw.decode("utf-8", errors="replace").strip().partition("=")
+            if on_progress is None:
+                continue
+            if key == "out_time_us" and info.duration > 0 and value.isdigit():
+                on_progress(min(int(value) / 1_000_000 / info.duration * 100, 100.0))
+            elif key == "progress" and value == "end":
+                on_progress(100.0)
+        stdout.close()
+        drain.join()
+
+        if process.wait() != 0:
+            raise RenderError(detail="Transcode failed: " + "\n".join(stderr_tail))
+    return output_path
+
+
+def transcode_many(
+    jobs: list[tuple[str, str]],
+    max_workers: int | None = None,
+    **kwargs: Any,
+) -> list[str]:
+    """Run several ``(input_path, output_path)`` transcodes in parallel.
+
+    Returns the output paths in job order. The first failure is raised once
+    every job has finished.
+    """
+    if not jobs:
+        return []
+    workers = max(1, min(max_workers or settings.TRANSCODE_WORKERS, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(transcode, src, dest, **kwargs) for src, dest in jobs]
+    return [future.result() for future in futures]
@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the micro-benchmark suite
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.backends import ScriptBackend
+
+# A plain ``pytest`` run without the plugin should not error on the ``benchmark`` fixture
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_bench_*.py"]
+
+
+class NullBackend(ScriptBackend):
+    """Backend that accepts every command instantly, so only Python-side work is timed."""
+
+    name = "null"
+
+    def run_script(self, client, file_name, replacements):
+        return ""
+
+    def hotkey(self, *keys):
+        pass
+
+    def press_key(self, key):
+        pass
+
+    def pause(self, seconds, token):
+        token.check()
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client(cache_folder):
+    client = Client()
+    client.setScriptBackend(NullBackend())
+    return client
+
+
+def project_items(count):
+    """Return a file_map.json ``files`` list with *count* items spread over folders."""
+    items = []
+    for index in range(1, count + 1):
+        if index % 50 == 1:
+            items.append({"id": index, "name": f"Folder {index}", "type": "Folder", "parentFolder": "Root"})
+            continue
+        items.append(
+            {
+                "id": index,
+                "name": f"Item {index}",
+                "type": "Composition",
+                "parentFolder": f"Folder {index - (index - 1) % 50}",
+                "duration": 10.0,
+                "frameRate": 30,
+                "width": 1920,
+                "height": 1080,
+            }
+        )
+    return items
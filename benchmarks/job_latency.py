@@ -0,0 +1,237 @@
+"""
+End-to-end job latency benchmark -- drive the real ``startBot`` against the
+stub command runner and report where a job's wall time goes.
+
+Each run writes a synthetic config with N scenes, starts a
+``StubCommandRunner`` on a private queue folder and runs ``startBot`` with the
+queue-based ``StubRunnerBackend``. Reported per run:
+
+* wall time and commands issued (per script)
+* sleeping -- fixed ``token.sleep`` / ``backend.pause`` calls outside the
+  queue (requested seconds, and what was actually slept after ``--sleep-scale``)
+* waiting -- time blocked in the queue until the runner consumed the command
+* queue latency percentiles (enqueue -> consumed, and enqueue -> picked up)
+
+Usage::
+
+    python benchmarks/job_latency.py --scenes 1 10 100 --latency 0.05
+    python benchmarks/job_latency.py --scenes 10 --sleep-scale 1 --json results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.cancellation import CancellationToken
+from ae_automation.stub_runner import StubCommandRunner, StubRunnerBackend
+
+TEMPLATE_ITEMS = [
+    {"id": 1, "name": "templates", "type": "Folder", "parentFolder": "Root"},
+    {"id": 2, "name": "Intro", "type": "Composition", "parentFolder": "templates", "duration": 5, "frameRate": 30},
+    {"id": 3, "name": "photo", "type": "Footage", "parentFolder": "templates"},
+]
+
+
+class TimedToken(CancellationToken):
+    """Cancellation token that accounts for every sleep of the job.
+
+    Sleeps inside the queue wait (``waiting`` set) are real polling and count
+    as waiting; all others are the fixed sleeps of the automation flow and
+    are shortened by *sleep_scale*.
+    """
+
+    def __init__(self, sleep_scale: float) -> None:
+        super().__init__()
+        self.sleep_scale = sleep_scale
+        self.requested_sleep = 0.0
+        self.actual_sleep = 0.0
+        self._local = threading.local()
+
+    @property
+    def waiting(self) -> bool:
+        return getattr(self._local, "waiting", False)
+
+    @waiting.setter
+    def waiting(self, value: bool) -> None:
+        self._local.waiting = value
+
+    def sleep(self, seconds: float) -> None:
+        if self.waiting:
+            super().sleep(seconds)
+            return
+        self.requested_sleep += seconds
+        started = time.perf_counter()
+        super().sleep(seconds * self.sleep_scale)
+        self.actual_sleep += time.perf_counter() - started
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of *values* (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def write_config(folder, scenes):
+    """Write a template project, a resource and an N-scene config into *folder*; return the config path."""
+    project_file = os.path.join(folder, "template.aep")
+    Path(project_file).write_bytes(b"stub project")
+    resource = os.path.join(folder, "photo.png")
+    Path(resource).write_bytes(b"stub image")
+    config = {
+        "project": {
+            "project_file": project_file,
+            "comp_name": "Main",
+            "comp_fps": 30,
+            "comp_width": 1920,
+            "comp_height": 1080,
+            "comp_end_time": scenes * 5,
+            "output_dir": folder,
+            "debug": True,
+            "resources": [{"type": "image", "name": "photo", "path": resource}],
+        },
+        "timeline": [
+            {
+                "startTime": i * 5,
+                "duration": 5,
+                "template_comp": "Intro",
+                "custom_actions": [
+                    {
+                        "change_type": "update_layer_property",
+                        "comp_name": "Intro",
+                        "layer_name": "Title",
+                        "property_name": "Text.Source Text",
+                        "value": f"Scene {i + 1}",
+                    },
+                    {
+                        "change_type": "update_layer_property",
+                        "comp_name": "Intro",
+                        "layer_name": "Title",
+                        "property_name": "Transform.Opacity",
+                        "value": "50",
+                    },
+                    {
+                        "change_type": "add_resource",
+                        "comp_name": "Intro",
+                        "resource_name": "photo",
+                        "startTime": 0,
+                        "duration": 5,
+                    },
+                ],
+            }
+            for i in range(scenes)
+        ],
+    }
+    config_file = os.path.join(folder, "config.json")
+    with open(config_file, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return config_file
+
+
+def run_job(scenes, latency=0.0, poll_interval=0.5, sleep_scale=0.0):
+    """Run one ``startBot`` job with *scenes* scenes; return its measurements."""
+    folder = tempfile.mkdtemp(prefix="ae_job_latency_")
+    queue_folder = os.path.join(folder, "queue")
+    saved = (settings.CACHE_FOLDER, settings.QUEUE_FOLDER)
+    settings.CACHE_FOLDER, settings.QUEUE_FOLDER = folder, queue_folder
+    try:
+        config_file = write_config(folder, scenes)
+        client = Client()
+        client.setScriptBackend(StubRunnerBackend())
+        token = TimedToken(sleep_scale)
+        client._cancel_token = token
+
+        round_trips = []
+        execute = client._execute_script_in_running_ae
+
+        def timed_execute(script_path):
+            token.waiting = True
+            started = time.perf_counter()
+            try:
+                return execute(script_path)
+            finally:
+                round_trips.append(time.perf_counter() - started)
+                token.waiting = False
+
+        client._execute_script_in_running_ae = timed_execute
+
+        runner = StubCommandRunner(queue_folder, folder, latency, poll_interval, TEMPLATE_ITEMS)
+        started = time.perf_counter()
+        with runner:
+            client.startBot(config_file)
+        wall = time.perf_counter() - started
+    finally:
+        settings.CACHE_FOLDER, settings.QUEUE_FOLDER = saved
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "scenes": scenes,
+        "wall_time": wall,
+        "commands": sum(runner.executed.values()),
+        "commands_by_script": dict(runner.executed.most_common()),
+        "sleep_requested": token.requested_sleep,
+        "sleep_actual": token.actual_sleep,
+        "wait_time": sum(round_trips),
+        "queue_latency": dict(
+            {f"p{pct}": percentile(round_trips, pct) for pct in (50, 90, 99)}, max=max(round_trips, default=0.0)
+        ),
+        "pickup_delay": {f"p{pct}": percentile(runner.pickup_delays, pct) for pct in (50, 90, 99)},
+    }
+
+
+def print_report(result):
+    latency = result["queue_latency"]
+    pickup = result["pickup_delay"]
+    print(f"== {result['scenes']} scene(s) ==")
+    print(f"  wall time        {result['wall_time']:10.3f} s")
+    print(f"  commands         {result['commands']:10d}")
+    print(f"  waiting (queue)  {result['wait_time']:10.3f} s")
+    print(f"  sleeping         {result['sleep_actual']:10.3f} s  ({result['sleep_requested']:.1f} s requested)")
+    other = result["wall_time"] - result["wait_time"] - result["sleep_actual"]
+    print(f"  other            {other:10.3f} s")
+    print(
+        f"  queue latency    p50 {latency['p50'] * 1000:.1f} ms  p90 {latency['p90'] * 1000:.1f} ms  "
+        f"p99 {latency['p99'] * 1000:.1f} ms  max {latency['max'] * 1000:.1f} ms"
+    )
+    print(
+        f"  runner pickup    p50 {pickup['p50'] * 1000:.1f} ms  p90 {pickup['p90'] * 1000:.1f} ms  "
+        f"p99 {pickup['p99'] * 1000:.1f} ms"
+    )
+    for name, count in result["commands_by_script"].items():
+        print(f"    {count:6d}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure orchestration overhead of startBot against a stub runner")
+    parser.add_argument("--scenes", type=int, nargs="+", default=[1, 10, 100], help="Scene counts to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub spends on each command")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Stub queue scan interval (AE uses 0.5)")
+    parser.add_argument(
+        "--sleep-scale", type=float, default=0.0, help="Fraction of the fixed sleeps to actually sleep (1 = real)"
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for scenes in args.scenes:
+        result = run_job(scenes, args.latency, args.poll_interval, args.sleep_scale)
+        print_report(result)
+        results.append(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
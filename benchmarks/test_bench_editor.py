@@ -0,0 +1,80 @@
+"""
+Benchmarks for VideoEditor project updates and undo/redo on large projects
+"""
+
+import json
+
+import pytest
+
+from ae_automation.edit_history import EditHistory
+
+SCENES = 500
+EDITS = 50
+
+
+def _project(scenes):
+    return {
+        "project": {"project_file": "template.aep", "comp_name": "Main", "output_dir": "out"},
+        "timeline": [
+            {
+                "startTime": i * 5,
+                "duration": 5,
+                "template_comp": "Intro",
+                "custom_actions": [
+                    {
+                        "change_type": "update_layer_property",
+                        "comp_name": "Intro",
+                        "layer_name": "Title",
+                        "property_name": "Text.Source Text",
+                        "value": f"Scene {i + 1}",
+                    }
+                ],
+            }
+            for i in range(scenes)
+        ],
+    }
+
+
+@pytest.fixture
+def editor(client, tmp_path):
+    project_file = tmp_path / "project.json"
+    data = _project(SCENES)
+    project_file.write_text(json.dumps(data), encoding="utf-8")
+    client.file_path = str(project_file)
+    client.data = data
+    client.history = EditHistory(data)
+    api = client.app.test_client()
+    for n in range(EDITS):
+        data["timeline"][n]["custom_actions"][0]["value"] = f"Edit {n}"
+        api.post("/api/project", json={"data": data})
+    return api
+
+
+def test_update_project(benchmark, editor, client):
+    data = client.data
+
+    def update():
+        return editor.post("/api/project", json={"data": data})
+
+    assert benchmark(update).status_code == 200
+
+
+def test_undo_redo(benchmark, editor):
+    def undo_redo():
+        editor.post("/api/undo")
+        return editor.post("/api/redo")
+
+    assert benchmark(undo_redo).status_code == 200
+
+
+def test_poll_project(benchmark, editor):
+    etag = editor.get("/api/project").headers["ETag"]
+
+    def poll():
+        return editor.get("/api/project", headers={"If-None-Match": etag})
+
+    assert benchmark(poll).status_code == 304
+
+
+def test_get_project(benchmark, editor):
+    assert benchmark(editor.get, "/api/project").status_code == 200
@@ -0,0 +1,43 @@
+"""
+Benchmarks for plugin registry queries with many installed plugins
+"""
+
+import json
+
+import pytest
+
+from ae_automation.plugins import PluginRegistry
+
+PLUGIN_COUNT = 500
+
+
+@pytest.fixture(scope="module")
+def registry(tmp_path_factory):
+    plugins_dir = tmp_path_factory.mktemp("plugins")
+    for n in range(PLUGIN_COUNT):
+        plugin_dir = plugins_dir / f"plugin-{n:03d}"
+        plugin_dir.mkdir()
+        manifest = {
+            "name": f"plugin-{n:03d}",
+            "version": "1.0.0",
+            "description": f"Lower third variant {n}",
+            "author": "bench",
+            "type": ("template", "action", "bundle")[n % 3],
+            "tags": ["lower-third", f"style-{n % 10}"],
+        }
+        (plugin_dir / "plugin.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return PluginRegistry(str(plugins_dir))
+
+
+def test_list_plugins(benchmark, registry):
+    # Built-in plugins are installed into the default directory, not this one
+    assert len(benchmark(registry.list_plugins)) == PLUGIN_COUNT
+
+
+def test_search_plugins_by_query(benchmark, registry):
+    assert len(benchmark(registry.search_plugins, "variant 49")) == 11
+
+
+def test_search_plugins_by_type_and_tags(benchmark, registry):
+    results = benchmark(registry.search_plugins, plugin_type="template", tags=["style-3"])
+    assert all(plugin["type"] == "template" for plugin in results)
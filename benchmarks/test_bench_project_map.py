@@ -0,0 +1,36 @@
+"""
+Benchmarks for project map loading and item lookups on large projects
+"""
+
+import json
+
+import pytest
+from conftest import project_items
+
+ITEM_COUNT = 10_000
+
+
+@pytest.fixture
+def large_map(client, cache_folder):
+    items = project_items(ITEM_COUNT)
+    with open(cache_folder / "file_map.json", "w", encoding="utf-8") as f:
+        json.dump({"files": items}, f)
+    client.afterEffectItems = items
+    return items
+
+
+def test_check_if_item_exists_miss(benchmark, client, large_map):
+    assert benchmark(client.checkIfItemExists, "Missing item") is True
+
+
+def test_check_if_item_exists_last(benchmark, client, large_map):
+    assert benchmark(client.checkIfItemExists, large_map[-1]["name"]) is False
+
+
+def test_go_to_item_last(benchmark, client, large_map):
+    benchmark(client.goToItem, large_map[-1]["name"])
+
+
+def test_get_project_map(benchmark, client, large_map):
+    data = benchmark(client.getProjectMap)
+    assert len(data["files"]) == ITEM_COUNT
@@ -0,0 +1,77 @@
+"""
+Benchmarks for the render pipeline against the fake aerender
+"""
+
+import os
+
+import pytest
+
+from ae_automation import fake_aerender, settings
+from ae_automation.outputs import OutputPipeline
+from ae_automation.render import build_aerender_command
+
+needs_ffmpeg = pytest.mark.skipif(not settings.FFMPEG_PATH, reason="Requires ffmpeg")
+
+
+@pytest.fixture
+def aerender(tmp_path, monkeypatch):
+    path = fake_aerender.install(str(tmp_path / "ae"))
+    monkeypatch.setattr(settings, "AERENDER_PATH", path)
+    monkeypatch.setattr(settings, "AFTER_EFFECT_FOLDER", str(tmp_path / "ae"))
+    monkeypatch.setenv("FAKE_AERENDER_MEDIA", "dummy")
+    return path
+
+
+def _render_command(tmp_path, **kwargs):
+    return build_aerender_command(str(tmp_path / "project.aep"), "Main", str(tmp_path / "out" / "Main.mp4"), **kwargs)
+
+
+def test_render_executor(benchmark, client, aerender, tmp_path):
+    command = _render_command(tmp_path)
+    result = benchmark.pedantic(client.runCommand, args=(command,), rounds=5)
+    assert result == "Command executed successfully."
+
+
+def test_progress_parsing_heavy_output(benchmark, client, aerender, tmp_path, monkeypatch):
+    # 20k PROGRESS lines interleaved with 2k stderr warnings
+    monkeypatch.setenv("FAKE_AERENDER_FRAMES", "20000")
+    monkeypatch.setenv("FAKE_AERENDER_STDERR_EVERY", "10")
+    command = _render_command(tmp_path)
+    events = []
+
+    def render():
+        events.clear()
+        client.runCommand(command, on_event=events.append)
+
+    benchmark.pedantic(render, rounds=3)
+    assert sum(1 for event in events if event.kind == "frame") == 20000
+    assert events[-1].total_frames == 20000
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("segments", [1, 4])
+def test_split_render_and_stitch(benchmark, client, aerender, tmp_path, monkeypatch, segments):
+    monkeypatch.setenv("FAKE_AERENDER_MEDIA", "ffmpeg")
+    project = str(tmp_path / "project.aep")
+    output_dir = str(tmp_path / "out")
+
+    def render():
+        return client.renderFile(project, "Main", output_dir, segments=segments, frame_range=(0, 299), cache=False)
+
+    path = benchmark.pedantic(render, rounds=3)
+    assert os.path.getsize(path) > 0
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("workers", [1, 4])
+def test_output_fanout(benchmark, client, aerender, tmp_path, workers):
+    master = str(tmp_path / "master.mp4")
+    fake_aerender.write_media(master, 60, 30, mode="ffmpeg", ffmpeg=settings.FFMPEG_PATH)
+    outputs = ["webm", "gif", {"format": "poster", "count": 3}, {"format": "mp4", "name": "copy"}]
+    pipeline = OutputPipeline(max_workers=workers)
+
+    def fan_out():
+        return pipeline.submit(master, outputs, str(tmp_path / "derived")).result()
+
+    results = benchmark.pedantic(fan_out, rounds=3)
+    assert len(results["poster"]) == 3
@@ -0,0 +1,105 @@
+"""
+Benchmarks for script assembly, custom action lowering and name/color helpers
+"""
+
+from ae_automation.execution_plan import lower_config
+from ae_automation.mixins.tools import _slug
+
+NAMES = [f"Scene {n} Lower Third_v{n % 7} Title" for n in range(200)]
+COLORS = [f"#{n:02X}{(n * 3) % 256:02X}{(n * 7) % 256:02X}" for n in range(200)]
+
+
+def _nested_config(scenes=20):
+    templates = {
+        "title": [
+            {
+                "change_type": "update_layer_property",
+                "comp_name": "{comp}",
+                "layer_name": "Title",
+                "property_name": "Text.Source Text",
+                "value": "{text}",
+            },
+            {
+                "change_type": "update_layer_property",
+                "comp_name": "{comp}",
+                "layer_name": "Title",
+                "property_name": "Transform.Opacity",
+                "value": "100",
+            },
+        ],
+        "card": [
+            {"change_type": "template", "template_name": "title", "template_values": {"comp": "Card", "text": "A"}},
+            {
+                "change_type": "update_layer_property",
+                "comp_name": "Card",
+                "layer_name": "BG",
+                "property_name": "Effects.Fill.Color",
+                "property_type": "color",
+                "value": "{color}",
+            },
+        ],
+        "slide": [
+            {"change_type": "template", "template_name": "card", "template_values": {"color": "#336699"}},
+            {"change_type": "template", "template_name": "title", "template_values": {"comp": "Slide", "text": "B"}},
+        ],
+    }
+    action = {"change_type": "template", "template_name": "slide", "template_values": {}}
+    return {
+        "project": {},
+        "templates": templates,
+        "timeline": [
+            {"template_comp": "Intro", "startTime": i * 5, "duration": 5, "custom_actions": [action] * 10}
+            for i in range(scenes)
+        ],
+    }
+
+
+def test_assemble_script(benchmark, client):
+    replacements = {
+        "{comp_name}": "scene-1-intro",
+        "{layer_name}": "Title",
+        "{property_name}": "Text.Source Text",
+        "{value}": "Hello world",
+    }
+    path, _ = benchmark(client.assembleScript, "update_properties.jsx", replacements)
+    assert path.endswith("update_properties.jsx")
+
+
+def test_run_script(benchmark, client):
+    benchmark(client.runScript, "selectItem.jsx", {"index": "42"})
+
+
+def test_lower_nested_templates(benchmark, client):
+    data = _nested_config()
+    plan = benchmark(lower_config, data, client.slug, client.hexToRGBA)
+    assert plan.lowered == 20 * 10 * 5
+
+
+def test_build_execution_plan(benchmark, client):
+    data = _nested_config()
+    plan = benchmark(client.buildExecutionPlan, data)
+    assert len(plan) > 0
+
+
+def test_slug(benchmark, client):
+    def slug_all():
+        return [client.slug(name) for name in NAMES]
+
+    # Start every round cold so slugify itself is measured, not just cache hits
+    result = benchmark.pedantic(slug_all, setup=_slug.cache_clear, rounds=50)
+    assert result[0] == "scene-0-lower-third-v0-title"
+
+
+def test_slug_cached(benchmark, client):
+    def slug_all():
+        return [client.slug(name) for name in NAMES]
+
+    slug_all()
+    assert benchmark(slug_all)[0] == "scene-0-lower-third-v0-title"
+
+
+def test_hex_to_rgba(benchmark, client):
+    def convert_all():
+        return [client.hexToRGBA(color) for color in COLORS]
+
+    assert benchmark(convert_all)[0] == "0.0,0.0,0.0,1"
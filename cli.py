@@ -22,8 +22,23 @@ def cmd_run(args: argparse.Namespace) -> None:
 
     print(f"Running automation with config: {args.config}")
 
+    tracer = None
+    if args.trace:
+        from ae_automation.tracing import start_tracing
+
+        tracer = start_tracing()
+
     client = Client()
-    client.startBot(args.config)
+    try:
+        client.startBot(args.config)
+        client.wait_for_outputs()
+    finally:
+        if tracer is not None:
+            from ae_automation.tracing import stop_tracing
+
+            stop_tracing()
+            tracer.export(args.trace)
+            print(f"Trace written to {args.trace} ({len(tracer.events)} spans)")
 
 
 def cmd_editor(args: argparse.Namespace) -> None:
@@ -272,6 +287,34 @@ def cmd_plugins(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def _deadline_arg(value: str) -> float | None:
+    """argparse type for --deadline, so a bad value is a usage error rather than a traceback"""
+    from ae_automation.job_store import parse_deadline
+
+    try:
+        return parse_deadline(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid deadline {value!r}, expected ISO 8601 such as 2026-10-20T09:00"
+        ) from None
+
+
+def _print_stage_summary(results: list[dict]) -> None:
+    """Print where the batch's time went, stage by stage"""
+    from ae_automation.timeline import summarize_stages
+
+    summary = summarize_stages([r.get("stages", []) for r in results])
+    if not summary:
+        return
+    grand_total = sum(entry["total"] for entry in summary) or 1.0
+    print(f"\n  {'Stage':<14}{'Jobs':>6}{'Total (s)':>12}{'Avg (s)':>10}{'Share':>8}{'Commands':>10}")
+    for entry in summary:
+        print(
+            f"  {entry['name']:<14}{entry['jobs']:>6}{entry['total']:>12.1f}{entry['average']:>10.1f}"
+            f"{entry['total'] / grand_total:>8.0%}{entry['commands']:>10}"
+        )
+
+
 def cmd_batch(args: argparse.Namespace) -> None:
     """Run multiple automation configs sequentially"""
     import glob as glob_mod
@@ -295,17 +338,19 @@ def cmd_batch(args: argparse.Namespace) -> None:
                 sys.exit(1)
             config_paths.append(os.path.abspath(p))
 
-    if not config_paths:
-        print("Error: No config files specified. Use positional args or --dir.")
+    if not config_paths and not args.resume:
+        print("Error: No config files specified. Use positional args, --dir or --resume.")
         sys.exit(1)
 
-    print(f"Batch processing {len(config_paths)} config(s):")
-    for p in config_paths:
-        print(f"  - {p}")
-    print()
-
     client = Client()
-    client.queue_configs(config_paths)
+    if config_paths:
+        print(f"Batch processing {len(config_paths)} config(s):")
+        for p in config_paths:
+            print(f"  - {p}")
+        print()
+        client.queue_configs(config_paths, priority=args.priority, deadline=args.deadline)
+    else:
+        print("Resuming unfinished jobs from the batch queue")
     client.start_batch()
 
     # Wait for completion by polling status
@@ -327,16 +372,98 @@ def cmd_batch(args: argparse.Namespace) -> None:
     print(f"\nBatch complete: {successes} succeeded, {failures} failed")
 
     for r in results:
-        icon = "OK" if r["status"] == "success" else "FAIL"
+        icon = {"success": "OK", "cancelled": "SKIP"}.get(r["status"], "FAIL")
         msg = f"  [{icon}] {r['config']}"
         if r["error"]:
             msg += f" -- {r['error']}"
         print(msg)
 
+    _print_stage_summary(results)
+
+    if args.report:
+        import json
+
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump(status, fh, indent=2)
+        print(f"\nReport written to {args.report}")
+
     if failures > 0:
         sys.exit(1)
 
 
+def cmd_coordinator(args: argparse.Namespace) -> None:
+    """Serve the batch queue to distributed render nodes"""
+    from ae_automation.distributed import Coordinator
+
+    coordinator = Coordinator(lease_seconds=args.lease)
+    print(f"Coordinator listening on http://{args.host}:{args.port}/ (lease {coordinator.lease_seconds:g}s)")
+    print("Queue jobs with 'ae-automation batch' or POST /api/jobs; press Ctrl+C to stop.")
+    try:
+        coordinator.serve(host=args.host, port=args.port)
+    except KeyboardInterrupt:
+        print("\nCoordinator stopped by user")
+
+
+def cmd_worker(args: argparse.Namespace) -> None:
+    """Lease and run jobs from a coordinator"""
+    from ae_automation.distributed import Worker, load_runner
+
+    runner = load_runner(args.runner) if args.runner else None
+    worker = Worker(args.coordinator, runner=runner, name=args.name, poll_interval=args.poll)
+    print(f"Worker {worker.name} polling {worker.url}")
+    try:
+        processed = worker.run(max_jobs=args.max_jobs, exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        worker.stop()
+        print("\nWorker stopped by user")
+        return
+    print(f"Worker finished: {processed} job(s) processed")
+
+
+def cmd_cache(args: argparse.Namespace) -> None:
+    """Inspect and prune the render result cache"""
+    import datetime
+
+    from ae_automation.render_cache import RenderCache
+
+    cache = RenderCache()
+    sub = args.cache_action
+
+    if sub == "list":
+        entries = cache.entries()
+        if not entries:
+            print("Render cache is empty.")
+            return
+        print(f"{'Key':<14} {'Size (MB)':>10} {'Hits':>6}  {'Last used':<19}  Label")
+        print("-" * 80)
+        for e in entries:
+            last_used = datetime.datetime.fromtimestamp(e["last_used"]).strftime("%Y-%m-%d %H:%M:%S")
+            size_mb = e["size"] / (1024 * 1024)
+            print(f"{e['key'][:12]:<14} {size_mb:>10.1f} {e.get('hits', 0):>6}  {last_used:<19}  {e['label']}")
+
+    elif sub == "stats":
+        stats = cache.stats()
+        print(f"Location:    {stats['cache_dir']}")
+        print(f"Entries:     {stats['entries']}")
+        total_mb = stats["total_bytes"] / (1024 * 1024)
+        max_mb = stats["max_bytes"] / (1024 * 1024)
+        print(f"Size:        {total_mb:.1f} MB / {max_mb:.0f} MB")
+        print(f"Total hits:  {stats['hits']}")
+
+    elif sub == "prune":
+        max_bytes = int(args.max_size * 1024 * 1024) if args.max_size is not None else None
+        removed = cache.prune(max_bytes=max_bytes)
+        print(f"Removed {len(removed)} cache entr{'y' if len(removed) == 1 else 'ies'}.")
+
+    elif sub == "clear":
+        removed_count = cache.clear()
+        print(f"Removed {removed_count} cache entr{'y' if removed_count == 1 else 'ies'}.")
+
+    else:
+        print("Unknown cache action. Use: list, stats, prune, clear")
+        sys.exit(1)
+
+
 def cmd_diagnose(args: argparse.Namespace) -> None:
     """Run diagnostic checks"""
     from ae_automation import Client
@@ -384,6 +511,7 @@ Examples:
   # Run automation
   ae-automation run config.json
   ae-automation run example.json
+  ae-automation run config.json --trace trace.json
 
   # Open editor
   ae-automation editor config.json
@@ -409,6 +537,20 @@ Examples:
   ae-automation test --verbose
   ae-automation test --version 2024
 
+  # Batch processing (the queue persists; --resume continues after a crash)
+  ae-automation batch --dir configs/
+  ae-automation batch --resume
+  ae-automation batch revision.json --priority 10 --deadline 2026-10-20T09:00
+  ae-automation batch --dir configs/ --report batch_report.json
+
+  # Distributed rendering: one coordinator, any number of render nodes
+  ae-automation coordinator --host 0.0.0.0 --port 5050
+  ae-automation worker --coordinator http://render-head:5050
+
+  # Inspect the render cache
+  ae-automation cache list
+  ae-automation cache prune --max-size 5000
+
   # Run diagnostics
   ae-automation diagnose
   ae-automation diagnose --no-wait
@@ -434,6 +576,9 @@ For more information, visit: https://github.com/jhd3197/after-effects-automation
         description="Execute After Effects automation using a JSON configuration file",
     )
     parser_run.add_argument("config", help="Path to the JSON configuration file")
+    parser_run.add_argument(
+        "--trace", metavar="FILE", help="Record a Chrome/Perfetto trace of the job's hot paths to FILE"
+    )
     parser_run.set_defaults(func=cmd_run)
 
     # ============================================================
@@ -507,8 +652,48 @@ For more information, visit: https://github.com/jhd3197/after-effects-automation
     )
     parser_batch.add_argument("configs", nargs="*", help="Paths to JSON configuration files")
     parser_batch.add_argument("--dir", "-d", help="Directory containing .json config files to process")
+    parser_batch.add_argument(
+        "--resume", action="store_true", help="Continue pending or interrupted jobs from the persistent queue"
+    )
+    parser_batch.add_argument(
+        "--priority", type=int, default=0, help="Job priority; higher runs first, even ahead of a running batch"
+    )
+    parser_batch.add_argument(
+        "--deadline", type=_deadline_arg, help="Finish-by time as ISO 8601, e.g. 2026-10-20T09:00"
+    )
+    parser_batch.add_argument("--report", help="Write per-job results and stage timings to this JSON file")
     parser_batch.set_defaults(func=cmd_batch)
 
+    # ============================================================
+    # COORDINATOR / WORKER commands
+    # ============================================================
+    parser_coordinator = subparsers.add_parser(
+        "coordinator",
+        help="Serve the batch queue to render nodes",
+        description="Expose the persistent batch queue over HTTP so worker nodes can lease jobs",
+    )
+    parser_coordinator.add_argument("--host", default="127.0.0.1", help="Host to listen on (default: 127.0.0.1)")
+    parser_coordinator.add_argument("--port", type=int, default=5050, help="Port to listen on (default: 5050)")
+    parser_coordinator.add_argument(
+        "--lease", type=float, help="Seconds a silent worker keeps its job (default: DISTRIBUTED_LEASE_SECONDS)"
+    )
+    parser_coordinator.set_defaults(func=cmd_coordinator)
+
+    parser_worker = subparsers.add_parser(
+        "worker",
+        help="Run jobs leased from a coordinator",
+        description="Render node agent: lease jobs from a coordinator, heartbeat and report results",
+    )
+    parser_worker.add_argument("--coordinator", required=True, help="Coordinator URL, e.g. http://render-head:5050")
+    parser_worker.add_argument("--name", help="Worker name shown in job status (default: host:pid-suffix)")
+    parser_worker.add_argument("--poll", type=float, help="Seconds between polls when the queue is empty")
+    parser_worker.add_argument("--max-jobs", type=int, help="Exit after this many jobs")
+    parser_worker.add_argument("--exit-when-idle", action="store_true", help="Exit once the queue is empty")
+    parser_worker.add_argument(
+        "--runner", help="Custom job runner as module:function (default: startBot on this machine)"
+    )
+    parser_worker.set_defaults(func=cmd_worker)
+
     # ============================================================
     # TEST command
     # ============================================================
@@ -558,6 +743,24 @@ For more information, visit: https://github.com/jhd3197/after-effects-automation
 
     parser_plugins.set_defaults(func=cmd_plugins)
 
+    # ============================================================
+    # CACHE command
+    # ============================================================
+    parser_cache = subparsers.add_parser(
+        "cache",
+        help="Inspect and prune the render cache",
+        description="List, prune, or clear cached render outputs",
+    )
+    cache_sub = parser_cache.add_subparsers(dest="cache_action")
+    cache_sub.add_parser("list", help="List cached renders, most recently used first")
+    cache_sub.add_parser("stats", help="Show cache size and hit totals")
+    c_prune = cache_sub.add_parser("prune", help="Evict least recently used entries")
+    c_prune.add_argument(
+        "--max-size", type=float, default=None, help="Target size in MB (default: RENDER_CACHE_MAX_MB)"
+    )
+    cache_sub.add_parser("clear", help="Remove every cached render")
+    parser_cache.set_defaults(func=cmd_cache)
+
     # ============================================================
     # DIAGNOSE command
     # ============================================================
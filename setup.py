@@ -43,6 +43,7 @@ setup(
         "flask-cors>=3.0.0",
         "werkzeug>=2.0.0",
         "psutil>=5.8.0",
+        "pydantic>=2.0",
     ],
     extras_require={
         "window-detection": ["pygetwindow>=0.0.9"],
@@ -0,0 +1,178 @@
+"""
+Unit tests for cooperative cancellation and per-job timeouts
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psutil
+
+from ae_automation import Client, settings
+from ae_automation.cancellation import NEVER_CANCELLED, CancellationToken, parse_stage_timeouts
+from ae_automation.exceptions import JobCancelledError, JobTimeoutError
+from ae_automation.job_store import JobStore
+from ae_automation.simulator import AESimulator, SimulatorBackend
+
+# A parent that spawns a sleeping child and then sleeps itself
+SPAWNING_SLEEPER = (
+    "import subprocess, sys, time; "
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+    "print('Starting composition', flush=True); time.sleep(60)"
+)
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Test the token's flag, sleeps and timers"""
+
+    def test_parse_stage_timeouts(self):
+        self.assertEqual(parse_stage_timeouts("open=300, render=7200.5"), {"open": 300.0, "render": 7200.5})
+        self.assertEqual(parse_stage_timeouts(""), {})
+
+    def test_sleep_wakes_on_cancel(self):
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel, args=("stop",)).start()
+        start = time.time()
+        with self.assertRaises(JobCancelledError) as ctx:
+            token.sleep(30)
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(ctx.exception.reason, "stop")
+        self.assertTrue(token.cancelled)
+
+    def test_stage_timeout(self):
+        token = CancellationToken(stage_timeouts={"render": 0.1})
+        with self.assertRaises(JobTimeoutError) as ctx, token.stage("render"):
+            token.sleep(30)
+        self.assertEqual((ctx.exception.stage, ctx.exception.timeout), ("render", 0.1))
+        token.close()
+
+    def test_finished_stage_does_not_fire(self):
+        token = CancellationToken(stage_timeouts={"open": 0.1})
+        token.begin_stage("open")
+        token.begin_stage("edit")
+        time.sleep(0.3)
+        token.check()
+        self.assertFalse(token.cancelled)
+
+    def test_job_timeout(self):
+        token = CancellationToken(timeout=0.1)
+        with self.assertRaises(JobTimeoutError):
+            token.sleep(30)
+
+    def test_never_cancelled_is_inert(self):
+        NEVER_CANCELLED.cancel()
+        NEVER_CANCELLED.check()
+        self.assertFalse(NEVER_CANCELLED.cancelled)
+
+    def test_cancel_kills_process_tree(self):
+        token = CancellationToken()
+        process = subprocess.Popen([sys.executable, "-c", SPAWNING_SLEEPER], stdout=subprocess.PIPE)
+        process.stdout.readline()  # child has been spawned
+        children = psutil.Process(process.pid).children(recursive=True)
+        self.assertTrue(children)
+        token.register_process(process)
+
+        token.cancel()
+
+        self.assertIsNotNone(process.wait(timeout=5))
+        process.stdout.close()
+        for child in children:
+            self.assertFalse(child.is_running() and child.status() != psutil.STATUS_ZOMBIE)
+
+
+class TestClientCancellation(unittest.TestCase):
+    """Test that runCommand and batch jobs honour the token"""
+
+    def setUp(self):
+        self.client = Client()
+
+    def tearDown(self):
+        self.client._cancel_token = None
+
+    def test_runcommand_times_out(self):
+        self.client._cancel_token = CancellationToken(timeout=0.5)
+        start = time.time()
+        with self.assertRaises(JobTimeoutError):
+            self.client.runCommand([sys.executable, "-c", SPAWNING_SLEEPER])
+        self.assertLess(time.time() - start, 10)
+
+    def test_runcommand_refuses_when_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        self.client._cancel_token = token
+        with patch("ae_automation.mixins.afterEffect.subprocess.Popen") as mock_popen:
+            with self.assertRaises(JobCancelledError):
+                self.client.runCommand(["aerender"])
+        mock_popen.assert_not_called()
+
+
+class TestBatchCancellation(unittest.TestCase):
+    """Test cancel_batch and timeouts on a running batch job"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.work_dir, "batch.db"))
+        self.client = Client()
+        self.client._batch_store = self.store
+        self.config = os.path.join(self.work_dir, "a.json")
+        with open(self.config, "w") as fh:
+            fh.write("{}")
+        self.started = threading.Event()
+        patcher = patch("ae_automation.backends.kill_ae_process")
+        self.mock_kill = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _hanging_bot(self, path):
+        self.started.set()
+        while True:
+            self.client._wait(0.5)  # e.g. wait_for_after_effects_ready
+
+    def _run(self, cancel=False):
+        with patch.object(Client, "startBot", side_effect=self._hanging_bot):
+            self.client.queue_config(self.config)
+            self.client.start_batch()
+            self.assertTrue(self.started.wait(5))
+            if cancel:
+                self.client.cancel_batch()
+            self.client._batch_thread.join(timeout=10)
+        self.assertFalse(self.client._batch_thread.is_alive())
+        return self.client.get_batch_status()["results"][0]
+
+    def test_cancel_batch_aborts_running_job(self):
+        result = self._run(cancel=True)
+        self.assertEqual(result["status"], "cancelled")
+        self.mock_kill.assert_called_once()
+        self.assertIsNone(self.client._cancel_token)
+
+    def test_cancel_closes_the_active_backend_only(self):
+        backend = SimulatorBackend(AESimulator())
+        self.client.setScriptBackend(backend)
+        with patch.object(backend, "close", wraps=backend.close) as close:
+            result = self._run(cancel=True)
+        self.assertEqual(result["status"], "cancelled")
+        close.assert_called_once()
+        self.mock_kill.assert_not_called()
+
+    def test_job_timeout(self):
+        with patch.object(settings, "BATCH_JOB_TIMEOUT", 0.3):
+            result = self._run()
+        self.assertEqual(result["status"], "error")
+        self.assertIn("timed out", result["error"])
+        self.mock_kill.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
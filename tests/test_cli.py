@@ -3,6 +3,7 @@ Unit tests for CLI commands (generate, export) and template registry.
 """
 
 import argparse
+import io
 import os
 import sys
 import tempfile
@@ -299,6 +300,21 @@ class TestMainParserRegistration(unittest.TestCase):
             cli.main()
         mock_cmd.assert_called_once()
 
+    @patch("cli.cmd_batch")
+    def test_batch_deadline_is_parsed(self, mock_cmd):
+        with patch("sys.argv", ["ae-automation", "batch", "a.json", "--deadline", "2026-10-20T09:00"]):
+            cli.main()
+        self.assertIsInstance(mock_cmd.call_args[0][0].deadline, float)
+
+    @patch("cli.cmd_batch")
+    def test_malformed_deadline_is_a_usage_error(self, mock_cmd):
+        with patch("sys.argv", ["ae-automation", "batch", "a.json", "--deadline", "tomorrow"]):
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr, self.assertRaises(SystemExit) as ctx:
+                cli.main()
+        self.assertEqual(ctx.exception.code, 2)
+        self.assertIn("invalid deadline 'tomorrow'", stderr.getvalue())
+        mock_cmd.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -222,5 +222,96 @@ class TestTimeFormatParsing(unittest.TestCase):
                 )
 
 
+class TestConfigSchema(unittest.TestCase):
+    """Test up-front typed validation of whole configs"""
+
+    def setUp(self):
+        with open(Path(__file__).parent.parent / "example.json") as fh:
+            self.config = json.load(fh)
+
+    def test_shipped_configs_validate(self):
+        from ae_automation.mixins.types import validate_config
+
+        root = Path(__file__).parent.parent
+        for path in [root / "example.json", *root.glob("ae_automation/builtin_plugins/*/config.json")]:
+            with self.subTest(config=path.name), open(path) as fh:
+                validate_config(json.load(fh))
+
+    def test_reports_every_error_at_once(self):
+        from ae_automation.exceptions import ConfigValidationError
+        from ae_automation.mixins.types import validate_config
+
+        self.config["project"]["comp_end_time"] = "1:00"
+        del self.config["project"]["comp_name"]
+        swap = next(
+            a for a in self.config["timeline"][1]["custom_actions"] if a["change_type"] == "swap_items_by_index"
+        )
+        del swap["fit_to_screen"]
+        self.config["timeline"][-1]["custom_actions"].append({"change_type": "add_marker", "comp_name": "X"})
+        self.config["timeline"][-1]["custom_actions"].append({"change_type": "update_layer_proprety"})
+
+        with self.assertRaises(ConfigValidationError) as ctx:
+            validate_config(self.config)
+        errors = "\n".join(ctx.exception.errors)
+        last = len(self.config["timeline"]) - 1
+        self.assertIn("project.comp_end_time", errors)
+        self.assertIn("project.comp_name: Field required", errors)
+        self.assertIn("custom_actions.2.fit_to_screen: Field required", errors)
+        self.assertIn(f"timeline.{last}.custom_actions", errors)
+        self.assertIn("marker_name: Field required", errors)
+        self.assertIn("update_layer_proprety", errors)
+        self.assertGreaterEqual(len(ctx.exception.errors), 6)
+
+    def test_cross_references(self):
+        from ae_automation.exceptions import ConfigValidationError
+        from ae_automation.mixins.types import validate_config
+
+        self.config["templates"] = {
+            "lower_third": [
+                {
+                    "change_type": "update_layer_property",
+                    "comp_name": "LowerThird",
+                    "layer_name": "Name",
+                    "property_name": "Text.Source Text",
+                    "value": "{first-name}",
+                }
+            ]
+        }
+        actions = self.config["timeline"][0]["custom_actions"]
+        actions.append(
+            {"change_type": "template", "template_name": "lower_third", "template_values": {"first-name": "A"}}
+        )
+        validate_config(self.config)
+
+        actions.append({"change_type": "template", "template_name": "lower_thrid"})
+        actions.append({"change_type": "template", "template_name": "lower_third"})
+        actions.append(
+            {"change_type": "add_resource", "comp_name": "C", "resource_name": "nope", "startTime": 0, "duration": 1}
+        )
+        with self.assertRaises(ConfigValidationError) as ctx:
+            validate_config(self.config)
+        errors = "\n".join(ctx.exception.errors)
+        self.assertIn("unknown template 'lower_thrid'", errors)
+        self.assertIn("missing 'first-name' used by template 'lower_third'", errors)
+        self.assertIn("unknown resource 'nope'", errors)
+
+    def test_validator_is_compiled_once(self):
+        from ae_automation.mixins.types import config_validator
+
+        self.assertIs(config_validator(), config_validator())
+
+    def test_start_fails_before_launching_ae(self):
+        from unittest.mock import patch
+
+        from ae_automation import Client
+        from ae_automation.exceptions import ConfigValidationError
+
+        del self.config["timeline"][0]["template_comp"]
+        with patch("ae_automation.backends.AfterEffectsBackend.open_project") as mock_open:
+            with self.assertRaises(ConfigValidationError):
+                Client().startAfterEffect(self.config)
+        mock_open.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,185 @@
+"""
+Unit tests for the distributed coordinator/worker protocol
+
+Runs a real coordinator on a local port and several worker agents with a
+stub runner in place of After Effects.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from werkzeug.serving import make_server
+
+from ae_automation import Client
+from ae_automation.distributed import Coordinator, Worker, load_runner
+from ae_automation.exceptions import CoordinatorError
+from ae_automation.job_store import JobStore
+
+TOKEN = "test-token"  # noqa: S105
+
+
+def stub_runner(config_path, token):
+    """Stand-in for startBot: 'renders' for the time the config asks for."""
+    with open(config_path) as fh:
+        config = json.load(fh)
+    token.sleep(config.get("seconds", 0.05))
+    if config.get("fail"):
+        raise RuntimeError("stub render failed")
+    return {"outputs": {"mp4": [config_path + ".mp4"]}}
+
+
+class CoordinatorTestCase(unittest.TestCase):
+    lease_seconds = 1.0
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.work_dir, "batch.db"))
+        client = Client()
+        client._batch_store = self.store
+        self.coordinator = Coordinator(client, lease_seconds=self.lease_seconds, token=TOKEN)
+        self.server = make_server("127.0.0.1", 0, self.coordinator.app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.coordinator.stop_reaper()
+        self.server.shutdown()
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _config(self, name, **content):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "w") as fh:
+            json.dump({"name": name, **content}, fh)
+        return path
+
+    def _worker(self, name, runner=stub_runner, **kwargs):
+        return Worker(self.url, runner=runner, name=name, poll_interval=0.05, token=TOKEN, **kwargs)
+
+
+class TestCoordinatorWorkers(CoordinatorTestCase):
+    """Test leasing, results and revocation across local workers"""
+
+    def test_several_workers_drain_the_queue(self):
+        configs = [self._config(f"job{i}.json", seconds=0.1) for i in range(6)]
+        configs.append(self._config("bad.json", fail=True))
+        status, _ = self._worker("w0")._request("/api/jobs", {"configs": configs})
+        self.assertEqual(status, 200)
+
+        workers = [self._worker(f"w{i}") for i in range(3)]
+        counts = {}
+        threads = [
+            threading.Thread(target=lambda w=w: counts.__setitem__(w.name, w.run(exit_when_idle=True))) for w in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        self.assertEqual(sum(counts.values()), 7)
+        self.assertGreater(sum(1 for n in counts.values() if n), 1)
+        jobs = {job["config"]: job for job in self.store.jobs()}
+        self.assertEqual(jobs[configs[0]]["state"], "success")
+        self.assertEqual(jobs[configs[0]]["result"]["outputs"]["mp4"], [configs[0] + ".mp4"])
+        self.assertIn(jobs[configs[0]]["worker"], counts)
+        self.assertEqual((jobs[configs[-1]]["state"], jobs[configs[-1]]["error"]), ("error", "stub render failed"))
+
+    def test_token_required(self):
+        status, body = Worker(self.url, token="x" + TOKEN)._request("/api/status")
+        self.assertEqual(status, 401)
+        self.assertIn("X-AE-Token", body["error"])
+
+    def test_silent_worker_loses_lease(self):
+        job_id = self.store.enqueue(self._config("a.json"))
+        silent = self._worker("silent")
+        status, body = silent._request("/api/lease", {"worker": "silent"})
+        self.assertEqual(body["job"]["id"], job_id)
+
+        time.sleep(self.lease_seconds + 0.2)
+        # Another node picks the job up once the lease has expired
+        self.assertTrue(self._worker("w1").run_once())
+        self.assertEqual(self.store.get(job_id)["worker"], "w1")
+        self.assertEqual(self.store.get(job_id)["attempts"], 2)
+
+        status, _ = silent._request(f"/api/jobs/{job_id}/heartbeat", {"worker": "silent"})
+        self.assertEqual(status, 409)
+        status, _ = silent._request(
+            f"/api/jobs/{job_id}/complete", {"worker": "silent", "state": "error", "error": "late"}
+        )
+        self.assertEqual(status, 409)
+        self.assertEqual(self.store.get(job_id)["state"], "success")
+
+    def test_revoked_worker_cancels_its_run(self):
+        job_id = self.store.enqueue(self._config("a.json", seconds=30))
+        started = threading.Event()
+
+        def slow_runner(path, token):
+            started.set()
+            return stub_runner(path, token)
+
+        worker = self._worker("w1", runner=slow_runner)
+        thread = threading.Thread(target=worker.run_once)
+        thread.start()
+        self.assertTrue(started.wait(5))
+        self.store.release(job_id, "w1")  # coordinator reassigns the job
+
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.store.get(job_id)["state"], "pending")
+
+    def test_reaper_revokes_without_polling(self):
+        job_id = self.store.enqueue(self._config("a.json"))
+        self.coordinator.lease("gone")
+        self.coordinator.start_reaper(interval=0.05)
+        deadline = time.time() + 5
+        while self.store.get(job_id)["state"] != "pending" and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.store.get(job_id)["state"], "pending")
+
+    def test_worker_without_shared_storage_gets_config_copy(self):
+        path = self._config("a.json")
+        with open(path) as fh:
+            text = fh.read()
+        self.store.enqueue(path)
+        job = self.coordinator.lease("w1")
+        os.remove(path)  # the path only exists on the coordinator
+
+        seen = []
+        worker = self._worker("w1", runner=lambda p, token: seen.append(p) or {}, work_dir=self.work_dir)
+        worker._run_job(job)
+
+        self.assertNotEqual(seen[0], path)
+        with open(seen[0]) as fh:
+            self.assertEqual(fh.read(), text)
+
+
+class TestWorkerHelpers(unittest.TestCase):
+    """Test runner loading and connection errors"""
+
+    def test_load_runner(self):
+        self.assertIs(load_runner("json:dumps"), json.dumps)
+        with self.assertRaises(ValueError):
+            load_runner("json")
+
+    def test_rejects_non_http_url(self):
+        with self.assertRaises(ValueError):
+            Worker("file:///etc/passwd")
+
+    def test_unreachable_coordinator(self):
+        worker = Worker("http://127.0.0.1:9", poll_interval=0)
+        with self.assertRaises(CoordinatorError):
+            worker.run_once()
+        self.assertEqual(worker.run(exit_when_idle=True), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Unit tests for the JSON-patch undo history
+"""
+
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation.edit_history import EditHistory, PatchError, apply_patch, diff, diff_with_inverse
+
+
+def _project(scenes):
+    return {
+        "project": {"comp_name": "Main", "resources": []},
+        "timeline": [{"template_comp": "Intro", "duration": 5, "title": f"Scene {i}"} for i in range(scenes)],
+    }
+
+
+class TestDiff(unittest.TestCase):
+    """Test patch generation and application"""
+
+    def _round_trip(self, old, new):
+        ops = diff(old, new)
+        self.assertEqual(apply_patch(copy.deepcopy(old), ops), new)
+        return ops
+
+    def test_equal_documents_have_no_ops(self):
+        self.assertEqual(diff(_project(3), _project(3)), [])
+
+    def test_nested_value_change_is_one_replace(self):
+        new = _project(100)
+        new["timeline"][42]["title"] = "Edited"
+        ops = self._round_trip(_project(100), new)
+        self.assertEqual(ops, [{"op": "replace", "path": "/timeline/42/title", "value": "Edited"}])
+
+    def test_inserted_scene_is_one_add(self):
+        new = _project(100)
+        new["timeline"].insert(0, {"template_comp": "Outro"})
+        ops = self._round_trip(_project(100), new)
+        self.assertEqual(ops, [{"op": "add", "path": "/timeline/0", "value": {"template_comp": "Outro"}}])
+
+    def test_removed_scenes_and_keys(self):
+        new = _project(10)
+        del new["timeline"][3:6]
+        del new["project"]["resources"]
+        new["project"]["a/b~c"] = 1
+        ops = self._round_trip(_project(10), new)
+        self.assertIn({"op": "add", "path": "/project/a~1b~0c", "value": 1}, ops)
+
+    def test_type_change_and_root_replace(self):
+        self._round_trip({"a": [1, 2]}, {"a": {"b": 1}})
+        self._round_trip([1], {"a": 1})
+
+    def test_inverse_restores_the_old_document(self):
+        old = _project(10)
+        new = copy.deepcopy(old)
+        new["timeline"][2]["title"] = "Edited"
+        del new["timeline"][4:7]
+        new["timeline"].insert(5, {"template_comp": "Outro"})
+        new["timeline"][7]["extra"] = [1, 2]
+        del new["project"]["resources"]
+        new["project"]["comp_name"] = {"nested": True}
+        ops, inverse = diff_with_inverse(old, new)
+        self.assertEqual(ops, diff(old, new))
+        patched = apply_patch(copy.deepcopy(old), ops)
+        self.assertEqual(patched, new)
+        self.assertEqual(apply_patch(patched, inverse), old)
+
+    def test_json_types_are_not_conflated(self):
+        for old, new in (
+            ({"a": 1}, {"a": True}),
+            ({"a": 0}, {"a": False}),
+            ({"a": 1}, {"a": 1.0}),
+            ([1, {"on": True}, 3], [1, {"on": 1}, 3]),
+            ([True, 2, 3, 4], [1, 2, 3, 4]),
+            ([1, 2, 3, False], [1, 2, 3, 0]),
+        ):
+            ops, inverse = diff_with_inverse(old, new)
+            self.assertTrue(ops, (old, new))
+            patched = apply_patch(copy.deepcopy(old), ops)
+            self.assertEqual(json.dumps(patched), json.dumps(new))
+            self.assertEqual(json.dumps(apply_patch(patched, inverse)), json.dumps(old))
+
+    def test_bad_path_raises(self):
+        with self.assertRaises(PatchError):
+            apply_patch({"a": []}, [{"op": "replace", "path": "/a/3", "value": 1}])
+        with self.assertRaises(PatchError):
+            apply_patch({}, [{"op": "remove", "path": "/missing"}])
+
+
+class TestEditHistory(unittest.TestCase):
+    """Test undo/redo, checkpoints and the caps"""
+
+    def _edit(self, history, data, n):
+        new = copy.deepcopy(data)
+        new["timeline"][n % len(new["timeline"])]["title"] = f"Edit {n}"
+        history.record(data, new)
+        return new
+
+    def test_undo_redo_round_trip(self):
+        states = [_project(20)]
+        history = EditHistory(states[0], checkpoint_every=3)
+        for n in range(7):
+            states.append(self._edit(history, states[-1], n))
+        data = copy.deepcopy(states[-1])
+        for expected in reversed(states[:-1]):
+            data = history.undo(data)
+            self.assertEqual(data, expected)
+        self.assertFalse(history.can_undo)
+        for expected in states[1:]:
+            data = history.redo(data)
+            self.assertEqual(data, expected)
+        self.assertFalse(history.can_redo)
+
+    def test_new_edit_discards_redo_branch(self):
+        data = _project(5)
+        history = EditHistory(data)
+        data = self._edit(history, data, 0)
+        data = self._edit(history, data, 1)
+        data = history.undo(data)
+        self._edit(history, data, 2)
+        self.assertEqual(len(history), 2)
+        self.assertFalse(history.can_redo)
+
+    def test_bool_edit_can_be_undone(self):
+        history = EditHistory({"project": {"loop": 1}})
+        self.assertTrue(history.record({"project": {"loop": 1}}, {"project": {"loop": True}}))
+        self.assertEqual(json.dumps(history.undo({"project": {"loop": True}})), '{"project": {"loop": 1}}')
+
+    def test_equal_update_is_not_recorded(self):
+        history = EditHistory(_project(2))
+        self.assertFalse(history.record(_project(2), _project(2)))
+        self.assertFalse(history.can_undo)
+
+    def test_patches_are_small(self):
+        data = _project(2000)
+        history = EditHistory(data, checkpoint_every=1000)
+        base = history.size_bytes
+        for n in range(50):
+            data = self._edit(history, data, n)
+        # 50 deltas take far less than a single snapshot of the project
+        self.assertLess(history.size_bytes - base, len(json.dumps(data)) / 2)
+
+    def test_entry_cap_drops_oldest_blocks(self):
+        data = _project(10)
+        history = EditHistory(data, max_entries=10, checkpoint_every=4)
+        for n in range(30):
+            data = self._edit(history, data, n)
+        self.assertLessEqual(len(history), 10 + 4)
+        # The oldest state left is a checkpoint, and undo still reaches it exactly
+        expected = history.state_at(0)
+        while history.can_undo:
+            data = history.undo(data)
+        self.assertEqual(data, expected)
+
+    def test_memory_cap(self):
+        data = _project(200)
+        history = EditHistory(data, max_bytes=len(json.dumps(data)) * 3, checkpoint_every=5)
+        for n in range(200):
+            data = self._edit(history, data, n)
+        self.assertLess(len(history), 200)
+        self.assertEqual(history.size_bytes, len(history._base) + sum(step.size for step in history._steps))
+        self.assertLessEqual(history.size_bytes, len(json.dumps(data)) * 3 + 5 * 200)
+
+    def test_diverged_document_is_rebuilt_from_checkpoint(self):
+        states = [_project(5)]
+        history = EditHistory(states[0], checkpoint_every=2)
+        for n in range(3):
+            states.append(self._edit(history, states[-1], n))
+        # Someone removed the scenes the last edit touched
+        diverged = {"project": {}, "timeline": []}
+        self.assertEqual(history.undo(diverged), states[2])
+
+    def test_nothing_to_undo(self):
+        with self.assertRaises(IndexError):
+            EditHistory({}).undo({})
+
+
+if __name__ == "__main__":
+    unittest.main()
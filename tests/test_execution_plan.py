@@ -0,0 +1,255 @@
+"""
+Unit tests for the custom action execution plan
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.exceptions import ConfigValidationError
+from ae_automation.execution_plan import (
+    Operation,
+    drop_redundant_edits,
+    group_by_comp,
+    lower_config,
+    merge_adjacent_edits,
+)
+from ae_automation.mixins.tools import ToolsMixin
+
+SLUG = ToolsMixin().slug
+
+
+def _edit(comp, layer, prop, value):
+    return {
+        "change_type": "update_layer_property",
+        "comp_name": comp,
+        "layer_name": layer,
+        "property_name": prop,
+        "value": value,
+    }
+
+
+def _config(actions, templates=None):
+    return {
+        "project": {},
+        "timeline": [{"template_comp": "Intro", "startTime": 0, "duration": 5, "custom_actions": actions}],
+        "templates": templates or {},
+    }
+
+
+def _op(kind, comp, **args):
+    return Operation(kind, 0, comp, args)
+
+
+class TestLowering(unittest.TestCase):
+    """Test how config actions become resolved operations"""
+
+    def test_comp_names_are_slugged_once(self):
+        plan = lower_config(_config([_edit("Title Card", "Text", "Source Text", "Hi")]), SLUG)
+        op = plan.operations[0]
+        self.assertEqual(op.comp, "scene-1-title-card")
+        self.assertEqual(op.args, {"layer": "Text", "property": "Source Text", "value": "Hi"})
+
+    def test_color_values_are_converted(self):
+        action = dict(_edit("Intro", "BG", "Color", "#FF0000"), property_type="color")
+        plan = lower_config(_config([action]), SLUG, color=lambda value: "rgba:" + value)
+        self.assertEqual(plan.operations[0].args["value"], "rgba:#FF0000")
+        self.assertEqual(action["value"], "#FF0000")
+
+    def test_nested_templates_are_expanded(self):
+        templates = {
+            "title": [_edit("{comp}", "Text", "Source Text", "{text}")],
+            "card": [
+                {"change_type": "template", "template_name": "title", "template_values": {"comp": "Card", "text": "A"}},
+                _edit("Card", "BG", "Opacity", "{opacity}"),
+            ],
+        }
+        action = {"change_type": "template", "template_name": "card", "template_values": {"opacity": 50}}
+        plan = lower_config(_config([action], templates), SLUG)
+        self.assertEqual(plan.lowered, 2)
+        self.assertEqual([op.args["value"] for op in plan], ["A", 50])
+        self.assertEqual({op.comp for op in plan}, {"scene-1-card"})
+
+    def test_placeholder_names_are_not_limited_to_word_characters(self):
+        templates = {
+            "title": [_edit("Intro", "Text", "Source Text", "{hero-title}"), _edit("Intro", "Sub", "Text", "{line 1}")]
+        }
+        action = {
+            "change_type": "template",
+            "template_name": "title",
+            "template_values": {"hero-title": "A", "line 1": "B"},
+        }
+        plan = lower_config(_config([action], templates), SLUG)
+        self.assertEqual([op.args["value"] for op in plan], ["A", "B"])
+
+    def test_recursive_template_raises(self):
+        templates = {"loop": [{"change_type": "template", "template_name": "loop"}]}
+        action = {"change_type": "template", "template_name": "loop"}
+        with self.assertRaises(ConfigValidationError):
+            lower_config(_config([action], templates), SLUG)
+
+    def test_add_comp_targets_scene_comp(self):
+        action = {"change_type": "add_comp", "comp_name": "Lower Third", "startTime": 1, "duration": 2}
+        op = lower_config(_config([action]), SLUG).operations[0]
+        self.assertEqual(op.comp, "scene-1-intro")
+        self.assertEqual(op.args["source"], "Lower Third")
+        self.assertEqual(op.args["folder"], "scene-1")
+
+
+class TestPasses(unittest.TestCase):
+    """Test the optimization passes"""
+
+    def test_overwritten_edit_is_dropped(self):
+        ops = [
+            _op("update_layer_property", "a", layer="T", property="Text", value="1"),
+            _op("update_layer_property", "b", layer="T", property="Text", value="x"),
+            _op("update_layer_property", "a", layer="T", property="Text", value="2"),
+        ]
+        result = drop_redundant_edits(ops)
+        self.assertEqual([op.args["value"] for op in result], ["x", "2"])
+
+    def test_keyframe_on_same_comp_keeps_earlier_edit(self):
+        ops = [
+            _op("update_layer_property", "a", layer="T", property="Opacity", value=1),
+            _op("update_layer_property_at_frame", "a", layer="T", property="Opacity", value=0, frame=10),
+            _op("update_layer_property", "a", layer="T", property="Opacity", value=2),
+        ]
+        self.assertEqual(len(drop_redundant_edits(ops)), 3)
+
+    def test_group_keeps_per_comp_order_and_respects_barriers(self):
+        ops = [
+            _op("update_layer_property", "a", layer="1", property="p", value=1),
+            _op("update_layer_property", "b", layer="1", property="p", value=2),
+            _op("update_layer_property", "a", layer="2", property="p", value=3),
+            _op("add_comp", "scene", source="x", folder="f", start=0, duration=1),
+            _op("update_layer_property", "b", layer="3", property="p", value=4),
+            _op("update_layer_property", "a", layer="3", property="p", value=5),
+        ]
+        result = group_by_comp(ops)
+        self.assertEqual([op.comp for op in result], ["a", "a", "b", "scene", "b", "a"])
+        self.assertEqual([op.args.get("value") for op in result], [1, 3, 2, None, 4, 5])
+
+    def test_adjacent_edits_merge(self):
+        ops = [
+            _op("update_layer_property", "a", layer="1", property="p", value=1),
+            _op("update_layer_property", "a", layer="2", property="p", value=2),
+            _op("update_layer_property", "a", layer="3", property="p", value=3),
+            _op("update_layer_property", "b", layer="1", property="p", value=4),
+        ]
+        result = merge_adjacent_edits(ops)
+        self.assertEqual([op.kind for op in result], ["update_layer_properties", "update_layer_property"])
+        self.assertEqual([edit["layer"] for edit in result[0].args["edits"]], ["1", "2", "3"])
+
+    def test_passes_do_not_cross_scenes(self):
+        data = _config([_edit("A", "T", "p", 1)])
+        data["timeline"].append(dict(data["timeline"][0], custom_actions=[_edit("A", "T", "p", 2)]))
+        plan = lower_config(data, SLUG).optimize()
+        self.assertEqual([(op.scene, op.comp) for op in plan], [(0, "scene-1-a"), (1, "scene-2-a")])
+
+
+class TestExecutePlan(unittest.TestCase):
+    """Test that the client runs planned operations"""
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_merged_edits_run_as_one_bulk_command(self):
+        data = _config([_edit("A", "T1", "p", 1), _edit("A", "T2", "p", 2), _edit("A", "T1", "p", 3)])
+        plan = self.client.buildExecutionPlan(data)
+        with patch.object(Client, "editCompBulk") as bulk, patch.object(Client, "editComp") as edit:
+            self.client.executePlan(plan.scene(0))
+        bulk.assert_called_once_with("scene-1-a", [("T2", "p", 2), ("T1", "p", 3)])
+        edit.assert_not_called()
+
+    def test_consecutive_swaps_open_comp_once(self):
+        swap = {
+            "change_type": "swap_items_by_index",
+            "comp_name": "A",
+            "layer_index": 1,
+            "layer_name": "img",
+            "fit_to_screen": False,
+            "fit_to_screen_width": False,
+            "fit_to_screen_height": False,
+        }
+        plan = self.client.buildExecutionPlan(_config([swap, dict(swap, layer_index=2)]))
+        self.client.setScriptBackend(MagicMock())
+        with patch.object(Client, "openItemByName") as open_item, patch.object(Client, "selectItemByName"):
+            with patch.object(Client, "selectLayerByIndex"):
+                self.client.executePlan(plan)
+        open_item.assert_called_once_with("scene-1-a")
+
+    def test_parse_custom_actions_still_runs_single_action(self):
+        self.client.afterEffectResource = [{"name": "music", "duration": 12.5}]
+        action = {
+            "change_type": "add_resource",
+            "comp_name": "A",
+            "resource_name": "music",
+            "startTime": 0,
+            "duration": 0,
+        }
+        with patch.object(Client, "addResourceToTimeline") as add:
+            self.client.parseCustomActions(action, "scene-1", {"template_comp": "Intro"}, {"templates": {}})
+        add.assert_called_once_with("music", "scene-1-a", 0, 12.5, moveToEnd="false")
+
+
+class TestEditCompBulk(unittest.TestCase):
+    """Test the batched update_properties_bulk.jsx command"""
+
+    def setUp(self):
+        self.client = Client()
+        self.cache = tempfile.mkdtemp()
+        self._cache_patch = patch.object(settings, "CACHE_FOLDER", self.cache)
+        self._cache_patch.start()
+
+    def tearDown(self):
+        self._cache_patch.stop()
+        shutil.rmtree(self.cache, ignore_errors=True)
+
+    def _run(self, edits, results):
+        def fake_run(fileName, replacements=None, debug=False):
+            self.replacements = replacements
+            if results is not None:
+                with open(os.path.join(self.cache, "update_properties_bulk.json"), "w", encoding="utf-8") as f:
+                    json.dump(results, f)
+
+        with patch.object(Client, "runScript", side_effect=fake_run) as run:
+            flags = self.client.editCompBulk("scene-1-a", edits)
+        return run, flags
+
+    def test_one_script_run_with_all_edits(self):
+        run, flags = self._run(
+            [("Title", "Text.Source Text", 'Say "hi"<br>there'), ("BG", "Opacity", 50)],
+            [{"ok": True}, {"ok": False, "error": "Layer not found: BG"}],
+        )
+        run.assert_called_once()
+        self.assertEqual(run.call_args[0][0], "update_properties_bulk.jsx")
+        payload = json.loads(self.replacements["{edits}"])
+        self.assertEqual(payload[0], {"layer": "Title", "property": "Text.Source Text", "value": 'Say "hi"\rthere'})
+        self.assertEqual(payload[1]["value"], "50")
+        self.assertEqual(flags, [True, False])
+
+    def test_missing_result_marks_every_edit_failed(self):
+        open(os.path.join(self.cache, "update_properties_bulk.json"), "w").write('[{"ok": true}]')
+        _, flags = self._run([("A", "p", 1), ("B", "p", 2)], None)
+        self.assertEqual(flags, [False, False])
+
+    def test_truncated_result_pads_with_failures(self):
+        _, flags = self._run([("A", "p", 1), ("B", "p", 2)], [{"ok": True}])
+        self.assertEqual(flags, [True, False])
+
+    def test_no_edits_skips_script(self):
+        run, flags = self._run([], [])
+        run.assert_not_called()
+        self.assertEqual(flags, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
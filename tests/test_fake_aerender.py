@@ -0,0 +1,72 @@
+"""
+Unit tests for the fake aerender executable
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, fake_aerender, settings
+from ae_automation.exceptions import RenderError
+from ae_automation.render import build_aerender_command
+
+
+@unittest.skipIf(sys.platform == "win32", "Launcher relies on a shebang")
+class TestFakeAerender(unittest.TestCase):
+    """Test the fake through the real render executor"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.aerender = fake_aerender.install(self.tmp)
+        self._patches = [
+            patch.object(settings, "AERENDER_PATH", self.aerender),
+            patch.dict(os.environ, {"FAKE_AERENDER_MEDIA": "dummy"}),
+        ]
+        for p in self._patches:
+            p.start()
+        self.client = Client()
+        self.output = os.path.join(self.tmp, "out", "Main.mp4")
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _render(self, **kwargs):
+        events = []
+        command = build_aerender_command("project.aep", "Main", self.output, **kwargs)
+        self.client.runCommand(command, on_event=events.append)
+        return events
+
+    def test_progress_is_parsed_from_frame_range(self):
+        events = self._render(start_frame=10, end_frame=69)
+        frames = [event for event in events if event.kind == "frame"]
+        self.assertEqual(len(frames), 60)
+        self.assertEqual(frames[-1].total_frames, 60)
+        self.assertEqual(events[-1].percent, 100)
+        self.assertTrue(os.path.isfile(self.output))
+
+    def test_stderr_lines_become_warnings(self):
+        with patch.dict(os.environ, {"FAKE_AERENDER_FRAMES": "20", "FAKE_AERENDER_STDERR_EVERY": "5"}):
+            events = self._render()
+        self.assertEqual(sum(1 for event in events if event.kind == "warning"), 4)
+
+    def test_exit_code_raises_render_error(self):
+        with patch.dict(os.environ, {"FAKE_AERENDER_FRAMES": "2", "FAKE_AERENDER_EXIT_CODE": "3"}):
+            with self.assertRaises(RenderError) as ctx:
+                self._render()
+        self.assertIn("render failed with code 3", str(ctx.exception))
+
+    def test_timecode(self):
+        self.assertEqual(fake_aerender.timecode(300, 30), "0:00:10:00")
+        self.assertEqual(fake_aerender.timecode(30 * 3661 + 5, 30), "1:01:01:05")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,305 @@
+"""
+Unit tests for the durable SQLite batch queue
+"""
+
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client
+from ae_automation.job_store import JobStore, estimate_job_cost, parse_deadline
+
+DEAD_WORKER = f"{socket.gethostname()}:999999999"
+
+
+class JobStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.work_dir, "batch.db")
+        self.store = JobStore(self.db_path, max_attempts=2)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _config(self, name, content=None):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "w") as fh:
+            json.dump(content if content is not None else {"name": name}, fh)
+        return path
+
+
+class TestJobStore(JobStoreTestCase):
+    """Test job states, claiming and crash recovery"""
+
+    def test_lifecycle(self):
+        job_id = self.store.enqueue("a.json")
+        job = self.store.claim_next("w1")
+        self.assertEqual((job["id"], job["state"], job["attempts"]), (job_id, "running", 1))
+        self.assertIsNone(self.store.claim_next("w1"))
+
+        self.store.finish(job_id, "success", result={"outputs": {"gif": ["a.gif"]}})
+        job = self.store.get(job_id)
+        self.assertEqual(job["state"], "success")
+        self.assertEqual(job["result"]["outputs"]["gif"], ["a.gif"])
+        self.assertIsNotNone(job["finished_at"])
+
+    def test_jobs_join_open_batch(self):
+        first = self.store.get(self.store.enqueue("a.json"))
+        second = self.store.get(self.store.enqueue("b.json"))
+        self.assertEqual(first["batch_id"], second["batch_id"])
+
+        for _ in range(2):
+            self.store.finish(self.store.claim_next()["id"], "success")
+        third = self.store.get(self.store.enqueue("c.json"))
+        self.assertNotEqual(third["batch_id"], first["batch_id"])
+
+    def test_concurrent_claims_never_share_a_job(self):
+        for i in range(40):
+            self.store.enqueue(f"{i}.json")
+        claimed = []
+
+        def worker():
+            store = JobStore(self.db_path)
+            while (job := store.claim_next()) is not None:
+                claimed.append(job["id"])
+            store.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claimed), sorted(set(claimed)))
+        self.assertEqual(len(claimed), 40)
+
+    def test_requeue_stale_respects_max_attempts(self):
+        job_id = self.store.enqueue("a.json")
+        self.store.claim_next(DEAD_WORKER)
+        self.assertEqual(self.store.requeue_stale(), 1)
+        self.assertEqual(self.store.get(job_id)["state"], "pending")
+
+        self.store.claim_next(DEAD_WORKER)
+        self.assertEqual(self.store.requeue_stale(), 0)
+        job = self.store.get(job_id)
+        self.assertEqual(job["state"], "error")
+        self.assertIn("Abandoned", job["error"])
+
+    def test_live_worker_is_not_requeued(self):
+        self.store.enqueue("a.json")
+        self.store.claim_next()  # this process
+        self.assertEqual(self.store.requeue_stale(), 0)
+
+    def test_other_process_can_enqueue(self):
+        self.store.enqueue("a.json")
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from ae_automation.job_store import JobStore;"
+            "JobStore(sys.argv[2]).enqueue('b.json')"
+        )
+        subprocess.run([sys.executable, "-c", code, str(Path(__file__).parent.parent), self.db_path], check=True)
+        self.assertEqual([job["config"] for job in self.store.jobs()], ["a.json", "b.json"])
+
+
+class TestScheduling(JobStoreTestCase):
+    """Test priority, earliest-deadline-first and shortest-job-first with aging"""
+
+    def _next_config(self):
+        return self.store.claim_next()["config"]
+
+    def test_urgent_job_jumps_ahead_without_cancelling(self):
+        for name in ("bulk1", "bulk2", "bulk3"):
+            self.store.enqueue(name, est_cost=1200)
+        self.assertEqual(self._next_config(), "bulk1")
+
+        self.store.enqueue("revision", priority=10, est_cost=1200)
+        self.assertEqual(self._next_config(), "revision")
+        self.assertEqual([self._next_config() for _ in range(2)], ["bulk2", "bulk3"])
+
+    def test_earliest_deadline_first_within_class(self):
+        now = time.time()
+        self.store.enqueue("undated", est_cost=1)
+        self.store.enqueue("friday", deadline=now + 3 * 86400, est_cost=1)
+        self.store.enqueue("tomorrow", deadline=now + 86400, est_cost=1)
+        self.store.enqueue("low", priority=-1, deadline=now + 60, est_cost=1)
+        self.assertEqual([self._next_config() for _ in range(4)], ["tomorrow", "friday", "undated", "low"])
+
+    def test_short_jobs_do_not_wait_behind_long_renders(self):
+        self.store.enqueue("long", est_cost=1200)
+        self.store.enqueue("short", est_cost=30)
+        self.assertEqual(self._next_config(), "short")
+
+    def test_aging_prevents_starvation(self):
+        long_id = self.store.enqueue("long", est_cost=1200)
+        self.store.enqueue("medium", est_cost=500)
+        # Two hours in the queue make the long job's cost count a third
+        self.store._conn().execute("UPDATE jobs SET created_at = created_at - 7200 WHERE id = ?", (long_id,))
+        with patch("ae_automation.job_store.settings.BATCH_AGING_SECONDS", 3600):
+            self.assertEqual(self._next_config(), "long")
+
+    def test_cost_estimated_from_config(self):
+        path = os.path.join(self.work_dir, "job.json")
+        with open(path, "w") as fh:
+            json.dump(
+                {
+                    "project": {"outputs": ["gif", "webm"]},
+                    "timeline": [{"startTime": 0, "duration": 5}, {"startTime": 5, "duration": 15}],
+                },
+                fh,
+            )
+        self.assertEqual(estimate_job_cost(path), 30.0)
+        self.assertIsNone(estimate_job_cost(os.path.join(self.work_dir, "missing.json")))
+        self.assertEqual(self.store.get(self.store.enqueue(path))["est_cost"], 30.0)
+
+    def test_parse_deadline(self):
+        self.assertEqual(parse_deadline(1700000000), 1700000000.0)
+        self.assertEqual(parse_deadline("2026-10-20T09:00:00+00:00"), 1792486800.0)
+        self.assertIsNone(parse_deadline(None))
+
+    def test_existing_database_is_migrated(self):
+        legacy = os.path.join(self.work_dir, "legacy.db")
+        conn = sqlite3.connect(legacy)
+        conn.execute(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, config TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL DEFAULT 3, error TEXT, result TEXT, worker TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        conn.execute("INSERT INTO jobs (batch_id, config, created_at) VALUES ('b', 'old.json', 0)")
+        conn.commit()
+        conn.close()
+
+        store = JobStore(legacy)
+        job = store.claim_next()
+        self.assertEqual((job["config"], job["priority"], job["deadline"]), ("old.json", 0, None))
+        store.close()
+
+
+class TestBatchQueueMixin(JobStoreTestCase):
+    """Test BatchQueueMixin on top of the job store"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.client._batch_store = self.store
+
+    def _run(self, side_effect=None):
+        with patch.object(Client, "startBot", side_effect=side_effect) as mock_start:
+            self.client.start_batch()
+            if self.client._batch_thread is not None:
+                self.client._batch_thread.join(timeout=30)
+        return mock_start
+
+    def test_queue_and_status(self):
+        a, b = self._config("a.json"), self._config("b.json")
+        self.assertEqual(self.client.queue_config(a), 1)
+        self.assertEqual(self.client.queue_configs([b]), 2)
+
+        def fail_on_b(path):
+            if path == b:
+                raise RuntimeError("boom")
+
+        self._run(fail_on_b)
+        status = self.client.get_batch_status()
+        self.assertFalse(status["running"])
+        self.assertEqual((status["current"], status["total"]), (2, 2))
+        self.assertEqual([r["status"] for r in status["results"]], ["success", "error"])
+        self.assertEqual(status["results"][1]["error"], "boom")
+        for key in ("config", "started_at", "finished_at"):
+            self.assertIn(key, status["results"][0])
+
+    def test_interrupted_job_resumes_after_restart(self):
+        a = self._config("a.json")
+        job_id = self.store.enqueue(a)
+        self.store.claim_next(DEAD_WORKER)  # simulated crash mid-job
+
+        mock_start = self._run()
+
+        mock_start.assert_called_once_with(a)
+        job = self.store.get(job_id)
+        self.assertEqual((job["state"], job["attempts"]), ("success", 2))
+
+    def test_cancel_drops_pending(self):
+        self.client.queue_configs([self._config("a.json"), self._config("b.json")])
+        self.client.cancel_batch()
+        mock_start = self._run()
+        mock_start.assert_not_called()
+        self.assertEqual([r["status"] for r in self.client.get_batch_status()["results"]], ["cancelled"] * 2)
+
+
+class TestCoalescing(JobStoreTestCase):
+    """Test that identical pending jobs share one run"""
+
+    def test_store_links_duplicates(self):
+        first = self.store.enqueue("a.json", fingerprint="f1", priority=0)
+        second = self.store.enqueue("b.json", fingerprint="f1", priority=5, deadline=100.0)
+        other = self.store.enqueue("c.json", fingerprint="f2")
+
+        self.assertEqual(self.store.get(second)["coalesced_into"], first)
+        self.assertIsNone(self.store.get(other)["coalesced_into"])
+        primary = self.store.get(first)
+        self.assertEqual((primary["priority"], primary["deadline"]), (5, 100.0))
+
+        job = self.store.claim_next("w1")
+        self.assertEqual(job["id"], first)
+        self.assertEqual(self.store.get(second)["state"], "running")
+        self.store.finish(first, "success", result={"outputs": {"gif": ["a.gif"]}})
+        self.assertEqual(self.store.claim_next("w1")["id"], other)
+
+        follower = self.store.get(second)
+        self.assertEqual(follower["state"], "success")
+        self.assertEqual(follower["result"], {"outputs": {"gif": ["a.gif"]}})
+
+    def test_running_job_is_not_coalesced(self):
+        first = self.store.enqueue("a.json", fingerprint="f1")
+        self.store.claim_next("w1")
+        second = self.store.enqueue("a.json", fingerprint="f1")
+        self.assertIsNone(self.store.get(second)["coalesced_into"])
+        self.assertEqual(self.store.claim_next("w1")["id"], second)
+        self.assertEqual(self.store.get(first)["state"], "running")
+
+    def test_stale_primary_requeues_followers(self):
+        first = self.store.enqueue("a.json", fingerprint="f1")
+        second = self.store.enqueue("a.json", fingerprint="f1")
+        self.store.claim_next(DEAD_WORKER)
+        self.store.requeue_stale()
+        self.assertEqual([self.store.get(i)["state"] for i in (first, second)], ["pending", "pending"])
+
+    def test_batch_runs_duplicate_configs_once(self):
+        client = Client()
+        client._batch_store = self.store
+        os.makedirs(os.path.join(self.work_dir, "sub"))
+        project = {"project": {"project_file": "p.aep", "output_dir": "out"}}
+        a = self._config("a.json", project)
+        b = self._config("b.json", project)
+        # Same text, but relative paths resolve elsewhere
+        c = self._config(os.path.join("sub", "c.json"), project)
+
+        client.queue_configs([a, b, c])
+        with patch.object(Client, "startBot") as mock_start:
+            client.start_batch()
+            client._batch_thread.join(timeout=30)
+
+        self.assertEqual(sorted(call.args[0] for call in mock_start.call_args_list), [a, c])
+        results = client.get_batch_status()["results"]
+        self.assertEqual([r["status"] for r in results], ["success"] * 3)
+        by_config = {r["config"]: r for r in results}
+        self.assertEqual(by_config[b]["coalesced_into"], by_config[a]["id"])
+        self.assertEqual(by_config[b]["stages"], by_config[a]["stages"])
+
+
+if __name__ == "__main__":
+    unittest.main()
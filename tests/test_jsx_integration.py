@@ -23,6 +23,7 @@ class TestJSXScripts(unittest.TestCase):
             "create_folder.jsx",
             "addComp.jsx",
             "update_properties.jsx",
+            "update_properties_bulk.jsx",
             "update_properties_frame.jsx",
             "add_resource.jsx",
             "add_marker.jsx",
@@ -67,6 +68,7 @@ class TestJSXScripts(unittest.TestCase):
             "create_folder.jsx": ["addFolder", "parentFolder"],
             "addComp.jsx": ["addComp", "parentFolder"],
             "update_properties.jsx": ["property", "setValue"],
+            "update_properties_bulk.jsx": ["{edits}", "setValue", "saveFile"],
         }
 
         for script_name, expected_keywords in test_cases.items():
@@ -0,0 +1,179 @@
+"""
+Unit tests for the metrics registry and /metrics endpoints
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, metrics, settings
+from ae_automation.metrics import Registry
+from ae_automation.render_cache import RenderCache
+from ae_automation.simulator import AESimulator, SimulatorBackend
+
+
+class TestRegistry(unittest.TestCase):
+    """Test the text exposition format"""
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_type_line_names_the_total_sample(self):
+        counter = self.registry.counter("ae_things_total", "Things", ["kind"])
+        counter.inc(kind="a")
+        counter.inc(2, kind='say "hi"')
+        text = self.registry.render()
+        self.assertIn("# HELP ae_things_total Things", text)
+        self.assertIn("# TYPE ae_things_total counter", text)
+        self.assertIn('ae_things_total{kind="a"} 1', text)
+        self.assertIn('ae_things_total{kind="say \\"hi\\""} 2', text)
+        with self.assertRaises(ValueError):
+            counter.inc(-1, kind="a")
+
+    def test_labels_must_match(self):
+        counter = self.registry.counter("ae_things_total", "Things", ["kind"])
+        with self.assertRaises(ValueError):
+            counter.inc()
+        with self.assertRaises(ValueError):
+            self.registry.counter("ae_things_total", "Again")
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("ae_latency_seconds", "Latency", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.observe(value)
+        text = self.registry.render()
+        self.assertIn('ae_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('ae_latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('ae_latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("ae_latency_seconds_sum 4.25", text)
+        self.assertIn("ae_latency_seconds_count 4", text)
+
+    def test_gauge_callback_is_read_at_scrape(self):
+        gauge = self.registry.gauge("ae_jobs", "Jobs", ["state"])
+        counts = {"pending": 2}
+        gauge.set_function(lambda: counts)
+        counts["running"] = 1
+        text = self.registry.render()
+        self.assertIn('ae_jobs{state="pending"} 2', text)
+        self.assertIn('ae_jobs{state="running"} 1', text)
+
+    def test_clear_keeps_gauge_callbacks(self):
+        gauge = self.registry.gauge("ae_depth", "Depth")
+        gauge.set_function(lambda: 3)
+        self.registry.clear()
+        self.assertEqual(gauge.value(), 3)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test the metrics recorded by the client"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._patches = [
+            patch.object(settings, "CACHE_FOLDER", self.tmp),
+            patch.object(settings, "QUEUE_FOLDER", os.path.join(self.tmp, "queue")),
+        ]
+        for p in self._patches:
+            p.start()
+        metrics.REGISTRY.clear()
+        self.client = Client()
+
+    def tearDown(self):
+        metrics.REGISTRY.clear()
+        for p in self._patches:
+            p.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_run_script_counts_and_times_commands(self):
+        self.client.setScriptBackend(SimulatorBackend(AESimulator({"items": []})))
+        self.client.getProjectMap()
+        self.assertEqual(metrics.COMMANDS.value(script="file_map.jsx"), 1)
+        self.assertEqual(metrics.COMMAND_LATENCY.count(script="file_map.jsx"), 1)
+
+    def test_runner_timing_is_split_into_pickup_and_execution(self):
+        os.makedirs(settings.QUEUE_FOLDER)
+        queue_file = os.path.join(settings.QUEUE_FOLDER, "cmd_1.jsx")
+        with open(os.path.join(settings.QUEUE_FOLDER, "cmd_1.timing"), "w", encoding="utf-8") as f:
+            json.dump({"seen_at": 1000250, "seen": 5000, "start": 6000, "end": 1506000, "ok": True}, f)
+        timing = self.client._read_command_timing(queue_file, "file_map.jsx", 1000.0)
+        self.assertAlmostEqual(timing["pickup"], 0.25)
+        self.assertAlmostEqual(timing["read"], 0.001)
+        self.assertAlmostEqual(timing["execute"], 1.5)
+        self.assertEqual(os.listdir(settings.QUEUE_FOLDER), [])
+        self.assertEqual(metrics.COMMAND_EXECUTION.count(script="file_map.jsx"), 1)
+        self.assertIsNone(self.client._read_command_timing(queue_file, "file_map.jsx", 1000.0))
+
+    def test_late_timing_files_are_discarded(self):
+        os.makedirs(settings.QUEUE_FOLDER)
+        for name in ("cmd_1.timing", "cmd_old.timing", "cmd_busy.timing", "cmd_busy.jsx"):
+            open(os.path.join(settings.QUEUE_FOLDER, name), "w").close()
+        old = os.path.getmtime(os.path.join(settings.QUEUE_FOLDER, "cmd_old.timing")) - 3600
+        os.utime(os.path.join(settings.QUEUE_FOLDER, "cmd_old.timing"), (old, old))
+        self.client._discard_command_timings(os.path.join(settings.QUEUE_FOLDER, "cmd_1.jsx"))
+        self.assertEqual(sorted(os.listdir(settings.QUEUE_FOLDER)), ["cmd_busy.jsx", "cmd_busy.timing"])
+
+    def test_queue_depth_counts_waiting_scripts(self):
+        os.makedirs(settings.QUEUE_FOLDER)
+        for name in ("cmd_1.jsx", "cmd_2.jsx", "cmd_3.error"):
+            open(os.path.join(settings.QUEUE_FOLDER, name), "w").close()
+        self.assertEqual(metrics.QUEUE_DEPTH.value(), 2)
+
+    def test_render_cache_hits_and_misses(self):
+        cache = RenderCache(os.path.join(self.tmp, "cache"))
+        source = os.path.join(self.tmp, "out.mp4")
+        with open(source, "wb") as f:
+            f.write(b"video")
+        dest = os.path.join(self.tmp, "copy.mp4")
+        self.assertIsNone(cache.get("key", dest))
+        cache.put("key", source)
+        self.assertEqual(cache.get("key", dest), dest)
+        self.assertEqual(metrics.RENDER_CACHE_LOOKUPS.value(result="miss"), 1)
+        self.assertEqual(metrics.RENDER_CACHE_LOOKUPS.value(result="hit"), 1)
+
+    def test_batch_jobs_by_state(self):
+        with patch.object(settings, "BATCH_DB_PATH", os.path.join(self.tmp, "jobs.db")):
+            config = os.path.join(self.tmp, "config.json")
+            with open(config, "w", encoding="utf-8") as f:
+                f.write("{}")
+            self.client.queue_config(config)
+            self.assertEqual(metrics.BATCH_JOBS.value(state="pending"), 1)
+            self.client.get_job_store().close()
+        metrics.BATCH_JOBS.set_function(None)
+
+
+class TestMetricsEndpoints(unittest.TestCase):
+    """Test /metrics on the VideoEditor and ChatPanel apps"""
+
+    def setUp(self):
+        metrics.REGISTRY.clear()
+        metrics.AE_RESTARTS.inc(reason="job")
+        self.client = Client()
+
+    def tearDown(self):
+        metrics.REGISTRY.clear()
+
+    def _check(self, app):
+        response = app.test_client().get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, metrics.CONTENT_TYPE)
+        text = response.get_data(as_text=True)
+        self.assertIn("# TYPE ae_commands_total counter", text)
+        self.assertIn('ae_restarts_total{reason="job"} 1', text)
+
+    def test_video_editor(self):
+        self._check(self.client.app)
+
+    def test_chat_panel(self):
+        self.client._init_chat()
+        self._check(self.client.chat_app)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the post-render output fan-out pipeline
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.exceptions import ConfigValidationError
+from ae_automation.job_store import JobStore
+from ae_automation.outputs import OutputPipeline, normalize_output_spec
+from ae_automation.transcode import probe_media
+
+
+class TestOutputSpecs(unittest.TestCase):
+    """Test config normalisation"""
+
+    def test_string_and_dict_specs(self):
+        self.assertEqual(normalize_output_spec("gif"), {"format": "gif", "width": 480, "fps": 12})
+        self.assertEqual(normalize_output_spec({"format": "GIF", "width": 320})["width"], 320)
+
+    def test_unknown_format_rejected(self):
+        with self.assertRaises(ConfigValidationError):
+            normalize_output_spec("avi")
+
+
+class TestMasterSnapshot(unittest.TestCase):
+    """Test that queued outputs keep reading the master they were submitted for"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.master = os.path.join(self.work_dir, "FinalComposition.mp4")
+        with open(self.master, "wb") as fh:
+            fh.write(b"render-A")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_rerendered_master_does_not_change_queued_outputs(self):
+        release = threading.Event()
+
+        def fake_render_output(master_path, spec, output_dir, source_path=None):
+            release.wait(5)
+            with open(source_path, "rb") as fh:
+                return [fh.read().decode()]
+
+        pipeline = OutputPipeline(max_workers=1)
+        with patch("ae_automation.outputs.render_output", side_effect=fake_render_output):
+            job = pipeline.submit(self.master, ["gif", "webm"])
+            # The next job renders the same output path
+            os.remove(self.master)
+            with open(self.master, "wb") as fh:
+                fh.write(b"render-B")
+            release.set()
+            self.assertEqual(job.result(timeout=5), {"gif": ["render-A"], "webm": ["render-A"]})
+        self.assertEqual(os.listdir(self.work_dir), ["FinalComposition.mp4"])
+
+
+@unittest.skipUnless(settings.FFMPEG_PATH, "Requires ffmpeg")
+class TestOutputPipeline(unittest.TestCase):
+    """Derive real outputs from a small master render"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.master = os.path.join(self.work_dir, "FinalComposition.mp4")
+        subprocess.run(
+            [settings.FFMPEG_PATH, "-loglevel", "error", "-y", "-f", "lavfi", "-i", "testsrc=size=96x64:rate=24"]
+            + ["-f", "lavfi", "-i", "sine", "-t", "2", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac"]
+            + [self.master],
+            check=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_fan_out_produces_every_declared_output(self):
+        pipeline = OutputPipeline(max_workers=3)
+        job = pipeline.submit(
+            self.master, ["mp4", "webm", {"format": "gif", "width": 48}, {"format": "poster", "count": 3}]
+        )
+        outputs = job.result(timeout=120)
+
+        self.assertEqual(outputs["mp4"], [self.master])
+        self.assertEqual(probe_media(outputs["webm"][0]).video_codec, "vp9")
+        self.assertEqual(probe_media(outputs["gif"][0]).video_codec, "gif")
+        self.assertEqual(len(outputs["poster"]), 3)
+        for path in outputs["poster"]:
+            self.assertTrue(os.path.getsize(path) > 0)
+        self.assertEqual(pipeline.pending(), 0)
+
+    def test_batch_records_outputs_after_background_encode(self):
+        client = Client()
+        client._batch_store = JobStore(os.path.join(self.work_dir, "batch.db"))
+        config = os.path.join(self.work_dir, "job.json")
+        with open(config, "w") as fh:
+            fh.write("{}")
+
+        def fake_start_bot(_config_path):
+            client._last_output_job = client.getOutputPipeline().submit(self.master, ["gif"])
+
+        with patch.object(Client, "startBot", side_effect=fake_start_bot):
+            client.queue_config(config)
+            client.start_batch()
+            client._batch_thread.join(timeout=120)
+
+        result = client.get_batch_status()["results"][0]
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(os.path.isfile(result["outputs"]["gif"][0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
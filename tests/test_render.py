@@ -0,0 +1,249 @@
+"""
+Unit tests for split (segmented) and scene-level rendering
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.render import build_aerender_command, split_frame_range, stitch_segments
+
+
+def _flag_value(cmd, flag):
+    return cmd[cmd.index(flag) + 1] if flag in cmd else None
+
+
+class TestSplitFrameRange(unittest.TestCase):
+    """Test frame range partitioning"""
+
+    def test_segments_cover_range_exactly(self):
+        """Segments are contiguous, non-overlapping and cover every frame once"""
+        for start, end, k in [(0, 17999, 8), (0, 9, 3), (100, 250, 7), (0, 0, 1), (5, 5, 4), (0, 299, 32)]:
+            with self.subTest(start=start, end=end, k=k):
+                ranges = split_frame_range(start, end, k)
+                self.assertEqual(ranges[0][0], start)
+                self.assertEqual(ranges[-1][1], end)
+                for (_, prev_end), (next_start, _) in zip(ranges, ranges[1:]):
+                    self.assertEqual(next_start, prev_end + 1)
+                covered = sum(e - s + 1 for s, e in ranges)
+                self.assertEqual(covered, end - start + 1)
+
+    def test_segment_sizes_are_balanced(self):
+        """Segment lengths differ by at most one frame"""
+        ranges = split_frame_range(0, 99, 7)
+        sizes = [e - s + 1 for s, e in ranges]
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def test_segments_clamped_to_frame_count(self):
+        """Never produces empty segments"""
+        ranges = split_frame_range(0, 2, 10)
+        self.assertEqual(ranges, [(0, 0), (1, 1), (2, 2)])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            split_frame_range(10, 5, 2)
+        with self.assertRaises(ValueError):
+            split_frame_range(0, 10, 0)
+
+
+class TestBuildAerenderCommand(unittest.TestCase):
+    """Test aerender argument assembly"""
+
+    def test_frame_bounds_and_template(self):
+        cmd = build_aerender_command("p.aep", "Comp", "out.mp4", 10, 20, "AIFF 48kHz")
+        self.assertEqual(_flag_value(cmd, "-s"), "10")
+        self.assertEqual(_flag_value(cmd, "-e"), "20")
+        self.assertEqual(_flag_value(cmd, "-OMtemplate"), "AIFF 48kHz")
+        self.assertEqual(_flag_value(cmd, "-comp"), "Comp")
+
+    def test_full_render_has_no_bounds(self):
+        cmd = build_aerender_command("p.aep", "Comp", "out.mp4")
+        self.assertNotIn("-s", cmd)
+        self.assertNotIn("-e", cmd)
+        self.assertNotIn("-OMtemplate", cmd)
+
+
+class TestRenderFileSegments(unittest.TestCase):
+    """Test renderFile(segments=...) orchestration without aerender"""
+
+    def setUp(self):
+        self.client = Client()
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    @patch("ae_automation.mixins.afterEffect.stitch_segments")
+    @patch.object(Client, "runCommand")
+    @patch.object(settings, "validate_settings")
+    def test_segments_use_frame_exact_bounds(self, _validate, mock_run, mock_stitch):
+        """Each segment command renders exactly its slice; audio renders the whole range once"""
+        self.client.afterEffectItems = [
+            {"name": "FinalComposition", "id": 1, "type": "CompItem", "duration": 10.0, "frameRate": 30.0}
+        ]
+        with patch.object(settings, "AERENDER_AUDIO_TEMPLATE", "AIFF 48kHz"):
+            output = self.client.renderFile("p.aep", "FinalComposition", self.output_dir, segments=4)
+
+        self.assertEqual(output, os.path.join(self.output_dir, "FinalComposition.mp4"))
+        commands = [c.args[0] for c in mock_run.call_args_list]
+        video = [c for c in commands if "-OMtemplate" not in c]
+        audio = [c for c in commands if "-OMtemplate" in c]
+
+        bounds = sorted((int(_flag_value(c, "-s")), int(_flag_value(c, "-e"))) for c in video)
+        self.assertEqual(bounds, [(0, 74), (75, 149), (150, 224), (225, 299)])
+        self.assertEqual(len(audio), 1)
+        self.assertEqual((_flag_value(audio[0], "-s"), _flag_value(audio[0], "-e")), ("0", "299"))
+
+        segment_paths, stitched_output, audio_path = mock_stitch.call_args[0]
+        self.assertEqual(len(segment_paths), 4)
+        self.assertEqual(segment_paths, sorted(segment_paths))
+        self.assertEqual(stitched_output, output)
+        self.assertTrue(audio_path.endswith(".aif"))
+
+    @patch.object(settings, "validate_settings")
+    def test_segments_without_frame_range_raise(self, _validate):
+        from ae_automation.exceptions import RenderError
+
+        self.client.afterEffectItems = []
+        with self.assertRaises(RenderError):
+            self.client.renderFile("p.aep", "Missing", self.output_dir, segments=2)
+
+    @patch.object(Client, "runCommand")
+    @patch.object(settings, "validate_settings")
+    def test_single_segment_renders_once(self, _validate, mock_run):
+        self.client.renderFile("p.aep", "Comp", self.output_dir)
+        mock_run.assert_called_once()
+        self.assertNotIn("-s", mock_run.call_args[0][0])
+
+
+class TestRenderScenes(unittest.TestCase):
+    """Test scene-level incremental rendering"""
+
+    def setUp(self):
+        from ae_automation.render_cache import RenderCache
+
+        self.work_dir = tempfile.mkdtemp()
+        self.template = os.path.join(self.work_dir, "template.aep")
+        with open(self.template, "wb") as fh:
+            fh.write(b"template")
+        self.client = Client()
+        self.client._render_cache = RenderCache(cache_dir=os.path.join(self.work_dir, "cache"), max_bytes=10**9)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _config(self, titles):
+        timeline = []
+        for i, title in enumerate(titles):
+            timeline.append(
+                {
+                    "startTime": i * 5,
+                    "duration": 5,
+                    "template_comp": "TitleTemplate",
+                    "custom_actions": [
+                        {
+                            "change_type": "update_layer_property",
+                            "comp_name": "TitleTemplate",
+                            "layer_name": "Title",
+                            "property_name": "Text.Source Text",
+                            "value": title,
+                        }
+                    ],
+                }
+            )
+        return {
+            "project": {
+                "project_file": self.template,
+                "comp_name": "FinalComposition",
+                "comp_fps": 30,
+                "output_dir": os.path.join(self.work_dir, "out"),
+                "resources": [],
+            },
+            "timeline": timeline,
+        }
+
+    def _fake_render(self, projectPath, compName, outputDir, **kwargs):
+        os.makedirs(outputDir, exist_ok=True)
+        path = os.path.join(outputDir, f"{compName}.mp4")
+        with open(path, "w") as fh:
+            fh.write(compName)
+        return path
+
+    @patch("ae_automation.mixins.afterEffect.stitch_segments")
+    def test_only_changed_scene_rerenders(self, mock_stitch):
+        with patch.object(Client, "renderFile", side_effect=self._fake_render) as mock_render:
+            self.client.renderScenes("staged.aep", self._config(["One", "Two", "Three"]))
+            self.assertEqual(mock_render.call_count, 3)
+            self.assertEqual(mock_render.call_args_list[0].kwargs["frame_range"], (0, 149))
+
+            mock_render.reset_mock()
+            self.client.renderScenes("staged.aep", self._config(["One", "Deux", "Three"]))
+
+        mock_render.assert_called_once()
+        self.assertEqual(mock_render.call_args[0][1], "scene-2-titletemplate")
+        stitched = [os.path.basename(p) for p in mock_stitch.call_args[0][0]]
+        self.assertEqual(
+            stitched, ["scene-1-titletemplate.mp4", "scene-2-titletemplate.mp4", "scene-3-titletemplate.mp4"]
+        )
+
+    @patch("ae_automation.mixins.afterEffect.stitch_segments")
+    def test_overlapping_scenes_fall_back_to_full_render(self, mock_stitch):
+        config = self._config(["One", "Two"])
+        config["timeline"][1]["startTime"] = 4.5
+        with patch.object(Client, "renderFile", side_effect=self._fake_render) as mock_render:
+            self.client.renderScenes("staged.aep", config)
+
+        mock_render.assert_called_once()
+        self.assertEqual(mock_render.call_args[0][1], "FinalComposition")
+        mock_stitch.assert_not_called()
+
+
+@unittest.skipUnless(settings.FFMPEG_PATH, "Requires ffmpeg")
+class TestStitchSegments(unittest.TestCase):
+    """Stitch real clips and verify no frames are lost or duplicated"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _make_clip(self, name, frames):
+        path = os.path.join(self.work_dir, name)
+        subprocess.run(
+            [settings.FFMPEG_PATH, "-loglevel", "error", "-y", "-f", "lavfi", "-i", "testsrc=size=64x64:rate=30"]
+            + ["-frames:v", str(frames), "-c:v", "libx264", "-pix_fmt", "yuv420p", path],
+            check=True,
+        )
+        return path
+
+    def _count_frames(self, path):
+        result = subprocess.run(
+            [settings.FFMPEG_PATH, "-hide_banner", "-i", path, "-map", "0:v:0", "-f", "null", "-"],
+            capture_output=True,
+            check=True,
+        )
+        matches = re.findall(r"frame=\s*(\d+)", result.stderr.decode("utf-8", errors="replace"))
+        return int(matches[-1])
+
+    def test_stitched_frame_count_matches_segments(self):
+        ranges = split_frame_range(0, 49, 3)
+        clips = [self._make_clip(f"segment_{i:03d}.mp4", e - s + 1) for i, (s, e) in enumerate(ranges)]
+        output = os.path.join(self.work_dir, "out.mp4")
+
+        stitch_segments(clips, output)
+
+        self.assertEqual(self._count_frames(output), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
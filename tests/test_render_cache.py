@@ -0,0 +1,196 @@
+"""
+Unit tests for the render result cache
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cli
+from ae_automation import Client, settings
+from ae_automation.render_cache import RenderCache
+
+
+def _put_many(cache_dir, work_dir, worker):
+    cache = RenderCache(cache_dir=cache_dir, max_bytes=10_000_000)
+    for n in range(10):
+        path = os.path.join(work_dir, f"render_{worker}_{n}.mp4")
+        with open(path, "wb") as fh:
+            fh.write(b"x")
+        cache.put(f"{worker}-{n}", path)
+
+
+class RenderCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cache = RenderCache(cache_dir=os.path.join(self.work_dir, "cache"), max_bytes=10_000)
+        self.aep = self._write("project.aep", b"aep-v1")
+        self.music = self._write("music.mp3", b"music-v1")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "wb") as fh:
+            fh.write(content)
+        return path
+
+
+class TestFingerprint(RenderCacheTestCase):
+    """Test cache key derivation"""
+
+    def test_same_inputs_same_key(self):
+        a = self.cache.fingerprint(self.aep, "Final", {"segments": 1}, [self.music])
+        b = self.cache.fingerprint(self.aep, "Final", {"segments": 1}, [self.music])
+        self.assertEqual(a, b)
+
+    def test_key_changes_with_each_input(self):
+        base = self.cache.fingerprint(self.aep, "Final", {"segments": 1}, [self.music])
+        self.assertNotEqual(base, self.cache.fingerprint(self.aep, "Other", {"segments": 1}, [self.music]))
+        self.assertNotEqual(base, self.cache.fingerprint(self.aep, "Final", {"segments": 4}, [self.music]))
+        self.assertNotEqual(base, self.cache.fingerprint(self.aep, "Final", {"segments": 1}, []))
+
+        time.sleep(0.01)
+        self._write("music.mp3", b"music-v2")
+        self.assertNotEqual(base, self.cache.fingerprint(self.aep, "Final", {"segments": 1}, [self.music]))
+
+    def test_resource_order_does_not_matter(self):
+        other = self._write("logo.png", b"logo")
+        a = self.cache.fingerprint(self.aep, "Final", None, [self.music, other])
+        b = self.cache.fingerprint(self.aep, "Final", None, [other, self.music])
+        self.assertEqual(a, b)
+
+
+class TestCacheStore(RenderCacheTestCase):
+    """Test get/put, hardlinking and LRU eviction"""
+
+    def test_miss_then_hit(self):
+        dest = os.path.join(self.work_dir, "out", "Final.mp4")
+        self.assertIsNone(self.cache.get("k1", dest))
+
+        render = self._write("render.mp4", b"x" * 100)
+        self.cache.put("k1", render, label="Final")
+
+        self.assertEqual(self.cache.get("k1", dest), dest)
+        with open(dest, "rb") as fh:
+            self.assertEqual(fh.read(), b"x" * 100)
+        self.assertEqual(self.cache.entries()[0]["hits"], 1)
+
+    def test_lru_eviction_respects_size_limit(self):
+        for key in ("a", "b", "c"):
+            self.cache.put(key, self._write(f"{key}.mp4", b"x" * 3000))
+            time.sleep(0.01)
+        # Touch "a" so "b" becomes least recently used
+        self.cache.get("a", os.path.join(self.work_dir, "a_out.mp4"))
+        self.cache.put("d", self._write("d.mp4", b"x" * 3000))
+
+        keys = {e["key"] for e in self.cache.entries()}
+        self.assertNotIn("b", keys)
+        self.assertIn("a", keys)
+        self.assertLessEqual(self.cache.stats()["total_bytes"], 10_000)
+
+    def test_cached_files_are_read_only(self):
+        self.cache.put("k1", self._write("render.mp4", b"video"))
+        mode = os.stat(os.path.join(self.cache.cache_dir, "k1.mp4")).st_mode
+        self.assertEqual(mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH), 0)
+
+    def test_processes_sharing_the_cache_keep_every_entry(self):
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=_put_many, args=(self.cache.cache_dir, self.work_dir, worker)) for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        self.assertEqual(len(self.cache.entries()), 40)
+        self.assertEqual(sorted(os.listdir(self.cache.cache_dir)).count("index.json"), 1)
+        self.assertFalse([name for name in os.listdir(self.cache.cache_dir) if name.endswith(".tmp")])
+
+    def test_prune_and_clear(self):
+        self.cache.put("a", self._write("a.mp4", b"x" * 3000))
+        self.cache.put("b", self._write("b.mp4", b"x" * 3000))
+        self.assertEqual(len(self.cache.prune(max_bytes=3000)), 1)
+        self.assertEqual(self.cache.clear(), 1)
+        self.assertEqual(self.cache.entries(), [])
+
+
+class TestRenderFileCache(RenderCacheTestCase):
+    """Test renderFile short-circuits on a cache hit"""
+
+    @patch.object(settings, "validate_settings")
+    def test_second_render_is_served_from_cache(self, _validate):
+        client = Client()
+        client._render_cache = self.cache
+        output_dir = os.path.join(self.work_dir, "out")
+
+        def fake_render(cmd):
+            with open(cmd[cmd.index("-output") + 1], "wb") as fh:
+                fh.write(b"video")
+            return "Command executed successfully."
+
+        with patch.object(Client, "runCommand", side_effect=fake_render) as mock_run:
+            first = client.renderFile(self.aep, "Final", output_dir, cache=True, resources=[self.music])
+            second = client.renderFile(self.aep, "Final", output_dir, cache=True, resources=[self.music])
+
+        self.assertEqual(first, second)
+        mock_run.assert_called_once()
+        self.assertTrue(os.path.isfile(second))
+
+    @patch.object(settings, "validate_settings")
+    def test_miss_does_not_overwrite_linked_cache_entry(self, _validate):
+        client = Client()
+        client._render_cache = self.cache
+        output_dir = os.path.join(self.work_dir, "out")
+        contents = iter([b"render-A", b"render-B"])
+
+        def fake_render(cmd):
+            # Writes in place like aerender does
+            with open(cmd[cmd.index("-output") + 1], "wb") as fh:
+                fh.write(next(contents))
+            return "Command executed successfully."
+
+        with patch.object(Client, "runCommand", side_effect=fake_render):
+            client.renderFile(self.aep, "Final", output_dir, frame_range=(0, 10), cache=True)
+            client.renderFile(self.aep, "Final", output_dir, frame_range=(0, 20), cache=True)
+
+        key_a = self.cache.fingerprint(self.aep, "Final", {"segments": 1, "frame_range": (0, 10)}, None)
+        dest = self.cache.get(key_a, os.path.join(self.work_dir, "a.mp4"))
+        with open(dest, "rb") as fh:
+            self.assertEqual(fh.read(), b"render-A")
+
+
+class TestCacheCli(RenderCacheTestCase):
+    """Test the cache CLI subcommand"""
+
+    def test_list_and_clear(self):
+        self.cache.put("abc123", self._write("a.mp4", b"x" * 10), label="Final")
+
+        with patch("ae_automation.render_cache.RenderCache", return_value=self.cache):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cli.cmd_cache(argparse.Namespace(cache_action="list"))
+            self.assertIn("abc123", out.getvalue())
+            self.assertIn("Final", out.getvalue())
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cli.cmd_cache(argparse.Namespace(cache_action="clear"))
+            self.assertIn("Removed 1 cache entry", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
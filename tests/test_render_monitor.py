@@ -0,0 +1,122 @@
+"""
+Unit tests for the streaming aerender output reader
+"""
+
+import subprocess
+import sys
+import textwrap
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client
+from ae_automation.exceptions import RenderError
+from ae_automation.render_monitor import AerenderOutputReader
+
+# Emulates aerender: duration header, then progress lines interleaved with far
+# more stderr than an OS pipe buffer holds (~64KB) so a reader that drains
+# only stdout would deadlock.
+FAKE_AERENDER = textwrap.dedent(
+    """
+    import sys, time
+    print("PROGRESS:  Duration: 0:00:02:00", flush=True)
+    print("PROGRESS:  Frame Rate: 30.00 (comp)", flush=True)
+    for frame in range(1, 61, 10):
+        sys.stderr.write("x" * 2000 + "\\n" * 10)
+        sys.stderr.write("noise " * 5000 + "\\n")
+        sys.stderr.flush()
+        print("PROGRESS:  0:00:00:%02d (%d): 0 Seconds" % (frame % 30, frame), flush=True)
+        time.sleep(0.01)
+    print("PROGRESS:  WARNING: missing font substituted", flush=True)
+    sys.exit(int(sys.argv[1]))
+    """
+)
+
+
+def _spawn(exit_code=0):
+    return subprocess.Popen(
+        [sys.executable, "-c", FAKE_AERENDER, str(exit_code)], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+class TestAerenderOutputReader(unittest.TestCase):
+    """Test concurrent draining and event parsing"""
+
+    def test_heavy_stderr_does_not_deadlock(self):
+        events = []
+        reader = AerenderOutputReader(_spawn(), on_event=events.append, max_lines=50, log_output=False)
+        returncode = reader.run()
+
+        self.assertEqual(returncode, 0)
+        kinds = [e.kind for e in events]
+        self.assertEqual(kinds[0], "start")
+        self.assertEqual(kinds[-1], "done")
+        self.assertIn("warning", kinds)
+        self.assertLessEqual(len(reader.stderr_tail), 50)
+
+        frames = [e for e in events if e.kind == "frame"]
+        self.assertEqual([e.frame for e in frames], [1, 11, 21, 31, 41, 51])
+        # 2 seconds at 30 fps, derived from the timecode duration
+        self.assertEqual(frames[-1].total_frames, 60)
+        self.assertEqual(frames[-1].percent, 85)
+        self.assertGreater(frames[-1].fps, 0)
+        self.assertIsNotNone(frames[-1].eta)
+        self.assertEqual(events[-1].percent, 100)
+
+    def test_direct_frame_count_and_failure(self):
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; print('DURATION: 0:00:10:00 (300)'); sys.stderr.write('boom'); sys.exit(3)",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        events = []
+        reader = AerenderOutputReader(process, on_event=events.append, log_output=False)
+
+        self.assertEqual(reader.run(), 3)
+        self.assertEqual(reader.total_frames, 300)
+        self.assertEqual(events[-1].returncode, 3)
+        self.assertEqual(events[-1].message, "boom")
+
+
+class TestRunCommandStreaming(unittest.TestCase):
+    """Test runCommand and renderFileWithProgress on top of the reader"""
+
+    def test_run_command_raises_with_stderr_tail(self):
+        client = Client()
+        with self.assertRaises(RenderError) as ctx:
+            client.runCommand([sys.executable, "-c", FAKE_AERENDER, "1"])
+        self.assertIn("noise", ctx.exception.detail)
+
+    def test_progress_falls_back_to_project_map(self):
+        client = Client()
+        client.afterEffectItems = [{"name": "Final", "id": 1, "type": "CompItem", "duration": 4.0, "frameRate": 30.0}]
+        events = []
+
+        with (
+            patch("ae_automation.mixins.afterEffect.settings.validate_settings"),
+            patch(
+                "ae_automation.mixins.afterEffect.build_aerender_command",
+                return_value=[sys.executable, "-c", "print('PROGRESS:  0:00:01:00 (30): 0 Seconds')"],
+            ),
+        ):
+            client.renderFileWithProgress("p.aep", "Final", "/tmp", on_event=events.append)
+            deadline = time.time() + 10
+            while client.get_render_progress()["status"] not in ("complete", "error") and time.time() < deadline:
+                time.sleep(0.01)
+
+        progress = client.get_render_progress()
+        self.assertEqual(progress["status"], "complete")
+        self.assertEqual(progress["total_frames"], 120)
+        self.assertEqual(progress["percent"], 100)
+        self.assertTrue(any(e.kind == "frame" and e.percent == 25 for e in events))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the render resource planner
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.render import build_aerender_command
+from ae_automation.render_planner import RenderPlanner
+
+GB = 1024**3
+
+
+def _fake_psutil(total_gb, available_gb, cpus, aerender_procs=0):
+    fake = MagicMock()
+    fake.virtual_memory.return_value = SimpleNamespace(total=total_gb * GB, available=available_gb * GB)
+    fake.cpu_count.return_value = cpus
+    procs = [SimpleNamespace(info={"name": "aerender.exe"}) for _ in range(aerender_procs)]
+    procs.append(SimpleNamespace(info={"name": "explorer.exe"}))
+    fake.process_iter.return_value = procs
+    return fake
+
+
+class TestRenderPlanner(unittest.TestCase):
+    """Test how memory, cores and active renders shape the plan"""
+
+    def _plan(self, psutil_mock, requested, **planner_kwargs):
+        planner_kwargs.setdefault("memory_per_process_gb", 4)
+        planner_kwargs.setdefault("memory_budget_percent", 70)
+        with patch("ae_automation.render_planner.psutil", psutil_mock):
+            return RenderPlanner(**planner_kwargs).plan(requested=requested)
+
+    def test_single_render_gets_whole_budget(self):
+        plan = self._plan(_fake_psutil(64, 48, 16), 1, mfr="off")
+        self.assertEqual(plan.concurrency, 1)
+        self.assertEqual(plan.mem_usage, (35, 70))
+        self.assertIsNone(plan.mfr_cpu_percent)
+
+    def test_concurrency_capped_by_available_memory(self):
+        plan = self._plan(_fake_psutil(16, 9, 32), 8, mfr="off")
+        self.assertEqual(plan.concurrency, 2)
+        self.assertEqual(plan.mem_usage, (17, 35))
+
+    def test_other_workers_shrink_memory_share(self):
+        alone = self._plan(_fake_psutil(64, 48, 16), 2, mfr="off")
+        shared = self._plan(_fake_psutil(64, 48, 16, aerender_procs=3), 2, mfr="off")
+        self.assertEqual(shared.active_renders, 3)
+        self.assertLess(shared.mem_usage[1], alone.mem_usage[1])
+
+    def test_mfr_follows_ae_version(self):
+        modern = self._plan(_fake_psutil(64, 48, 16), 8, mfr="auto", ae_version=2024)
+        legacy = self._plan(_fake_psutil(64, 48, 16), 8, mfr="auto", ae_version=2020)
+        # MFR renders use several cores each, so fewer processes run at once
+        self.assertEqual(modern.concurrency, 4)
+        self.assertEqual(modern.mfr_cpu_percent, 25)
+        self.assertEqual(legacy.concurrency, 8)
+        self.assertIsNone(legacy.mfr_cpu_percent)
+
+    def test_without_psutil_falls_back_to_cpu_count(self):
+        plan = self._plan(None, 2, mfr="off")
+        self.assertGreaterEqual(plan.concurrency, 1)
+        self.assertEqual(plan.active_renders, 0)
+
+    def test_mfr_flag_in_command(self):
+        cmd = build_aerender_command("p.aep", "Comp", "out.mp4", mem_usage=(30, 60), mfr_cpu_percent=50)
+        self.assertEqual(cmd[-6:], ["-mem_usage", "30", "60", "-mfr", "ON", "50"])
+        self.assertNotIn("-mfr", build_aerender_command("p.aep", "Comp", "out.mp4"))
+
+
+class TestRenderFilePlan(unittest.TestCase):
+    """Test renderFile applies the plan to aerender"""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.client = Client()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    @patch.object(Client, "runCommand")
+    @patch.object(settings, "validate_settings")
+    def test_plan_drives_command_and_is_logged(self, _validate, mock_run):
+        with patch("ae_automation.render_planner.psutil", _fake_psutil(64, 48, 16)):
+            self.client._render_planner = RenderPlanner(memory_per_process_gb=4, mfr="on")
+            with self.assertLogs("ae_automation.render_planner", level="INFO") as logs:
+                self.client.renderFile("p.aep", "Comp", self.output_dir)
+
+        cmd = mock_run.call_args[0][0]
+        self.assertEqual(cmd[cmd.index("-mem_usage") + 1 : cmd.index("-mem_usage") + 3], ["35", "70"])
+        self.assertEqual(cmd[cmd.index("-mfr") + 1 : cmd.index("-mfr") + 3], ["ON", "100"])
+        self.assertTrue(any("Render timing: Comp" in line for line in logs.output))
+        self.assertEqual(self.client._render_planner._in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Unit tests for the in-memory After Effects simulator backend
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.backends import AfterEffectsBackend, create_backend
+from ae_automation.exceptions import ConfigValidationError, ScriptExecutionError
+from ae_automation.simulator import AESimulator, SimulatorBackend, js_slugify
+
+TEMPLATE_PROJECT = {
+    "items": [
+        {"type": "folder", "name": "templates"},
+        {"type": "footage", "name": "logo.png", "folder": "templates"},
+        {"type": "comp", "name": "Badge", "folder": "templates", "duration": 5, "layers": [{"source": "logo.png"}]},
+        {
+            "type": "comp",
+            "name": "Intro",
+            "folder": "templates",
+            "duration": 5,
+            "layers": [{"name": "Title", "type": "text"}, {"source": "Badge"}],
+        },
+    ]
+}
+
+
+def _config(output_dir, project_file, resource_path, scenes=2):
+    return {
+        "project": {
+            "project_file": project_file,
+            "comp_name": "Main",
+            "comp_fps": 30,
+            "comp_width": 1920,
+            "comp_height": 1080,
+            "comp_end_time": 20,
+            "output_dir": output_dir,
+            "debug": True,
+            "resources": [{"type": "image", "name": "photo", "path": resource_path}],
+        },
+        "timeline": [
+            {
+                "startTime": i * 5,
+                "duration": 5,
+                "template_comp": "Intro",
+                "custom_actions": [
+                    {
+                        "change_type": "update_layer_property",
+                        "comp_name": "Intro",
+                        "layer_name": "Title",
+                        "property_name": "Text.Source Text",
+                        "value": f"Scene {i + 1}",
+                    },
+                    {
+                        "change_type": "update_layer_property",
+                        "comp_name": "Intro",
+                        "layer_name": "Title",
+                        "property_name": "Transform.Opacity",
+                        "value": "50",
+                    },
+                    {
+                        "change_type": "add_resource",
+                        "comp_name": "Intro",
+                        "resource_name": "photo",
+                        "startTime": 0,
+                        "duration": 5,
+                    },
+                ],
+            }
+            for i in range(scenes)
+        ],
+    }
+
+
+class TestSimulatorEndToEnd(unittest.TestCase):
+    """Test startAfterEffect against the simulator"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._cache = patch.object(settings, "CACHE_FOLDER", self.tmp)
+        self._cache.start()
+        self.project_file = os.path.join(self.tmp, "template.aep")
+        with open(self.project_file, "w", encoding="utf-8") as f:
+            json.dump(TEMPLATE_PROJECT, f)
+        self.resource = os.path.join(self.tmp, "photo.png")
+        open(self.resource, "wb").close()
+        # Debug runs expect the template to be open already
+        self.simulator = AESimulator(TEMPLATE_PROJECT, strict=True)
+        self.client = Client()
+        self.client.setScriptBackend(SimulatorBackend(self.simulator))
+
+    def tearDown(self):
+        self._cache.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_builds_scenes_from_template(self):
+        self.client.startAfterEffect(_config(self.tmp, self.project_file, self.resource))
+
+        sim = self.simulator
+        self.assertEqual(sim.errors, [])
+        main = sim.find("Main")
+        self.assertEqual(main.parent.name, settings.AFTER_EFFECT_PROJECT_FOLDER)
+        self.assertEqual([layer.name for layer in main.layers], ["scene-2-intro", "scene-1-intro"])
+        self.assertEqual(main.layers[0].startTime, 5.0)
+
+        for n in (1, 2):
+            scene = sim.find(f"scene-{n}-intro")
+            self.assertEqual(scene.parent.name, f"scene-{n}")
+            title = scene.layers[1]
+            self.assertEqual(title.properties, {"Text.Source Text": f"Scene {n}", "Transform.Opacity": "50"})
+            self.assertEqual(scene.layers[0].source.name, "photo")
+            # Nested comps are duplicated into the scene folder too
+            self.assertEqual(scene.layers[2].source.name, f"scene-{n}-badge")
+
+        # The two title edits per scene ran as one bulk command
+        self.assertEqual(sim.commands["update_properties_bulk.jsx"], 2)
+        self.assertEqual(sim.commands["update_properties.jsx"], 0)
+
+    def test_latency_is_applied_per_command(self):
+        backend = SimulatorBackend(self.simulator, latency={"*": 0.0, "file_map.jsx": 0.05})
+        self.client.setScriptBackend(backend)
+        started = time.perf_counter()
+        self.client.startAfterEffect(_config(self.tmp, self.project_file, self.resource, scenes=1))
+        elapsed = time.perf_counter() - started
+        self.assertGreaterEqual(elapsed, 0.05 * self.simulator.commands["file_map.jsx"])
+
+    def test_file_map_matches_project(self):
+        self.client.getScriptBackend().open_project(self.project_file)
+        data = self.client.getProjectMap()
+        self.assertEqual([f["name"] for f in data["files"]], ["templates", "logo.png", "Badge", "Intro"])
+        self.assertEqual(data["files"][0]["parentFolder"], "Root")
+        self.assertEqual(data["files"][3]["duration"], 5.0)
+
+
+class TestSimulatorOperations(unittest.TestCase):
+    """Test individual simulated operations"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._cache = patch.object(settings, "CACHE_FOLDER", self.tmp)
+        self._cache.start()
+        self.simulator = AESimulator(TEMPLATE_PROJECT)
+
+    def tearDown(self):
+        self._cache.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_errors_are_recorded_or_raised(self):
+        self.simulator.execute("update_properties.jsx", {"{comp_name}": "Nope", "{layer_name}": "x"})
+        self.assertEqual(self.simulator.errors[0][0], "update_properties.jsx")
+
+        self.simulator.strict = True
+        with self.assertRaises(ScriptExecutionError):
+            self.simulator.execute("unknown.jsx", {})
+
+    def test_setting_keyframed_property_fails(self):
+        args = {"{comp_name}": "Intro", "{layer_name}": "Title", "{property_name}": "Opacity", "{value}": "0"}
+        self.simulator.execute("update_properties_frame.jsx", dict(args, **{"{frame}": "1"}))
+        self.simulator.execute("update_properties.jsx", args)
+        self.assertIn("keyframes", self.simulator.errors[0][1])
+
+    def test_delete_key_removes_selected_folder_and_contents(self):
+        self.simulator.execute("selectItem.jsx", {"index": "1"})
+        self.simulator.press(("delete",))
+        self.assertEqual(self.simulator.items, [])
+
+    def test_swap_replaces_selected_layer_source(self):
+        sim = self.simulator
+        sim.execute("openItemName.jsx", {"{name}": "Intro"})
+        sim.execute("selectItemByName.jsx", {"{name}": "logo.png"})
+        sim.execute("selectLayerByIndex.jsx", {"{comp_name}": "Intro", "{layer_index}": "2"})
+        sim.press(("ctrl", "alt", "/"))
+        self.assertEqual(sim.find("Intro").layers[1].source.name, "logo.png")
+
+    def test_save_round_trips_through_open(self):
+        path = os.path.join(self.tmp, "saved.aep")
+        self.simulator.execute("save_project.jsx", {"{projectPath}": path})
+        backend = SimulatorBackend()
+        backend.open_project(path)
+        self.assertEqual([item.name for item in backend.simulator.items], ["templates", "logo.png", "Badge", "Intro"])
+        self.assertEqual(backend.simulator.find("Intro").layers[1].source.name, "Badge")
+
+    def test_js_slugify_matches_framework(self):
+        self.assertEqual(js_slugify("Scene-1-Lower Third_v2"), "scene-1-lower-third-v2")
+        self.assertEqual(js_slugify("  Café: Intro "), "cafe-intro")
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test choosing the backend from settings"""
+
+    def test_default_is_after_effects(self):
+        self.assertIsInstance(create_backend("aftereffects"), AfterEffectsBackend)
+
+    def test_simulator_uses_configured_latency(self):
+        with patch.object(settings, "SIMULATOR_LATENCY", 0.25):
+            backend = create_backend("simulator")
+        self.assertIsInstance(backend, SimulatorBackend)
+        self.assertEqual(backend.command_latency("file_map.jsx"), 0.25)
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ConfigValidationError):
+            create_backend("premiere")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the stub command runner
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.stub_runner import StubCommandRunner, StubRunnerBackend
+
+FILES = [{"id": 1, "name": "Intro", "type": "Composition", "parentFolder": "Root"}]
+
+
+class TestStubCommandRunner(unittest.TestCase):
+    """Test processing of queued command files"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.queue = os.path.join(self.tmp, "queue")
+        os.makedirs(self.queue)
+        self._patches = [
+            patch.object(settings, "CACHE_FOLDER", self.tmp),
+            patch.object(settings, "QUEUE_FOLDER", self.queue),
+        ]
+        for p in self._patches:
+            p.start()
+        self.client = Client()
+        self.runner = StubCommandRunner(files=FILES, poll_interval=0.01)
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _enqueue(self, file_name, replacements=None):
+        path, _ = self.client.assembleScript(file_name, replacements)
+        shutil.copy2(path, os.path.join(self.queue, "cmd_test.jsx"))
+
+    def _read(self, name):
+        with open(os.path.join(self.tmp, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_file_map_reports_given_files(self):
+        self._enqueue("file_map.jsx")
+        self.assertEqual(self.runner.process_queue(), 1)
+        self.assertEqual(self._read("file_map.json"), {"files": FILES})
+        # The command leaves the queue; its runner timing stays for the client
+        self.assertEqual(os.listdir(self.queue), ["cmd_test.timing"])
+        self.assertEqual(self.runner.executed["file_map.jsx"], 1)
+        self.assertEqual(len(self.runner.pickup_delays), 1)
+
+    def test_bulk_edit_reports_one_result_per_edit(self):
+        edits = json.dumps(
+            [{"layer": "A", "property": "p", "value": "1"}, {"layer": "B", "property": "p", "value": "2"}]
+        )
+        self._enqueue("update_properties_bulk.jsx", {"{comp_name}": "Intro", "{edits}": edits})
+        self.runner.process_queue()
+        self.assertEqual(self._read("update_properties_bulk.json"), [{"ok": True}, {"ok": True}])
+
+    def test_list_results_are_empty(self):
+        self._enqueue("duplicate_comp_2.jsx")
+        self.runner.process_queue()
+        self.assertEqual(self._read("comp_map.json"), [])
+
+    def test_per_script_latency(self):
+        runner = StubCommandRunner(latency={"*": 0.0, "file_map.jsx": 0.5})
+        self.assertEqual(runner.command_latency("file_map.jsx"), 0.5)
+        self.assertEqual(runner.command_latency("selectItem.jsx"), 0.0)
+
+    def test_timing_file_is_written(self):
+        self._enqueue("file_map.jsx")
+        self.runner.latency = 0.02
+        self.runner.process_queue()
+        with open(os.path.join(self.queue, "cmd_test.timing"), encoding="utf-8") as f:
+            timing = json.load(f)
+        self.assertTrue(timing["ok"])
+        self.assertLessEqual(timing["seen"], timing["start"])
+        self.assertGreaterEqual(timing["end"] - timing["start"], 20000)
+
+    def test_run_script_round_trip_through_queue(self):
+        self.client.setScriptBackend(StubRunnerBackend())
+
+        def sleep(seconds):
+            # Keep the queue polling, skip the fixed settle sleeps
+            if seconds < 1:
+                time.sleep(seconds)
+
+        with patch.object(Client, "cancel_token") as token, self.runner:
+            token.return_value.sleep.side_effect = sleep
+            self.client.getProjectMap()
+        self.assertEqual(self.client.afterEffectItems, FILES)
+        self.assertEqual(self.runner.executed["file_map.jsx"], 1)
+        self.assertEqual(os.listdir(self.queue), [])
+        report = {row["script"]: row for row in self.client.commandLatencyReport()}
+        self.assertGreaterEqual(report["file_map.jsx"]["execute"], 0)
+        self.assertIsNotNone(report["file_map.jsx"]["pickup"])
+
+
+if __name__ == "__main__":
+    unittest.main()
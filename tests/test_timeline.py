@@ -0,0 +1,132 @@
+"""
+Unit tests for per-job stage timelines
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cli
+from ae_automation import Client
+from ae_automation.job_store import JobStore
+from ae_automation.timeline import StageTimeline, summarize_stages
+
+
+class TestStageTimeline(unittest.TestCase):
+    """Test stage boundaries, command counts and aggregation"""
+
+    def test_stages_and_commands(self):
+        timeline = StageTimeline()
+        timeline.count_command()  # outside any stage: ignored
+        timeline.begin("startup")
+        time.sleep(0.02)
+        timeline.begin("imports")
+        timeline.count_command()
+        timeline.count_command()
+        self.assertEqual(timeline.current, "imports")
+        timeline.end()
+
+        stages = timeline.as_list()
+        self.assertEqual([(s["name"], s["commands"]) for s in stages], [("startup", 0), ("imports", 2)])
+        self.assertGreaterEqual(stages[0]["duration"], 0.02)
+        self.assertAlmostEqual(stages[1]["start"], stages[0]["start"] + stages[0]["duration"], places=3)
+        self.assertIsNone(timeline.current)
+
+    def test_open_stage_reports_elapsed(self):
+        timeline = StageTimeline()
+        timeline.begin("render")
+        self.assertGreaterEqual(timeline.as_list()[0]["duration"], 0)
+
+    def test_summarize(self):
+        jobs = [
+            [{"name": "startup", "duration": 10.0, "commands": 0}, {"name": "render", "duration": 30.0, "commands": 1}],
+            [{"name": "startup", "duration": 20.0, "commands": 0}],
+        ]
+        summary = summarize_stages(jobs)
+        self.assertEqual([s["name"] for s in summary], ["startup", "render"])
+        self.assertEqual((summary[0]["jobs"], summary[0]["total"], summary[0]["average"]), (2, 30.0, 15.0))
+        self.assertEqual(summary[1]["commands"], 1)
+
+
+class TestBatchStages(unittest.TestCase):
+    """Test that batch results carry the job's stage timeline"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.work_dir, "batch.db"))
+        self.client = Client()
+        self.client._batch_store = self.store
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_batch_result_has_stages(self):
+        config = os.path.join(self.work_dir, "a.json")
+        with open(config, "w") as fh:
+            fh.write("{}")
+
+        def fake_bot(path):
+            self.client.mark_stage("imports")
+            self.client.count_command()
+            self.client.mark_stage("render")
+            self.client.runCommand([sys.executable, "-c", "pass"])
+
+        self.client.queue_config(config)
+        with patch.object(Client, "startBot", side_effect=fake_bot):
+            self.client.start_batch()
+            self.client._batch_thread.join(timeout=30)
+
+        stages = self.client.get_batch_status()["results"][0]["stages"]
+        self.assertEqual([(s["name"], s["commands"]) for s in stages], [("imports", 1), ("render", 1)])
+        self.assertTrue(all(s["duration"] is not None for s in stages))
+
+
+class TestBatchReport(unittest.TestCase):
+    """Test the batch command's summary table and --report file"""
+
+    @patch("ae_automation.Client")
+    def test_report(self, mock_client_cls):
+        status = {
+            "batch_id": "b1",
+            "current": 1,
+            "total": 1,
+            "running": False,
+            "results": [
+                {
+                    "config": "a.json",
+                    "status": "success",
+                    "error": None,
+                    "stages": [{"name": "render", "start": 0.0, "duration": 12.5, "commands": 1}],
+                }
+            ],
+        }
+        mock_client_cls.return_value = MagicMock(get_batch_status=MagicMock(return_value=status))
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "a.json")
+            report = os.path.join(tmp, "report.json")
+            Path(config).write_text("{}")
+            args = argparse.Namespace(
+                configs=[config], dir=None, resume=False, priority=0, deadline=None, report=report
+            )
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cli.cmd_batch(args)
+            with open(report) as fh:
+                self.assertEqual(json.load(fh), status)
+        self.assertRegex(out.getvalue(), r"render\s+1\s+12\.5\s+12\.5\s+100%\s+1")
+
+
+if __name__ == "__main__":
+    unittest.main()
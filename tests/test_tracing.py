@@ -0,0 +1,115 @@
+"""
+Unit tests for hot-path tracing
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings, tracing
+from ae_automation.cancellation import CancellationToken
+from ae_automation.simulator import AESimulator, SimulatorBackend
+from ae_automation.tracing import span, start_tracing, stop_tracing, trace_context
+
+PROJECT = {"items": [{"type": "folder", "name": "templates"}, {"type": "comp", "name": "Intro", "folder": "templates"}]}
+
+
+class TestTracer(unittest.TestCase):
+    """Test span recording and export"""
+
+    def setUp(self):
+        self.tracer = start_tracing()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        stop_tracing()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_disabled_span_is_shared_no_op(self):
+        stop_tracing()
+        self.assertFalse(tracing.is_tracing())
+        with span("runScript") as trace:
+            trace.set(items=3)
+        self.assertIs(span("other"), tracing._NULL_SPAN)
+        self.assertEqual(self.tracer.events, [])
+
+    def test_span_records_complete_event(self):
+        with span("runScript", script="file_map.jsx") as trace:
+            trace.set(items=4)
+        event = self.tracer.events[0]
+        self.assertEqual(event["name"], "runScript")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"], {"script": "file_map.jsx", "items": 4})
+        self.assertGreaterEqual(event["dur"], 0)
+
+    def test_context_ids_are_attached(self):
+        with trace_context(job=7):
+            with trace_context(scene=2), span("assemble"):
+                pass
+            with span("read_result"):
+                pass
+        self.assertEqual([e["args"] for e in self.tracer.events], [{"job": 7, "scene": 2}, {"job": 7}])
+
+    def test_error_is_recorded(self):
+        with self.assertRaises(ValueError), span("ffmpeg"):
+            raise ValueError("boom")
+        self.assertEqual(self.tracer.events[0]["args"]["error"], "ValueError")
+
+    def test_export_names_threads(self):
+        def probe():
+            with span("probe_media"):
+                pass
+
+        thread = threading.Thread(target=probe, name="worker-1")
+        thread.start()
+        thread.join()
+        path = self.tracer.export(os.path.join(self.tmp, "trace.json"))
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        names = {e["args"]["name"] for e in data["traceEvents"] if e["ph"] == "M"}
+        self.assertIn("worker-1", names)
+        self.assertEqual(data["displayTimeUnit"], "ms")
+
+    def test_cancellation_sleep_is_traced(self):
+        CancellationToken().sleep(0.01)
+        self.assertEqual(self.tracer.events[0]["name"], "sleep")
+        self.assertEqual(self.tracer.events[0]["args"], {"seconds": 0.01})
+
+
+class TestClientSpans(unittest.TestCase):
+    """Test the spans emitted by the script path"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._cache = patch.object(settings, "CACHE_FOLDER", self.tmp)
+        self._cache.start()
+        self.client = Client()
+        self.client.setScriptBackend(SimulatorBackend(AESimulator(PROJECT)))
+        self.tracer = start_tracing()
+
+    def tearDown(self):
+        stop_tracing()
+        self._cache.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_project_map_spans(self):
+        with trace_context(job=1):
+            self.client.getProjectMap()
+        names = [e["name"] for e in self.tracer.events]
+        self.assertIn("runScript", names)
+        self.assertIn("read_result", names)
+        outer = self.tracer.events[-1]
+        self.assertEqual(outer["name"], "getProjectMap")
+        self.assertEqual(outer["args"], {"job": 1, "items": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the ffmpeg transcode stage
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation import Client, settings
+from ae_automation.exceptions import RenderError
+from ae_automation.transcode import (
+    MediaInfo,
+    build_transcode_command,
+    parse_media_info,
+    probe_media,
+    transcode,
+    transcode_many,
+)
+
+FFMPEG_INPUT_SUMMARY = """
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'render.mov':
+  Duration: 00:01:02.50, start: 0.000000, bitrate: 12000 kb/s
+  Stream #0:0[0x1](eng): Video: prores (HQ) (apch / 0x68637061), yuv422p10le, 1920x1080, 11000 kb/s, 23.98 fps, 23.98 tbr, 24k tbn (default)
+  Stream #0:1[0x2](eng): Audio: pcm_s16le (sowt / 0x74776F73), 48000 Hz, stereo, s16, 1536 kb/s (default)
+"""
+
+
+class TestCommandBuilding(unittest.TestCase):
+    """Test probe parsing and copy/re-encode decisions"""
+
+    def test_parse_media_info(self):
+        info = parse_media_info(FFMPEG_INPUT_SUMMARY)
+        self.assertEqual(info.video_codec, "prores")
+        self.assertEqual(info.audio_codec, "pcm_s16le")
+        self.assertAlmostEqual(info.fps, 23.98)
+        self.assertAlmostEqual(info.duration, 62.5)
+
+    def test_matching_codecs_use_stream_copy(self):
+        cmd = build_transcode_command("in.mov", "out.mp4", MediaInfo(10, "h264", "aac", 30))
+        self.assertIn("copy", cmd[cmd.index("-c") + 1])
+        self.assertNotIn("-c:v", cmd)
+
+    def test_mismatched_codecs_reencode_without_forcing_rate(self):
+        cmd = build_transcode_command("in.mov", "out.mp4", parse_media_info(FFMPEG_INPUT_SUMMARY))
+        self.assertEqual(cmd[cmd.index("-c:v") + 1], "libx264")
+        self.assertEqual(cmd[cmd.index("-c:a") + 1], "aac")
+        self.assertNotIn("-r", cmd)
+        self.assertEqual(cmd[cmd.index("-progress") + 1], "pipe:1")
+
+    def test_h264_with_pcm_audio_copies_video(self):
+        cmd = build_transcode_command("in.mov", "out.mp4", MediaInfo(10, "h264", "pcm_s16le", 30))
+        self.assertEqual(cmd[cmd.index("-c:v") + 1], "copy")
+        self.assertEqual(cmd[cmd.index("-c:a") + 1], "aac")
+        self.assertNotIn("-crf", cmd)
+
+    def test_only_audio_reencoded_when_video_matches_but_container_differs(self):
+        cmd = build_transcode_command("in.mov", "out.mkv", MediaInfo(10, "h264", "aac", 30))
+        self.assertEqual(cmd[cmd.index("-c:a") + 1], "copy")
+
+
+@unittest.skipUnless(settings.FFMPEG_PATH, "Requires ffmpeg")
+class TestTranscode(unittest.TestCase):
+    """Run real ffmpeg transcodes"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _make_clip(self, name, video_codec, audio_codec, rate=25):
+        path = os.path.join(self.work_dir, name)
+        subprocess.run(
+            [settings.FFMPEG_PATH, "-loglevel", "error", "-y", "-f", "lavfi", "-i", f"testsrc=size=64x64:rate={rate}"]
+            + ["-f", "lavfi", "-i", "sine", "-t", "2", "-c:v", video_codec, "-c:a", audio_codec]
+            + (["-pix_fmt", "yuv420p"] if video_codec == "libx264" else [])
+            + [path],
+            check=True,
+        )
+        return path
+
+    def test_reencode_preserves_frame_rate_and_reports_progress(self):
+        source = self._make_clip("render.mov", "mjpeg", "pcm_s16le", rate=25)
+        output = os.path.join(self.work_dir, "render.mp4")
+        progress = []
+
+        transcode(source, output, on_progress=progress.append)
+
+        info = probe_media(output)
+        self.assertEqual(info.video_codec, "h264")
+        self.assertEqual(info.audio_codec, "aac")
+        self.assertEqual(info.fps, 25)
+        self.assertEqual(progress[-1], 100.0)
+        self.assertEqual(progress, sorted(progress))
+
+    def test_convert_mov_to_mp4_and_parallel_jobs(self):
+        sources = [self._make_clip(f"clip{i}.mov", "libx264", "aac", rate=30) for i in range(3)]
+        outputs = [s.replace(".mov", ".mp4") for s in sources]
+
+        Client().convertMovToMp4(sources[0], outputs[0])
+        self.assertEqual(transcode_many(list(zip(sources[1:], outputs[1:])), max_workers=2), outputs[1:])
+
+        for output in outputs:
+            self.assertEqual(probe_media(output).fps, 30)
+
+    def test_failure_raises_render_error(self):
+        broken = os.path.join(self.work_dir, "broken.mov")
+        with open(broken, "wb") as fh:
+            fh.write(b"not a movie")
+        with self.assertRaises(RenderError):
+            transcode(broken, os.path.join(self.work_dir, "broken.mp4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
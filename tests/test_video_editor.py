@@ -0,0 +1,122 @@
+"""
+Unit tests for the VideoEditor project API
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ae_automation.mixins.VideoEditorApp import VideoEditorAppMixin
+
+PROJECT = {"project": {"comp_name": "Main"}, "timeline": [{"template_comp": "Intro", "duration": 5}]}
+
+
+class TestProjectCaching(unittest.TestCase):
+    """Test GET /api/project caching and conditional requests"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.project_file = os.path.join(self.tmp, "project.json")
+        self._write(PROJECT)
+        self.editor = VideoEditorAppMixin()
+        self.editor.file_path = self.project_file
+        self.api = self.editor.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, data):
+        with open(self.project_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def test_unchanged_file_is_parsed_once(self):
+        with patch("ae_automation.mixins.VideoEditorApp.json.load", wraps=json.load) as load:
+            first = self.api.get("/api/project")
+            second = self.api.get("/api/project")
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(first.get_json()["data"], PROJECT)
+        self.assertEqual(first.headers["ETag"], second.headers["ETag"])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.api.get("/api/project").headers["ETag"]
+        response = self.api.get("/api/project", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_external_edit_is_picked_up(self):
+        etag = self.api.get("/api/project").headers["ETag"]
+        changed = {**PROJECT, "timeline": []}
+        self._write(changed)
+        response = self.api.get("/api/project", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"], changed)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_update_changes_etag_without_reparsing(self):
+        etag = self.api.get("/api/project").headers["ETag"]
+        changed = {**PROJECT, "timeline": []}
+        self.api.post("/api/project", json={"data": changed})
+        with patch("ae_automation.mixins.VideoEditorApp.json.load", wraps=json.load) as load:
+            response = self.api.get("/api/project", headers={"If-None-Match": etag})
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"], changed)
+
+
+class TestUndoRedo(unittest.TestCase):
+    """Test undo/redo through the API"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.project_file = os.path.join(self.tmp, "project.json")
+        with open(self.project_file, "w", encoding="utf-8") as f:
+            json.dump(PROJECT, f)
+        self.editor = VideoEditorAppMixin()
+        self.editor.file_path = self.project_file
+        self.api = self.editor.app.test_client()
+        self.api.get("/api/project")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _saved(self):
+        with open(self.project_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_undo_and_redo_edits(self):
+        edited = {**PROJECT, "timeline": [{"template_comp": "Outro", "duration": 3}]}
+        response = self.api.post("/api/project", json={"data": edited})
+        self.assertTrue(response.get_json()["can_undo"])
+
+        response = self.api.post("/api/undo")
+        self.assertEqual(response.get_json()["data"], PROJECT)
+        self.assertFalse(response.get_json()["can_undo"])
+        self.assertEqual(self._saved(), PROJECT)
+
+        response = self.api.post("/api/redo")
+        self.assertEqual(response.get_json()["data"], edited)
+        self.assertFalse(response.get_json()["can_redo"])
+        self.assertEqual(self._saved(), edited)
+
+    def test_nothing_to_undo(self):
+        self.assertEqual(self.api.post("/api/undo").status_code, 400)
+        self.assertEqual(self.api.post("/api/redo").status_code, 400)
+
+    def test_external_edit_can_be_undone(self):
+        changed = {**PROJECT, "timeline": []}
+        with open(self.project_file, "w", encoding="utf-8") as f:
+            json.dump(changed, f)
+        self.api.get("/api/project")
+        self.assertEqual(self.api.post("/api/undo").get_json()["data"], PROJECT)
+
+
+if __name__ == "__main__":
+    unittest.main()